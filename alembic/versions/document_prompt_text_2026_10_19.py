@@ -0,0 +1,47 @@
+"""Prompt-ready document text
+
+Adds:
+- ``documents.prompt_text`` — the sanitized text sent to the LLM, stored only
+  when it differs from ``documents.text``.
+- ``documents.prompt_text_version`` — sanitizer version that produced it.
+- ``documents.prompt_token_estimate`` — rough token count of the prompt text.
+- ``documents.prompt_text_sha256`` — content hash of the prompt text.
+
+Existing rows are left NULL (sanitized at read time); fill them with
+``python -m backend.scripts.backfill_prompt_text``.
+
+Revision ID: document_prompt_text_2026_10_19
+Revises: groundtruth_store_2026_10_19
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "document_prompt_text_2026_10_19"
+down_revision: Union[str, None] = "groundtruth_store_2026_10_19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("prompt_text", sa.String(), nullable=True))
+    op.add_column(
+        "documents", sa.Column("prompt_text_version", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "documents", sa.Column("prompt_token_estimate", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "documents", sa.Column("prompt_text_sha256", sa.String(64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "prompt_text_sha256")
+    op.drop_column("documents", "prompt_token_estimate")
+    op.drop_column("documents", "prompt_text_version")
+    op.drop_column("documents", "prompt_text")
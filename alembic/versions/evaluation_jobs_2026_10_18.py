@@ -0,0 +1,73 @@
+"""evaluation jobs
+
+Adds ``evaluation_jobs``: one row per background batch evaluation (the
+batch-evaluate endpoint, and auto-evaluation of finished trials). Holds the
+requested trials, status, progress counters and the per-trial outcomes. Rows
+go with their project or ground truth.
+
+Revision ID: evaluation_jobs_2026_10_18
+Revises: combined_documents_2026_08_07
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "evaluation_jobs_2026_10_18"
+down_revision: Union[str, None] = "combined_documents_2026_08_07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "evaluation_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("groundtruth_id", sa.Integer(), nullable=False),
+        sa.Column("created_by_id", sa.Integer(), nullable=True),
+        sa.Column("trial_ids", sa.JSON(), nullable=True),
+        sa.Column("force_recalculate", sa.Boolean(), nullable=True),
+        sa.Column("source", sa.String(length=20), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("trials_done", sa.Integer(), nullable=True),
+        sa.Column("trials_failed", sa.Integer(), nullable=True),
+        sa.Column("results", sa.JSON(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["groundtruth_id"], ["ground_truth.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["created_by_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_evaluation_jobs_project_status",
+        "evaluation_jobs",
+        ["project_id", "status"],
+    )
+    op.create_index(
+        "ix_evaluation_jobs_groundtruth_id", "evaluation_jobs", ["groundtruth_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_evaluation_jobs_groundtruth_id", table_name="evaluation_jobs")
+    op.drop_index("ix_evaluation_jobs_project_status", table_name="evaluation_jobs")
+    op.drop_table("evaluation_jobs")
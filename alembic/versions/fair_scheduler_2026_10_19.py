@@ -0,0 +1,58 @@
+"""Fair trial scheduling
+
+Adds:
+- ``users.scheduling_weight`` / ``projects.scheduling_weight`` — relative
+  share of trial capacity; a trial's weight is the product of its owner's and
+  its project's. Existing rows get the neutral weight 1.
+- ``trial_shards.queued_at`` — when a shard was handed to Celery; NULL while
+  it waits for its trial's share of the shard slots.
+
+Revision ID: fair_scheduler_2026_10_19
+Revises: trial_shards_2026_10_19
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "fair_scheduler_2026_10_19"
+down_revision: Union[str, None] = "trial_shards_2026_10_19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "scheduling_weight", sa.Float(), nullable=False, server_default="1"
+        ),
+    )
+    op.add_column(
+        "projects",
+        sa.Column(
+            "scheduling_weight", sa.Float(), nullable=False, server_default="1"
+        ),
+    )
+    op.add_column(
+        "trial_shards",
+        sa.Column("queued_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Shards planned before this revision were all handed to Celery at once.
+    op.execute(
+        "UPDATE trial_shards SET queued_at = started_at "
+        "WHERE queued_at IS NULL AND started_at IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE trial_shards SET queued_at = CURRENT_TIMESTAMP "
+        "WHERE queued_at IS NULL AND status IN ('PENDING', 'PROCESSING')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("trial_shards", "queued_at")
+    op.drop_column("projects", "scheduling_weight")
+    op.drop_column("users", "scheduling_weight")
@@ -0,0 +1,31 @@
+"""Columnar ground truth store
+
+Adds:
+- ``ground_truth.store_manifest`` — where the parsed rows live: the store
+  artifact's file_uuid, the source file_uuid / ID column it was built from,
+  row count and columns. Existing ``data_cache`` blobs are converted to an
+  artifact (and cleared) the first time each ground truth is read.
+
+Revision ID: groundtruth_store_2026_10_19
+Revises: ocr_cache_2026_10_19
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "groundtruth_store_2026_10_19"
+down_revision: Union[str, None] = "ocr_cache_2026_10_19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("ground_truth", sa.Column("store_manifest", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ground_truth", "store_manifest")
@@ -0,0 +1,68 @@
+"""OCR result cache
+
+Adds:
+- ``ocr_cache_entries`` — OCR/conversion results keyed by a digest of (file
+  hash, engine, model, options hash), shared across projects and re-runs.
+  Payloads are zlib-compressed JSON; ``last_used_at`` drives LRU eviction.
+- ``projects.ocr_cache_enabled`` — per-project opt-out; existing projects
+  default to using the cache.
+
+Revision ID: ocr_cache_2026_10_19
+Revises: evaluation_jobs_2026_10_18
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "ocr_cache_2026_10_19"
+down_revision: Union[str, None] = "evaluation_jobs_2026_10_18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ocr_cache_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("file_hash", sa.String(length=64), nullable=False),
+        sa.Column("engine", sa.String(length=50), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=True),
+        sa.Column("options_hash", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=True,
+        ),
+        sa.Column(
+            "last_used_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("cache_key"),
+    )
+    op.create_index(
+        "ix_ocr_cache_entries_last_used_at", "ocr_cache_entries", ["last_used_at"]
+    )
+    op.add_column(
+        "projects",
+        sa.Column(
+            "ocr_cache_enabled", sa.Boolean(), nullable=False, server_default=sa.true()
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "ocr_cache_enabled")
+    op.drop_index("ix_ocr_cache_entries_last_used_at", table_name="ocr_cache_entries")
+    op.drop_table("ocr_cache_entries")
@@ -0,0 +1,50 @@
+"""Trial shard ledger
+
+Adds:
+- ``trial_shards`` — the slices of a Celery trial's documents, each run as
+  its own task: the documents it covers, its status and claim count, the
+  latest attempt's failures, token totals and a heartbeat the orphan sweeper
+  uses to re-queue shards whose worker died.
+
+Revision ID: trial_shards_2026_10_19
+Revises: document_prompt_text_2026_10_19
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "trial_shards_2026_10_19"
+down_revision: Union[str, None] = "document_prompt_text_2026_10_19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trial_shards",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("trial_id", sa.Integer(), nullable=False),
+        sa.Column("shard_index", sa.Integer(), nullable=False),
+        sa.Column("document_ids", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("failures", sa.JSON(), nullable=True),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("cached_prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["trial_id"], ["trials.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("trial_id", "shard_index", name="uq_trial_shard_index"),
+    )
+    op.create_index("ix_trial_shards_status", "trial_shards", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trial_shards_status", table_name="trial_shards")
+    op.drop_table("trial_shards")
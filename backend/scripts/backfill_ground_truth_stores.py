@@ -0,0 +1,38 @@
+# backend/scripts/backfill_ground_truth_stores.py
+#!/usr/bin/env python3
+"""
+Script to build the columnar store of ground truths that have none.
+
+Ground truths parsed before the store existed keep their rows in the legacy
+``data_cache`` blob, and reads of them build a temporary store every time
+until this runs.
+
+Usage:
+python -m backend.scripts.backfill_ground_truth_stores
+Only one project: python -m backend.scripts.backfill_ground_truth_stores --project-id 12
+"""
+
+import argparse
+
+from backend.src.db.session import SessionLocal
+from backend.src.utils.groundtruth_store import backfill_ground_truth_stores
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the columnar store of ground truths missing one"
+    )
+    parser.add_argument(
+        "--project-id", type=int, default=None, help="Only backfill this project"
+    )
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        built, skipped = backfill_ground_truth_stores(
+            session, project_id=args.project_id
+        )
+    print(f"Built {built} ground truth stores; {skipped} files did not parse.")
+
+
+if __name__ == "__main__":
+    main()
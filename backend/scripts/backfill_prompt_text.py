@@ -0,0 +1,46 @@
+# backend/scripts/backfill_prompt_text.py
+#!/usr/bin/env python3
+"""
+Script to fill the prompt-ready text of existing documents.
+
+Documents written before the prompt columns existed, or sanitized by an older
+SANITIZER_VERSION, are sanitized on every extraction request until this runs.
+
+Usage:
+python -m backend.scripts.backfill_prompt_text
+Only one project: python -m backend.scripts.backfill_prompt_text --project-id 12
+Smaller transactions: python -m backend.scripts.backfill_prompt_text --batch-size 100
+"""
+
+import argparse
+
+from backend.src.db.session import SessionLocal
+from backend.src.utils.document_prompt import SANITIZER_VERSION, backfill_prompt_text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute prompt-ready text for documents missing it"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Documents updated per transaction (default: 500)",
+    )
+    parser.add_argument(
+        "--project-id", type=int, default=None, help="Only backfill this project"
+    )
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    with SessionLocal() as session:
+        count = backfill_prompt_text(
+            session, batch_size=args.batch_size, project_id=args.project_id
+        )
+    print(f"Updated {count} documents to sanitizer version {SANITIZER_VERSION}.")
+
+
+if __name__ == "__main__":
+    main()
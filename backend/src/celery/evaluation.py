@@ -0,0 +1,31 @@
+# backend/src/celery/evaluation.py
+"""Celery task that runs a batch-evaluation job (see ``utils/evaluation_jobs.py``).
+
+Queued on ``default``: evaluation is CPU and database work with no OCR, so it
+must not wait behind the single-slot ``preprocess`` queue. The task body is
+the same function the API runs inline when Celery is disabled; it finalizes
+the job itself and never raises, so there is nothing for Celery to retry.
+"""
+
+import logging
+
+from ..utils.evaluation_jobs import run_job
+from .celery_config import celery_app
+
+logger = logging.getLogger(__name__)
+
+evaluate_trials_job = None
+
+if celery_app is not None:
+
+    @celery_app.task(
+        bind=True,
+        name="backend.src.celery.evaluation.evaluate_trials_job",
+        # Redelivery after a worker loss resumes the job: trials already
+        # recorded on it are skipped (see run_job).
+        acks_late=True,
+        reject_on_worker_lost=True,
+    )
+    def evaluate_trials_job(self, job_id: int) -> None:
+        """Evaluate every trial of an EvaluationJob."""
+        run_job(job_id)
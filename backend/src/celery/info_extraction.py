@@ -12,17 +12,26 @@ from .. import models
 from ..core.config import settings
 from ..db.session import db_session
 from ..middleware.error_handlers import internal_error_message
+from ..utils.fair_scheduler import trial_weights
 from ..utils.info_extraction import extract_info_single_doc_async, update_trial_progress
+from ..utils.trial_shards import (
+    cancel_pending_shards,
+    claim_finalization,
+    claim_shard,
+    finish_shard,
+    heartbeat_shard,
+    open_shards,
+    plan_shards,
+    queue_next_shards,
+    queued_shards,
+    shard_concurrency,
+    shard_totals,
+    unqueue_shards,
+)
 from .celery_config import celery_app
 
 log = logging.getLogger(__name__)
 
-# Upper bound on per-trial LLM concurrency. Each concurrent document holds an
-# in-flight HTTP connection + response buffer; an unbounded value (user sets
-# max_concurrency=100000) would exhaust FDs/connections/memory in one worker.
-# 32 is comfortably above the default of 8 and any realistic trial.
-MAX_TRIAL_CONCURRENCY = 32
-
 
 def _broadcast_trial_update(trial: models.Trial, event: str = "progress"):
     """Broadcast trial task update via Redis pub/sub (for use in Celery tasks).
@@ -62,18 +71,464 @@ def _broadcast_trial_update(trial: models.Trial, event: str = "progress"):
         log.error("Error broadcasting trial update: %s", e, exc_info=True)
 
 
+_TERMINAL = (
+    models.TrialStatus.COMPLETED,
+    models.TrialStatus.FAILED,
+    models.TrialStatus.CANCELLED,
+)
+
+# The shard task; None when Celery is disabled.
+extract_trial_shard = None
+
+
+def dispatch_shards(trial_id: int, shard_ids: List[int]) -> None:
+    """Queue one ``extract_trial_shard`` task per shard on the default queue."""
+    for shard_id in shard_ids:
+        extract_trial_shard.delay(trial_id=trial_id, shard_id=shard_id)
+
+
+def queue_waiting_shards() -> int:
+    """Top up every running trial's window of queued shards (see
+    ``utils/fair_scheduler.py``) and hand the shards to Celery.
+
+    Called whenever a shard settles or a trial is planned. Returns the number
+    of shards queued.
+    """
+    with db_session() as db:
+        marked = queue_next_shards(db, settings.TRIAL_SHARD_SLOTS)
+    by_trial: Dict[int, List[int]] = {}
+    for trial_id, shard_id in marked:
+        by_trial.setdefault(trial_id, []).append(shard_id)
+    pending = list(by_trial.items())
+    try:
+        while pending:
+            trial_id, shard_ids = pending[0]
+            dispatch_shards(trial_id, shard_ids)
+            pending.pop(0)
+    except Exception:
+        # Shards marked queued without a message would fill their trial's
+        # window forever: hand them back so the next top-up queues them.
+        with db_session() as db:
+            unqueue_shards(db, [s for _, shard_ids in pending for s in shard_ids])
+        raise
+    return len(marked)
+
+
+def _queue_waiting_shards_safely() -> None:
+    try:
+        queue_waiting_shards()
+    except Exception:
+        # The shards stay in the ledger, unqueued; the next settled shard or
+        # the orphan sweeper queues them.
+        log.exception("Could not queue waiting trial shards")
+
+
+async def _run_documents(
+    trial_id: int,
+    shard_id: int,
+    document_ids: List[int],
+    *,
+    api_key: str,
+    llm_model: str,
+    base_url: str,
+    schema_id: int,
+    prompt_id: int,
+    project_id: int,
+    advanced_options: Dict[str, Any] | None,
+    max_concurrency: int,
+    scheduling_weight: float = 1.0,
+) -> tuple[Dict[str, str], Dict[str, int], bool]:
+    """Extract one shard's documents.
+
+    Returns ``(failures, token_totals, cancelled)``.
+    """
+    # Create one client per shard. follow_redirects=False closes the SSRF
+    # redirect-bypass vector: a user-controlled endpoint can't 3xx the
+    # request to a blocked internal/metadata address. Mirrors the
+    # _test_client helper in utils/info_extraction.py.
+    async with AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+        http_client=httpx2.AsyncClient(
+            follow_redirects=False,
+            timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
+        ),
+    ) as client:
+        failures: Dict[str, str] = {}
+        doc_tasks: Dict[int, asyncio.Task] = {}
+        cancelled = False
+        # The prompt's static part is rendered once for the whole shard
+        # (prefix layout), and prompt/cached-prompt token counts are summed
+        # into the shard's ledger row, then into the trial's meta.
+        prefix_cache: Dict[int, Any] = {}
+        token_totals = {"prompt_tokens": 0, "cached_prompt_tokens": 0}
+
+        # ---- Concurrency limiter inside the shard ----
+        # This shard's part of the trial's max_concurrency (see
+        # trial_shards.shard_concurrency).
+        sem = asyncio.Semaphore(max_concurrency)
+
+        def _extract(doc_id: int):
+            return extract_info_single_doc_async(
+                client=client,
+                trial_id=trial_id,
+                document_id=doc_id,
+                llm_model=llm_model,
+                schema_id=schema_id,
+                prompt_id=prompt_id,
+                project_id=project_id,
+                advanced_options=advanced_options,
+                base_url=base_url,
+                prefix_cache=prefix_cache,
+                scheduling_weight=scheduling_weight,
+            )
+
+        # Per-document processing -------------------------------------------------
+        async def _process(doc_id: int):
+            async with sem:
+                try:
+                    # First, quick checks with a short-lived session
+                    with db_session() as db:
+                        trial = db.get(models.Trial, trial_id)
+                        if trial and trial.is_cancelled:
+                            raise asyncio.CancelledError("Trial was cancelled")
+
+                        # Skip only docs whose stored result succeeded. On a
+                        # re-run of the shard after a mid-run crash, docs with
+                        # a failed/incomplete/invalid result get re-extracted
+                        # (_store_result updates the row in place — same rule
+                        # it applies itself). Legacy rows without a status
+                        # carry it in additional_content; if neither is set,
+                        # skip conservatively rather than re-spend LLM cost.
+                        existing = db.execute(
+                            select(
+                                models.TrialResult.status,
+                                models.TrialResult.additional_content,
+                            ).where(
+                                models.TrialResult.trial_id == trial_id,
+                                models.TrialResult.document_id == doc_id,
+                            )
+                        ).first()
+                        if existing is not None:
+                            existing_status = (
+                                existing.status.value
+                                if existing.status
+                                else (existing.additional_content or {}).get("status")
+                            )
+                            if existing_status in ("success", None):
+                                return
+
+                    # LLM call + store result. extract_info_single_doc_async
+                    # opens its own short-lived sessions for load/store
+                    # so no DB connection is held during the LLM call.
+                    prompt_tokens, cached_tokens = await _extract(doc_id)
+                    token_totals["prompt_tokens"] += prompt_tokens
+                    token_totals["cached_prompt_tokens"] += cached_tokens
+
+                except asyncio.CancelledError:
+                    log.warning(
+                        "Trial %s: Doc %s was force-cancelled", trial_id, doc_id
+                    )
+                    failures[str(doc_id)] = "Cancelled"
+                    raise
+                except Exception as exc:
+                    failures[str(doc_id)] = internal_error_message(
+                        exc, prefix="Extraction failed"
+                    )
+                    log.error("Trial %s: Doc %s failed: %s", trial_id, doc_id, exc)
+
+        # Launch tasks (they'll be throttled by the semaphore)
+        for doc_id in document_ids:
+            doc_tasks[doc_id] = asyncio.create_task(_process(doc_id))
+
+        # Heartbeat: updates progress periodically + broadcasts via WebSocket
+        async def _progress_heartbeat():
+            last_broadcast = None
+            while True:
+                await asyncio.sleep(3)  # Faster updates (matching preprocessing)
+                # Catch per-tick so a transient DB error does NOT exit the
+                # loop: exiting would stop bumping the shard's heartbeat and
+                # the trial's `updated_at`, and the orphan sweeper would then
+                # re-queue this live shard as "worker lost". Log and retry
+                # next tick instead.
+                try:
+                    with db_session() as db:
+                        heartbeat_shard(db, shard_id)
+                        update_trial_progress(db, trial_id)
+                        trial = db.get(models.Trial, trial_id)
+
+                        if trial:
+                            # Broadcast update if status/progress changed
+                            current_state = (
+                                trial.status,
+                                trial.docs_done,
+                                trial.progress,
+                            )
+                            if last_broadcast != current_state:
+                                last_broadcast = current_state
+                                _broadcast_trial_update(trial, "progress")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    log.warning(
+                        "Trial %s: Heartbeat error (continuing): %s",
+                        trial_id,
+                        exc,
+                    )
+
+                if all(t.done() for t in doc_tasks.values()):
+                    break
+
+        # Cancellation watcher: cancels in-flight tasks
+        async def _cancellation_watcher():
+            nonlocal cancelled
+            while True:
+                await asyncio.sleep(1)
+                # Resilient per-tick: a transient DB error must not stop the
+                # watcher, or a cancel request would never abort the in-flight
+                # documents.
+                try:
+                    with db_session() as db:
+                        trial = db.get(models.Trial, trial_id)
+                        if trial and trial.is_cancelled:
+                            log.warning(
+                                "Trial %s: Cancellation detected, aborting in-flight tasks",
+                                trial_id,
+                            )
+                            cancelled = True
+                            for t in doc_tasks.values():
+                                if not t.done():
+                                    t.cancel()
+                            # Queued shards will not run either.
+                            cancel_pending_shards(db, trial_id)
+                            break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    log.warning(
+                        "Trial %s: Cancellation watcher error (continuing): %s",
+                        trial_id,
+                        exc,
+                    )
+                if all(t.done() for t in doc_tasks.values()):
+                    break
+
+        # Run all together. return_exceptions=True on the outer gather so an
+        # unexpected raise in the heartbeat/watcher can't cancel the sibling
+        # document coroutines; the shard settles from what they recorded.
+        await asyncio.gather(
+            asyncio.gather(*doc_tasks.values(), return_exceptions=True),
+            _progress_heartbeat(),
+            _cancellation_watcher(),
+            return_exceptions=True,
+        )
+        return failures, token_totals, cancelled
+
+
+def run_trial_shard(trial_id: int, shard_id: int) -> None:
+    """Claim one shard of a trial, extract its documents and settle it.
+
+    Whoever settles the trial's last open shard finalizes the trial (see
+    :func:`finalize_trial`). A shard that is not PENDING — already claimed by
+    another worker, or settled — is skipped, so duplicated and redelivered
+    messages are harmless.
+    """
+    with db_session() as db:
+        shard = claim_shard(db, shard_id)
+        if shard is None:
+            log.info("Trial %s: shard %s is not pending, skipping", trial_id, shard_id)
+            return
+        trial = db.get(models.Trial, trial_id)
+        if trial is None or trial.finished_at is not None:
+            # Deleted, or finalized behind the ledger's back (e.g. failed
+            # by an older worker's restart reclaim): nothing to run for.
+            finish_shard(db, shard_id, models.TrialStatus.CANCELLED, failures={})
+            _queue_waiting_shards_safely()
+            return
+        if trial.is_cancelled:
+            cancel_pending_shards(db, trial_id)
+            finish_shard(db, shard_id, models.TrialStatus.CANCELLED, failures={})
+            finalize_trial(trial_id)
+            _queue_waiting_shards_safely()
+            return
+        shard_index = shard.shard_index
+        document_ids = list(dict.fromkeys(shard.document_ids or []))
+        # The api_key is stored encrypted on the Trial row and decrypted here —
+        # it never traverses the Celery broker as plaintext. The rest of the
+        # configuration is read from the row too, so the sweeper can re-queue
+        # a shard by its id alone.
+        config = {
+            "api_key": trial.api_key,
+            "llm_model": trial.llm_model,
+            "base_url": trial.base_url,
+            "schema_id": trial.schema_id,
+            "prompt_id": trial.prompt_id,
+            "project_id": trial.project_id,
+            "advanced_options": trial.advanced_options,
+            "max_concurrency": shard_concurrency(
+                trial.advanced_options,
+                len(open_shards(db, trial_id)),
+                settings.TRIAL_SHARD_SLOTS,
+            ),
+            "scheduling_weight": trial_weights(db, [trial_id]).get(trial_id, 1.0),
+        }
+
+    error: Exception | None = None
+    try:
+        failures, token_totals, cancelled = asyncio.run(
+            _run_documents(trial_id, shard_id, document_ids, **config)
+        )
+    except Exception as exc:
+        # Failure outside the per-document handler (e.g. the AsyncOpenAI
+        # client couldn't be constructed). The shard settles FAILED so the
+        # trial still finalizes once the other shards are done.
+        log.exception("Trial %s: shard %s failed", trial_id, shard_id)
+        error = exc
+        failures = {
+            f"_shard_{shard_index}": internal_error_message(exc, prefix="Trial failed")
+        }
+        token_totals, cancelled = {}, False
+
+    if cancelled:
+        status = models.TrialStatus.CANCELLED
+    elif failures:
+        status = models.TrialStatus.FAILED
+    else:
+        status = models.TrialStatus.COMPLETED
+    with db_session() as db:
+        finish_shard(db, shard_id, status, failures=failures, **token_totals)
+    finalize_trial(trial_id)
+    _queue_waiting_shards_safely()
+    if error is not None:
+        raise error
+
+
+def finalize_trial(trial_id: int) -> bool:
+    """Set the trial's final status once no shard is open.
+
+    Returns False without doing anything when a shard is still open or the
+    trial was already finalized, so every shard (and the sweeper) can call it.
+    """
+    with db_session() as db:
+        if not claim_finalization(db, trial_id):
+            return False
+        failures, token_totals = shard_totals(db, trial_id)
+        update_trial_progress(db, trial_id)  # ensure docs_done/progress are up to date
+        trial: models.Trial = db.get(models.Trial, trial_id)
+        if trial is None:
+            return True
+        # Distinct ids: results are unique per (trial, document), so a legacy
+        # trial with duplicated document_ids must not have its total inflated
+        # (done == total would be unreachable).
+        total = len(set(trial.document_ids or []))
+        done = db.scalar(
+            select(func.count())
+            .select_from(models.TrialResult)
+            .where(models.TrialResult.trial_id == trial_id)
+        )
+        cancelled = trial.is_cancelled
+        # Added to any earlier run's totals (trials planned before the shard
+        # ledger existed kept theirs in meta).
+        previous = trial.meta or {}
+        trial.meta = previous | {
+            key: int(previous.get(key) or 0) + value
+            for key, value in token_totals.items()
+        }
+
+        if cancelled:
+            trial.status = models.TrialStatus.CANCELLED
+            event = "cancelled"
+            # Honor rollback_on_cancel: delete any TrialResult rows produced
+            # before cancellation was detected. This mirrors the preprocessing
+            # task's rollback (celery/preprocessing.py). Safe to do here
+            # because finalization runs after every shard has settled, so no
+            # new results are being created concurrently.
+            if trial.rollback_on_cancel:
+                db.execute(
+                    delete(models.TrialResult).where(
+                        models.TrialResult.trial_id == trial_id
+                    )
+                )
+                trial.docs_done = 0
+                trial.progress = 0.0
+            trial.meta = (trial.meta or {}) | {
+                "failures": failures,
+                "eta_seconds": 0,
+            }
+        elif done == total and not failures:
+            trial.status = models.TrialStatus.COMPLETED
+            event = "completed"
+            trial.meta = (trial.meta or {}) | {
+                "failures": {},
+                "eta_seconds": 0,
+            }
+        else:
+            trial.status = models.TrialStatus.FAILED
+            event = "failed"
+            trial.meta = (trial.meta or {}) | {
+                "failures": failures,
+                "eta_seconds": 0,
+            }
+        db.commit()
+
+        # Broadcast final status via Redis pub/sub
+        _broadcast_trial_update(trial, event)
+
+        # Email whoever started the run if they've been away long enough to
+        # have missed the live update. Swallows its own errors — see
+        # utils/notifications.py.
+        from ..utils.notifications import notify_trial_finished
+
+        notify_trial_finished(db, trial)
+
+        # Opt-in (advanced_options.auto_evaluate_groundtruth_id): queue an
+        # evaluation job for the completed run.
+        from ..utils.evaluation_jobs import queue_auto_evaluation
+
+        queue_auto_evaluation(db, trial)
+    return True
+
+
+def _mark_trial_failed(trial_id: int, exc: Exception) -> None:
+    """Finalize a trial whose planning failed outright as FAILED."""
+    try:
+        with db_session() as db:
+            trial = db.get(models.Trial, trial_id)
+            if trial and trial.status not in _TERMINAL:
+                trial.status = models.TrialStatus.FAILED
+                trial.finished_at = dt.datetime.now(dt.UTC)
+                trial.meta = (trial.meta or {}) | {
+                    "failures": {
+                        "_task": internal_error_message(exc, prefix="Trial failed")
+                    },
+                    "eta_seconds": 0,
+                }
+                db.commit()
+                _broadcast_trial_update(trial, "failed")
+
+                # The normal finalizer never ran, so notify from here — a run
+                # that died this way is exactly the one its owner most needs
+                # to hear about.
+                from ..utils.notifications import notify_trial_finished
+
+                notify_trial_finished(db, trial)
+    except Exception:
+        log.exception(
+            "Trial %s: failed to mark FAILED after catastrophic error",
+            trial_id,
+        )
+
+
 if celery_app:
 
     @celery_app.task(
         bind=True,
-        # Note: We deliberately don't use autoretry_for. Catastrophic failures
-        # (e.g. AsyncOpenAI client construction, exceptions escaping _run()) are
+        # Note: We deliberately don't use autoretry_for. A planning failure is
         # caught below and the Trial is marked FAILED. With autoretry_for, the
-        # re-raised exception would trigger a Celery retry that re-runs the
-        # entire trial from scratch, resurrecting a FAILED trial (status flaps
-        # FAILED -> IN_PROGRESS -> ...). Per-document failures are handled
-        # inside _run() and never reach this handler. Matches the preprocessing
-        # task (see celery/preprocessing.py).
+        # re-raised exception would trigger a Celery retry that re-plans a
+        # FAILED trial (status flaps FAILED -> IN_PROGRESS -> ...). Matches
+        # the preprocessing task (see celery/preprocessing.py).
         acks_late=True,
     )
     def extract_info_celery(
@@ -87,323 +542,67 @@ if celery_app:
         project_id: int,
         advanced_options: Dict[str, Any] | None = None,
     ) -> None:
+        """Plan a trial: write its shard ledger and queue its first shards.
+
+        The run's configuration is read from the Trial row by each shard; the
+        arguments other than ``document_ids`` are kept for messages queued by
+        earlier releases.
+        """
         # Dedupe (order-preserving), mirroring create_trial: results are unique
         # per (trial, document), so a duplicated id would make done == total
         # unreachable and the trial would always finalize FAILED. Trials created
         # before the endpoint deduped may still carry duplicates.
         document_ids = list(dict.fromkeys(document_ids))
-
-        async def _run():
+        try:
             # Stale-task / re-delivery guard. With task_acks_late=True and a
             # Redis visibility_timeout, a message can be redelivered after a
-            # worker loss or a long-running task exceeding the visibility
-            # window — while the original worker (or the sweeper in
-            # task_signals.py) may have already finalized this trial as
-            # FAILED/CANCELLED/COMPLETED. Re-running would resurrect a failed
-            # trial (status flaps FAILED -> ... -> COMPLETED) and waste LLM
-            # cost on duplicate calls. Bail out if the trial is already
-            # terminal. This mirrors the preprocessing task's stale-task
-            # detection (celery/preprocessing.py).
+            # worker loss while the trial was already finalized as
+            # FAILED/CANCELLED/COMPLETED. Re-planning would resurrect a failed
+            # trial and waste LLM cost. A redelivery of a trial that is still
+            # running re-queues the shards it had queued, which is harmless: a
+            # shard runs only once it is claimed.
             with db_session() as db:
                 trial = db.get(models.Trial, trial_id)
                 if trial is None:
                     log.warning("Trial %s: not found, skipping", trial_id)
                     return
-                if trial.status in (
-                    models.TrialStatus.COMPLETED,
-                    models.TrialStatus.FAILED,
-                    models.TrialStatus.CANCELLED,
-                ):
+                if trial.status in _TERMINAL:
                     log.warning(
                         "Trial %s: already terminal (%s), skipping re-delivery",
                         trial_id,
                         trial.status,
                     )
                     return
-                # The api_key is stored encrypted on the Trial row and decrypted
-                # here — it never traverses the Celery broker as plaintext.
-                api_key = trial.api_key
-
-            # Create one client per task. follow_redirects=False closes the SSRF
-            # redirect-bypass vector: a user-controlled endpoint can't 3xx the
-            # request to a blocked internal/metadata address. Mirrors the
-            # _test_client helper in utils/info_extraction.py.
-            async with AsyncOpenAI(
-                api_key=api_key,
-                base_url=base_url,
-                timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
-                http_client=httpx2.AsyncClient(
-                    follow_redirects=False,
-                    timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
-                ),
-            ) as client:
-                failures: Dict[str, str] = {}
-                doc_tasks: Dict[int, asyncio.Task] = {}
-
-                # ---- Concurrency limiter inside the task ----
-                max_conc = 8
-                if advanced_options and isinstance(advanced_options, dict):
-                    max_conc = int(advanced_options.get("max_concurrency", max_conc))
-                    if max_conc < 1:
-                        max_conc = 1
-                    if max_conc > MAX_TRIAL_CONCURRENCY:
-                        max_conc = MAX_TRIAL_CONCURRENCY
-                sem = asyncio.Semaphore(max_conc)
-
-                # Per-document processing -------------------------------------------------
-                async def _process(doc_id: int):
-                    async with sem:
-                        try:
-                            # First, quick checks with a short-lived session
-                            with db_session() as db:
-                                trial = db.get(models.Trial, trial_id)
-                                if trial and trial.is_cancelled:
-                                    raise asyncio.CancelledError("Trial was cancelled")
-
-                                # Skip only docs whose stored result succeeded.
-                                # On a re-delivery after a mid-run crash, docs
-                                # with a failed/incomplete/invalid result get
-                                # re-extracted (_store_result updates the row in
-                                # place — same rule it applies itself). Legacy
-                                # rows without a status carry it in
-                                # additional_content; if neither is set, skip
-                                # conservatively rather than re-spend LLM cost.
-                                existing = db.execute(
-                                    select(
-                                        models.TrialResult.status,
-                                        models.TrialResult.additional_content,
-                                    ).where(
-                                        models.TrialResult.trial_id == trial_id,
-                                        models.TrialResult.document_id == doc_id,
-                                    )
-                                ).first()
-                                if existing is not None:
-                                    existing_status = (
-                                        existing.status.value
-                                        if existing.status
-                                        else (existing.additional_content or {}).get(
-                                            "status"
-                                        )
-                                    )
-                                    if existing_status in ("success", None):
-                                        return
-
-                            # LLM call + store result. extract_info_single_doc_async
-                            # opens its own short-lived sessions for load/store
-                            # so no DB connection is held during the LLM call.
-                            await extract_info_single_doc_async(
-                                client=client,
-                                trial_id=trial_id,
-                                document_id=doc_id,
-                                llm_model=llm_model,
-                                schema_id=schema_id,
-                                prompt_id=prompt_id,
-                                project_id=project_id,
-                                advanced_options=advanced_options,
-                                base_url=base_url,
-                            )
-
-                        except asyncio.CancelledError:
-                            log.warning(
-                                "Trial %s: Doc %s was force-cancelled", trial_id, doc_id
-                            )
-                            failures[str(doc_id)] = "Cancelled"
-                            raise
-                        except Exception as exc:
-                            failures[str(doc_id)] = internal_error_message(
-                                exc, prefix="Extraction failed"
-                            )
-                            log.error(
-                                "Trial %s: Doc %s failed: %s", trial_id, doc_id, exc
-                            )
-
-                # Launch tasks (they'll be throttled by the semaphore)
-                for doc_id in document_ids:
-                    doc_tasks[doc_id] = asyncio.create_task(_process(doc_id))
-
-                # Heartbeat: updates progress periodically + broadcasts via WebSocket
-                async def _progress_heartbeat():
-                    last_broadcast = None
-                    while True:
-                        await asyncio.sleep(
-                            3
-                        )  # Faster updates (matching preprocessing)
-                        # Catch per-tick so a transient DB error does NOT exit the
-                        # loop: exiting would stop bumping `updated_at`, and the
-                        # orphan sweeper would then false-fail this live trial as
-                        # "worker lost". Log and retry next tick instead.
-                        try:
-                            with db_session() as db:
-                                update_trial_progress(db, trial_id)
-                                trial = db.get(models.Trial, trial_id)
-
-                                if trial:
-                                    # Broadcast update if status/progress changed
-                                    current_state = (
-                                        trial.status,
-                                        trial.docs_done,
-                                        trial.progress,
-                                    )
-                                    if last_broadcast != current_state:
-                                        last_broadcast = current_state
-                                        _broadcast_trial_update(trial, "progress")
-                        except asyncio.CancelledError:
-                            raise
-                        except Exception as exc:
-                            log.warning(
-                                "Trial %s: Heartbeat error (continuing): %s",
-                                trial_id,
-                                exc,
-                            )
-
-                        if all(t.done() for t in doc_tasks.values()):
-                            break
-
-                # Cancellation watcher: cancels in-flight tasks
-                async def _cancellation_watcher():
-                    while True:
-                        await asyncio.sleep(1)
-                        # Resilient per-tick: a transient DB error must not stop
-                        # the watcher, or a cancel request would never abort the
-                        # in-flight documents.
-                        try:
-                            with db_session() as db:
-                                trial = db.get(models.Trial, trial_id)
-                                if trial and trial.is_cancelled:
-                                    log.warning(
-                                        "Trial %s: Cancellation detected, aborting in-flight tasks",
-                                        trial_id,
-                                    )
-                                    for t in doc_tasks.values():
-                                        if not t.done():
-                                            t.cancel()
-                                    break
-                        except asyncio.CancelledError:
-                            raise
-                        except Exception as exc:
-                            log.warning(
-                                "Trial %s: Cancellation watcher error (continuing): %s",
-                                trial_id,
-                                exc,
-                            )
-                        if all(t.done() for t in doc_tasks.values()):
-                            break
-
-                # Run all together. return_exceptions=True on the outer gather so
-                # an unexpected raise in the heartbeat/watcher can't cancel the
-                # sibling document coroutines; finalization reads DB state.
-                await asyncio.gather(
-                    asyncio.gather(*doc_tasks.values(), return_exceptions=True),
-                    _progress_heartbeat(),
-                    _cancellation_watcher(),
-                    return_exceptions=True,
+                shard_ids = plan_shards(
+                    db, trial_id, document_ids, settings.TRIAL_SHARD_SIZE
                 )
-
-            # Finalize state in a short-lived session
-            with db_session() as db:
-                trial: models.Trial = db.get(models.Trial, trial_id)
-                update_trial_progress(
-                    db, trial_id
-                )  # ensure docs_done/progress are up to date
-                if trial:
-                    trial.finished_at = dt.datetime.now(dt.UTC)
-                    # Distinct ids: results are unique per (trial, document), so
-                    # a legacy trial with duplicated document_ids must not have
-                    # its total inflated (done == total would be unreachable).
-                    total = len(set(trial.document_ids or []))
-                    done = db.scalar(
-                        select(func.count())
-                        .select_from(models.TrialResult)
-                        .where(models.TrialResult.trial_id == trial_id)
-                    )
-                    cancelled = trial.is_cancelled
-
-                    if cancelled:
-                        trial.status = models.TrialStatus.CANCELLED
-                        event = "cancelled"
-                        # Honor rollback_on_cancel: delete any TrialResult rows
-                        # produced before cancellation was detected. This mirrors
-                        # the preprocessing task's rollback (celery/preprocessing.py).
-                        # Safe to do here because finalization runs after all
-                        # in-flight doc tasks have settled, so no new results are
-                        # being created concurrently.
-                        if trial.rollback_on_cancel:
-                            db.execute(
-                                delete(models.TrialResult).where(
-                                    models.TrialResult.trial_id == trial_id
-                                )
-                            )
-                            trial.docs_done = 0
-                            trial.progress = 0.0
-                        trial.meta = (trial.meta or {}) | {
-                            "failures": failures,
-                            "eta_seconds": 0,
-                        }
-                    elif done == total and not failures:
-                        trial.status = models.TrialStatus.COMPLETED
-                        event = "completed"
-                        trial.meta = (trial.meta or {}) | {
-                            "failures": {},
-                            "eta_seconds": 0,
-                        }
-                    else:
-                        trial.status = models.TrialStatus.FAILED
-                        event = "failed"
-                        trial.meta = (trial.meta or {}) | {
-                            "failures": failures,
-                            "eta_seconds": 0,
-                        }
-                    db.commit()
-
-                    # Broadcast final status via Redis pub/sub
-                    _broadcast_trial_update(trial, event)
-
-                    # Email whoever started the run if they've been away long
-                    # enough to have missed the live update. Swallows its own
-                    # errors — see utils/notifications.py.
-                    from ..utils.notifications import notify_trial_finished
-
-                    notify_trial_finished(db, trial)
-
-        try:
-            asyncio.run(_run())
-        except Exception as exc:
-            # Catastrophic failure outside the per-document handler (e.g. the
-            # AsyncOpenAI client couldn't be constructed, or something escaped
-            # _run() before finalization). Without this the Trial row stays
-            # stuck in PROCESSING forever — per-doc failures are already
-            # handled inside _run(), this only covers exceptions that escape it.
-            log.exception("Trial %s: catastrophic failure, marking FAILED", trial_id)
-            try:
-                with db_session() as db:
-                    trial = db.get(models.Trial, trial_id)
-                    if trial and trial.status not in (
-                        models.TrialStatus.COMPLETED,
-                        models.TrialStatus.FAILED,
-                        models.TrialStatus.CANCELLED,
-                    ):
-                        trial.status = models.TrialStatus.FAILED
-                        trial.finished_at = dt.datetime.now(dt.UTC)
-                        trial.meta = (trial.meta or {}) | {
-                            "failures": {
-                                "_task": internal_error_message(
-                                    exc, prefix="Trial failed"
-                                )
-                            },
-                            "eta_seconds": 0,
-                        }
-                        db.commit()
-                        _broadcast_trial_update(trial, "failed")
-
-                        # The normal finalizer never ran, so notify from here —
-                        # a run that died this way is exactly the one its owner
-                        # most needs to hear about.
-                        from ..utils.notifications import notify_trial_finished
-
-                        notify_trial_finished(db, trial)
-            except Exception:
-                log.exception(
-                    "Trial %s: failed to mark FAILED after catastrophic error",
+                redelivered = queued_shards(db, trial_id)
+            if shard_ids:
+                if redelivered:
+                    dispatch_shards(trial_id, redelivered)
+                queued = queue_waiting_shards()
+                log.info(
+                    "Trial %s: %d shard(s) planned, %d queued",
                     trial_id,
+                    len(shard_ids),
+                    queued + len(redelivered),
                 )
+            else:
+                # Nothing left to run (no documents): finalize right away.
+                finalize_trial(trial_id)
+        except Exception as exc:
+            # Without this the Trial row stays stuck in PROCESSING forever.
+            log.exception("Trial %s: planning failed, marking FAILED", trial_id)
+            _mark_trial_failed(trial_id, exc)
             raise
+
+    @celery_app.task(
+        bind=True,
+        name="backend.src.celery.info_extraction.extract_trial_shard",
+        # Redelivery after a worker loss finds the shard claimed and exits;
+        # the orphan sweeper re-queues it once its heartbeat goes stale.
+        acks_late=True,
+    )
+    def extract_trial_shard(self, trial_id: int, shard_id: int) -> None:
+        """Extract the documents of one trial shard."""
+        run_trial_shard(trial_id, shard_id)
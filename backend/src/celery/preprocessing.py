@@ -14,7 +14,11 @@ from ..middleware.error_handlers import (
     operational_error_message,
 )
 from ..schemas.project import redact_ocr_secrets
-from ..utils.preprocessing import PreprocessingPipeline
+from ..utils.preprocessing import (
+    PreprocessingPipeline,
+    engine_concurrency,
+    find_conflicting_file_tasks,
+)
 from .celery_config import celery_app
 
 log = logging.getLogger(__name__)
@@ -50,6 +54,46 @@ def _count_file_tasks_by_status(
     return {status: count for status, count in rows}
 
 
+def _use_mistral_batch(ocr_engine: str, extraction_mode: str, file_count: int) -> bool:
+    """Whether a chunk of ``file_count`` files should OCR via a Mistral batch job."""
+    threshold = settings.MISTRAL_OCR_BATCH_MIN_FILES
+    return (
+        (ocr_engine == "mistral_ocr" or extraction_mode == "high_accuracy_remote")
+        and threshold > 0
+        and file_count >= threshold
+    )
+
+
+def _prefetch_mistral_batch(
+    task_id: int,
+    file_task_ids: list[int],
+    api_key: str | None,
+    base_url: str | None,
+) -> dict:
+    """Run :meth:`PreprocessingPipeline.prefetch_mistral_batch` for a chunk.
+
+    Never raises: if the batch job fails as a whole, every file is simply
+    OCR'd on its own afterwards.
+    """
+    try:
+        with next(get_db()) as db:
+            pipeline = PreprocessingPipeline(
+                db, task_id, api_key=api_key, base_url=base_url
+            )
+            try:
+                return pipeline.prefetch_mistral_batch(file_task_ids)
+            finally:
+                pipeline.close()
+    except Exception as e:
+        log.warning(
+            "PreprocessingTask %s: Mistral batch OCR unavailable, OCR'ing "
+            "files one by one: %s",
+            task_id,
+            e,
+        )
+        return {}
+
+
 def _broadcast_preprocessing_update(
     task: models.PreprocessingTask, event: str = "progress"
 ):
@@ -277,22 +321,9 @@ if celery_app:
                 # Determine concurrency limit + worst-case per-file timeout based
                 # on the OCR backend. This ensures we don't overwhelm specific
                 # backends, and lets us bound the chunk by time (below).
-                if (
-                    ocr_engine == "mistral_ocr"
-                    or extraction_mode == "high_accuracy_remote"
-                ):
-                    max_concurrent = settings.MISTRAL_OCR_MAX_CONCURRENT_FILES
-                    engine_file_timeout = settings.MISTRAL_OCR_FILE_TIMEOUT_SECONDS
-                elif ocr_engine == "llm_vision":
-                    max_concurrent = settings.VISION_OCR_MAX_CONCURRENT_FILES
-                    engine_file_timeout = settings.VISION_OCR_FILE_TIMEOUT_SECONDS
-                else:
-                    # Default to docling-serve or general limit
-                    max_concurrent = min(
-                        settings.DOCLING_SERVE_MAX_CONCURRENT_FILES,
-                        settings.PREPROCESS_MAX_CONCURRENT_FILES,
-                    )
-                    engine_file_timeout = settings.DOCLING_SERVE_FILE_TIMEOUT_SECONDS
+                max_concurrent, engine_file_timeout = engine_concurrency(
+                    additional_settings
+                )
                 # A chunk may contain mixed file types; a table/text file falls
                 # back to the general timeout, so take the max as the worst case.
                 per_file_timeout = max(
@@ -317,6 +348,12 @@ if celery_app:
                     settings.CELERY_TASK_SOFT_TIME_LIMIT_SECONDS
                     * _CHUNK_TIME_BUDGET_FRACTION
                 )
+                # A Mistral batch job (below) may wait up to its own timeout
+                # before the files run; keep that out of the files' budget.
+                if _use_mistral_batch(
+                    ocr_engine, extraction_mode, settings.MISTRAL_OCR_BATCH_MIN_FILES
+                ):
+                    time_budget -= settings.MISTRAL_OCR_BATCH_TIMEOUT_SECONDS
                 waves = max(1, time_budget // max(1, per_file_timeout))
                 max_by_time = waves * max_concurrent
                 chunk_size = min(settings.PREPROCESS_CHUNK_SIZE, max_by_time)
@@ -341,6 +378,12 @@ if celery_app:
                     ).scalars()
                 )
 
+                # One set-based conflict screen for the whole chunk; each
+                # file re-checks only if it was flagged here.
+                conflict_candidates = find_conflicting_file_tasks(
+                    db, task.configuration_id, file_task_ids
+                )
+
                 log.info(
                     "Starting preprocessing task %s with concurrency limit %d, "
                     "chunk size %d (OCR engine: %s, per-file timeout %ds)",
@@ -351,6 +394,22 @@ if celery_app:
                     per_file_timeout,
                 )
 
+            # Large chunks bound for Mistral OCR go through one batch job first
+            # (Mistral's high-throughput path); the files then only build their
+            # documents from the prefetched text. Files the job did not cover
+            # are OCR'd one by one below as usual.
+            batch_results: dict = {}
+            if _use_mistral_batch(ocr_engine, extraction_mode, len(file_task_ids)):
+                batch_results = await asyncio.to_thread(
+                    _prefetch_mistral_batch, task_id, file_task_ids, api_key, base_url
+                )
+                log.info(
+                    "PreprocessingTask %s: Mistral batch OCR covered %d of %d files",
+                    task_id,
+                    len(batch_results),
+                    len(file_task_ids),
+                )
+
             sem = asyncio.Semaphore(max_concurrent)
             running_tasks = {}
             # Tracks OS worker threads currently inside blocking_run. The
@@ -399,6 +458,8 @@ if celery_app:
                                             task_id,
                                             api_key=api_key,
                                             base_url=base_url,
+                                            mistral_batch_results=batch_results,
+                                            conflict_candidates=conflict_candidates,
                                         )
                                         if pipeline.check_cancelled():
                                             raise asyncio.CancelledError(
@@ -13,7 +13,7 @@ import datetime
 import logging
 
 from celery import signals
-from sqlalchemy import func
+from sqlalchemy import exists, func, select
 
 from .. import models
 from ..core.config import settings
@@ -279,6 +279,90 @@ def mark_failed(sender=None, task_id=None, exception=None, args=None, **_):
         )
 
 
+def _recover_trial_shards(
+    db, *, stale_before: datetime.datetime | None = None, restarted: bool = False
+) -> int:
+    """Re-queue the trial shards of dead workers and finalize settled trials.
+
+    With ``stale_before``, shards whose heartbeat is older are re-opened, and
+    PENDING shards queued before it while no shard of their trial runs are
+    sent again (their message was lost);
+    on a ``restarted`` worker every PROCESSING shard is re-opened, and every
+    open shard that was queued is queued again. Trial windows are then topped
+    up, which also restarts a trial whose shards all wait in the ledger
+    because the worker that should have queued them died. Returns the number
+    of shards re-opened, failed or sent again.
+    """
+    from ..utils import trial_shards
+    from .info_extraction import (
+        dispatch_shards,
+        finalize_trial,
+        queue_waiting_shards,
+    )
+
+    reopened, exhausted = trial_shards.reopen_stale_shards(
+        db,
+        max_attempts=settings.TRIAL_SHARD_MAX_ATTEMPTS,
+        failure=lambda: operational_error_message(
+            detail="Trial shard interrupted too many times (worker crashed or "
+            "was killed); giving up on it.",
+            prefix="Part of the trial was interrupted repeatedly. Please retry.",
+        ),
+        stale_before=stale_before,
+    )
+    requeue: dict[int, list[int]] = {}
+    lost: list[tuple[int, int]] = []
+    if restarted:
+        trial_ids = db.scalars(
+            select(models.TrialShard.trial_id)
+            .where(models.TrialShard.status.in_(trial_shards.OPEN_STATUSES))
+            .distinct()
+        )
+        for trial_id in trial_ids.all():
+            requeue[trial_id] = trial_shards.queued_shards(db, trial_id)
+    else:
+        if stale_before is not None:
+            lost = trial_shards.requeue_lost_shards(db, queued_before=stale_before)
+        for trial_id, shard_id in [*reopened, *lost]:
+            requeue.setdefault(trial_id, []).append(shard_id)
+        if lost:
+            logger.warning(
+                "Trial shards: re-sent %d queued shard(s) never picked up (trials=%s)",
+                len(lost),
+                sorted({t for t, _ in lost})[:50],
+            )
+    if reopened or exhausted:
+        logger.warning(
+            "Trial shards: re-queued %d, failed %d for good (trials=%s)",
+            len(reopened),
+            len(exhausted),
+            sorted({t for t, _ in reopened} | exhausted)[:50],
+        )
+
+    for trial_id, shard_ids in requeue.items():
+        try:
+            dispatch_shards(trial_id, shard_ids)
+        except Exception:
+            # The shards stay PENDING; a later redelivery or restart queues them.
+            logger.exception("Could not re-queue shards of trial %s", trial_id)
+    try:
+        queue_waiting_shards()
+    except Exception:
+        logger.exception("Could not queue waiting trial shards")
+
+    settled = set(exhausted) | set(
+        trial_shards.settled_unfinalized_trials(
+            db, stale_before=None if restarted else stale_before
+        )
+    )
+    for trial_id in sorted(settled):
+        try:
+            finalize_trial(trial_id)
+        except Exception:
+            logger.exception("Could not finalize trial %s", trial_id)
+    return len(reopened) + len(exhausted) + len(lost)
+
+
 # ────────────────── periodic sweeper ──────────────────
 def sweep_orphans():
     # A file task whose last heartbeat (falling back to started_at for rows
@@ -417,20 +501,31 @@ def sweep_orphans():
                 # the "finished" email has to come from here.
                 notify_preprocessing_finished(db, parent)
 
-        # 4) fail stuck Trials. The extraction heartbeat (run by both the Celery
-        # task and the synchronous bypass_celery path) bumps `updated_at` every
-        # few seconds, so a PROCESSING trial whose `updated_at` is older than the
-        # cutoff has a dead worker (crash / OOM / SIGKILL) — the top-level
-        # try/except in extract_info_celery only catches exceptions, not a hard
-        # worker kill, so without this the trial would stay PROCESSING forever.
+        # 4) re-queue trial shards whose worker died. A running shard bumps
+        # its heartbeat every few seconds; a stale one goes back to PENDING and
+        # is queued again (documents that already succeeded are skipped), or
+        # is FAILED once it has used TRIAL_SHARD_MAX_ATTEMPTS claims. Then
+        # finalize trials whose last shard settled without a finalizer.
         trial_cutoff = datetime.datetime.now(datetime.UTC) - datetime.timedelta(
             seconds=settings.ORPHAN_STALE_SECONDS
         )
+        affected += _recover_trial_shards(db, stale_before=trial_cutoff)
+
+        # 4b) fail stuck Trials without a shard ledger (synchronous
+        # bypass_celery runs, and Celery trials whose planner died before
+        # writing one). The extraction heartbeat bumps `updated_at` every few
+        # seconds, so a PROCESSING trial whose `updated_at` is older than the
+        # cutoff has a dead worker (crash / OOM / SIGKILL) — the task's
+        # try/except only catches exceptions, not a hard worker kill, so
+        # without this the trial would stay PROCESSING forever. Sharded
+        # trials are left to the ledger: a trial whose shards are queued
+        # behind other work is waiting, not dead.
         stuck_trials = (
             db.query(models.Trial)
             .filter(
                 models.Trial.status == models.TrialStatus.PROCESSING,
                 models.Trial.updated_at < trial_cutoff,
+                ~exists().where(models.TrialShard.trial_id == models.Trial.id),
             )
             .all()
         )
@@ -463,6 +558,37 @@ def sweep_orphans():
             _broadcast_trial_update(trial, "failed")
             notify_trial_finished(db, trial)
 
+        # 5) fail stuck evaluation jobs. The job runner bumps `updated_at`
+        # every few seconds while its trials are evaluated (see
+        # utils/evaluation_jobs.py), so the same staleness rule applies.
+        from ..utils.evaluation_jobs import mark_failed as fail_evaluation_job
+
+        stuck_job_ids = list(
+            db.execute(
+                select(models.EvaluationJob.id).where(
+                    models.EvaluationJob.status
+                    == models.EvaluationJobStatus.PROCESSING,
+                    models.EvaluationJob.updated_at < trial_cutoff,
+                )
+            ).scalars()
+        )
+        for job_id in stuck_job_ids:
+            logger.warning(
+                "Orphan sweeper: marking stuck EvaluationJob %s FAILED", job_id
+            )
+            fail_evaluation_job(
+                job_id,
+                operational_error_message(
+                    detail=(
+                        f"EvaluationJob {job_id} finalized by orphan sweeper "
+                        "(worker crashed or was killed)."
+                    ),
+                    prefix="The evaluation was interrupted before it completed. "
+                    "Please retry.",
+                ),
+            )
+            affected += 1
+
         # One alert per sweep, not per reaped row — and rate-limited on top of
         # that, because a crashed worker with a large backlog would otherwise
         # mail every admin on every beat tick.
@@ -564,6 +690,12 @@ def reclaim_orphaned_on_startup(role: str) -> str:
                     _broadcast_preprocessing_update(task, "failed")
 
         elif role == "default":
+            # Sharded trials resume instead of failing: every shard this worker
+            # was running goes back to PENDING, and every queued open shard is
+            # queued again — the messages this worker had prefetched are stranded in
+            # the broker's unacked set. A shard queued twice still runs once.
+            reclaimed += _recover_trial_shards(db, restarted=True)
+
             # Bypass trials run inside a FastAPI *web* process, not this worker —
             # a worker restart says nothing about them, so reclaiming them here
             # would false-fail a live synchronous trial. If the web process
@@ -574,6 +706,7 @@ def reclaim_orphaned_on_startup(role: str) -> str:
                 .filter(
                     models.Trial.status == models.TrialStatus.PROCESSING,
                     models.Trial.bypass_celery.isnot(True),
+                    ~exists().where(models.TrialShard.trial_id == models.Trial.id),
                 )
                 .all()
             )
@@ -747,3 +880,17 @@ if celery_app is not None:
     def _start_settings_listener(**_):
         """Start the settings-invalidation subscriber per worker process."""
         _settings_invalidation_listener()
+
+    @signals.worker_process_shutdown.connect
+    def _flush_audit_queue(**_):
+        """Write queued audit rows before a pool process exits.
+
+        Pool processes may leave via ``os._exit``, which skips the ``atexit``
+        flush registered in utils/audit.py.
+        """
+        try:
+            from ..utils.audit import flush_audit_queue
+
+            flush_audit_queue()
+        except Exception as e:  # pragma: no cover - best effort
+            logger.warning("Failed to flush audit queue on worker exit: %s", e)
@@ -350,6 +350,24 @@ class Settings(BaseSettings):
         le=7200,
         description="Timeout in seconds for docling-serve OCR per file",
     )
+    # PDFs with more pages than this are sent to docling-serve as page-range
+    # slices of this size, converted concurrently and reassembled in page
+    # order. A failed slice is retried on its own. 0 sends every file whole.
+    DOCLING_SERVE_SLICE_PAGES: int = Field(
+        default=50,
+        ge=0,
+        le=1000,
+        description="Pages per docling-serve request for large PDFs (0 = no split)",
+    )
+    # Requests open at once against one docling-serve instance from a single
+    # worker process, counting the slices of every file in flight. Match it to
+    # the server's capacity (its conversion workers).
+    DOCLING_SERVE_MAX_CONCURRENT_REQUESTS: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum concurrent requests per docling-serve instance",
+    )
 
     # Mistral OCR API concurrency
     MISTRAL_OCR_MAX_CONCURRENT_FILES: int = Field(
@@ -370,6 +388,30 @@ class Settings(BaseSettings):
         le=10,
         description="Maximum retry attempts for Mistral OCR API requests",
     )
+    # A preprocessing chunk with at least this many files OCRs its
+    # Mistral-bound documents through one Mistral batch job (polled every
+    # MISTRAL_OCR_BATCH_POLL_SECONDS) before processing the files. Documents
+    # the job fails on, or all of them if it runs past
+    # MISTRAL_OCR_BATCH_TIMEOUT_SECONDS, are OCR'd one by one as usual.
+    # 0 disables batch jobs.
+    MISTRAL_OCR_BATCH_MIN_FILES: int = Field(
+        default=20,
+        ge=0,
+        le=10000,
+        description="Minimum files per chunk to use a Mistral OCR batch job (0 = never)",
+    )
+    MISTRAL_OCR_BATCH_POLL_SECONDS: int = Field(
+        default=10,
+        ge=1,
+        le=300,
+        description="Interval in seconds between Mistral OCR batch job status checks",
+    )
+    MISTRAL_OCR_BATCH_TIMEOUT_SECONDS: int = Field(
+        default=1800,
+        ge=60,
+        le=21600,
+        description="Maximum wait in seconds for a Mistral OCR batch job",
+    )
 
     # Vision LLM OCR concurrency
     VISION_OCR_MAX_CONCURRENT_FILES: int = Field(
@@ -462,6 +504,171 @@ class Settings(BaseSettings):
         description="Maximum allowed size for a single uploaded file (files/ground truth)",
     )
 
+    # ─────────────────────────────────────────────────────────────
+    # Caching
+    # ─────────────────────────────────────────────────────────────
+
+    # Upper bound on how long the document list's counts (total, today/week/
+    # month) are served from cache. Every document change invalidates them
+    # immediately; the TTL only bounds the drift of the date buckets, which
+    # move with the clock. 0 disables the cache (every poll counts live).
+    DOCUMENT_STATS_CACHE_TTL_SECONDS: int = Field(
+        default=60,
+        ge=0,
+        le=3600,
+        description="Max age in seconds of cached document-list statistics (0 = no cache)",
+    )
+
+    # How long an API process reuses a signed-in user's role, active flag and
+    # project grants without reading them from the database. Changes to a
+    # user or their shares invalidate the entry immediately (through Redis
+    # when it is available); the TTL is the backstop. 0 disables the cache
+    # (every request loads the user).
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(
+        default=30,
+        ge=0,
+        le=300,
+        description="Max age in seconds of a cached authenticated user (0 = no cache)",
+    )
+
+    # Storage budget for OCR results reused across projects and re-runs
+    # (utils/ocr_cache.py). Results are keyed by file content hash, engine,
+    # model and engine options, stored compressed in the database, and the
+    # least recently used are evicted once the total exceeds the budget.
+    # 0 disables the cache (nothing is read or stored).
+    OCR_CACHE_MAX_MB: int = Field(
+        default=1024,
+        ge=0,
+        le=1048576,
+        description="Storage budget in MB for cached OCR results (0 = no cache)",
+    )
+
+    # ─────────────────────────────────────────────────────────────
+    # Audit trail writer
+    # ─────────────────────────────────────────────────────────────
+
+    # "async" (default) queues audit rows in-process and a background thread
+    # inserts them in batches, so requests don't wait on an audit commit.
+    # "sync" writes each row in its own session before returning (tests,
+    # debugging). Queued rows are flushed on shutdown either way.
+    AUDIT_WRITE_MODE: str = Field(
+        default="async",
+        description="Audit trail write mode: async (batched) or sync",
+    )
+    AUDIT_BATCH_SIZE: int = Field(
+        default=200,
+        ge=1,
+        le=5000,
+        description="Audit rows inserted per batch",
+    )
+    AUDIT_FLUSH_INTERVAL_MS: int = Field(
+        default=500,
+        ge=10,
+        le=60000,
+        description="Longest an audit row waits in the queue before a flush",
+    )
+    # Bounded so a stalled database can't grow the queue without limit. When
+    # it is full, "block" makes the auditing request wait (up to a few
+    # seconds) for the writer to catch up; "drop" discards the row at once.
+    # Discarded rows are counted and logged either way.
+    AUDIT_QUEUE_MAX_ROWS: int = Field(
+        default=10000,
+        ge=100,
+        le=1000000,
+        description="Maximum audit rows held in memory awaiting insert",
+    )
+    AUDIT_OVERFLOW_POLICY: str = Field(
+        default="block",
+        description="When the audit queue is full: block or drop",
+    )
+
+    # ─────────────────────────────────────────────────────────────
+    # Evaluation jobs
+    # ─────────────────────────────────────────────────────────────
+
+    # Trials evaluated at the same time within one batch-evaluation job. Each
+    # holds its own DB session and the trial's results/ground truth in memory.
+    EVALUATION_JOB_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Trials evaluated in parallel per evaluation job",
+    )
+
+    # Rows of a CSV/XLSX ground truth file parsed at a time. Parsing memory
+    # follows this, not the file size.
+    GROUND_TRUTH_PARSE_CHUNK_ROWS: int = Field(
+        default=10000,
+        ge=1,
+        le=1000000,
+        description="Rows per block when parsing CSV/XLSX ground truth files",
+    )
+
+    # ─────────────────────────────────────────────────────────────
+    # Trial execution (Celery)
+    # ─────────────────────────────────────────────────────────────
+
+    # A Celery trial is split into shards of this many documents, each its own
+    # task on the default queue, so one trial can run on every idle worker and
+    # a lost worker costs at most one shard (see utils/trial_shards.py).
+    TRIAL_SHARD_SIZE: int = Field(
+        default=500,
+        ge=1,
+        le=100000,
+        description="Documents per trial shard task",
+    )
+    # Claims of one shard before the sweeper gives up on it and marks it
+    # FAILED. Each worker loss mid-shard costs one claim.
+    TRIAL_SHARD_MAX_ATTEMPTS: int = Field(
+        default=3,
+        ge=1,
+        le=20,
+        description="Times a trial shard is run before it is marked failed",
+    )
+    # Shard tasks queued at once across all running trials. Active trials split
+    # the slots by weight (user × project scheduling weight), and the rest of
+    # each trial's shards wait in the ledger, so a small trial started behind a
+    # large one gets workers on the next free slot (see utils/fair_scheduler.py).
+    # Keep it at the number of default-queue worker processes (the stock
+    # worker_default runs -c 4): extra slots are shards waiting in the broker,
+    # ahead of any trial started after them.
+    TRIAL_SHARD_SLOTS: int = Field(
+        default=4,
+        ge=1,
+        le=10000,
+        description="Trial shard tasks queued at once, shared fairly by trials",
+    )
+    # Concurrent LLM requests per endpoint (base URL and model) across all
+    # trials, OCR runs and workers; waiting requests are served in weighted
+    # fair order. 0 = no cap.
+    LLM_ENDPOINT_MAX_CONCURRENCY: int = Field(
+        default=0,
+        ge=0,
+        le=10000,
+        description="Max concurrent LLM requests per endpoint (0 = unlimited)",
+    )
+    # Requests and tokens per minute per endpoint (base URL and model), shared
+    # by all workers (see utils/endpoint_limits.py). 0 = no limit.
+    LLM_ENDPOINT_RPM: int = Field(
+        default=0,
+        ge=0,
+        le=1000000,
+        description="Max LLM requests per minute per endpoint (0 = unlimited)",
+    )
+    LLM_ENDPOINT_TPM: int = Field(
+        default=0,
+        ge=0,
+        le=1000000000,
+        description="Max LLM tokens per minute per endpoint (0 = unlimited)",
+    )
+    # Per-endpoint overrides of the three limits above, as a JSON object keyed
+    # by base URL or "<base URL>|<model>", e.g.
+    # {"http://vllm:8000/v1": {"rpm": 600, "tpm": 400000, "max_in_flight": 48}}
+    LLM_ENDPOINT_LIMITS: str = Field(
+        default="",
+        description="JSON per-endpoint overrides of the LLM endpoint limits",
+    )
+
     # ─────────────────────────────────────────────────────────────
     # Logging & Debugging
     # ─────────────────────────────────────────────────────────────
@@ -1356,6 +1563,22 @@ SETTINGS_META = {
         "label": "Docling File Timeout (seconds)",
         "help": "Timeout in seconds for docling-serve OCR per file (60-7200)",
     },
+    "DOCLING_SERVE_SLICE_PAGES": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Preprocessing",
+        "label": "Docling Pages per Request",
+        "help": "PDFs with more pages are converted as concurrent page-range slices of this size; a failed slice is retried on its own (0 sends files whole, max 1000)",
+    },
+    "DOCLING_SERVE_MAX_CONCURRENT_REQUESTS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Preprocessing",
+        "label": "Docling Max Concurrent Requests",
+        "help": "Requests open at once against the docling-serve instance per worker process, including page-range slices (1-32)",
+    },
     # Mistral OCR specific settings
     "MISTRAL_OCR_MAX_CONCURRENT_FILES": {
         "type": "int",
@@ -1381,6 +1604,30 @@ SETTINGS_META = {
         "label": "Mistral Max Retries",
         "help": "Maximum retry attempts for Mistral OCR API requests (0-10)",
     },
+    "MISTRAL_OCR_BATCH_MIN_FILES": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Preprocessing",
+        "label": "Mistral Batch Threshold (files)",
+        "help": "Chunks with at least this many files OCR their Mistral-bound documents through one Mistral batch job; failed documents are retried one by one (0 = never, max 10000)",
+    },
+    "MISTRAL_OCR_BATCH_POLL_SECONDS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Preprocessing",
+        "label": "Mistral Batch Poll Interval (seconds)",
+        "help": "How often to check a Mistral OCR batch job's status (1-300)",
+    },
+    "MISTRAL_OCR_BATCH_TIMEOUT_SECONDS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Preprocessing",
+        "label": "Mistral Batch Timeout (seconds)",
+        "help": "Longest wait for a Mistral OCR batch job before it is cancelled and its files are OCR'd one by one (60-21600)",
+    },
     # Vision LLM OCR specific settings
     "VISION_OCR_MAX_CONCURRENT_FILES": {
         "type": "int",
@@ -1490,6 +1737,144 @@ SETTINGS_META = {
         "label": "Max Upload Size (bytes)",
         "help": "Maximum allowed size for a single uploaded file, e.g. PDFs/images/ground truth (default 500MB). Uploads exceeding this are rejected with 413 before being fully read.",
     },
+    # Caching
+    "DOCUMENT_STATS_CACHE_TTL_SECONDS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Document Stats Cache TTL (seconds)",
+        "help": "Max age of the cached document counts shown in the document list (0-3600, 0 = always count live). Document changes invalidate the cache immediately.",
+    },
+    "PRINCIPAL_CACHE_TTL_SECONDS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Signed-in User Cache TTL (seconds)",
+        "help": "How long each API process reuses a signed-in user's role, account status and project shares before reading them again (0-300, 0 = read on every request). Role, password, status and share changes take effect immediately.",
+    },
+    "OCR_CACHE_MAX_MB": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "OCR Cache Budget (MB)",
+        "help": "Compressed storage for OCR results reused when the same file is preprocessed again with the same engine and options, in any project (0-1048576, 0 = off). Least recently used results are evicted first. Projects can opt out in their settings.",
+    },
+    # Audit trail writer
+    "AUDIT_WRITE_MODE": {
+        "type": "str",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Audit Write Mode",
+        "help": "async: audit rows are queued and inserted in batches by a background writer, off the request path. sync: each row is committed before the request continues.",
+    },
+    "AUDIT_BATCH_SIZE": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Audit Batch Size",
+        "help": "Audit rows inserted per batch in async mode (1-5000).",
+    },
+    "AUDIT_FLUSH_INTERVAL_MS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Audit Flush Interval (ms)",
+        "help": "Longest a queued audit row waits before it is written, even if the batch is not full (10-60000).",
+    },
+    "AUDIT_QUEUE_MAX_ROWS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Audit Queue Limit",
+        "help": "Maximum audit rows held in memory per process while the database catches up (100-1000000).",
+    },
+    "AUDIT_OVERFLOW_POLICY": {
+        "type": "str",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Audit Overflow Policy",
+        "help": "What happens when the audit queue is full: block (the request waits a few seconds for room) or drop (the row is discarded). Discarded rows are counted under Admin → Audit.",
+    },
+    "EVALUATION_JOB_CONCURRENCY": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Evaluation Job Parallelism",
+        "help": "How many trials one batch-evaluation job evaluates at the same time (1-32).",
+    },
+    "GROUND_TRUTH_PARSE_CHUNK_ROWS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Ground Truth Parse Block Rows",
+        "help": "Rows of a CSV/XLSX ground truth file parsed at a time. Larger blocks parse a little faster and use more memory.",
+    },
+    "TRIAL_SHARD_SIZE": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Trial Shard Size",
+        "help": "Documents per trial shard. Each shard is a separate background task, so a trial runs on as many workers as it has shards; a trial's max concurrency is split between its running shards (1-100000).",
+    },
+    "TRIAL_SHARD_MAX_ATTEMPTS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Trial Shard Attempts",
+        "help": "How often a trial shard interrupted by a lost worker is run again before it counts as failed (1-20).",
+    },
+    "TRIAL_SHARD_SLOTS": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Trial Shard Slots",
+        "help": "Shard tasks queued at once across all running trials, split by user and project scheduling weight. Set to the number of default-queue worker processes, 4 in the stock deployment (1-10000).",
+    },
+    "LLM_ENDPOINT_MAX_CONCURRENCY": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "LLM Endpoint Concurrency Cap",
+        "help": "Max concurrent LLM requests per endpoint (base URL and model) across all trials, OCR runs and workers, granted in weighted fair order. 0 disables the cap.",
+    },
+    "LLM_ENDPOINT_RPM": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "LLM Endpoint Requests / Minute",
+        "help": "Max LLM requests per minute per endpoint (base URL and model), shared by all workers. 0 disables the limit.",
+    },
+    "LLM_ENDPOINT_TPM": {
+        "type": "int",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "LLM Endpoint Tokens / Minute",
+        "help": "Max LLM tokens (prompt and completion) per minute per endpoint (base URL and model), shared by all workers. 0 disables the limit.",
+    },
+    "LLM_ENDPOINT_LIMITS": {
+        "type": "str",
+        "secret": False,
+        "readonly": False,
+        "category": "Performance",
+        "label": "Per-Endpoint LLM Limits",
+        "help": 'JSON overrides by base URL or "base URL|model", e.g. {"http://vllm:8000/v1": {"rpm": 600, "tpm": 400000, "max_in_flight": 48}}. Unlisted endpoints use the limits above.',
+    },
     # Logging & Debugging
     "PREPROCESS_LOG_DOCUMENT_IDS": {
         "type": "bool",
@@ -15,6 +15,7 @@ from sqlalchemy.orm import Session
 from ..core.config import settings
 from ..dependencies import get_db
 from ..models.user import RefreshToken, User
+from ..utils import principal_cache
 from ..utils.api_errors import api_error
 from ..utils.audit import record_denial
 from ..utils.enums import UserRole
@@ -54,13 +55,18 @@ def project_access_level(user: User, project) -> str | None:
     Returns one of ``"owner"`` / ``"write"`` / ``"read"``. Ownership is the
     ``projects.owner_id`` column; an admin with ``ADMIN_ALL_PROJECT_ACCESS``
     is treated as an owner of every project. Everything else comes from a
-    ``project_shares`` row, which is eager-loaded on ``Project.shares`` so this
-    costs no extra query at the ~85 authorization gates that call it.
+    ``project_shares`` row. The request's user (``get_current_user``) carries
+    their grants from the principal cache, so the ~85 authorization gates that
+    call this cost no query; any other ``User`` falls back to
+    ``Project.shares``.
     """
     if getattr(project, "owner_id", None) == user.id:
         return ACCESS_OWNER
     if admin_has_global_project_access(user):
         return ACCESS_OWNER
+    grants = getattr(user, "project_grants", None)
+    if grants is not None:
+        return grants.get(getattr(project, "id", None))
     for share in getattr(project, "shares", None) or ():
         if share.user_id == user.id:
             permission = share.permission
@@ -310,9 +316,10 @@ def get_current_user(
     except (PyJWTError, ValueError, TypeError):
         raise credentials_exception
 
-    user = (
-        db.execute(select(User).where(User.id == user_id_int)).scalars().one_or_none()
-    )
+    # Served from the per-process principal cache when possible (no query);
+    # see utils/principal_cache.py for how changes invalidate it.
+    token_version = payload.get("tkn_v", 0)
+    user = principal_cache.get_user(db, user_id_int, token_version)
     if user is None:
         raise credentials_exception
     if not user.is_active:
@@ -323,7 +330,6 @@ def get_current_user(
             "User account is deactivated",
         )
     # Validate token version — a newer version means old tokens are revoked
-    token_version = payload.get("tkn_v", 0)
     if token_version < user.token_version:
         raise api_error(
             "core.token_revoked",
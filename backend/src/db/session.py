@@ -40,6 +40,21 @@ SessionLocal = sessionmaker(
 )
 
 
+# Registers the Session hook that stores a document's prompt-ready text when
+# its text is written (utils/document_prompt.py) and the hooks that invalidate
+# the document-list stats cache on commit (utils/document_stats.py). Imported
+# here, after SessionLocal, so every process that can write a Document — web,
+# Celery worker, scripts — carries them without each entry point having to
+# remember.
+from ..utils import document_prompt as _document_prompt  # noqa: E402,F401
+from ..utils import document_stats as _document_stats  # noqa: E402,F401
+
+# Likewise for the principal cache's invalidation hooks (utils/principal_cache.py):
+# a role, password or share change made by any process must retire the cached
+# signed-in user.
+from ..utils import principal_cache as _principal_cache  # noqa: E402,F401
+
+
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
 
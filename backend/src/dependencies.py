@@ -1,9 +1,10 @@
 # backend/src/dependencies.py
 import hashlib
 import os
+import tempfile
 import threading
 import uuid
-from typing import Any, Generator
+from typing import Any, BinaryIO, Generator
 
 import boto3
 from botocore.client import BaseClient
@@ -210,9 +211,19 @@ def save_upload_stream(file) -> str:
     Local storage writes chunk-by-chunk; S3 uses ``upload_fileobj`` (streaming +
     automatic multipart). Returns the generated storage key.
     """
-    file_name = f"{uuid.uuid4()}"
     fileobj = file.file
     fileobj.seek(0)
+    return save_stream(fileobj)
+
+
+def save_stream(fileobj) -> str:
+    """Stream a binary file object, from its current position, to storage.
+
+    The file-object counterpart of :func:`save_file` for content built on disk
+    (e.g. a temporary file) that should not be read into memory first.
+    Returns the generated storage key.
+    """
+    file_name = f"{uuid.uuid4()}"
 
     if settings.LOCAL_DIRECTORY:
         file_path = f"{settings.LOCAL_DIRECTORY}/{file_name}"
@@ -286,6 +297,29 @@ def stream_file(file_name: str):
                     pass
 
 
+def open_file(file_name: str) -> BinaryIO:
+    """Open a stored file as a seekable binary file; the caller closes it.
+
+    Local storage opens the file in place. S3 downloads it to an anonymous
+    temporary file first, so readers that need random access (ZIP, XLSX) or
+    several passes work from disk rather than holding the file in memory.
+    """
+    if settings.LOCAL_DIRECTORY:
+        file_path = f"{settings.LOCAL_DIRECTORY}/{file_name}"
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File {file_name} not found in local storage.")
+        return open(file_path, "rb")
+    s3: Any = get_s3_client()
+    tmp = tempfile.TemporaryFile()
+    try:
+        s3.download_fileobj(settings.S3_BUCKET_NAME, file_name, tmp)
+    except BaseException:
+        tmp.close()
+        raise
+    tmp.seek(0)
+    return tmp
+
+
 def get_file(file_name: str, force_streaming: bool = False) -> bytes:
     """
     Retrieves a file from S3 or local storage as bytes.
@@ -5,6 +5,7 @@ import asyncio
 import json
 import logging
 import multiprocessing as mp
+import random
 
 try:
     mp.set_start_method("spawn")
@@ -38,7 +39,7 @@ from .routers.v1.endpoints import (
     sso,
     users,
 )
-from .utils import presence
+from .utils import presence, project_recipients
 from .utils.logging_config import setup_logging
 from .websocket_manager import manager
 
@@ -53,7 +54,9 @@ def _resolve_project_recipients(data: dict) -> set[int]:
 
     The project's owner plus every user it is shared with (any permission — a
     read-only collaborator watching a preprocessing run needs the progress
-    events just as much as the person who started it).
+    events just as much as the person who started it). Served from the
+    per-process recipient cache (utils/project_recipients.py), so steady-state
+    fan-out costs no database round-trip.
 
     Returns an empty set if the payload has no project id, the project was
     deleted, or the DB is unavailable. Empty means the update is delivered to
@@ -64,29 +67,7 @@ def _resolve_project_recipients(data: dict) -> set[int]:
     if project_id is None:
         return set()
     try:
-        from sqlalchemy import select
-
-        from .db.session import SessionLocal
-        from .models.project import Project, ProjectShare
-
-        db = SessionLocal()
-        try:
-            recipients = set(
-                db.execute(
-                    select(Project.owner_id).where(Project.id == project_id)
-                ).scalars()
-            )
-            recipients.update(
-                db.execute(
-                    select(ProjectShare.user_id).where(
-                        ProjectShare.project_id == project_id
-                    )
-                ).scalars()
-            )
-            recipients.discard(None)
-            return recipients
-        finally:
-            db.close()
+        return set(project_recipients.get_recipients(project_id))
     except Exception as e:
         logger.debug(f"Could not resolve recipients for project {project_id}: {e}")
         return set()
@@ -159,12 +140,178 @@ def _spawn_celery_worker(
 
 
 # ───────────────────────── FastAPI lifespan ──────────────────────
+# Realtime messages decoded and dispatched as one batch: one JSON pass, at
+# most one settings reload and one recipient-resolution thread hop per batch.
+_REALTIME_BATCH_MAX = 100
+
+# Reconnect backoff for the Redis subscriber: exponential from the base, capped,
+# with full jitter so replicas that lost Redis together don't reconnect in
+# lockstep.
+_SUBSCRIBER_BACKOFF_BASE_SECONDS = 0.5
+_SUBSCRIBER_BACKOFF_MAX_SECONDS = 30.0
+
+
+def _decode_batch(raw_messages: list) -> list[dict]:
+    """Decode a batch of pub/sub payloads, skipping (and logging) bad ones."""
+    decoded = []
+    for raw in raw_messages:
+        try:
+            data = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+        except ValueError as e:
+            logger.warning(f"Dropping malformed realtime message: {e}")
+            continue
+        if isinstance(data, dict):
+            decoded.append(data)
+    return decoded
+
+
+def _resolve_recipients_batch(project_ids: set[int]) -> dict[int, set[int]]:
+    return {
+        pid: _resolve_project_recipients({"project_id": pid}) for pid in project_ids
+    }
+
+
+async def _dispatch_realtime(messages: list[dict]) -> None:
+    """Apply control messages and fan task updates out to WebSocket clients."""
+    updates = []
+    reload_settings = False
+    for data in messages:
+        kind = data.get("type")
+        if kind == "settings_invalidate":
+            reload_settings = True
+        elif kind == "project_recipients_invalidate":
+            project_recipients.invalidate(data.get("project_id"))
+        else:
+            updates.append(data)
+
+    if reload_settings:
+        # Reload this replica's cached settings. broadcast=False so we don't
+        # re-publish and loop.
+        from .core.dynamic_settings import reload_settings_cache
+
+        await asyncio.to_thread(reload_settings_cache, broadcast=False)
+
+    if not updates:
+        return
+
+    # Filter server-side by project membership: deliver only to the project
+    # owner, its collaborators, and admins. Previously this was broadcast to
+    # every connected user and the frontend was trusted to filter — a client
+    # that didn't filter could observe other users' task progress/metadata.
+    # Cache hits are answered on the loop; the misses of the whole batch share
+    # one thread hop.
+    recipients: dict[int, set[int]] = {}
+    missing: set[int] = set()
+    for data in updates:
+        project_id = data.get("project_id")
+        if project_id is None or project_id in recipients:
+            continue
+        cached = project_recipients.peek(project_id)
+        if cached is not None:
+            recipients[project_id] = set(cached)
+        else:
+            missing.add(project_id)
+    if missing:
+        recipients.update(await asyncio.to_thread(_resolve_recipients_batch, missing))
+
+    for data in updates:
+        await manager.broadcast_to_project(
+            recipients.get(data.get("project_id"), set()), data
+        )
+
+
 async def _redis_subscriber_task():
-    """Background task that subscribes to Redis task updates and broadcasts via WebSocket.
+    """Background task that relays Redis task updates to WebSocket clients.
+
+    Uses ``redis.asyncio`` and blocks in ``listen()``, so an update is relayed
+    as soon as it arrives and no thread sits polling. Task updates are taken
+    by pattern (``task_updates*``), so publishers can move to suffixed
+    channels without a subscriber change; settings invalidation is an exact
+    channel. Whatever else is already buffered is decoded and dispatched with
+    the message that woke the loop, up to ``_REALTIME_BATCH_MAX``.
+
+    Connection loss (Redis restart, network blip) is retried forever with
+    jittered exponential backoff; Celery keeps working meanwhile, just
+    without real-time progress updates.
+    """
+    from .utils.redis_broadcast import (
+        SETTINGS_INVALIDATE_CHANNEL,
+        TASK_UPDATE_CHANNEL,
+        new_async_subscriber_client,
+    )
 
-    Runs in the background without blocking startup. If Redis is unavailable,
-    the task simply doesn't run - Celery workers will still work, just without
-    real-time progress updates.
+    attempt = 0
+    while True:
+        client = new_async_subscriber_client()
+        if client is None:
+            logger.warning(
+                "Redis not available - real-time Celery task updates disabled"
+            )
+            return
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.psubscribe(f"{TASK_UPDATE_CHANNEL}*")
+            # Subscribe to settings invalidation too. Without it, a settings
+            # change made on ANOTHER web replica never reaches this process's
+            # @lru_cache'd settings, so it would serve stale config until
+            # restart. (The saving replica reloads its own cache directly;
+            # Celery workers get it via their own subscriber — this closes the
+            # gap for multi-replica web deployments.)
+            await pubsub.subscribe(SETTINGS_INVALIDATE_CHANNEL)
+            logger.info(
+                "Subscribed to Redis channels: %s*, %s",
+                TASK_UPDATE_CHANNEL,
+                SETTINGS_INVALIDATE_CHANNEL,
+            )
+            attempt = 0
+
+            async for message in pubsub.listen():
+                if message["type"] not in ("message", "pmessage"):
+                    continue
+                batch = [message["data"]]
+                while len(batch) < _REALTIME_BATCH_MAX:
+                    more = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=0.0
+                    )
+                    if more is None:
+                        break
+                    if more["type"] in ("message", "pmessage"):
+                        batch.append(more["data"])
+                try:
+                    await _dispatch_realtime(_decode_batch(batch))
+                except Exception as e:
+                    logger.error(f"Redis message processing error: {e}", exc_info=True)
+        except asyncio.CancelledError:
+            logger.info("Redis subscriber task cancelled")
+            raise
+        except Exception as e:
+            logger.warning(f"Redis subscriber disconnected: {e}")
+        finally:
+            try:
+                await pubsub.aclose()
+                await client.aclose()
+            except Exception:
+                pass
+
+        delay = random.uniform(
+            0,
+            min(
+                _SUBSCRIBER_BACKOFF_MAX_SECONDS,
+                _SUBSCRIBER_BACKOFF_BASE_SECONDS * 2**attempt,
+            ),
+        )
+        attempt += 1
+        logger.info(f"Reconnecting Redis subscriber in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+async def _threaded_redis_subscriber_task():
+    """Polling subscriber for redis-py builds without ``redis.asyncio``.
+
+    redis-py's pubsub.get_message() is a BLOCKING call; running it directly on
+    the event loop stalls all async handlers (including WebSocket broadcasts)
+    for the full timeout window each iteration, so it is offloaded to a worker
+    thread with a short timeout.
     """
     from .utils.redis_broadcast import (
         SETTINGS_INVALIDATE_CHANNEL,
@@ -187,14 +334,9 @@ async def _redis_subscriber_task():
         )
         return
 
+    pubsub = None
     try:
         pubsub = redis_client.pubsub()
-        # Subscribe to task updates (for WebSocket fan-out) AND settings
-        # invalidation. Without the latter, a settings change made on ANOTHER
-        # web replica never reaches this process's @lru_cache'd settings, so it
-        # would serve stale config until restart. (The saving replica reloads
-        # its own cache directly; Celery workers get it via their own
-        # subscriber — this closes the gap for multi-replica web deployments.)
         pubsub.subscribe(TASK_UPDATE_CHANNEL, SETTINGS_INVALIDATE_CHANNEL)
         logger.info(
             "Subscribed to Redis channels: %s, %s",
@@ -205,33 +347,12 @@ async def _redis_subscriber_task():
         # Yield control back to event loop so startup can complete
         await asyncio.sleep(0)
 
-        # Use get_message with short timeout for responsive async loop.
-        # redis-py's pubsub.get_message() is a BLOCKING call; running it
-        # directly on the event loop stalls all async handlers (including
-        # WebSocket broadcasts) for the full timeout window each iteration.
-        # Offload it to a worker thread so the loop stays responsive.
         while True:
             try:
                 # Short timeout (100ms) so we don't block shutdown
                 message = await asyncio.to_thread(pubsub.get_message, timeout=0.1)
                 if message and message["type"] == "message":
-                    data = json.loads(message["data"])
-                    if data.get("type") == "settings_invalidate":
-                        # Reload this replica's cached settings. broadcast=False
-                        # so we don't re-publish and loop.
-                        from .core.dynamic_settings import reload_settings_cache
-
-                        await asyncio.to_thread(reload_settings_cache, broadcast=False)
-                        continue
-                    # Filter server-side by project membership: deliver only to
-                    # the project owner, its collaborators, and admins.
-                    # Previously this was broadcast to every connected user and
-                    # the frontend was trusted to filter — a client that didn't
-                    # filter could observe other users' task progress/metadata.
-                    recipients = await asyncio.to_thread(
-                        _resolve_project_recipients, data
-                    )
-                    await manager.broadcast_to_project(recipients, data)
+                    await _dispatch_realtime(_decode_batch([message["data"]]))
             except Exception as e:
                 logger.error(f"Redis message processing error: {e}", exc_info=True)
     except asyncio.CancelledError:
@@ -245,6 +366,41 @@ async def _redis_subscriber_task():
             pass
 
 
+async def _local_broadcast_task():
+    """Relay task updates published inside this process when Redis is absent.
+
+    ``redis_broadcast`` hands updates it can't publish to local listeners.
+    The listener only enqueues (it runs on the publishing thread); this task
+    drains the queue in batches through the same dispatch as the Redis path.
+    """
+    from .utils.redis_broadcast import add_local_listener, remove_local_listener
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=10_000)
+
+    def _offer(message: dict) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.debug("Local realtime queue full; dropping update")
+
+    def _listener(message: dict) -> None:
+        loop.call_soon_threadsafe(_offer, message)
+
+    add_local_listener(_listener)
+    try:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _REALTIME_BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await _dispatch_realtime(batch)
+            except Exception as e:
+                logger.error(f"Local realtime dispatch error: {e}", exc_info=True)
+    finally:
+        remove_local_listener(_listener)
+
+
 async def _log_public_url():
     """Surface the configured public origin so users know how to reach the app.
 
@@ -312,16 +468,26 @@ async def lifespan(app):
             )
         )
 
-    # Start Redis subscriber in background (non-blocking, optional)
+    # Start Redis subscriber in background (non-blocking, optional). The
+    # threaded poller is kept for redis-py builds without asyncio support.
     redis_task = None
     if settings.CELERY_BROKER_URL.startswith("redis://"):
+        from .utils.redis_broadcast import aioredis
+
         try:
             # Create task but don't await it - runs in background
-            redis_task = asyncio.create_task(_redis_subscriber_task())
+            redis_task = asyncio.create_task(
+                _redis_subscriber_task()
+                if aioredis is not None
+                else _threaded_redis_subscriber_task()
+            )
             logger.info("🚀 Redis subscriber task started in background")
         except Exception as e:
             logger.debug(f"Redis subscriber not started: {e}")
 
+    # Updates published in this process while Redis is absent or down.
+    local_task = asyncio.create_task(_local_broadcast_task())
+
     # Print the public app URL as the last startup line (after uvicorn's own
     # "running on" line, which is logged only once this lifespan yields).
     url_task = asyncio.create_task(_log_public_url())
@@ -329,10 +495,12 @@ async def lifespan(app):
     try:
         yield
     finally:
-        if redis_task:
-            redis_task.cancel()
+        for task in (redis_task, local_task):
+            if task is None:
+                continue
+            task.cancel()
             try:
-                await redis_task
+                await task
             except asyncio.CancelledError:
                 pass
         url_task.cancel()
@@ -341,6 +509,12 @@ async def lifespan(app):
         except asyncio.CancelledError:
             pass
 
+        # Audit rows still queued by this process (also flushed at exit, but
+        # the database may be gone by then).
+        from .utils.audit import flush_audit_queue
+
+        await asyncio.to_thread(flush_audit_queue)
+
         for p in workers:
             if p.is_alive():
                 p.terminate()
@@ -528,7 +702,9 @@ async def activity_websocket(websocket: WebSocket):
                     # browser vanished without closing the socket lets the
                     # marker expire (see utils/presence.py).
                     presence.touch(user.id)
-                    await websocket.send_text("pong")
+                    # Queued behind pending broadcasts rather than sent here,
+                    # so it never races the socket's writer task.
+                    await manager.send_text(websocket, "pong")
             except WebSocketDisconnect:
                 break
             except Exception as e:
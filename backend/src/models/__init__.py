@@ -5,6 +5,8 @@ from .project import (
     Document,
     DocumentSet,
     Evaluation,
+    EvaluationJob,
+    EvaluationJobStatus,
     EvaluationMetric,
     FieldMapping,
     FieldType,
@@ -13,6 +15,7 @@ from .project import (
     FileStorageType,
     FileType,
     GroundTruth,
+    OCRCacheEntry,
     PreprocessingConfiguration,
     PreprocessingStatus,
     PreprocessingStrategy,
@@ -25,6 +28,7 @@ from .project import (
     Schema,
     Trial,
     TrialResult,
+    TrialShard,
     TrialStatus,
 )
 from .sso import IdentityProvider, UserIdentity
@@ -58,6 +62,7 @@ __all__ = [
     "DocumentSet",
     "Trial",
     "TrialResult",
+    "TrialShard",
     "TrialStatus",
     "Schema",
     "Prompt",
@@ -67,10 +72,13 @@ __all__ = [
     "PreprocessingConfiguration",
     "PreprocessingStatus",
     "FilePreprocessingTask",
+    "OCRCacheEntry",
     "GroundTruth",
     "Evaluation",
     "FieldType",
     "FieldMapping",
+    "EvaluationJob",
+    "EvaluationJobStatus",
     "EvaluationMetric",
     "PasswordResetToken",
     "NotificationPreference",
@@ -13,6 +13,7 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Table,
     UniqueConstraint,
@@ -55,6 +56,15 @@ class Project(Base):
     status: Mapped[ProjectStatus] = mapped_column(
         Enum(ProjectStatus, native_enum=False, length=10), default=ProjectStatus.ACTIVE
     )
+    # Whether preprocessing may reuse, and contribute to, the OCR results
+    # cached across projects (utils/ocr_cache.py). Off keeps a project's
+    # documents out of the shared store entirely.
+    ocr_cache_enabled: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Share of trial capacity relative to other projects
+    # (utils/fair_scheduler.py); multiplied by the trial owner's weight.
+    scheduling_weight: Mapped[float] = mapped_column(
+        Float, default=1.0, server_default="1"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -95,10 +105,10 @@ class Project(Base):
     shares: Mapped[list["ProjectShare"]] = relationship(
         back_populates="project",
         cascade="all, delete-orphan",
-        # Eager-loaded because every project authorization check consults it
-        # (see core.security.project_access_level); a lazy load there would add
-        # a query to each of the ~85 gates.
-        lazy="selectin",
+        # Lazy: authorization checks for the request's user read the grants
+        # cached with the user (core.security.project_access_level), so loading
+        # every project's shares eagerly would only add a query per load.
+        # Routes that report share counts selectin-load it explicitly.
     )
 
 
@@ -322,6 +332,17 @@ class Document(Base):
     text: Mapped[str] = mapped_column(String, nullable=False)
     document_name: Mapped[str] = mapped_column(String(500), nullable=True)
 
+    # Prompt-ready text, filled whenever ``text`` is written (see
+    # utils/document_prompt.py). ``prompt_text`` is NULL when the sanitized
+    # text equals ``text``; the version names the sanitizer that produced it.
+    # Deferred: only extraction reads it, with an explicit select.
+    prompt_text: Mapped[str | None] = mapped_column(
+        String, nullable=True, deferred=True
+    )
+    prompt_text_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    prompt_token_estimate: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    prompt_text_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     # Metadata
     meta_data: Mapped[dict] = mapped_column(MutableDict.as_mutable(JSON), nullable=True)
     # Can include: page_number, row_number, source_columns, etc.
@@ -707,6 +728,35 @@ class FilePreprocessingTask(Base):
     )
 
 
+class OCRCacheEntry(Base):
+    """An OCR/conversion result reusable for any file with the same bytes.
+
+    Keyed by ``cache_key``, a digest of (file hash, engine, model, options
+    hash); ``payload`` is the zlib-compressed JSON result. Not owned by a
+    project: rows outlive the files they came from and are evicted least
+    recently used first (see ``utils/ocr_cache.py``).
+    """
+
+    __tablename__ = "ocr_cache_entries"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    cache_key: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    file_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    engine: Mapped[str] = mapped_column(String(50), nullable=False)
+    model: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    options_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (Index("ix_ocr_cache_entries_last_used_at", "last_used_at"),)
+
+
 class Prompt(Base):
     __tablename__ = "prompts"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -862,6 +912,9 @@ class Trial(Base):
     evaluations: Mapped[list["Evaluation"]] = relationship(
         back_populates="trial", cascade="all, delete-orphan"
     )
+    shards: Mapped[list["TrialShard"]] = relationship(
+        back_populates="trial", cascade="all, delete-orphan"
+    )
 
     @property
     def api_key(self) -> str:
@@ -878,6 +931,68 @@ class Trial(Base):
         self.status = TrialStatus.CANCELLED
 
 
+class TrialShard(Base):
+    """One slice of a Celery trial's documents, run as its own task.
+
+    The rows of a trial form its shard ledger (see ``utils/trial_shards.py``):
+    which documents each shard covers, whether it is queued, running or
+    settled, and what its runs spent. Only the Celery path writes shards;
+    synchronous (``bypass_celery``) trials have none.
+    """
+
+    __tablename__ = "trial_shards"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    trial_id: Mapped[int] = mapped_column(
+        ForeignKey("trials.id", ondelete="CASCADE"), nullable=False
+    )
+    shard_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    document_ids: Mapped[list[int]] = mapped_column(
+        MutableList.as_mutable(JSON), default=list
+    )
+    # PENDING (waiting or queued) → PROCESSING (claimed by a worker) → COMPLETED / FAILED
+    # / CANCELLED. A stale PROCESSING shard is put back to PENDING by the
+    # orphan sweeper.
+    status: Mapped[TrialStatus] = mapped_column(
+        Enum(TrialStatus, native_enum=False, length=20), default=TrialStatus.PENDING
+    )
+    # When the shard was handed to Celery. NULL while it waits for its trial's
+    # share of TRIAL_SHARD_SLOTS (see utils/trial_shards.py).
+    queued_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Claims so far; capped by TRIAL_SHARD_MAX_ATTEMPTS.
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    # Per-document failures of the latest attempt, keyed like
+    # ``Trial.meta["failures"]``.
+    failures: Mapped[dict | None] = mapped_column(
+        MutableDict.as_mutable(JSON), nullable=True
+    )
+    # Summed over all attempts, then into the trial's meta at finalization.
+    prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    cached_prompt_tokens: Mapped[int] = mapped_column(Integer, default=0)
+
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Bumped by the shard's progress heartbeat; the orphan sweeper re-queues
+    # a PROCESSING shard whose heartbeat is older than ORPHAN_STALE_SECONDS.
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    trial: Mapped["Trial"] = relationship(back_populates="shards")
+
+    __table_args__ = (
+        UniqueConstraint("trial_id", "shard_index", name="uq_trial_shard_index"),
+        # The orphan sweeper scans running shards every tick.
+        Index("ix_trial_shards_status", "status"),
+    )
+
+
 class TrialResult(Base):
     __tablename__ = "trial_results"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -988,6 +1103,10 @@ class GroundTruth(Base):
         MutableDict.as_mutable(JSON), nullable=True
     )
     id_column_name: Mapped[str] = mapped_column(String(200), nullable=True)
+    # Where the parsed rows live (see utils/groundtruth_store.py): artifact
+    # file_uuid, the source file_uuid/id_column it was built from, row count
+    # and columns. Replaces data_cache, which is only read to migrate.
+    store_manifest: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -1005,6 +1124,65 @@ class GroundTruth(Base):
     __table_args__ = (Index("ix_ground_truth_project_id", "project_id"),)
 
 
+class EvaluationJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class EvaluationJob(Base):
+    """A batch of trial evaluations against one ground truth, run in the
+    background (see ``utils/evaluation_jobs.py``). ``results`` holds one entry
+    per finished trial: its outcome (``evaluated``/``reused``/``failed``), the
+    evaluation id, and a category-only error message."""
+
+    __tablename__ = "evaluation_jobs"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    groundtruth_id: Mapped[int] = mapped_column(
+        ForeignKey("ground_truth.id", ondelete="CASCADE"), nullable=False
+    )
+    created_by_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    trial_ids: Mapped[list[int]] = mapped_column(
+        MutableList.as_mutable(JSON), default=list
+    )
+    force_recalculate: Mapped[bool] = mapped_column(Boolean, default=False)
+    # "batch" (the batch-evaluate endpoint) or "auto" (queued when a trial
+    # with auto-evaluation finishes).
+    source: Mapped[str] = mapped_column(String(20), default="batch")
+    status: Mapped[EvaluationJobStatus] = mapped_column(
+        Enum(EvaluationJobStatus, native_enum=False, length=20),
+        default=EvaluationJobStatus.PENDING,
+    )
+    trials_done: Mapped[int] = mapped_column(Integer, default=0)
+    trials_failed: Mapped[int] = mapped_column(Integer, default=0)
+    results: Mapped[list] = mapped_column(MutableList.as_mutable(JSON), default=list)
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    # Bumped by the runner's heartbeat; the orphan sweeper fails PROCESSING
+    # jobs whose worker stopped updating it.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_evaluation_jobs_project_status", "project_id", "status"),
+        Index("ix_evaluation_jobs_groundtruth_id", "groundtruth_id"),
+    )
+
+
 class Evaluation(Base):
     __tablename__ = "evaluations"
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -2,7 +2,7 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, func
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.base import Base
@@ -34,6 +34,16 @@ class User(Base):
     failed_login_attempts: Mapped[int] = mapped_column(default=0)
     locked_until: Mapped[datetime | None] = mapped_column(DateTime(), nullable=True)
     last_login_at: Mapped[datetime | None] = mapped_column(DateTime(), nullable=True)
+    # Share of trial capacity relative to other users (utils/fair_scheduler.py);
+    # multiplied by the project's weight. Set by admins.
+    scheduling_weight: Mapped[float] = mapped_column(
+        Float, default=1.0, server_default="1"
+    )
+    # Not a column: ``{project_id: permission}`` for the request's user, set by
+    # get_current_user from the principal cache (utils/principal_cache.py) and
+    # read by core.security.project_access_level. None on users loaded any
+    # other way, which then fall back to ``Project.shares``.
+    project_grants = None
     projects: Mapped[list["Project"]] = relationship(
         back_populates="owner", cascade="all, delete-orphan"
     )  # noqa: F821
@@ -11,8 +11,14 @@ from ....core.dynamic_settings import reload_settings_cache
 from ....core.rate_limit import limiter
 from ....core.security import get_admin_user
 from ....dependencies import get_db
-from ....models import AppSetting
-from ....schemas import TestEmailResponse
+from ....models import AppSetting, Project, User
+from ....schemas import (
+    OCRCacheStatus,
+    SchedulerStatus,
+    SchedulingWeights,
+    TestEmailResponse,
+)
+from ....utils import fair_scheduler, ocr_cache, trial_shards
 from ....utils.api_errors import api_error
 from ....utils.audit import record_audit
 from ....utils.crypto import encrypt
@@ -208,6 +214,114 @@ def send_test_email_to_self(
     return TestEmailResponse(sent=True, recipient=current_user.email)
 
 
+# --------------------------
+# OCR cache endpoints
+# --------------------------
+
+
+@router.get("/ocr-cache", response_model=OCRCacheStatus)
+def get_ocr_cache_status(
+    current_user=Depends(get_admin_user), db: Session = Depends(get_db)
+) -> OCRCacheStatus:
+    """Entries, compressed size and hit count of the OCR result cache."""
+    return OCRCacheStatus(**ocr_cache.stats(db))
+
+
+@router.delete("/ocr-cache")
+def clear_ocr_cache(
+    current_user=Depends(get_admin_user), db: Session = Depends(get_db)
+):
+    """Drop every cached OCR result; the next run of each file re-OCRs it."""
+    deleted = ocr_cache.clear(db)
+    db.commit()
+    record_audit(
+        AuditAction.DELETE,
+        actor=current_user,
+        resource_type="ocr_cache",
+        detail={"entries": deleted},
+    )
+    return {"deleted": deleted}
+
+
+# --------------------------
+# Fair scheduler endpoints
+# --------------------------
+
+
+def _custom_weights(db: Session) -> SchedulingWeights:
+    return SchedulingWeights(
+        users=dict(
+            db.query(User.id, User.scheduling_weight).filter(
+                User.scheduling_weight != 1
+            )
+        ),
+        projects=dict(
+            db.query(Project.id, Project.scheduling_weight).filter(
+                Project.scheduling_weight != 1
+            )
+        ),
+    )
+
+
+@router.get("/scheduler", response_model=SchedulerStatus)
+def get_scheduler_status(
+    current_user=Depends(get_admin_user), db: Session = Depends(get_db)
+) -> SchedulerStatus:
+    """Running trials' weights and shard windows, each LLM endpoint's limits
+    and the slots each trial holds or waits for, and the non-default
+    weights."""
+    demand = trial_shards.trial_demand(db)
+    windows = trial_shards.trial_windows(db, demand, settings.TRIAL_SHARD_SLOTS)
+    return SchedulerStatus(
+        shard_slots=settings.TRIAL_SHARD_SLOTS,
+        endpoint_max_concurrency=settings.LLM_ENDPOINT_MAX_CONCURRENCY,
+        trials=[
+            {
+                "trial_id": trial_id,
+                "weight": weight,
+                "open_shards": open_count,
+                "queued_shards": queued,
+                "window": windows.get(trial_id, 0),
+            }
+            for trial_id, (weight, open_count, queued) in sorted(demand.items())
+        ],
+        endpoints=fair_scheduler.gate_snapshot(),
+        weights=_custom_weights(db),
+    )
+
+
+@router.put("/scheduler/weights", response_model=SchedulingWeights)
+def update_scheduling_weights(
+    weights: SchedulingWeights,
+    current_user=Depends(get_admin_user),
+    db: Session = Depends(get_db),
+) -> SchedulingWeights:
+    """Set the scheduling weight of the listed users and projects (1 is the
+    default). Applies to shards and LLM requests scheduled from now on."""
+    for model, changes, kind in (
+        (User, weights.users, "user"),
+        (Project, weights.projects, "project"),
+    ):
+        for row_id, weight in changes.items():
+            row = db.get(model, row_id)
+            if row is None:
+                raise api_error(
+                    f"admin.{kind}_not_found",
+                    404,
+                    f"No {kind} with id {row_id}",
+                    id=row_id,
+                )
+            row.scheduling_weight = weight
+    db.commit()
+    record_audit(
+        AuditAction.SETTING_CHANGE,
+        actor=current_user,
+        resource_type="scheduling_weight",
+        detail=weights.model_dump(),
+    )
+    return _custom_weights(db)
+
+
 # --------------------------
 # Celery endpoints
 # --------------------------
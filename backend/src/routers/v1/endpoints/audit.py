@@ -20,10 +20,12 @@ from ....dependencies import get_db
 from ....models.audit import AuditLog, ErrorLog
 from ....schemas.audit import (
     AuditLogEntry,
+    AuditWriterStatus,
     ErrorLogEntry,
     PaginatedAuditLogs,
     PaginatedErrorLogs,
 )
+from ....utils.audit import audit_writer_stats
 from ....utils.csv_safety import SafeCsvWriter
 from ....utils.enums import AuditAction, AuditOutcome
 
@@ -200,6 +202,18 @@ def export_audit_logs(
     )
 
 
+@router.get("/audit/writer", response_model=AuditWriterStatus)
+def get_audit_writer_status(
+    current_user=Depends(get_admin_user),
+) -> AuditWriterStatus:
+    """Queue depth and dropped-row count of the audit writer.
+
+    A non-zero ``dropped`` means the trail has gaps: the queue overflowed
+    (``AUDIT_OVERFLOW_POLICY``) while the database couldn't keep up.
+    """
+    return AuditWriterStatus(**audit_writer_stats())
+
+
 @router.get("/errors", response_model=PaginatedErrorLogs)
 def list_error_logs(
     error_id: str | None = None,
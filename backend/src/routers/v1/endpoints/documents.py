@@ -19,6 +19,7 @@ from ....core.security import (
 )
 from ....dependencies import get_db, get_file, remove_file
 from ....models.project import document_set_association, document_source_association
+from ....utils import document_stats
 from ....utils.api_errors import api_error
 from ....utils.audit import record_audit
 from ....utils.deletion import (
@@ -130,11 +131,6 @@ def get_documents(
     if config_id is not None:
         base = base.where(D.preprocessing_config_id == config_id)
 
-    if date_from is not None:
-        base = base.where(D.created_at >= date_from)
-    if date_to is not None:
-        base = base.where(D.created_at < date_to)
-
     # Filter by OCR engine (stored in meta_data JSON)
     if ocr_engine is not None:
         # PostgreSQL JSON operator for ocr_engine field
@@ -144,6 +140,16 @@ def get_documents(
         # Membership filter via the association table (EXISTS subquery).
         base = base.where(D.document_sets.any(models.DocumentSet.id == document_set_id))
 
+    # The today/week/month buckets are counted over this scope — every filter
+    # except the date range and the free-text search.
+    stats_scope = base
+
+    if date_from is not None:
+        base = base.where(D.created_at >= date_from)
+    if date_to is not None:
+        base = base.where(D.created_at < date_to)
+    unsearched = base
+
     joined_for_search = False
     if search:
         pattern = f"%{search}%"
@@ -158,55 +164,34 @@ def get_documents(
         )
         joined_for_search = True
 
-    # total BEFORE slicing
-    # Use exact count - reliable and works with all query types
-    # For large tables, PostgreSQL will use index-only scans when possible
-    total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
-
-    # Compute stats server-side using efficient COUNT queries
-    recent_count = None
-    today_count = None
-    week_count = None
-    month_count = None
-
-    if compute_stats:
-        now = datetime.datetime.now(datetime.UTC)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_ago = now - datetime.timedelta(days=7)
-        month_ago = now - datetime.timedelta(days=30)
-
-        # Build stats query with same filters as base
-        stats_base = select(func.count(D.id)).where(D.project_id == project_id)
-        if not include_archived:
-            stats_base = stats_base.where(D.is_latest.is_(True))
-        if file_id is not None:
-            stats_base = stats_base.where(D.original_file_id == file_id)
-        if file_preprocessing_task_id is not None:
-            stats_base = stats_base.where(
-                D.file_preprocessing_task_id == file_preprocessing_task_id
-            )
-        if config_id is not None:
-            stats_base = stats_base.where(D.preprocessing_config_id == config_id)
-        if ocr_engine is not None:
-            stats_base = stats_base.where(
-                D.meta_data["ocr_engine"].as_string() == ocr_engine
-            )
-        if document_set_id is not None:
-            stats_base = stats_base.where(
-                D.document_sets.any(models.DocumentSet.id == document_set_id)
-            )
-
-        # Today count
-        today_count = db.scalar(stats_base.where(D.created_at >= today_start)) or 0
-
-        # Week count (last 7 days)
-        week_count = db.scalar(stats_base.where(D.created_at >= week_ago)) or 0
-
-        # Month count (last 30 days)
-        month_count = db.scalar(stats_base.where(D.created_at >= month_ago)) or 0
-
-        # Recent count (alias for week_count)
-        recent_count = week_count
+    # Counts are served from the per-project stats cache (see
+    # utils/document_stats.py): the list is polled while preprocessing runs and
+    # the COUNT queries dominate each poll. Free-text searches are ad hoc, so
+    # their total is always counted live; the buckets don't depend on them.
+    stats_filters = {
+        "file_id": file_id,
+        "file_preprocessing_task_id": file_preprocessing_task_id,
+        "config_id": config_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "ocr_engine": ocr_engine,
+        "document_set_id": document_set_id,
+        "include_archived": bool(include_archived),
+        "compute_stats": bool(compute_stats),
+    }
+    generation, stats = document_stats.lookup(project_id, stats_filters)
+    if stats is None:
+        stats = document_stats.store(
+            project_id,
+            generation,
+            stats_filters,
+            _count_documents(
+                db, unsearched, stats_scope, compute_stats=bool(compute_stats)
+            ),
+        )
+    total = stats["total"]
+    if joined_for_search:
+        total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
 
     # Page query.
     # A stable secondary sort on the primary key is REQUIRED: rows created in the
@@ -246,13 +231,53 @@ def get_documents(
     return schemas.PaginatedDocuments(
         items=[schemas.DocumentListItem.model_validate(d) for d in items],
         total=total,
-        recent_count=recent_count,
-        today_count=today_count,
-        week_count=week_count,
-        month_count=month_count,
+        recent_count=stats["recent_count"],
+        today_count=stats["today_count"],
+        week_count=stats["week_count"],
+        month_count=stats["month_count"],
+        stats_computed_at=stats["computed_at"],
     )
 
 
+def _count_documents(db: Session, base, stats_scope, *, compute_stats: bool) -> dict:
+    """Exact total of ``base`` plus the today/week/month buckets of ``stats_scope``.
+
+    ``base`` is the filtered (but unsearched) document SELECT built by
+    :func:`get_documents`; ``stats_scope`` is the same without the date range.
+    """
+    D = models.Document
+    # Exact count - reliable and works with all query types. For large tables,
+    # PostgreSQL will use index-only scans when possible.
+    total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
+    if not compute_stats:
+        return {
+            "total": total,
+            "recent_count": None,
+            "today_count": None,
+            "week_count": None,
+            "month_count": None,
+        }
+
+    now = datetime.datetime.now(datetime.UTC)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = now - datetime.timedelta(days=7)
+    month_ago = now - datetime.timedelta(days=30)
+
+    def _created_since(since: datetime.datetime) -> int:
+        scoped = stats_scope.where(D.created_at >= since).subquery()
+        return db.scalar(select(func.count()).select_from(scoped)) or 0
+
+    week_count = _created_since(week_ago)
+    return {
+        "total": total,
+        # Recent count is an alias for the 7-day bucket.
+        "recent_count": week_count,
+        "today_count": _created_since(today_start),
+        "week_count": week_count,
+        "month_count": _created_since(month_ago),
+    }
+
+
 @router.get("/document/{document_id}", response_model=schemas.Document)
 def get_document(
     *,
@@ -1096,6 +1121,8 @@ def update_document_set(
         else:
             setattr(doc_set, field, value)
 
+    # Membership is rewritten with bulk statements the session hooks can't see.
+    document_stats.mark_dirty(db, project_id)
     db.commit()
     db.refresh(doc_set)
 
@@ -1273,6 +1300,7 @@ def delete_document_set(
     # 5. Delete membership rows + the set (bulk), then the documents, then the
     # orphaned preprocessed File rows (docs reference files, so files go last).
     cascade_delete_document_sets(db, [set_id])
+    document_stats.mark_dirty(db, project_id)
     if deleted_doc_ids:
         db.execute(
             sa_delete(models.Document).where(models.Document.id.in_(deleted_doc_ids))
@@ -1,27 +1,38 @@
 # backend/src/routers/v1/endpoints/evaluations.py
 """Evaluation endpoints for projects."""
 
-import csv
-import io
 import logging
 
-import pandas as pd
 from fastapi import APIRouter, Body, Depends, Query
 from fastapi.responses import Response, StreamingResponse
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, contains_eager, load_only, selectinload
 
 from .... import models, schemas
 from ....core.security import can_access_project, get_current_user
 from ....dependencies import get_db
+from ....middleware.error_handlers import internal_error_message
 from ....utils.api_errors import api_error
 from ....utils.audit import record_audit
-from ....utils.csv_safety import SafeCsvWriter
 from ....utils.enums import AuditAction
+from ....utils.evaluation_export import (
+    DOCUMENT_METRIC_COLUMNS,
+    FIELD_METRIC_COLUMNS,
+    SUMMARY_COLUMNS,
+    document_metric_rows,
+    field_detail_columns,
+    field_detail_rows,
+    field_metric_rows,
+    file_size,
+    iter_csv,
+    iter_file,
+    peek_rows,
+    summary_rows,
+    write_xlsx,
+)
 from ....utils.helpers import (
     build_evaluation_zipfiles,
-    collect_evaluation_field_level_details,
-    collect_trial_document_metadata,
+    collect_trials_document_metadata,
     excel_sheet_name,
     trial_display_label,
 )
@@ -32,6 +43,74 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _load_project_evaluations(
+    db: Session,
+    project_id: int,
+    evaluation_ids: list[int],
+    *,
+    columns: tuple = (),
+) -> list[tuple[models.Evaluation, models.Trial]]:
+    """Load the requested evaluations of a project together with their trials.
+
+    A fixed number of queries however many ids are requested: one for the
+    evaluations joined to their trials (the join is also the project check)
+    and one selectin query for the ground-truth names. ``columns`` restricts the
+    evaluation columns fetched, so callers that don't need the large JSON
+    metric columns don't pay for them.
+
+    Pairs come back in request order; unknown ids, ids from other projects
+    and repeats are dropped.
+    """
+    options = [
+        contains_eager(models.Evaluation.trial),
+        selectinload(models.Evaluation.ground_truth).load_only(
+            models.GroundTruth.id, models.GroundTruth.name
+        ),
+    ]
+    if columns:
+        options.append(load_only(*columns))
+    rows = db.execute(
+        select(models.Evaluation)
+        .join(models.Evaluation.trial)
+        .where(
+            models.Evaluation.id.in_(set(evaluation_ids)),
+            models.Trial.project_id == project_id,
+        )
+        .options(*options)
+    ).scalars()
+    by_id = {eval_obj.id: eval_obj for eval_obj in rows}
+    return [
+        (by_id[eval_id], by_id[eval_id].trial)
+        for eval_id in dict.fromkeys(evaluation_ids)
+        if eval_id in by_id
+    ]
+
+
+def _metric_counts_by(
+    db: Session, evaluation_ids: list[int], column
+) -> dict[int, dict]:
+    """``{evaluation_id: {key: (total, correct)}}`` over ``EvaluationMetric``.
+
+    Aggregated in SQL (``GROUP BY evaluation_id, <column>``) so only one row
+    per evaluation and key reaches Python, not every stored metric row.
+    """
+    metric = models.EvaluationMetric
+    rows = db.execute(
+        select(
+            metric.evaluation_id,
+            column,
+            func.count(),
+            func.sum(case((metric.is_correct, 1), else_=0)),
+        )
+        .where(metric.evaluation_id.in_(evaluation_ids))
+        .group_by(metric.evaluation_id, column)
+    ).all()
+    counts: dict[int, dict] = {}
+    for evaluation_id, key, total, correct in rows:
+        counts.setdefault(evaluation_id, {})[key] = (total, correct or 0)
+    return counts
+
+
 def _enrich_document_metrics(db: Session, evaluation: models.Evaluation) -> list[dict]:
     """Return ``evaluation.document_metrics`` enriched for display.
 
@@ -233,28 +312,31 @@ def compare_evaluations(
             "Not authorized to access this project's evaluations",
         )
 
-    # Get evaluations
-    evaluations: list[tuple[models.Evaluation, models.Trial]] = []
-    for eval_id in evaluation_ids:
-        eval_obj = db.execute(
-            select(models.Evaluation).where(models.Evaluation.id == eval_id)
-        ).scalar_one_or_none()
-
-        if eval_obj:
-            # Verify it belongs to project
-            trial = db.execute(
-                select(models.Trial).where(
-                    models.Trial.id == eval_obj.trial_id,
-                    models.Trial.project_id == project_id,
-                )
-            ).scalar_one_or_none()
-
-            if trial:
-                evaluations.append((eval_obj, trial))
+    # The comparison is built from the overall metrics plus per-field and
+    # per-document counts aggregated in SQL; the large per-field/per-document
+    # JSON columns are never fetched.
+    evaluations = _load_project_evaluations(
+        db,
+        project_id,
+        evaluation_ids,
+        columns=(
+            models.Evaluation.id,
+            models.Evaluation.trial_id,
+            models.Evaluation.groundtruth_id,
+            models.Evaluation.metrics,
+            models.Evaluation.created_at,
+        ),
+    )
 
     if not evaluations:
         raise api_error("evaluations.no_evaluations_found", 404, "No evaluations found")
 
+    loaded_ids = [eval_obj.id for eval_obj, _trial in evaluations]
+    field_counts = _metric_counts_by(db, loaded_ids, models.EvaluationMetric.field_name)
+    document_counts = _metric_counts_by(
+        db, loaded_ids, models.EvaluationMetric.document_id
+    )
+
     # Build comparison
     comparison = {
         "evaluations": [],
@@ -266,10 +348,11 @@ def compare_evaluations(
     # Collect all fields
     all_fields = set()
     for eval_obj, _trial in evaluations:
-        all_fields.update(eval_obj.field_metrics.keys())
+        all_fields.update(field_counts.get(eval_obj.id, {}).keys())
 
     # Build evaluation summaries
     for eval_obj, trial in evaluations:
+        per_document = document_counts.get(eval_obj.id, {}).values()
         comparison["evaluations"].append(
             {
                 "id": eval_obj.id,
@@ -277,6 +360,10 @@ def compare_evaluations(
                 "model": trial.llm_model,
                 "groundtruth_id": eval_obj.groundtruth_id,
                 "metrics": eval_obj.metrics,
+                "documents_evaluated": len(per_document),
+                "documents_fully_correct": sum(
+                    1 for total, correct in per_document if correct == total
+                ),
                 "created_at": eval_obj.created_at.isoformat(),
             }
         )
@@ -298,14 +385,14 @@ def compare_evaluations(
     for field in sorted(all_fields):
         comparison["field_comparison"][field] = []
         for eval_obj, trial in evaluations:
-            field_metric = eval_obj.field_metrics.get(field, {})
+            total, correct = field_counts.get(eval_obj.id, {}).get(field, (0, 0))
             comparison["field_comparison"][field].append(
                 {
                     "evaluation_id": eval_obj.id,
                     "model": trial.llm_model,
-                    "accuracy": field_metric.get("accuracy", 0),
-                    "total_count": field_metric.get("total_count", 0),
-                    "correct_count": field_metric.get("correct_count", 0),
+                    "accuracy": correct / total if total else 0,
+                    "total_count": total,
+                    "correct_count": correct,
                 }
             )
 
@@ -581,8 +668,10 @@ def download_evaluations_report(
             "evaluations.no_evaluation_ids", 400, "No evaluation_ids provided"
         )
 
-    # Cap the batch: the gather loop issues two DB queries per evaluation (N+1).
-    # Compare with compare_evaluations (cap = 10).
+    # Cap the batch to bound the size of the report. Loading is batched (a
+    # fixed number of queries regardless of the count); the cap limits the
+    # rows and document texts assembled. Compare with compare_evaluations
+    # (cap = 10).
     max_evaluations = 50
     if len(evaluation_ids_list) > max_evaluations:
         raise api_error(
@@ -607,21 +696,9 @@ def download_evaluations_report(
             "Not authorized to access this project's evaluations",
         )
 
-    # Gather evaluations (and their trials)
-    evaluations = []
-    for eval_id in evaluation_ids_list:
-        eval_obj = db.execute(
-            select(models.Evaluation).where(models.Evaluation.id == eval_id)
-        ).scalar_one_or_none()
-        if eval_obj:
-            trial = db.execute(
-                select(models.Trial).where(
-                    models.Trial.id == eval_obj.trial_id,
-                    models.Trial.project_id == project_id,
-                )
-            ).scalar_one_or_none()
-            if trial:
-                evaluations.append((eval_obj, trial))
+    # Gather evaluations (and their trials). Field-by-field details are not
+    # loaded here: the writers stream them from a cursor.
+    evaluations = _load_project_evaluations(db, project_id, evaluation_ids_list)
     if not evaluations:
         raise api_error("evaluations.no_evaluations_found", 404, "No evaluations found")
 
@@ -664,291 +741,126 @@ def download_evaluations_report(
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
 
+    evaluation_ids_found = [eval_obj.id for eval_obj, _ in evaluations]
+
     # --- CSV Export ---
+    # One sheet-like file with titled sections, encoded row by row; the
+    # field-level details stream off a database cursor.
     if format == "csv":
-        output = io.StringIO()
-        writer = SafeCsvWriter(csv.writer(output))
-        # Summary
-        writer.writerow(
-            [
-                "Evaluation ID",
-                "Trial",
-                "Trial Number",
-                "Trial ID",
-                "Model",
-                "Ground Truth",
-                "Accuracy",
-                "Precision",
-                "Recall",
-                "F1 Score",
-                "Total Documents",
-                "Total Fields",
-                "Created At",
-            ]
-        )
-        for eval_obj, trial in evaluations:
-            gt = db.get(models.GroundTruth, eval_obj.groundtruth_id)
-            writer.writerow(
-                [
-                    eval_obj.id,
-                    trial_display_label(trial),
-                    trial.project_trial_number,
-                    eval_obj.trial_id,
-                    trial.llm_model,
-                    gt.name if gt else "Unknown",
-                    eval_obj.metrics.get("accuracy", 0),
-                    eval_obj.metrics.get("precision", 0),
-                    eval_obj.metrics.get("recall", 0),
-                    eval_obj.metrics.get("f1_score", 0),
-                    eval_obj.metrics.get("total_documents", 0),
-                    eval_obj.metrics.get("total_fields", 0),
-                    eval_obj.created_at.isoformat(),
-                ]
-            )
-        # Field metrics
-        if include_details:
-            writer.writerow([])
-            writer.writerow(["Field-Level Metrics"])
-            writer.writerow(
-                [
-                    "Evaluation ID",
-                    "Field Name",
-                    "Accuracy",
-                    "Precision",
-                    "Recall",
-                    "F1 Score",
-                    "Total Count",
-                    "Correct Count",
-                    "Error Count",
-                ]
-            )
-            for eval_obj, _ in evaluations:
-                for field, metrics in (eval_obj.field_metrics or {}).items():
-                    writer.writerow(
-                        [
-                            eval_obj.id,
-                            field,
-                            metrics.get("accuracy", 0),
-                            metrics.get("precision", 0),
-                            metrics.get("recall", 0),
-                            metrics.get("f1_score", 0),
-                            metrics.get("total_count", 0),
-                            metrics.get("correct_count", 0),
-                            metrics.get("error_count", 0),
-                        ]
-                    )
-        # Field-by-field details
-        if include_field_details:
-            writer.writerow([])
-            writer.writerow(["Field-by-Field Details"])
-            headers = [
-                "Evaluation ID",
-                "Document ID",
-                "Field Name",
-                "Ground Truth",
-                "Prediction",
-                "Is Correct",
-            ]
-            if include_errors:
-                headers += ["Error Type", "Confidence"]
-            writer.writerow(headers)
-            for eval_obj, _ in evaluations:
-                details = collect_evaluation_field_level_details(
-                    db, eval_obj, include_errors
-                )
-                for detail in details:
-                    row = [
-                        detail.get("Evaluation ID", ""),
-                        detail.get("Document ID", ""),
-                        detail.get("Field Name", ""),
-                        detail.get("Ground Truth", ""),
-                        detail.get("Prediction", ""),
-                        detail.get("Is Correct", ""),
-                    ]
-                    if include_errors:
-                        row += [
-                            detail.get("Error Type", ""),
-                            detail.get("Confidence", ""),
-                        ]
-                    writer.writerow(row)
-        # Document metrics
-        if include_details:
-            writer.writerow([])
-            writer.writerow(["Document-Level Metrics"])
-            writer.writerow(
-                [
-                    "Evaluation ID",
-                    "Document ID",
-                    "Accuracy",
-                    "Correct Fields",
-                    "Total Fields",
-                    "Missing Fields",
-                    "Incorrect Fields",
-                    "Error",
-                ]
-            )
-            for eval_obj, _ in evaluations:
-                for doc_metrics in eval_obj.document_metrics:
-                    writer.writerow(
-                        [
-                            eval_obj.id,
-                            doc_metrics.get("document_id"),
-                            doc_metrics.get("accuracy"),
-                            doc_metrics.get("correct_fields"),
-                            doc_metrics.get("total_fields"),
-                            ";".join(doc_metrics.get("missing_fields", [])),
-                            ";".join(doc_metrics.get("incorrect_fields", [])),
-                            doc_metrics.get("error", ""),
-                        ]
-                    )
-        # Document metadata/content/GT per doc
-        if include_document_content or include_ground_truth_content:
-            writer.writerow([])
-            writer.writerow(["Document Metadata and Content"])
-            doc_header_written = False
-            for eval_obj, trial in evaluations:
-                docs = collect_trial_document_metadata(
+
+        def report_rows():
+            yield SUMMARY_COLUMNS
+            yield from summary_rows(evaluations)
+            if include_details:
+                yield []
+                yield ["Field-Level Metrics"]
+                yield FIELD_METRIC_COLUMNS
+                yield from field_metric_rows(evaluations)
+            if include_field_details:
+                yield []
+                yield ["Field-by-Field Details"]
+                yield field_detail_columns(include_errors)
+                yield from field_detail_rows(db, evaluation_ids_found, include_errors)
+            if include_details:
+                yield []
+                yield ["Document-Level Metrics"]
+                yield DOCUMENT_METRIC_COLUMNS
+                yield from document_metric_rows(evaluations)
+            if include_document_content or include_ground_truth_content:
+                yield []
+                yield ["Document Metadata and Content"]
+                docs_by_trial = collect_trials_document_metadata(
                     db,
-                    trial,
+                    [trial for _, trial in evaluations],
                     include_content=include_document_content,
                     include_ground_truth=include_ground_truth_content,
                 )
-                if docs and not doc_header_written:
-                    writer.writerow(docs[0].keys())
-                    doc_header_written = True
-                for doc in docs:
-                    writer.writerow([doc.get(col, "") for col in docs[0].keys()])
-
-        content = output.getvalue()
-        media_type = "text/csv"
+                columns = None
+                for _, trial in evaluations:
+                    for doc in docs_by_trial.get(trial.id, []):
+                        if columns is None:
+                            columns = list(doc.keys())
+                            yield columns
+                        yield [doc.get(col, "") for col in columns]
+
         filename = f"evaluation_report_{project_id}.csv"
+        return StreamingResponse(
+            iter_csv(report_rows()),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
 
     # --- XLSX Export ---
-    else:  # format == "xlsx"
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-            # Summary
-            summary_data = []
-            for eval_obj, trial in evaluations:
-                gt = db.get(models.GroundTruth, eval_obj.groundtruth_id)
-                summary_data.append(
-                    {
-                        "Evaluation ID": eval_obj.id,
-                        "Trial": trial_display_label(trial),
-                        "Trial Number": trial.project_trial_number,
-                        "Trial ID": eval_obj.trial_id,
-                        "Model": trial.llm_model,
-                        "Ground Truth": gt.name if gt else "Unknown",
-                        "Accuracy": eval_obj.metrics.get("accuracy", 0),
-                        "Precision": eval_obj.metrics.get("precision", 0),
-                        "Recall": eval_obj.metrics.get("recall", 0),
-                        "F1 Score": eval_obj.metrics.get("f1_score", 0),
-                        "Total Documents": eval_obj.metrics.get("total_documents", 0),
-                        "Total Fields": eval_obj.metrics.get("total_fields", 0),
-                        "Created At": eval_obj.created_at.isoformat(),
-                    }
-                )
-            pd.DataFrame(summary_data).to_excel(
-                writer, sheet_name="Summary", index=False
+    # Write-only workbook: each sheet goes to a temp file as its rows are
+    # appended, and the saved workbook is spooled to disk once it is large.
+    def sheets():
+        yield "Summary", SUMMARY_COLUMNS, summary_rows(evaluations)
+        optional = []
+        if include_details:
+            optional.append(
+                ("Field Metrics", FIELD_METRIC_COLUMNS, field_metric_rows(evaluations))
             )
-            # Field metrics
-            if include_details:
-                field_data = []
-                for eval_obj, _ in evaluations:
-                    for field, metrics in (eval_obj.field_metrics or {}).items():
-                        field_data.append(
-                            {
-                                "Evaluation ID": eval_obj.id,
-                                "Field Name": field,
-                                "Accuracy": metrics.get("accuracy", 0),
-                                "Precision": metrics.get("precision", 0),
-                                "Recall": metrics.get("recall", 0),
-                                "F1 Score": metrics.get("f1_score", 0),
-                                "Total Count": metrics.get("total_count", 0),
-                                "Correct Count": metrics.get("correct_count", 0),
-                                "Error Count": metrics.get("error_count", 0),
-                            }
-                        )
-                if field_data:
-                    pd.DataFrame(field_data).to_excel(
-                        writer, sheet_name="Field Metrics", index=False
-                    )
-            # Field-by-field details
-            if include_field_details:
-                all_details = []
-                for eval_obj, _ in evaluations:
-                    all_details.extend(
-                        collect_evaluation_field_level_details(
-                            db, eval_obj, include_errors
-                        )
-                    )
-                if all_details:
-                    pd.DataFrame(all_details).to_excel(
-                        writer, sheet_name="Field Details", index=False
-                    )
-            # Document metrics
-            if include_details:
-                doc_data = []
-                for eval_obj, _ in evaluations:
-                    for doc_metrics in eval_obj.document_metrics:
-                        doc_data.append(
-                            {
-                                "Evaluation ID": eval_obj.id,
-                                "Document ID": doc_metrics.get("document_id"),
-                                "Accuracy": doc_metrics.get("accuracy"),
-                                "Correct Fields": doc_metrics.get("correct_fields"),
-                                "Total Fields": doc_metrics.get("total_fields"),
-                                "Missing Fields": ";".join(
-                                    doc_metrics.get("missing_fields", [])
-                                ),
-                                "Incorrect Fields": ";".join(
-                                    doc_metrics.get("incorrect_fields", [])
-                                ),
-                                "Error": doc_metrics.get("error", ""),
-                            }
-                        )
-                if doc_data:
-                    pd.DataFrame(doc_data).to_excel(
-                        writer, sheet_name="Document Metrics", index=False
-                    )
-            # Document metadata/content/GT per doc
-            if include_document_content or include_ground_truth_content:
-                used_sheet_names: set[str] = {
-                    "Summary",
-                    "Field Metrics",
+        if include_field_details:
+            optional.append(
+                (
                     "Field Details",
+                    field_detail_columns(include_errors),
+                    field_detail_rows(db, evaluation_ids_found, include_errors),
+                )
+            )
+        if include_details:
+            optional.append(
+                (
                     "Document Metrics",
-                }
-                for eval_obj, trial in evaluations:
-                    docs = collect_trial_document_metadata(
-                        db,
-                        trial,
-                        include_content=include_document_content,
-                        include_ground_truth=include_ground_truth_content,
+                    DOCUMENT_METRIC_COLUMNS,
+                    document_metric_rows(evaluations),
+                )
+            )
+        for title, columns, rows in optional:
+            rows = peek_rows(rows)
+            if rows is not None:
+                yield title, columns, rows
+        # Document metadata/content/GT, one sheet per trial
+        if include_document_content or include_ground_truth_content:
+            used_sheet_names: set[str] = {
+                "Summary",
+                "Field Metrics",
+                "Field Details",
+                "Document Metrics",
+            }
+            docs_by_trial = collect_trials_document_metadata(
+                db,
+                [trial for _, trial in evaluations],
+                include_content=include_document_content,
+                include_ground_truth=include_ground_truth_content,
+            )
+            for _, trial in evaluations:
+                docs = docs_by_trial.get(trial.id, [])
+                if docs:
+                    columns = list(docs[0].keys())
+                    yield (
+                        excel_sheet_name(
+                            f"{trial_display_label(trial)} Docs",
+                            fallback=f"Trial {trial.project_trial_number} Docs",
+                            used=used_sheet_names,
+                        ),
+                        columns,
+                        ([doc.get(col, "") for col in columns] for doc in docs),
                     )
-                    if docs:
-                        pd.DataFrame(docs).to_excel(
-                            writer,
-                            sheet_name=excel_sheet_name(
-                                f"{trial_display_label(trial)} Docs",
-                                fallback=f"Trial {trial.project_trial_number} Docs",
-                                used=used_sheet_names,
-                            ),
-                            index=False,
-                        )
-        output.seek(0)
-        content = output.getvalue()
-        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        filename = f"evaluation_report_{project_id}.xlsx"
-
-    return Response(
-        content=content,
-        media_type=media_type,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+
+    workbook = write_xlsx(sheets())
+    filename = f"evaluation_report_{project_id}.xlsx"
+    return StreamingResponse(
+        iter_file(workbook),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(file_size(workbook)),
+        },
     )
 
 
-@router.post("/evaluation/batch", response_model=list[schemas.Evaluation])
+@router.post("/evaluation/batch", response_model=schemas.EvaluationJob, status_code=202)
 def batch_evaluate_trials(
     *,
     db: Session = Depends(get_db),
@@ -957,8 +869,15 @@ def batch_evaluate_trials(
     groundtruth_id: int = Body(...),
     force_recalculate: bool = Body(False),
     current_user: models.User = Depends(get_current_user),
-) -> list[schemas.Evaluation]:
-    """Evaluate multiple trials against ground truth."""
+) -> schemas.EvaluationJob:
+    """Queue a job evaluating multiple trials against ground truth.
+
+    Returns the job immediately (202). Per-trial progress arrives as
+    ``evaluation_job_update`` websocket messages and from
+    ``GET /evaluation/jobs/{job_id}``. Submitting the same trials again while
+    that job is still queued or running returns the existing job. With Celery
+    disabled the job runs before the response is sent.
+    """
     # Cap the batch to bound work (each trial evaluation recomputes metrics
     # across all its documents).
     max_trials = 200
@@ -993,41 +912,19 @@ def batch_evaluate_trials(
         raise api_error(
             "evaluations.groundtruth_not_found", 404, "Ground truth not found"
         )
-    # Evaluate trials
-    from ....utils.evaluation import EvaluationEngine
+    from ....utils import evaluation_jobs
+
+    job, created = evaluation_jobs.create_job(
+        db,
+        project_id=project_id,
+        groundtruth_id=groundtruth_id,
+        trial_ids=trial_ids,
+        force_recalculate=force_recalculate,
+        created_by_id=current_user.id,
+    )
+    if not created:
+        return job
 
-    engine = EvaluationEngine(db)
-    results = []
-    errors = []
-    for trial_id in trial_ids:
-        try:
-            # Verify trial exists
-            trial: models.Trial | None = db.execute(
-                select(models.Trial).where(
-                    models.Trial.project_id == project_id, models.Trial.id == trial_id
-                )
-            ).scalar_one_or_none()
-            if not trial:
-                errors.append(f"Trial {trial_id} not found")
-                continue
-            evaluation = engine.evaluate_trial(
-                trial_id=trial_id,
-                groundtruth_id=groundtruth_id,
-                force_recalculate=force_recalculate,
-            )
-            results.append(evaluation)
-        except Exception as e:
-            # Log the full error server-side; only a category-only message
-            # reaches the client (str(e) can contain DB internals / paths).
-            logger.warning("Error evaluating trial %s: %s", trial_id, e, exc_info=True)
-            errors.append(f"Error evaluating trial {trial_id}")
-    if errors and not results:
-        raise api_error(
-            "evaluations.all_evaluations_failed",
-            400,
-            f"All evaluations failed: {'; '.join(errors)}",
-            errors="; ".join(errors),
-        )
     record_audit(
         AuditAction.CREATE,
         actor=current_user,
@@ -1035,11 +932,59 @@ def batch_evaluate_trials(
         project_id=project_id,
         detail={
             "groundtruth_id": groundtruth_id,
-            "evaluated": len(results),
-            "errors": len(errors),
+            "evaluation_job_id": job.id,
+            "trials": len(job.trial_ids),
         },
     )
-    return results
+    try:
+        evaluation_jobs.dispatch_job(job.id)
+    except Exception as e:
+        # Broker unreachable. Fail the job so it doesn't sit PENDING forever
+        # (and block an identical resubmission via deduplication).
+        evaluation_jobs.mark_failed(
+            job.id,
+            internal_error_message(
+                e, actor=current_user, prefix="Failed to queue evaluation job"
+            ),
+        )
+        raise api_error(
+            "evaluations.job_dispatch_failed",
+            503,
+            "Could not queue the evaluation job. Please try again.",
+        )
+    db.refresh(job)
+    return job
+
+
+@router.get("/evaluation/jobs/{job_id}", response_model=schemas.EvaluationJob)
+def get_evaluation_job(
+    *,
+    db: Session = Depends(get_db),
+    project_id: int,
+    job_id: int,
+    current_user: models.User = Depends(get_current_user),
+) -> schemas.EvaluationJob:
+    """Status and per-trial results of a batch-evaluation job."""
+    project: models.Project | None = db.execute(
+        select(models.Project).where(models.Project.id == project_id)
+    ).scalar_one_or_none()
+    if not project:
+        raise api_error("evaluations.project_not_found", 404, "Project not found")
+    if not can_access_project(current_user, project, permission="read"):
+        raise api_error(
+            "evaluations.not_authorized_access",
+            403,
+            "Not authorized to access this project's evaluations",
+        )
+    job: models.EvaluationJob | None = db.execute(
+        select(models.EvaluationJob).where(
+            models.EvaluationJob.id == job_id,
+            models.EvaluationJob.project_id == project_id,
+        )
+    ).scalar_one_or_none()
+    if not job:
+        raise api_error("evaluations.job_not_found", 404, "Evaluation job not found")
+    return job
 
 
 @router.get("/evaluation/{evaluation_id}/errors", response_model=list[dict])
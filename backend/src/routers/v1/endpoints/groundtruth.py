@@ -3,6 +3,7 @@
 
 import json
 import logging
+from collections.abc import Mapping
 from pathlib import Path
 from typing import cast
 
@@ -27,12 +28,17 @@ from ....dependencies import (
     get_db,
     read_upload_with_limit_async,
     remove_file,
-    save_file,
+    save_stream,
     save_upload_stream_checked,
 )
 from ....utils.api_errors import api_error
 from ....utils.audit import record_audit
 from ....utils.enums import AuditAction, ComparisonMethod
+from ....utils.groundtruth_store import (
+    drop_ground_truth_store,
+    prebuild_ground_truth_store,
+    remove_store_artifact,
+)
 from ....utils.helpers import extract_field_types_from_schema
 from ....utils.json_utils import strip_nul
 
@@ -109,8 +115,8 @@ async def upload_groundtruth(
         )
     # Save the file
     if multiple_json and files:
-        # Cap the number of files: each is read fully into memory and held in a
-        # BytesIO ZIP buffer, so an unbounded count could exhaust memory.
+        # Cap the number of files: each is read fully into memory while it is
+        # validated and added, so bound the work one request can queue.
         max_files = 100
         if len(files) > max_files:
             raise api_error(
@@ -121,48 +127,49 @@ async def upload_groundtruth(
                 max_files=max_files,
                 requested=len(files),
             )
-        # Create a ZIP file in memory containing all JSON files
-        import io
+        # Zip all JSON files into a temporary file (not a memory buffer), then
+        # stream it to storage.
+        import tempfile
         import zipfile
 
-        zip_buffer = io.BytesIO()
         used_arcnames: set[str] = set()
-        with zipfile.ZipFile(zip_buffer, "w") as zf:
-            for idx, json_file in enumerate(files):
-                content = await read_upload_with_limit_async(json_file)
-                # Validate it's valid JSON
-                try:
-                    json.loads(content)
-                except json.JSONDecodeError:
-                    raise api_error(
-                        "groundtruth.invalid_json_file",
-                        400,
-                        f"File {json_file.filename} is not valid JSON",
-                        filename=json_file.filename,
+        with tempfile.TemporaryFile() as zip_file:
+            with zipfile.ZipFile(zip_file, "w") as zf:
+                for idx, json_file in enumerate(files):
+                    content = await read_upload_with_limit_async(json_file)
+                    # Validate it's valid JSON
+                    try:
+                        json.loads(content)
+                    except json.JSONDecodeError:
+                        raise api_error(
+                            "groundtruth.invalid_json_file",
+                            400,
+                            f"File {json_file.filename} is not valid JSON",
+                            filename=json_file.filename,
+                        )
+                    # Build a UNIQUE arcname ending in ``.json``. The parser only
+                    # reads ``*.json`` members and, for id-less documents, keys them
+                    # by filename stem — so a missing name (all become "") or a
+                    # duplicate name would silently drop/overwrite a document. Keep
+                    # the original name when unique (filename-based GT matching still
+                    # works) and only disambiguate real collisions.
+                    base_name = (
+                        Path(json_file.filename).name if json_file.filename else ""
                     )
-                # Build a UNIQUE arcname ending in ``.json``. The parser only
-                # reads ``*.json`` members and, for id-less documents, keys them
-                # by filename stem — so a missing name (all become "") or a
-                # duplicate name would silently drop/overwrite a document. Keep
-                # the original name when unique (filename-based GT matching still
-                # works) and only disambiguate real collisions.
-                base_name = Path(json_file.filename).name if json_file.filename else ""
-                if not base_name.endswith(".json"):
-                    base_name = f"{base_name or 'document'}.json"
-                arcname = base_name
-                dup = 1
-                while arcname in used_arcnames:
-                    arcname = f"{Path(base_name).stem}_{dup}.json"
-                    dup += 1
-                used_arcnames.add(arcname)
-                zf.writestr(arcname, content)
-
-        zip_buffer.seek(0)
-        file_content = zip_buffer.read()
+                    if not base_name.endswith(".json"):
+                        base_name = f"{base_name or 'document'}.json"
+                    arcname = base_name
+                    dup = 1
+                    while arcname in used_arcnames:
+                        arcname = f"{Path(base_name).stem}_{dup}.json"
+                        dup += 1
+                    used_arcnames.add(arcname)
+                    zf.writestr(arcname, content)
+            zip_file.seek(0)
+            # save_stream() does blocking disk/S3 I/O, so run it in a
+            # threadpool to keep the event loop free.
+            file_uuid = await run_in_threadpool(save_stream, zip_file)
         format = "zip"  # Treat as ZIP internally
-        # The zipped JSON blob is already in memory; save_file() does blocking
-        # disk/S3 I/O, so run it in a threadpool to keep the event loop free.
-        file_uuid = await run_in_threadpool(save_file, file_content)
     else:
         # Single file upload — stream it straight to storage (size-capped)
         # instead of reading the whole file into memory first, so a large
@@ -204,6 +211,8 @@ async def upload_groundtruth(
             pass
         raise
     db.refresh(gt)
+    # Parse once now into the columnar store every reader uses.
+    await run_in_threadpool(prebuild_ground_truth_store, db, gt)
     record_audit(
         AuditAction.CREATE,
         actor=current_user,
@@ -289,6 +298,7 @@ def delete_groundtruth(
     # storage first and the commit then fails, the DB row survives pointing at
     # deleted bytes. Matches files.py:delete_file (commit-then-remove).
     file_uuid = groundtruth.file_uuid
+    store_uuid = (groundtruth.store_manifest or {}).get("file_uuid")
 
     # Remove any evaluations using this ground truth
     evaluations = (
@@ -325,6 +335,7 @@ def delete_groundtruth(
         logger.warning(
             "Failed to remove ground truth file %s", file_uuid, exc_info=True
         )
+    remove_store_artifact(store_uuid)
 
     return schemas.GroundTruth.model_validate(groundtruth)
 
@@ -402,7 +413,7 @@ def update_groundtruth(
         # GroundTruth.name is String(100) — sanitize + truncate (see upload)
         groundtruth.name = strip_nul(name)[:100]
 
-    old_file_uuid = None
+    old_file_uuid = old_store_uuid = None
     if file:
         # Save the new file and point the row at it, but defer removing the old
         # bytes until after the commit succeeds — otherwise a commit failure
@@ -414,10 +425,10 @@ def update_groundtruth(
         file_uuid = save_upload_stream_checked(file)
         groundtruth.file_uuid = file_uuid
 
-        # The parsed ground-truth cache was built from the *old* file bytes.
-        # Drop it so the next evaluation re-parses from the new file —
-        # otherwise a replaced GT file would be scored against stale values.
-        groundtruth.data_cache = None
+        # The parsed ground-truth store was built from the *old* file bytes.
+        # Drop it and rebuild from the new file below — otherwise a replaced
+        # GT file would be scored against stale values.
+        old_store_uuid = drop_ground_truth_store(groundtruth)
 
         evaluations = (
             db.execute(
@@ -448,6 +459,8 @@ def update_groundtruth(
                 old_file_uuid,
                 exc_info=True,
             )
+        remove_store_artifact(old_store_uuid)
+        prebuild_ground_truth_store(db, groundtruth)
 
     return schemas.GroundTruth.model_validate(groundtruth)
 
@@ -502,13 +515,15 @@ def update_ground_truth_id_column(
         )
     groundtruth.id_column_name = id_column
 
-    # Clear data cache to force re-parsing with new ID column/field logic
-    groundtruth.data_cache = None
+    # Drop the parsed store and rebuild it with the new ID column/field logic
+    old_store_uuid = drop_ground_truth_store(groundtruth)
 
     # Invalidate related evaluations
     _invalidate_evaluations(db, models.Evaluation.groundtruth_id == groundtruth_id)
 
     db.commit()
+    remove_store_artifact(old_store_uuid)
+    prebuild_ground_truth_store(db, groundtruth)
     db.refresh(groundtruth)
 
     return schemas.GroundTruth.model_validate(groundtruth)
@@ -551,7 +566,9 @@ def preview_groundtruth(
     engine = EvaluationEngine(db)
 
     try:
-        gt_data = engine._load_ground_truth(groundtruth)
+        # Only the stored head rows are needed, not the whole ground truth.
+        with engine:
+            gt_data = engine._ground_truth_store(groundtruth).head(3)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
@@ -605,7 +622,7 @@ def preview_groundtruth(
     return {
         "fields": field_paths,
         "field_types": field_types,
-        "preview_data": {k: v for k, v in list(gt_data.items())[:3]},
+        "preview_data": gt_data,
         "available_columns": available_columns,
         "current_id_column": groundtruth.id_column_name,
     }
@@ -615,7 +632,7 @@ def _match_gt_key_for_document(
     doc_id: int,
     document_name: str | None,
     filename: str | None,
-    gt_keys_lower: dict[str, str],
+    gt_keys_lower: Mapping[str, str],
 ) -> str | None:
     """Resolve the ground-truth key a document would match during evaluation.
 
@@ -669,7 +686,7 @@ def preview_groundtruth_document_matches(
     Runs BEFORE the ID column/field is saved: the candidate ``id_column``
     (CSV/XLSX column name, JSON id field, or null/empty for the app's default
     filename-based matching) is applied in-memory only — neither
-    ``id_column_name`` nor ``data_cache`` is touched, and no evaluations are
+    ``id_column_name`` nor the ground truth store is touched, and no evaluations are
     invalidated. Matching mirrors what evaluation will actually do (see
     ``_match_gt_key_for_document``), so a 0-match configuration is caught
     before mappings are saved instead of after a full evaluation run.
@@ -694,29 +711,49 @@ def preview_groundtruth_document_matches(
     candidate = strip_nul(id_column or "").strip()
     saved = (groundtruth.id_column_name or "").strip()
 
-    # Load ground-truth data keyed by the CANDIDATE id config. Reuse the cached
-    # parse only when the candidate equals the saved column (the cache was
-    # built with it); otherwise parse fresh in memory, mirroring
-    # EvaluationEngine._load_ground_truth (utils/evaluation.py): the id column
-    # is passed to the parser for CSV/XLSX only — JSON/ZIP keys always come
-    # from the documents' id/patient_id fields or the archive filenames.
-    if candidate == saved and groundtruth.data_cache:
-        gt_data = groundtruth.data_cache
+    # Load ground-truth keys for the CANDIDATE id config. Reuse the store's
+    # key index only when the candidate equals the saved column (the store was
+    # built with it); otherwise stream a fresh parse keeping only the keys,
+    # mirroring utils/groundtruth_store.py: the id column is passed to the
+    # parser for CSV/XLSX only — JSON/ZIP keys always come from the
+    # documents' id/patient_id fields or the archive filenames.
+    if candidate == saved:
+        from ....utils.groundtruth_store import load_ground_truth_store
+
+        try:
+            store = load_ground_truth_store(db, groundtruth)
+        except ValueError as e:
+            raise api_error(
+                "groundtruth.match_preview_parse_failed", 422, str(e), error=str(e)
+            )
+        except Exception:
+            logger.error(
+                "Match preview failed to load ground truth %s",
+                groundtruth_id,
+                exc_info=True,
+            )
+            raise api_error(
+                "groundtruth.match_preview_load_failed",
+                500,
+                "Failed to load ground truth. See server logs for details.",
+            )
+        with store:
+            gt_keys = store.keys
+            gt_keys_lower = store.keys_lower
     else:
-        from ....dependencies import get_file
+        from ....dependencies import open_file
         from ....utils.evaluation import GroundTruthParser
-        from ....utils.json_utils import make_jsonable
 
+        tabular = groundtruth.format in ["csv", "xlsx"]
+        id_config = (candidate or None) if tabular else None
         try:
-            content = get_file(groundtruth.file_uuid)
-            parser = GroundTruthParser()
-            if groundtruth.format in ["csv", "xlsx"]:
-                gt_data = parser.parse(
-                    content, groundtruth.format, id_column=candidate or None
-                )
-            else:
-                gt_data = parser.parse(content, groundtruth.format)
-            gt_data = make_jsonable(gt_data)
+            with open_file(groundtruth.file_uuid) as source:
+                gt_keys = [
+                    key
+                    for key, _ in GroundTruthParser().iter_documents(
+                        source, groundtruth.format, id_column=id_config
+                    )
+                ]
         except ValueError as e:
             # Parse errors (e.g. candidate column missing from the file) are
             # actionable user feedback — surface them like the preview endpoint.
@@ -734,6 +771,7 @@ def preview_groundtruth_document_matches(
                 500,
                 "Failed to load ground truth. See server logs for details.",
             )
+        gt_keys_lower = {str(k).lower(): k for k in gt_keys}
 
     if groundtruth.format in ["csv", "xlsx"]:
         match_mode = "id_column" if candidate else "filename"
@@ -754,7 +792,6 @@ def preview_groundtruth_document_matches(
         .where(models.Document.project_id == project_id)
     ).all()
 
-    gt_keys_lower = {str(k).lower(): k for k in gt_data.keys()}
     matched_keys: set[str] = set()
     for doc_id, document_name, file_name in doc_rows:
         key = _match_gt_key_for_document(
@@ -763,10 +800,10 @@ def preview_groundtruth_document_matches(
         if key is not None:
             matched_keys.add(key)
 
-    unmatched_examples = [str(k) for k in gt_data.keys() if k not in matched_keys][:5]
+    unmatched_examples = [str(k) for k in gt_keys if k not in matched_keys][:5]
 
     return schemas.GroundTruthMatchPreview(
-        total_rows=len(gt_data),
+        total_rows=len(gt_keys),
         matched_count=len(matched_keys),
         unmatched_examples=unmatched_examples,
         match_mode=match_mode,
@@ -1054,8 +1091,10 @@ def suggest_field_mappings(
     # Load ground truth data
     from ....utils.evaluation import EvaluationEngine
 
-    engine = EvaluationEngine(db)
-    gt_data = engine._load_ground_truth(groundtruth)
+    with EvaluationEngine(db) as engine:
+        store = engine._ground_truth_store(groundtruth)
+        gt_head = store.head(1)
+        gt_columns = store.columns
 
     # Check if ground truth is JSON format
     is_json_format = groundtruth.format in ["json", "zip"]
@@ -1070,7 +1109,7 @@ def suggest_field_mappings(
 
         # Get ground truth fields with dot notation from first document
         gt_fields_flat = set()
-        sample_doc = next(iter(gt_data.values())) if gt_data else {}
+        sample_doc = next(iter(gt_head.values()), {})
 
         def extract_gt_fields(data, prefix=""):
             """Extract fields with dot notation from nested dict."""
@@ -1108,10 +1147,8 @@ def suggest_field_mappings(
         return suggestions
     else:
         # Use existing fuzzy matching for CSV
-        # Get ground truth fields
-        gt_fields = set()
-        for fields in gt_data.values():
-            gt_fields.update(fields.keys())
+        # Get ground truth fields (the store's columns: every row's keys)
+        gt_fields = set(gt_columns)
 
         # Suggest mappings
         suggestions = []
@@ -1222,8 +1259,8 @@ def validate_json_ground_truth(
     # Load ground truth data
     from ....utils.evaluation import EvaluationEngine
 
-    engine = EvaluationEngine(db)
-    gt_data = engine._load_ground_truth(groundtruth)
+    with EvaluationEngine(db) as engine:
+        gt_data = engine._ground_truth_store(groundtruth).head(10)
 
     errors = []
     warnings = []
@@ -1315,8 +1352,8 @@ def auto_map_fields(
     # Load ground truth data
     from ....utils.evaluation import EvaluationEngine
 
-    engine = EvaluationEngine(db)
-    gt_data = engine._load_ground_truth(groundtruth)
+    with EvaluationEngine(db) as engine:
+        gt_data = engine._ground_truth_store(groundtruth).head(10)
 
     # Extract schema fields
     schema_fields = {}
@@ -15,6 +15,7 @@ from ....core.security import can_access_project, get_current_user
 from ....dependencies import get_db
 from ....middleware.error_handlers import internal_error_message
 from ....models.project import document_set_association
+from ....utils import document_stats
 from ....utils.api_errors import api_error
 from ....utils.audit import record_audit
 from ....utils.enums import AuditAction
@@ -670,6 +671,7 @@ async def preprocess_project_data(
                     models.Document.id.in_(doc_ids_to_delete)
                 )
             )
+            document_stats.mark_dirty(db, project_id)
         files_to_process = list(files)
 
     # Resolve bypass_celery (from the request body or an inline config) and
@@ -14,6 +14,7 @@ from ....core.security import (
     project_access_level,
 )
 from ....dependencies import get_db, remove_file
+from ....utils import project_recipients
 from ....utils.api_errors import api_error
 from ....utils.audit import record_audit
 from ....utils.deletion import cascade_delete_project
@@ -370,6 +371,8 @@ def get_projects(
         selectinload(models.Project.owner).options(
             load_only(models.User.id, models.User.full_name, models.User.email)
         ),
+        # share_count below
+        selectinload(models.Project.shares),
         # absolutely no documents on the list route
         noload(models.Project.documents),
     )
@@ -478,6 +481,7 @@ def get_project(
             selectinload(models.Project.owner).options(
                 load_only(models.User.id, models.User.full_name, models.User.email)
             ),
+            selectinload(models.Project.shares),
             noload(models.Project.documents),
         )
     ).first()
@@ -586,12 +590,16 @@ def update_project(
     if current_user.role != "admin":
         update_data.pop("owner_id", None)
 
+    previous_owner_id = existing_project.owner_id
     for key, value in update_data.items():
         setattr(existing_project, key, value)
 
     db.add(existing_project)
     db.commit()
     db.refresh(existing_project)
+    if existing_project.owner_id != previous_owner_id:
+        # Ownership transfer changes who receives live task updates.
+        project_recipients.recipients_changed(project_id)
 
     record_audit(
         AuditAction.UPDATE,
@@ -631,23 +639,24 @@ def delete_project(
             permission="delete",
         )
 
-    # Collect stored-file UUIDs (uploaded files + ground truth) before the
-    # cascade-delete removes their DB rows, so we can still free the bytes in
-    # local/S3 storage afterwards. Mirrors delete_user (users.py).
+    # Collect stored-file UUIDs (uploaded files, ground truth sources and their
+    # columnar store artifacts) before the cascade-delete removes their DB
+    # rows, so we can still free the bytes in local/S3 storage afterwards.
+    # Mirrors delete_user (users.py).
     file_uuids = [
         row[0]
         for row in db.execute(
             select(models.File.file_uuid).where(models.File.project_id == project_id)
         ).all()
     ]
-    file_uuids.extend(
-        row[0]
-        for row in db.execute(
-            select(models.GroundTruth.file_uuid).where(
-                models.GroundTruth.project_id == project_id
-            )
-        ).all()
-    )
+    for gt_uuid, manifest in db.execute(
+        select(models.GroundTruth.file_uuid, models.GroundTruth.store_manifest).where(
+            models.GroundTruth.project_id == project_id
+        )
+    ).all():
+        file_uuids.append(gt_uuid)
+        if store_uuid := (manifest or {}).get("file_uuid"):
+            file_uuids.append(store_uuid)
 
     # Serialize the response before deleting. The old ORM-cascade path left
     # every child collection loaded so model_validate happened to work; the
@@ -676,6 +685,7 @@ def delete_project(
     counts = cascade_delete_project(db, project_id)
     db.execute(delete(models.Project).where(models.Project.id == project_id))
     db.commit()
+    project_recipients.recipients_changed(project_id)
 
     record_audit(
         AuditAction.DELETE,
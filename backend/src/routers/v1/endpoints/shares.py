@@ -26,6 +26,7 @@ from ....core.security import (
     get_current_user,
 )
 from ....dependencies import get_db
+from ....utils import project_recipients
 from ....utils.api_errors import api_error
 from ....utils.audit import record_audit
 from ....utils.enums import AuditAction
@@ -157,6 +158,9 @@ def create_project_share(
 
     db.commit()
     db.refresh(share)
+    if action == AuditAction.PROJECT_SHARE:
+        # A new member starts receiving the project's live task updates.
+        project_recipients.recipients_changed(project_id)
 
     record_audit(
         action,
@@ -263,6 +267,7 @@ def delete_project_share(
     target_user_id = share.user_id
     db.delete(share)
     db.commit()
+    project_recipients.recipients_changed(project_id)
 
     record_audit(
         AuditAction.PROJECT_UNSHARE,
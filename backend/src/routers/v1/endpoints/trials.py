@@ -477,6 +477,11 @@ def create_trial(
             raise
         finally:
             stop_heartbeat.set()
+
+        # Same opt-in auto-evaluation as the Celery finalizer.
+        from ....utils.evaluation_jobs import queue_auto_evaluation
+
+        queue_auto_evaluation(db, trial_db)
     else:
         # The api_key is NOT passed through the broker: it is stored encrypted
         # on the Trial row (api_key_encrypted) and decrypted inside the task.
@@ -1635,66 +1640,65 @@ def evaluate_trial(
 
     from ....utils.evaluation import EvaluationEngine
 
-    engine = EvaluationEngine(db)
-
-    try:
-        validation_result = engine._validate_evaluation_prerequisites(
-            trial_id, groundtruth_id
-        )
-        if not validation_result["valid"]:
-            error_details = {
-                "message": "Cannot evaluate trial due to validation errors",
-                "errors": validation_result["errors"],
-                "suggestions": [],
-            }
-            for error in validation_result["errors"]:
-                if "No field mappings configured" in error:
-                    error_details["suggestions"].append(
-                        "Configure field mappings between your ground truth data and schema fields"
-                    )
-                elif "No results found" in error:
-                    error_details["suggestions"].append(
-                        "Ensure the trial has completed successfully and produced results"
-                    )
-                elif "documents have matching ground truth" in error:
-                    error_details["suggestions"].append(
-                        "Check that your ground truth file contains keys that match your document IDs or filenames"
-                    )
-            raise HTTPException(status_code=400, detail=error_details)
-    except HTTPException:
-        # Re-raise the structured validation error (with errors + suggestions)
-        # so it reaches the client instead of being flattened by the handler below.
-        raise
-    except Exception as e:
-        # Don't echo the internal exception string to the client — it can
-        # contain DB error messages, file paths, or library internals.
-        logger.warning("Evaluation validation failed for trial %s: %s", trial_id, e)
-        raise api_error(
-            "trials.validation_failed",
-            400,
-            "Validation failed. See server logs for details.",
-        )
+    with EvaluationEngine(db) as engine:
+        try:
+            validation_result = engine._validate_evaluation_prerequisites(
+                trial_id, groundtruth_id
+            )
+            if not validation_result["valid"]:
+                error_details = {
+                    "message": "Cannot evaluate trial due to validation errors",
+                    "errors": validation_result["errors"],
+                    "suggestions": [],
+                }
+                for error in validation_result["errors"]:
+                    if "No field mappings configured" in error:
+                        error_details["suggestions"].append(
+                            "Configure field mappings between your ground truth data and schema fields"
+                        )
+                    elif "No results found" in error:
+                        error_details["suggestions"].append(
+                            "Ensure the trial has completed successfully and produced results"
+                        )
+                    elif "documents have matching ground truth" in error:
+                        error_details["suggestions"].append(
+                            "Check that your ground truth file contains keys that match your document IDs or filenames"
+                        )
+                raise HTTPException(status_code=400, detail=error_details)
+        except HTTPException:
+            # Re-raise the structured validation error (with errors + suggestions)
+            # so it reaches the client instead of being flattened by the handler below.
+            raise
+        except Exception as e:
+            # Don't echo the internal exception string to the client — it can
+            # contain DB error messages, file paths, or library internals.
+            logger.warning("Evaluation validation failed for trial %s: %s", trial_id, e)
+            raise api_error(
+                "trials.validation_failed",
+                400,
+                "Validation failed. See server logs for details.",
+            )
 
-    try:
-        evaluation = engine.evaluate_trial(
-            trial_id=trial_id,
-            groundtruth_id=groundtruth_id,
-            force_recalculate=force_recalculate,
-        )
-    except ValueError as e:
-        raise api_error("trials.evaluation_value_error", 400, str(e), error=str(e))
-    except Exception as e:
-        logger.error(
-            "Evaluation failed for trial %s / ground truth %s: %s",
-            trial_id,
-            groundtruth_id,
-            e,
-            exc_info=True,
-        )
-        raise HTTPException(
-            status_code=500,
-            detail="Evaluation failed. See server logs for details.",
-        )
+        try:
+            evaluation = engine.evaluate_trial(
+                trial_id=trial_id,
+                groundtruth_id=groundtruth_id,
+                force_recalculate=force_recalculate,
+            )
+        except ValueError as e:
+            raise api_error("trials.evaluation_value_error", 400, str(e), error=str(e))
+        except Exception as e:
+            logger.error(
+                "Evaluation failed for trial %s / ground truth %s: %s",
+                trial_id,
+                groundtruth_id,
+                e,
+                exc_info=True,
+            )
+            raise HTTPException(
+                status_code=500,
+                detail="Evaluation failed. See server logs for details.",
+            )
 
     # Batch-load all EvaluationMetric rows for this evaluation once and group
     # them in Python, instead of one query per field (sample errors) and one
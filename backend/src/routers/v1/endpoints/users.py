@@ -522,8 +522,8 @@ def delete_user(
             "Cannot delete admin users",
         )
 
-    # Collect all stored-file UUIDs (uploaded files + ground truth) from the
-    # user's projects before cascade-delete removes their DB rows, so we can
+    # Collect all stored-file UUIDs (uploaded files, ground truth sources and
+    # their columnar store artifacts) from the user's projects before cascade-delete removes their DB rows, so we can
     # still free the bytes in local/S3 storage afterwards. Mirrors delete_project.
     file_uuids = [
         row[0]
@@ -532,13 +532,15 @@ def delete_user(
         .filter(models.Project.owner_id == user.id)
         .all()
     ]
-    file_uuids.extend(
-        row[0]
-        for row in db.query(models.GroundTruth.file_uuid)
+    for gt_uuid, manifest in (
+        db.query(models.GroundTruth.file_uuid, models.GroundTruth.store_manifest)
         .join(models.Project, models.GroundTruth.project_id == models.Project.id)
         .filter(models.Project.owner_id == user.id)
         .all()
-    )
+    ):
+        file_uuids.append(gt_uuid)
+        if store_uuid := (manifest or {}).get("file_uuid"):
+            file_uuids.append(store_uuid)
 
     # Delete physical files from storage
     for file_uuid in file_uuids:
@@ -29,6 +29,7 @@ from .project import (
     Evaluation,
     EvaluationCreate,
     EvaluationDetail,
+    EvaluationJob,
     EvaluationListItem,
     EvaluationMetricDetail,
     EvaluationSummary,
@@ -43,6 +44,7 @@ from .project import (
     GroundTruth,
     GroundTruthCreate,
     GroundTruthMatchPreview,
+    OCRCacheStatus,
     PaginatedDocuments,
     PaginatedDocumentSets,
     PaginatedFiles,
@@ -67,6 +69,8 @@ from .project import (
     Prompt,
     PromptCreate,
     PromptUpdate,
+    SchedulerStatus,
+    SchedulingWeights,
     Schema,
     SchemaCreate,
     SchemaUpdate,
@@ -177,6 +181,9 @@ __all__ = [
     "PreprocessingConfigurationUpdate",
     "PreprocessingDuplicatePreview",
     "PdfEmbeddedTextInfo",
+    "OCRCacheStatus",
+    "SchedulerStatus",
+    "SchedulingWeights",
     "Trial",
     "TrialResult",
     "TrialCreate",
@@ -194,6 +201,7 @@ __all__ = [
     "Evaluation",
     "EvaluationCreate",
     "EvaluationDetail",
+    "EvaluationJob",
     "EvaluationListItem",
     "FieldMapping",
     "FieldMappingCreate",
@@ -30,6 +30,16 @@ class PaginatedAuditLogs(BaseModel):
     items: list[AuditLogEntry]
 
 
+class AuditWriterStatus(BaseModel):
+    """The answering process's audit queue (each API worker has its own)."""
+
+    mode: str
+    overflow_policy: str
+    queue_max_rows: int
+    pending: int
+    dropped: int
+
+
 class ErrorLogEntry(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
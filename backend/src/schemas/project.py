@@ -33,6 +33,9 @@ class ProjectBase(UTCModel):
     description: str | None = Field(None, max_length=500)
     status: ProjectStatus | None = None
     owner_id: int | None = None
+    # Reuse OCR results cached from identical files in any project, and
+    # contribute this project's (utils/ocr_cache.py). Off for data isolation.
+    ocr_cache_enabled: bool = True
 
 
 class ProjectCreate(ProjectBase):
@@ -217,6 +220,9 @@ class PaginatedDocuments(UTCModel):
     today_count: int | None = None  # Documents created today
     week_count: int | None = None  # Documents created in last 7 days
     month_count: int | None = None  # Documents created in last 30 days
+    # When the counts above were computed. They come from a per-project cache
+    # (invalidated on every document change), so this can trail the request.
+    stats_computed_at: datetime | None = None
 
 
 class DocumentCombineGroup(UTCModel):
@@ -801,6 +807,78 @@ class PreprocessingTask(PreprocessingTaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class OCRCacheStatus(BaseModel):
+    """Usage of the OCR result cache shared by all projects."""
+
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+
+
+class SchedulingWeights(BaseModel):
+    """Scheduling weights by user id and project id. A trial's weight is its
+    owner's times its project's; unlisted users and projects weigh 1."""
+
+    users: dict[int, float] = Field(default_factory=dict)
+    projects: dict[int, float] = Field(default_factory=dict)
+
+    @field_validator("users", "projects")
+    @classmethod
+    def _positive(cls, weights: dict[int, float]) -> dict[int, float]:
+        for weight in weights.values():
+            if not 0 < weight <= 1000:
+                raise ValueError("weights must be greater than 0 and at most 1000")
+        return weights
+
+
+class SchedulerTrialShare(BaseModel):
+    """A running trial's weight and its window of queued shards."""
+
+    trial_id: int
+    weight: float
+    open_shards: int
+    queued_shards: int
+    window: int
+
+
+class SchedulerEndpointTrial(BaseModel):
+    """A flow of calls to an endpoint: a trial, or ``ocr`` for vision OCR."""
+
+    flow: str
+    trial_id: int | None = None
+    weight: float
+    in_flight: int
+    waiting: int
+    share: float
+    target_share: float
+
+
+class SchedulerEndpoint(BaseModel):
+    """LLM requests holding or waiting for slots of one endpoint and model,
+    and the endpoint's limits (0 = unlimited)."""
+
+    endpoint: str
+    base_url: str | None = None
+    model: str | None = None
+    rpm: int = 0
+    tpm: int = 0
+    max_in_flight: int = 0
+    in_flight: int
+    waiting: int
+    trials: List[SchedulerEndpointTrial]
+
+
+class SchedulerStatus(BaseModel):
+    """Current shares of the fair trial scheduler."""
+
+    shard_slots: int
+    endpoint_max_concurrency: int
+    trials: List[SchedulerTrialShare]
+    endpoints: List[SchedulerEndpoint]
+    weights: SchedulingWeights
+
+
 class EvaluationBase(UTCModel):
     trial_id: int
     groundtruth_id: int
@@ -871,6 +949,32 @@ class EvaluationDetail(UTCModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EvaluationJob(UTCModel):
+    """A background batch evaluation (``POST /evaluation/batch``).
+
+    ``results`` gains one entry per finished trial —
+    ``{"trial_id", "status", "evaluation_id", "error"}`` with status
+    ``evaluated``, ``reused`` (a fresh evaluation already existed) or
+    ``failed``.
+    """
+
+    id: int
+    project_id: int
+    groundtruth_id: int
+    trial_ids: list[int]
+    force_recalculate: bool
+    source: str
+    status: str
+    trials_done: int
+    trials_failed: int
+    results: list[dict]
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class FieldMappingBase(UTCModel):
     schema_field: str = Field(..., max_length=200)
     ground_truth_field: str = Field(..., max_length=200)
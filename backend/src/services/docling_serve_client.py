@@ -9,18 +9,78 @@ memory usage and avoiding duplicate model loading in Celery workers.
 The client uses multipart/form-data requests to /v1/convert/file,
 which is more memory-efficient than base64-encoded JSON payloads.
 
+Large PDFs are split into page-range slices that are converted concurrently:
+a 500-page scan used to be one request lasting many minutes, and any failure
+lost all of it.
+
+Design notes:
+
+* Requests from every client in the process run on one background event loop
+  (``_io_loop``) through an ``httpx.AsyncClient``. The public ``convert_*``
+  methods stay synchronous for the preprocessing pipeline's worker threads;
+  they block on the loop, so retry backoff no longer sleeps in the caller's
+  thread while other slices are in flight.
+* PDFs with more than ``slice_pages`` pages are split with pypdf in the
+  calling thread and each slice is posted as its own file. Slices share a
+  per-server semaphore (``max_concurrent_requests``), so all conversions in a
+  process together never have more requests open against one docling-serve
+  instance than it is configured for.
+* Each slice retries on its own; a failed slice never re-sends the slices
+  that already converted. Once a slice exhausts its retries the remaining
+  ones are cancelled and the conversion fails as before.
+* Slice results are reassembled in page order. A slice without any text (say
+  blank pages) contributes nothing rather than failing the document; only a
+  document with no text at all is an error, as for an unsplit file.
+
 Fallback behavior (only when DOCLING_LOCAL_FALLBACK=true):
 - If docling-serve is unavailable (connection error), falls back to local Docling.
 - This is useful for local testing and development.
 """
 
+import asyncio
+import io
 import logging
+import os
+import random
+import threading
 from dataclasses import dataclass, field
+from pathlib import PurePath
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# Requests of all clients in this process run on one event loop in a daemon
+# thread, created on first use (and again in a forked child).
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+_loop_lock = threading.Lock()
+
+# Per docling-serve base URL: (limit, semaphore). Touched only on the loop.
+_server_limits: dict[str, tuple[int, asyncio.Semaphore]] = {}
+
+
+def _io_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="docling-serve-io", daemon=True
+            ).start()
+            _loop, _loop_pid = loop, os.getpid()
+        return _loop
+
+
+def _server_limit(base_url: str, limit: int) -> asyncio.Semaphore:
+    current = _server_limits.get(base_url)
+    if current is None or current[0] != limit:
+        # A changed limit applies to requests started from now on; requests
+        # holding the old semaphore finish under it.
+        current = (limit, asyncio.Semaphore(limit))
+        _server_limits[base_url] = current
+    return current[1]
+
 
 class DoclingServeError(Exception):
     """Raised when docling-serve API call fails."""
@@ -57,13 +117,31 @@ class DoclingServeError(Exception):
         super().__init__(" | ".join(error_parts))
 
 
+class _ServerUnavailableError(Exception):
+    """docling-serve could not be reached and local fallback is enabled."""
+
+
 @dataclass
 class DoclingServeResult:
-    """Result from docling-serve conversion."""
+    """Result from docling-serve conversion.
+
+    For a PDF converted in slices, ``raw_response`` is
+    ``{"page_count": n, "slices": [{"pages": [first, last], "response": ...}]}``
+    and ``page_ranges`` lists the slices' 1-based inclusive page ranges.
+    """
 
     text: str
     raw_response: dict | None = None
     warnings: list[str] = field(default_factory=list)
+    page_ranges: list[tuple[int, int]] = field(default_factory=list)
+
+
+@dataclass
+class _Slice:
+    first_page: int
+    last_page: int
+    filename: str
+    content: bytes
 
 
 class DoclingServeClient:
@@ -71,9 +149,13 @@ class DoclingServeClient:
 
     Args:
         base_url: Base URL of docling-serve instance.
-        timeout_seconds: Request timeout in seconds.
-        max_retries: Maximum number of retry attempts.
+        timeout_seconds: Request timeout in seconds (per request, i.e. per slice).
+        max_retries: Maximum number of retry attempts (per slice).
         default_ocr_langs: Default OCR languages for Tesseract.
+        slice_pages: Split PDFs with more pages than this into slices of this
+            many pages. ``0`` sends every file whole.
+        max_concurrent_requests: Requests open at once against this
+            docling-serve instance, across all clients in the process.
     """
 
     def __init__(
@@ -84,6 +166,8 @@ class DoclingServeClient:
         default_ocr_langs: list[str] | str | None = None,
         retry_backoff: float = 2.0,
         base_retry_delay: float = 1.0,
+        slice_pages: int = 0,
+        max_concurrent_requests: int = 4,
     ):
         if not base_url:
             raise DoclingServeError("docling-serve base URL is required")
@@ -93,10 +177,12 @@ class DoclingServeClient:
         self.max_retries = max_retries
         self.retry_backoff = retry_backoff
         self.base_retry_delay = base_retry_delay
+        self.slice_pages = max(0, slice_pages)
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
         # Default to "auto" for automatic language detection
         self.default_ocr_langs = default_ocr_langs or "auto"
 
-        self._client = httpx.Client(timeout=timeout_seconds)
+        self._client = httpx.AsyncClient(timeout=timeout_seconds)
 
     def convert_pdf_no_ocr(
         self,
@@ -201,9 +287,10 @@ class DoclingServeClient:
         ocr_engine: str | None = None,
         ocr_langs: list[str] | str | None = None,
     ) -> DoclingServeResult:
-        """Send conversion request to docling-serve.
+        """Send conversion request(s) to docling-serve.
 
-        Uses multipart/form-data to /v1/convert/file endpoint.
+        Uses multipart/form-data to /v1/convert/file endpoint. PDFs longer
+        than ``slice_pages`` are converted as concurrent page-range slices.
 
         Args:
             file_content: Raw file bytes.
@@ -221,13 +308,6 @@ class DoclingServeClient:
         Raises:
             DoclingServeError: If conversion fails.
         """
-        endpoint = f"{self.base_url}/v1/convert/file"
-
-        # Build multipart form data
-        files = {
-            "files": (filename, file_content, mime_type),
-        }
-
         # Note: from_formats and to_formats should be comma-separated strings,
         # not lists, for multipart form data
         data = {
@@ -259,20 +339,118 @@ class DoclingServeClient:
                 elif ocr_langs.lower() != "auto":
                     data["ocr_lang"] = ocr_langs
 
+        ocr_mode = f"do_ocr={do_ocr}, force_ocr={force_ocr}"
+        # Splitting is CPU-bound; do it here rather than on the shared loop.
+        slices = None
+        if mime_type == "application/pdf" and self.slice_pages:
+            slices = _split_pdf(file_content, filename, self.slice_pages)
+
+        try:
+            if slices:
+                coro = self._convert_slices(slices, data, ocr_mode)
+            else:
+                coro = self._post_with_retry(
+                    filename, file_content, mime_type, data, ocr_mode
+                )
+            return self._run(coro)
+        except _ServerUnavailableError as e:
+            logger.info(
+                "docling-serve unavailable, falling back to local Docling: %s", e
+            )
+            return _convert_with_local_docling(
+                file_content=file_content,
+                filename=filename,
+                mime_type=mime_type,
+                from_formats=from_formats,
+                do_ocr=do_ocr,
+                force_ocr=force_ocr,
+                ocr_engine=ocr_engine,
+                ocr_langs=[ocr_langs] if isinstance(ocr_langs, str) else ocr_langs,
+            )
+
+    def _run(self, coro):
+        """Run ``coro`` on the shared I/O loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, _io_loop()).result()
+
+    async def _convert_slices(
+        self, slices: list["_Slice"], data: dict, ocr_mode: str
+    ) -> DoclingServeResult:
+        tasks = [
+            asyncio.ensure_future(
+                self._post_with_retry(
+                    s.filename,
+                    s.content,
+                    "application/pdf",
+                    data,
+                    ocr_mode,
+                    allow_empty=True,
+                )
+            )
+            for s in slices
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # One slice is out of retries (or the server is gone): the
+            # document cannot be completed, so stop the others.
+            for task in tasks:
+                task.cancel()
+            raise
+
+        text = "\n\n".join(r.text for r in results if r.text).strip()
+        if not text:
+            raise DoclingServeError(
+                "Could not extract Markdown from any page of the document",
+                endpoint=f"{self.base_url}/v1/convert/file",
+                filename=slices[0].filename,
+                ocr_mode=ocr_mode,
+            )
+        return DoclingServeResult(
+            text=text,
+            raw_response={
+                "page_count": slices[-1].last_page,
+                "slices": [
+                    {"pages": [s.first_page, s.last_page], "response": r.raw_response}
+                    for s, r in zip(slices, results)
+                ],
+            },
+            warnings=[w for r in results for w in r.warnings],
+            page_ranges=[(s.first_page, s.last_page) for s in slices],
+        )
+
+    async def _post_with_retry(
+        self,
+        filename: str,
+        content: bytes,
+        mime_type: str,
+        data: dict,
+        ocr_mode: str,
+        *,
+        allow_empty: bool = False,
+    ) -> DoclingServeResult:
+        """Post one file (or slice), retrying with backoff.
+
+        The per-server semaphore is held only while a request is open, not
+        during backoff. With ``allow_empty`` a response without Markdown is a
+        valid empty result instead of an error.
+        """
+        endpoint = f"{self.base_url}/v1/convert/file"
+        files = {"files": (filename, content, mime_type)}
         last_error: DoclingServeError | None = None
 
         for attempt in range(self.max_retries + 1):
             try:
                 logger.debug(
-                    "Calling docling-serve: %s (attempt %d/%d, OCR=%s, force=%s)",
+                    "Calling docling-serve: %s for %s (attempt %d/%d, %s)",
                     endpoint,
+                    filename,
                     attempt + 1,
                     self.max_retries + 1,
-                    do_ocr,
-                    force_ocr,
+                    ocr_mode,
                 )
 
-                response = self._client.post(endpoint, files=files, data=data)
+                async with _server_limit(self.base_url, self.max_concurrent_requests):
+                    response = await self._client.post(endpoint, files=files, data=data)
 
                 if response.status_code != 200:
                     raise DoclingServeError(
@@ -281,18 +459,21 @@ class DoclingServeClient:
                         response_body=response.text[:500],
                         endpoint=endpoint,
                         filename=filename,
-                        ocr_mode=f"do_ocr={do_ocr}, force_ocr={force_ocr}",
+                        ocr_mode=ocr_mode,
                     )
 
                 response_json = response.json()
-                text = _extract_markdown(response_json)
-
-                warnings = _extract_warnings(response_json)
+                try:
+                    text = _extract_markdown(response_json)
+                except DoclingServeError:
+                    if not allow_empty:
+                        raise
+                    text = ""
 
                 return DoclingServeResult(
                     text=text,
                     raw_response=response_json,
-                    warnings=warnings,
+                    warnings=_extract_warnings(response_json),
                 )
 
             except httpx.TimeoutException as e:
@@ -300,7 +481,7 @@ class DoclingServeClient:
                     f"docling-serve request timed out after {self.timeout_seconds}s",
                     endpoint=endpoint,
                     filename=filename,
-                    ocr_mode=f"do_ocr={do_ocr}, force_ocr={force_ocr}",
+                    ocr_mode=ocr_mode,
                 )
                 logger.warning("docling-serve timeout: %s", e)
 
@@ -310,30 +491,14 @@ class DoclingServeClient:
                 from ..core.config import settings
 
                 if settings.DOCLING_LOCAL_FALLBACK:
-                    logger.info(
-                        "docling-serve unavailable, falling back to local Docling: %s",
-                        e,
-                    )
-                    return _convert_with_local_docling(
-                        file_content=file_content,
-                        filename=filename,
-                        mime_type=mime_type,
-                        from_formats=from_formats,
-                        do_ocr=do_ocr,
-                        force_ocr=force_ocr,
-                        ocr_engine=ocr_engine,
-                        ocr_langs=[ocr_langs]
-                        if isinstance(ocr_langs, str)
-                        else ocr_langs,
-                    )
-                else:
-                    last_error = DoclingServeError(
-                        f"docling-serve request failed: {e}",
-                        endpoint=endpoint,
-                        filename=filename,
-                        ocr_mode=f"do_ocr={do_ocr}, force_ocr={force_ocr}",
-                    )
-                    logger.warning("docling-serve request error: %s", e)
+                    raise _ServerUnavailableError(str(e)) from e
+                last_error = DoclingServeError(
+                    f"docling-serve request failed: {e}",
+                    endpoint=endpoint,
+                    filename=filename,
+                    ocr_mode=ocr_mode,
+                )
+                logger.warning("docling-serve request error: %s", e)
 
             except DoclingServeError as e:
                 last_error = e
@@ -342,20 +507,18 @@ class DoclingServeClient:
             # Backoff before the next attempt (skip on the last try). Matches
             # the mistral/vision OCR retry pattern so a transient docling-serve
             # failure isn't hammered immediately. The local-fallback branch
-            # above returns early, so we only reach here for retryable errors.
+            # above raises, so we only reach here for retryable errors.
             if attempt < self.max_retries:
-                import random
-                import time
-
                 delay = self.base_retry_delay * (self.retry_backoff**attempt)
                 jitter = random.uniform(0, delay * 0.1)  # 10% jitter
                 logger.warning(
-                    "docling-serve retrying in %.1fs (attempt %d/%d)",
+                    "docling-serve retrying %s in %.1fs (attempt %d/%d)",
+                    filename,
                     delay + jitter,
                     attempt + 2,
                     self.max_retries + 1,
                 )
-                time.sleep(delay + jitter)
+                await asyncio.sleep(delay + jitter)
 
         # All retries exhausted
         raise last_error or DoclingServeError(
@@ -366,7 +529,7 @@ class DoclingServeClient:
 
     def close(self):
         """Close the HTTP client."""
-        self._client.close()
+        self._run(self._client.aclose())
 
     def __enter__(self):
         return self
@@ -375,6 +538,45 @@ class DoclingServeClient:
         self.close()
 
 
+def _split_pdf(content: bytes, filename: str, slice_pages: int) -> list[_Slice] | None:
+    """Split a PDF into slices of ``slice_pages`` pages.
+
+    Returns None when the PDF is short enough to send whole, or when pypdf
+    cannot read it (encrypted or damaged files go to docling-serve unsplit,
+    which reports its own error).
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    try:
+        reader = PdfReader(io.BytesIO(content))
+        if reader.is_encrypted:
+            return None
+        page_count = len(reader.pages)
+        if page_count <= slice_pages:
+            return None
+        name = PurePath(filename)
+        slices: list[_Slice] = []
+        for start in range(0, page_count, slice_pages):
+            end = min(start + slice_pages, page_count)
+            writer = PdfWriter()
+            for index in range(start, end):
+                writer.add_page(reader.pages[index])
+            buf = io.BytesIO()
+            writer.write(buf)
+            slices.append(
+                _Slice(
+                    first_page=start + 1,
+                    last_page=end,
+                    filename=f"{name.stem}.p{start + 1}-{end}{name.suffix or '.pdf'}",
+                    content=buf.getvalue(),
+                )
+            )
+    except Exception as e:
+        logger.warning("Could not split %s into page ranges: %s", filename, e)
+        return None
+    return slices
+
+
 def _convert_with_local_docling(
     file_content: bytes,
     filename: str,
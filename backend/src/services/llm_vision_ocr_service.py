@@ -17,6 +17,8 @@ import httpx2
 from openai import OpenAI
 
 from ..core.config import settings
+from ..utils.document_prompt import estimate_tokens
+from ..utils.fair_scheduler import llm_slot_sync
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +50,10 @@ class LLMVisionOCRService:
     # HTTP status codes that should trigger a retry
     RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
+    # Rough prompt tokens of one page image, charged to the endpoint's token
+    # budget until the response reports the real usage.
+    IMAGE_TOKEN_ESTIMATE = 1000
+
     def __init__(
         self,
         api_key: str,
@@ -78,6 +84,7 @@ class LLMVisionOCRService:
                 timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS,
             ),
         )
+        self.base_url = base_url
         self.model = model
         self.prompt = prompt or self.DEFAULT_PROMPT
         self.max_image_dim = max_image_dim
@@ -362,22 +369,32 @@ class LLMVisionOCRService:
             assert (
                 self.client is not None
             )  # constructed in __init__; closed only after use
-            return self.client.chat.completions.create(
+            # Each attempt takes its own slot of the endpoint's shared limits
+            # (utils/endpoint_limits.py), queued with the trials using it.
+            with llm_slot_sync(
+                self.base_url,
+                "ocr",
                 model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": self.prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": data_url},
-                            },
-                        ],
-                    }
-                ],
-                max_tokens=4096,
-            )
+                tokens=estimate_tokens(self.prompt) + self.IMAGE_TOKEN_ESTIMATE,
+            ) as slot:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": self.prompt},
+                                {
+                                    "type": "image_url",
+                                    "image_url": {"url": data_url},
+                                },
+                            ],
+                        }
+                    ],
+                    max_tokens=4096,
+                )
+                slot.record(response)
+                return response
 
         try:
             response = self._execute_with_retry(
@@ -1,8 +1,28 @@
 # backend/src/services/mistral_ocr_service.py
-"""Mistral OCR service for document text extraction with retry logic."""
-
+"""Mistral OCR service for document text extraction with retry logic.
+
+Design notes:
+
+* One SDK client per (API key, server URL, timeout) is kept for the life of
+  the worker process (``_shared_client``) and reused by every file, so a file
+  no longer pays for three client constructions and their connection setup.
+  The cache is small and per process (rebuilt after a fork).
+* ``process`` OCRs one document (upload, signed URL, ``ocr.process``).
+  ``process_batch`` OCRs many through Mistral's batch job interface: it
+  uploads each document, submits one ``/v1/ocr`` batch job whose requests
+  carry the documents' signed URLs, polls the job and reads the results from
+  its output file. Per-document failures come back as ``MistralOCRError``
+  values so the caller can retry just those documents one by one.
+"""
+
+import json
 import logging
+import os
+import random
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 
 from mistralai.client import Mistral
@@ -11,6 +31,40 @@ from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Distinct credentials a worker process keeps clients for (per-task API keys
+# can differ); the least recently used client is closed beyond this.
+_MAX_SHARED_CLIENTS = 8
+_shared_clients: OrderedDict[tuple, Mistral] = OrderedDict()
+_shared_clients_pid: int | None = None
+_shared_clients_lock = threading.Lock()
+
+# Batch job states after which polling stops.
+_BATCH_TERMINAL = {"SUCCESS", "FAILED", "TIMEOUT_EXCEEDED", "CANCELLED"}
+
+
+def _shared_client(api_key: str, server_url: str, timeout_ms: int) -> Mistral:
+    global _shared_clients_pid
+    key = (api_key, server_url, timeout_ms)
+    with _shared_clients_lock:
+        if _shared_clients_pid != os.getpid():
+            # Connections inherited across a fork are not ours to reuse.
+            _shared_clients.clear()
+            _shared_clients_pid = os.getpid()
+        client = _shared_clients.get(key)
+        if client is None:
+            client = Mistral(
+                api_key=api_key, server_url=server_url, timeout_ms=timeout_ms
+            )
+            _shared_clients[key] = client
+            while len(_shared_clients) > _MAX_SHARED_CLIENTS:
+                _, evicted = _shared_clients.popitem(last=False)
+                try:
+                    evicted.__exit__(None, None, None)
+                except Exception:
+                    logger.debug("Error closing Mistral client", exc_info=True)
+        _shared_clients.move_to_end(key)
+        return client
+
 
 class MistralOCRError(Exception):
     """Raised when Mistral OCR processing fails."""
@@ -22,6 +76,22 @@ class MistralOCRResult:
     pages: list[str] = field(default_factory=list)
 
 
+def _result_from_pages(pages, markdown) -> MistralOCRResult:
+    """Concatenate page Markdown (``pages`` holds each page's Markdown or None)."""
+    all_text = ""
+    collected = []
+    if pages:
+        for page_markdown in pages:
+            page_text = page_markdown or ""
+            collected.append(page_text)
+            all_text += page_text + "\n\n"
+    else:
+        # Some responses return a single markdown field
+        all_text = markdown or ""
+
+    return MistralOCRResult(text=all_text.strip(), pages=[p for p in collected if p])
+
+
 class MistralOCRService:
     """Service that sends documents to Mistral OCR API and returns markdown.
 
@@ -111,8 +181,6 @@ class MistralOCRService:
 
                 # Calculate delay with exponential backoff + jitter
                 delay = self.base_retry_delay * (self.retry_backoff**attempt)
-                import random
-
                 jitter = random.uniform(0, delay * 0.1)  # 10% jitter
 
                 logger.warning(
@@ -130,106 +198,218 @@ class MistralOCRService:
             f"{operation_name} failed after {self.max_retries} retries: {last_exception}"
         )
 
-    def process(self, file_content: bytes) -> MistralOCRResult:
-        """Send file content to Mistral OCR API and return concatenated markdown.
+    def _client(self) -> Mistral:
+        return _shared_client(
+            self.api_key,
+            self.server_url,
+            settings.LLM_REQUEST_TIMEOUT_SECONDS * 1000,
+        )
 
-        Includes retry logic for transient errors.
-        """
-        # Detect document type from content bytes
-        document_type: str
+    @staticmethod
+    def _document_type(file_content: bytes) -> str:
+        """``"pdf"`` or ``"image"``, detected from the content bytes."""
         try:
             import magic
 
             mime_type = magic.from_buffer(file_content, mime=True)
             if mime_type == "application/pdf":
-                document_type = "pdf"
+                return "pdf"
             elif mime_type.startswith("image/"):
-                document_type = "image"
+                return "image"
             else:
                 raise MistralOCRError(f"Unsupported file type: {mime_type}")
         except ImportError:
             # Fallback: detect by file signature bytes
             if file_content[:4] == b"%PDF":
-                document_type = "pdf"
+                return "pdf"
             elif file_content[:8] == b"\x89PNG\r\n\x1a\n" or file_content[:2] in (
                 b"\xff\xd8",
                 b"BM",
             ):
-                document_type = "image"
+                return "image"
             else:
-                document_type = "pdf"
-
-        # Helper functions for each API call
-        def upload_document():
-            with Mistral(
-                api_key=self.api_key,
-                server_url=self.server_url,
-                timeout_ms=settings.LLM_REQUEST_TIMEOUT_SECONDS * 1000,
-            ) as mistral:
-                return mistral.files.upload(
+                return "pdf"
+
+    def _upload(self, file_content: bytes) -> str:
+        """Upload a document and return a signed URL Mistral can read it from."""
+        mistral = self._client()
+        document_type = self._document_type(file_content)
+
+        # Execute upload with retry
+        try:
+            uploaded_pdf = self._execute_with_retry(
+                lambda: mistral.files.upload(
                     file={
                         "file_name": f"document.{document_type}",
                         "content": file_content,
                     },
                     purpose="ocr",
-                )
-
-        def get_signed_url(file_id: str):
-            with Mistral(
-                api_key=self.api_key,
-                server_url=self.server_url,
-                timeout_ms=settings.LLM_REQUEST_TIMEOUT_SECONDS * 1000,
-            ) as mistral:
-                return mistral.files.get_signed_url(file_id=file_id)
-
-        def process_ocr(document_url: str):
-            with Mistral(
-                api_key=self.api_key,
-                server_url=self.server_url,
-                timeout_ms=settings.LLM_REQUEST_TIMEOUT_SECONDS * 1000,
-            ) as mistral:
-                return mistral.ocr.process(
-                    model=self.model,
-                    document={
-                        "type": "document_url",
-                        "document_url": document_url,
-                    },
-                )
-
-        # Execute upload with retry
-        try:
-            uploaded_pdf = self._execute_with_retry(upload_document, "Document upload")
+                ),
+                "Document upload",
+            )
         except MistralOCRError as e:
             raise MistralOCRError(f"Failed to upload document: {e}")
 
         # Execute signed URL request with retry
         try:
             signed_url = self._execute_with_retry(
-                lambda: get_signed_url(uploaded_pdf.id),
+                lambda: mistral.files.get_signed_url(file_id=uploaded_pdf.id),
                 "Signed URL request",
             )
         except MistralOCRError as e:
             raise MistralOCRError(f"Failed to get signed URL: {e}")
+        return signed_url.url
+
+    def process(self, file_content: bytes) -> MistralOCRResult:
+        """Send file content to Mistral OCR API and return concatenated markdown.
+
+        Includes retry logic for transient errors.
+        """
+        document_url = self._upload(file_content)
+        mistral = self._client()
 
         # Execute OCR processing with retry
         try:
             ocr_response = self._execute_with_retry(
-                lambda: process_ocr(signed_url.url),
+                lambda: mistral.ocr.process(
+                    model=self.model,
+                    document={
+                        "type": "document_url",
+                        "document_url": document_url,
+                    },
+                ),
                 "OCR processing",
             )
         except MistralOCRError as e:
             raise MistralOCRError(f"Mistral OCR processing failed: {e}")
 
-        # Concatenate markdown from all pages
-        all_text = ""
-        pages = []
-        if ocr_response.pages:
-            for page in ocr_response.pages:
-                page_text = page.markdown or ""
-                pages.append(page_text)
-                all_text += page_text + "\n\n"
-        else:
-            # Some responses return a single markdown field
-            all_text = getattr(ocr_response, "markdown", "") or ""
-
-        return MistralOCRResult(text=all_text.strip(), pages=[p for p in pages if p])
+        return _result_from_pages(
+            [page.markdown for page in ocr_response.pages or ()],
+            getattr(ocr_response, "markdown", None),
+        )
+
+    def process_batch(
+        self,
+        documents: Iterable[tuple[str, bytes]],
+        *,
+        poll_interval: float = 10.0,
+        timeout: float = 1800.0,
+        should_cancel: Callable[[], bool] | None = None,
+    ) -> dict[str, MistralOCRResult | MistralOCRError]:
+        """OCR ``(key, content)`` documents through one Mistral batch job.
+
+        ``documents`` is consumed lazily, so each document's bytes can be
+        released once it is uploaded. Returns a result or a
+        ``MistralOCRError`` per key; a document that could not be uploaded is
+        reported the same way and left out of the job.
+
+        Raises:
+            MistralOCRError: If the job cannot be created, fails as a whole,
+                runs past ``timeout`` or ``should_cancel()`` turns true. The
+                job is cancelled in the last two cases.
+        """
+        results: dict[str, MistralOCRResult | MistralOCRError] = {}
+        requests = []
+        for key, content in documents:
+            try:
+                document_url = self._upload(content)
+            except MistralOCRError as e:
+                results[key] = e
+                continue
+            requests.append(
+                {
+                    "custom_id": key,
+                    "body": {
+                        "document": {
+                            "type": "document_url",
+                            "document_url": document_url,
+                        }
+                    },
+                }
+            )
+        if not requests:
+            return results
+
+        mistral = self._client()
+        job = self._execute_with_retry(
+            lambda: mistral.batch.jobs.create(
+                endpoint="/v1/ocr",
+                model=self.model,
+                requests=requests,
+                metadata={"source": "llmaixweb"},
+            ),
+            "Batch job creation",
+        )
+        logger.info(
+            "Mistral OCR batch job %s submitted with %d document(s)",
+            job.id,
+            len(requests),
+        )
+
+        deadline = time.monotonic() + timeout
+        while job.status not in _BATCH_TERMINAL:
+            if should_cancel is not None and should_cancel():
+                self._cancel_batch(job.id)
+                raise MistralOCRError(f"Batch job {job.id} cancelled")
+            if time.monotonic() >= deadline:
+                self._cancel_batch(job.id)
+                raise MistralOCRError(
+                    f"Batch job {job.id} did not finish within {timeout:.0f}s"
+                )
+            time.sleep(poll_interval)
+            job = self._execute_with_retry(
+                lambda: mistral.batch.jobs.get(job_id=job.id), "Batch job status"
+            )
+
+        if job.status != "SUCCESS" and not job.output_file:
+            raise MistralOCRError(f"Batch job {job.id} ended as {job.status}")
+
+        for line in self._batch_file_lines(job.output_file):
+            key = line.get("custom_id")
+            response = line.get("response") or {}
+            body = response.get("body") or {}
+            if response.get("status_code") == 200 and not line.get("error"):
+                results[key] = _result_from_pages(
+                    [page.get("markdown") for page in body.get("pages") or ()],
+                    body.get("markdown"),
+                )
+            else:
+                results[key] = MistralOCRError(
+                    f"Mistral OCR processing failed: "
+                    f"{line.get('error') or body or response.get('status_code')}"
+                )
+        for line in self._batch_file_lines(job.error_file):
+            key = line.get("custom_id")
+            if key not in results:
+                results[key] = MistralOCRError(
+                    f"Mistral OCR processing failed: {line.get('error') or line}"
+                )
+        for request in requests:
+            results.setdefault(
+                request["custom_id"],
+                MistralOCRError(f"Batch job {job.id} returned no result"),
+            )
+        return results
+
+    def _batch_file_lines(self, file_id: str | None) -> list[dict]:
+        if not file_id:
+            return []
+        mistral = self._client()
+
+        def download() -> bytes:
+            # files.download returns a streamed response: read the body
+            # before it is closed (``.text`` on it raises ResponseNotRead).
+            response = mistral.files.download(file_id=file_id)
+            try:
+                return response.read()
+            finally:
+                response.close()
+
+        body = self._execute_with_retry(download, "Batch result download")
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+
+    def _cancel_batch(self, job_id: str) -> None:
+        try:
+            self._client().batch.jobs.cancel(job_id=job_id)
+        except Exception as e:
+            logger.warning("Could not cancel Mistral batch job %s: %s", job_id, e)
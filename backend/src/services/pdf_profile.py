@@ -0,0 +1,158 @@
+# backend/src/services/pdf_profile.py
+"""One-pass PDF inspection for preprocessing routing.
+
+``_process_pdf`` used to open a PDF several times before any conversion
+started: pypdf for the encryption check, pypdf again for each embedded-text
+probe, and the storage backend was asked for the bytes on every branch. For a
+large scan each pass re-parsed the whole cross-reference table. ``inspect_pdf``
+opens the document once with PyMuPDF and records everything routing needs in
+a :class:`PdfProfile`.
+
+Design notes:
+
+* Geometry (size, rotation) is read for every page; text and image coverage
+  only for the pages the embedded-text probe samples
+  (``_get_text_probe_page_indices``, the same evenly spaced pages as before),
+  so inspection stays cheap for thousand-page scans.
+* ``encrypted`` matches what pypdf's ``is_encrypted`` reported: any PDF with
+  an encryption dictionary, including owner-password-only files that open
+  without a password. ``needs_password`` is the narrower "cannot be read".
+* Embedded-text detection applies ``_has_useful_text`` to the sampled pages'
+  text, so thresholds behave as in ``pdf_text_probe.has_embedded_text``.
+  PyMuPDF and pypdf extract slightly different text; the threshold is coarse
+  enough that this does not change routing for real documents.
+* Never raises: bytes PyMuPDF cannot open give an unreadable profile with no
+  pages and no embedded text, which routes like before (straight to OCR).
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+import pymupdf
+
+from .pdf_text_probe import _get_text_probe_page_indices, _has_useful_text
+
+logger = logging.getLogger(__name__)
+
+# PDF user space units per inch.
+_POINTS_PER_INCH = 72.0
+
+
+@dataclass(frozen=True)
+class PdfPageProfile:
+    """One page. ``text``/``text_chars``/``image_coverage`` are None unless
+    the page was sampled."""
+
+    index: int
+    width: float
+    height: float
+    rotation: int
+    text: str | None = None
+    image_coverage: float | None = None
+
+    @property
+    def text_chars(self) -> int | None:
+        return None if self.text is None else len(self.text.strip())
+
+    @property
+    def text_density(self) -> float | None:
+        """Embedded-text characters per square inch of page."""
+        if self.text is None:
+            return None
+        area = (self.width / _POINTS_PER_INCH) * (self.height / _POINTS_PER_INCH)
+        return self.text_chars / area if area > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class PdfProfile:
+    readable: bool
+    encrypted: bool = False
+    needs_password: bool = False
+    page_count: int = 0
+    pages: tuple[PdfPageProfile, ...] = field(default_factory=tuple)
+
+    @property
+    def sampled_pages(self) -> list[PdfPageProfile]:
+        return [page for page in self.pages if page.text is not None]
+
+    def has_embedded_text(self, min_chars: int = 100) -> bool:
+        """Whether the sampled pages carry useful embedded text."""
+        return _has_useful_text(
+            "\n".join(page.text for page in self.sampled_pages if page.text),
+            min_chars=min_chars,
+        )
+
+    @property
+    def image_coverage(self) -> float:
+        """Mean image coverage of the sampled pages (0 when none sampled)."""
+        sampled = self.sampled_pages
+        if not sampled:
+            return 0.0
+        return sum(page.image_coverage or 0.0 for page in sampled) / len(sampled)
+
+
+def _image_coverage(page: "pymupdf.Page") -> float:
+    """Fraction of the page covered by placed images, capped at 1."""
+    rect = page.rect
+    area = rect.width * rect.height
+    if area <= 0:
+        return 0.0
+    covered = 0.0
+    for info in page.get_image_info():
+        clipped = pymupdf.Rect(info["bbox"]) & rect
+        if not clipped.is_empty:
+            covered += clipped.width * clipped.height
+    return min(1.0, covered / area)
+
+
+def inspect_pdf(file_content: bytes, *, max_pages_to_check: int = 8) -> PdfProfile:
+    """Open ``file_content`` once and profile it. Never raises."""
+    try:
+        doc = pymupdf.open(stream=file_content, filetype="pdf")
+    except Exception:
+        logger.warning("Failed to open PDF for inspection", exc_info=True)
+        return PdfProfile(readable=False)
+
+    with doc:
+        if doc.needs_pass:
+            return PdfProfile(
+                readable=True,
+                encrypted=True,
+                needs_password=True,
+                page_count=doc.page_count,
+            )
+        encrypted = bool((doc.metadata or {}).get("encryption"))
+        sampled = set(
+            _get_text_probe_page_indices(
+                num_pages=doc.page_count, max_pages_to_check=max_pages_to_check
+            )
+        )
+        pages = []
+        for index in range(doc.page_count):
+            try:
+                page = doc.load_page(index)
+                text = coverage = None
+                if index in sampled:
+                    try:
+                        text = page.get_text()
+                        coverage = _image_coverage(page)
+                    except Exception:
+                        text, coverage = "", 0.0
+                pages.append(
+                    PdfPageProfile(
+                        index=index,
+                        width=page.rect.width,
+                        height=page.rect.height,
+                        rotation=page.rotation,
+                        text=text,
+                        image_coverage=coverage,
+                    )
+                )
+            except Exception:
+                logger.debug("Could not inspect PDF page %d", index, exc_info=True)
+        return PdfProfile(
+            readable=True,
+            encrypted=encrypted,
+            page_count=doc.page_count,
+            pages=tuple(pages),
+        )
@@ -3,11 +3,19 @@
 
 Design choices:
 
-* **Independent session.** Each audit row is written in its own short-lived
-  session and committed immediately, so a later rollback of the business
-  transaction never discards the record, and an audit-write failure never rolls
-  back the caller's work. For mutations, call :func:`record_audit` *after* the
-  business commit so the trail reflects what actually persisted.
+* **Independent session.** Audit rows are written in their own short-lived
+  session, so a later rollback of the business transaction never discards the
+  record, and an audit-write failure never rolls back the caller's work. For
+  mutations, call :func:`record_audit` *after* the business commit so the trail
+  reflects what actually persisted.
+* **Off the request path.** By default (``AUDIT_WRITE_MODE=async``) a row is
+  snapshotted — timestamp, request id and client IP included — and queued; a
+  background thread inserts queued rows in batches of ``AUDIT_BATCH_SIZE`` or
+  every ``AUDIT_FLUSH_INTERVAL_MS``. The queue is bounded
+  (``AUDIT_QUEUE_MAX_ROWS``); when it is full, ``AUDIT_OVERFLOW_POLICY`` either
+  blocks the caller until there is room or drops the row, and every dropped
+  row is counted. Queued rows are flushed synchronously at process exit.
+  ``AUDIT_WRITE_MODE=sync`` commits each row before returning (tests).
 * **Never raises.** Auditing is best-effort from the caller's perspective: a
   failure to write the trail is logged but does not break the request. (In a
   hardened deployment the mirror-to-SIEM option would catch these; see the
@@ -18,11 +26,14 @@ Design choices:
 
 from __future__ import annotations
 
+import atexit
 import logging
+import os
 import threading
 import time
-from collections import OrderedDict
-from typing import TYPE_CHECKING
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
 
 from ..db.session import SessionLocal
 from ..models.audit import AuditLog
@@ -55,7 +66,10 @@ def record_audit(
     try:
         actor_id = getattr(actor, "id", None)
         email = actor_email or getattr(actor, "email", None)
-        row = AuditLog(
+        # Column values rather than an AuditLog instance: the row may be
+        # inserted later on another thread, possibly retried on its own.
+        row = dict(
+            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
             actor_user_id=actor_id,
             actor_email=email,
             actor_ip=get_client_ip(),
@@ -67,9 +81,10 @@ def record_audit(
             detail=detail,
             request_id=get_request_id(),
         )
-        with SessionLocal() as db:
-            db.add(row)
-            db.commit()
+        if _writer_settings().AUDIT_WRITE_MODE == "sync":
+            _insert_rows([row])
+        else:
+            _writer.submit(row)
     except Exception:  # pragma: no cover - audit must never break a request
         logger.exception(
             "Failed to write audit log (action=%s, resource=%s:%s)",
@@ -79,6 +94,189 @@ def record_audit(
         )
 
 
+# ───────────────────────── Batched writer ─────────────────────────
+
+# How long a caller waits for queue space under the "block" policy before the
+# row is dropped anyway. Blocking forever would turn a database outage into
+# hung requests, which is worse than a counted gap in the trail.
+_BLOCK_TIMEOUT_SECONDS = 5.0
+
+
+def _writer_settings():
+    # Imported lazily: this module is imported while the app is still being
+    # assembled, before dynamic_settings should be touched.
+    from ..core.dynamic_settings import get_settings
+
+    return get_settings()
+
+
+def _insert_rows(rows: list[dict[str, Any]]) -> None:
+    """Insert audit rows in one transaction, falling back to one per row.
+
+    The fallback keeps a single bad row (e.g. a ``project_id`` whose project
+    was deleted meanwhile) from discarding the rest of its batch.
+    """
+    try:
+        with SessionLocal() as db:
+            db.add_all([AuditLog(**row) for row in rows])
+            db.commit()
+        return
+    except Exception:
+        if len(rows) == 1:
+            raise
+        logger.warning(
+            "Batched audit insert of %d rows failed; retrying row by row", len(rows)
+        )
+    for row in rows:
+        try:
+            with SessionLocal() as db:
+                db.add(AuditLog(**row))
+                db.commit()
+        except Exception:
+            logger.exception(
+                "Failed to write audit log (action=%s, resource=%s:%s)",
+                getattr(row["action"], "value", row["action"]),
+                row["resource_type"],
+                row["resource_id"],
+            )
+
+
+class _AuditWriter:
+    """Per-process audit queue drained by a daemon thread."""
+
+    def __init__(self) -> None:
+        self._pending: deque[dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, row: dict[str, Any]) -> None:
+        cfg = _writer_settings()
+        with self._cond:
+            self._ensure_thread()
+            if len(self._pending) >= cfg.AUDIT_QUEUE_MAX_ROWS:
+                deadline = time.monotonic() + _BLOCK_TIMEOUT_SECONDS
+                while (
+                    cfg.AUDIT_OVERFLOW_POLICY == "block"
+                    and len(self._pending) >= cfg.AUDIT_QUEUE_MAX_ROWS
+                    and (remaining := deadline - time.monotonic()) > 0
+                ):
+                    self._cond.wait(remaining)
+                if len(self._pending) >= cfg.AUDIT_QUEUE_MAX_ROWS:
+                    self.dropped += 1
+                    # Log the first drop and then every power of two, so an
+                    # overload is visible without one log line per request.
+                    if self.dropped & (self.dropped - 1) == 0:
+                        logger.error(
+                            "Audit queue full (%d rows); %d audit rows dropped "
+                            "so far in this process",
+                            len(self._pending),
+                            self.dropped,
+                        )
+                    return
+            self._pending.append(row)
+            if len(self._pending) >= cfg.AUDIT_BATCH_SIZE:
+                self._cond.notify_all()
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        """Block until a batch is due, then move it to in-flight."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            cfg = _writer_settings()
+            due = time.monotonic() + cfg.AUDIT_FLUSH_INTERVAL_MS / 1000
+            while (
+                0 < len(self._pending) < cfg.AUDIT_BATCH_SIZE
+                and (remaining := due - time.monotonic()) > 0
+            ):
+                self._cond.wait(remaining)
+            size = min(len(self._pending), cfg.AUDIT_BATCH_SIZE)
+            batch = [self._pending.popleft() for _ in range(size)]
+            self._in_flight += len(batch)
+            # Wake callers blocked on a full queue.
+            self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            try:
+                if batch:
+                    _insert_rows(batch)
+            except Exception:
+                logger.exception("Failed to write %d audit rows", len(batch))
+            finally:
+                with self._cond:
+                    self._in_flight -= len(batch)
+                    self._cond.notify_all()
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """Write everything queued so far, on the calling thread.
+
+        Also waits (up to ``timeout``) for a batch the writer thread is
+        currently inserting, so nothing recorded before the call is lost when
+        the process exits right after.
+        """
+        with self._cond:
+            rows = list(self._pending)
+            self._pending.clear()
+            self._cond.notify_all()
+        if rows:
+            try:
+                _insert_rows(rows)
+            except Exception:
+                logger.exception("Failed to flush %d audit rows", len(rows))
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._in_flight and (remaining := deadline - time.monotonic()) > 0:
+                self._cond.wait(remaining)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "pending": len(self._pending) + self._in_flight,
+                "dropped": self.dropped,
+            }
+
+    def _reset_after_fork(self) -> None:
+        # A forked child (Celery prefork) inherits the queue but not the
+        # thread; rows queued in the parent are the parent's to write.
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._thread = None
+        self.dropped = 0
+
+
+_writer = _AuditWriter()
+os.register_at_fork(after_in_child=_writer._reset_after_fork)
+atexit.register(_writer.flush)
+
+
+def flush_audit_queue(timeout: float = 10.0) -> None:
+    """Synchronously write all queued audit rows (shutdown, tests)."""
+    _writer.flush(timeout)
+
+
+def audit_writer_stats() -> dict[str, Any]:
+    """Queue depth and dropped-row count of this process's audit writer."""
+    cfg = _writer_settings()
+    return {
+        **_writer.stats(),
+        "mode": cfg.AUDIT_WRITE_MODE,
+        "overflow_policy": cfg.AUDIT_OVERFLOW_POLICY,
+        "queue_max_rows": cfg.AUDIT_QUEUE_MAX_ROWS,
+    }
+
+
 # ───────────────────────── Denied access ─────────────────────────
 #
 # Denials are the one audit event an unauthenticated-ish caller can trigger at
@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session
 
 from .. import models
 from ..models.project import document_set_association
+from . import document_stats, principal_cache
 
 
 def trials_referencing_docs(
@@ -77,7 +78,8 @@ def cascade_delete_trials(db: Session, trial_ids: list[int]) -> dict[str, int]:
     )
 
     # Evaluation-metric children are removed before their evaluations (the FK has
-    # no DB-level ON DELETE), then evaluations and trial results, then the trials.
+    # no DB-level ON DELETE), then evaluations, trial results and shards, then the
+    # trials.
     eval_ids = select(models.Evaluation.id).where(
         models.Evaluation.trial_id.in_(trial_ids)
     )
@@ -92,6 +94,9 @@ def cascade_delete_trials(db: Session, trial_ids: list[int]) -> dict[str, int]:
     db.execute(
         delete(models.TrialResult).where(models.TrialResult.trial_id.in_(trial_ids))
     )
+    db.execute(
+        delete(models.TrialShard).where(models.TrialShard.trial_id.in_(trial_ids))
+    )
     # Core-delete the trial rows (rather than ORM db.delete) so the ORM doesn't
     # re-run a delete-orphan cascade over the children we just bulk-deleted.
     db.execute(delete(models.Trial).where(models.Trial.id.in_(trial_ids)))
@@ -142,6 +147,7 @@ def cascade_clear_document_references(
     if not doc_ids:
         return counts
 
+    document_stats.mark_dirty(db, project_id)
     trial_ids = [tid for tid, _, _ in trials_referencing_docs(db, project_id, doc_ids)]
     counts.update(cascade_delete_trials(db, trial_ids))
 
@@ -275,6 +281,7 @@ def cascade_delete_project(db: Session, project_id: int) -> dict[str, int]:
     cross-project ``move_files`` chains) — without them the ``RESTRICT`` FKs
     would abort the document delete.
     """
+    document_stats.mark_dirty(db, project_id)
     trial_ids = (
         select(models.Trial.id)
         .where(models.Trial.project_id == project_id)
@@ -317,6 +324,14 @@ def cascade_delete_project(db: Session, project_id: int) -> dict[str, int]:
     )
 
     counts: dict[str, int] = {}
+    counts["evaluation_jobs"] = db.execute(
+        delete(models.EvaluationJob).where(
+            or_(
+                models.EvaluationJob.project_id == project_id,
+                models.EvaluationJob.groundtruth_id.in_(gt_ids),
+            )
+        )
+    ).rowcount
     counts["evaluation_metrics"] = db.execute(
         delete(models.EvaluationMetric).where(
             or_(
@@ -341,6 +356,9 @@ def cascade_delete_project(db: Session, project_id: int) -> dict[str, int]:
             )
         )
     ).rowcount
+    db.execute(
+        delete(models.TrialShard).where(models.TrialShard.trial_id.in_(trial_ids))
+    )
     counts["trials"] = db.execute(
         delete(models.Trial).where(models.Trial.project_id == project_id)
     ).rowcount
@@ -396,6 +414,14 @@ def cascade_delete_project(db: Session, project_id: int) -> dict[str, int]:
             models.PreprocessingConfiguration.project_id == project_id
         )
     ).rowcount
+    # A bulk delete skips the session hooks: drop the grantees' cached
+    # principals (and their grants) explicitly.
+    for user_id in db.scalars(
+        select(models.ProjectShare.user_id).where(
+            models.ProjectShare.project_id == project_id
+        )
+    ):
+        principal_cache.mark_dirty(db, user_id)
     counts["shares"] = db.execute(
         delete(models.ProjectShare).where(models.ProjectShare.project_id == project_id)
     ).rowcount
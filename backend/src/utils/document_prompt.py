@@ -0,0 +1,223 @@
+# backend/src/utils/document_prompt.py
+"""Prompt-ready document text, computed once per document.
+
+Every extraction request sends the document through :func:`sanitize_for_prompt`
+(NFC normalization plus several regex passes over the full text). That used to
+run on every request: again on a length retry, and again for every trial over
+the same document set. The result is now stored on the document when it is
+created or its text changes, and extraction reads it directly.
+
+Design notes:
+
+* ``Document.prompt_text`` holds the sanitized text only when it differs from
+  ``Document.text``; NULL means "same as ``text``", so clean documents (most
+  of them) are not stored twice. ``prompt_text_version`` records which
+  :data:`SANITIZER_VERSION` produced it, ``prompt_token_estimate`` a rough
+  token count for scheduling, and ``prompt_text_sha256`` the hash of the
+  prompt-ready text.
+* The ``before_flush`` hook below fills the columns for new documents and for
+  documents whose ``text`` changed, so every writer — the preprocessing
+  pipeline, combined and restored documents — is covered without calling it.
+* Bump :data:`SANITIZER_VERSION` whenever :func:`sanitize_for_prompt` changes
+  its output. Documents stamped with another version (or none, e.g. written
+  before these columns existed) are sanitized at read time until
+  ``python -m backend.scripts.backfill_prompt_text`` rewrites them.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from collections.abc import Iterator
+from itertools import chain
+
+from sqlalchemy import bindparam, event, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+#: Version of :func:`sanitize_for_prompt`'s output; stored with the text.
+SANITIZER_VERSION = 1
+
+# Keep only LF (\n). Excludes TAB (\t) and CR (\r) so they can be handled explicitly.
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
+
+# Unicode non-characters (optional but harmless)
+_NONCHAR_RE = re.compile(
+    r"[﷐-﷯￾￿"
+    r"\U0001FFFE-\U0001FFFF"
+    r"\U0002FFFE-\U0002FFFF"
+    r"\U0003FFFE-\U0003FFFF"
+    r"\U0004FFFE-\U0004FFFF"
+    r"\U0005FFFE-\U0005FFFF"
+    r"\U0006FFFE-\U0006FFFF"
+    r"\U0007FFFE-\U0007FFFF"
+    r"\U0008FFFE-\U0008FFFF"
+    r"\U0009FFFE-\U0009FFFF"
+    r"\U000AFFFE-\U000AFFFF"
+    r"\U000BFFFE-\U000BFFFF"
+    r"\U000CFFFE-\U000CFFFF"
+    r"\U000DFFFE-\U000DFFFF"
+    r"\U000EFFFE-\U000EFFFF"
+    r"\U0010FFFE-\U0010FFFF]"
+)
+
+
+def sanitize_for_prompt(text: str, *, collapse_space: bool = False) -> str:
+    """Hardened sanitizer to prevent raw control chars being copied into JSON."""
+    if text is None:
+        return ""
+
+    # Ensure it's valid Unicode
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", "replace")
+
+    # Normalize (composed form)
+    text = unicodedata.normalize("NFC", text)
+
+    # Normalize line endings and tabs *before* control filtering
+    text = text.replace("\r", "\n").replace("\t", "    ")
+
+    # Remove dangerous C0 controls except LF (\n)
+    text = _CONTROL_CHARS_RE.sub("", text)
+
+    # Strip Unicode non-characters
+    text = _NONCHAR_RE.sub("", text)
+
+    # (Optional) tame pathological whitespace
+    if collapse_space:
+        text = re.sub(r"\n{4,}", "\n\n\n", text)
+        text = re.sub(r"[ \t]{3,}", "  ", text)
+
+    return text
+
+
+def estimate_tokens(text: str) -> int:
+    """A rough, tokenizer-free token count: about four UTF-8 bytes per token."""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def prompt_fields(text: str | None) -> dict:
+    """The ``Document`` prompt columns for raw ``text``."""
+    clean = sanitize_for_prompt(text or "")
+    return {
+        "prompt_text": None if clean == text else clean,
+        "prompt_text_version": SANITIZER_VERSION,
+        "prompt_token_estimate": estimate_tokens(clean),
+        "prompt_text_sha256": hashlib.sha256(clean.encode("utf-8")).hexdigest(),
+    }
+
+
+def prompt_ready_text(
+    text: str | None, prompt_text: str | None, prompt_text_version: int | None
+) -> str:
+    """The sanitized text of a document, from its stored columns if current."""
+    if prompt_text_version == SANITIZER_VERSION:
+        return (text or "") if prompt_text is None else prompt_text
+    return sanitize_for_prompt(text or "")
+
+
+def load_prompt_text(session: Session, document_id: int) -> str | None:
+    """A document's prompt-ready text, or None if there is no such document.
+
+    A current document is read without loading ``text`` when its sanitized
+    copy is stored separately.
+    """
+    from ..models.project import Document
+
+    row = session.execute(
+        select(
+            Document.prompt_text_version,
+            Document.prompt_text,
+        ).where(Document.id == document_id)
+    ).first()
+    if row is None:
+        return None
+    version, prompt_text = row
+    if version == SANITIZER_VERSION and prompt_text is not None:
+        return prompt_text
+    text = session.scalar(select(Document.text).where(Document.id == document_id))
+    return prompt_ready_text(text, prompt_text, version)
+
+
+def _stale_batches(
+    session: Session, batch_size: int, project_id: int | None
+) -> Iterator[list]:
+    from ..models.project import Document
+
+    last_id = 0
+    while True:
+        query = (
+            select(Document.id, Document.text)
+            .where(
+                Document.id > last_id,
+                or_(
+                    Document.prompt_text_version.is_(None),
+                    Document.prompt_text_version != SANITIZER_VERSION,
+                ),
+            )
+            .order_by(Document.id)
+            .limit(batch_size)
+        )
+        if project_id is not None:
+            query = query.where(Document.project_id == project_id)
+        rows = session.execute(query).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def backfill_prompt_text(
+    session: Session, *, batch_size: int = 500, project_id: int | None = None
+) -> int:
+    """Compute the prompt columns of every document missing the current
+    version, ``batch_size`` documents per transaction. Returns the count.
+
+    ``updated_at`` is left as it was: the document itself did not change.
+    """
+    from ..models.project import Document
+
+    table = Document.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("doc_id"))
+        .values(
+            prompt_text=bindparam("prompt_text"),
+            prompt_text_version=bindparam("prompt_text_version"),
+            prompt_token_estimate=bindparam("prompt_token_estimate"),
+            prompt_text_sha256=bindparam("prompt_text_sha256"),
+            updated_at=table.c.updated_at,
+        )
+    )
+    done = 0
+    for rows in _stale_batches(session, batch_size, project_id):
+        session.execute(
+            statement,
+            [{"doc_id": row.id, **prompt_fields(row.text)} for row in rows],
+        )
+        session.commit()
+        done += len(rows)
+        logger.info("Prompt text backfill: %d documents updated", done)
+    return done
+
+
+# ───────────────────────── session hook ──────────────────────────
+@event.listens_for(Session, "before_flush")
+def _fill_prompt_text(session, flush_context, instances) -> None:
+    from ..models.project import Document
+
+    # Dirty documents only when their text changed: reading the text of any
+    # other update would load a deferred column for nothing.
+    changed = chain(
+        (obj for obj in session.new if isinstance(obj, Document)),
+        (
+            obj
+            for obj in session.dirty
+            if isinstance(obj, Document)
+            and inspect(obj).attrs.text.history.has_changes()
+        ),
+    )
+    for obj in changed:
+        for name, value in prompt_fields(obj.text).items():
+            setattr(obj, name, value)
@@ -0,0 +1,209 @@
+# backend/src/utils/document_stats.py
+"""Per-project cache for the document list's count/stats block.
+
+``GET /project/{id}/document`` runs an exact ``COUNT`` plus three date-bucket
+counts on every page, and the frontend polls that list while a preprocessing
+run is in flight. Those numbers only change when a document is created,
+archived, deleted or moved between document sets, so they are cached per
+project and per filter combination (OCR engine, document set, archived
+versions, …) and dropped when the project's documents change.
+
+Design notes:
+
+* Invalidation is generational. Each project has a counter; a cache entry is
+  stored under the generation that was current *before* its counts were read.
+  Bumping the counter orphans every entry of the project at once — there is no
+  key scan — and a reader racing a commit can only ever write its (possibly
+  stale) result under the old generation, which nobody reads again.
+* The counter is bumped *after* the writing transaction commits, not when the
+  change is made: bumping first would let a concurrent reader re-cache the
+  pre-commit counts under the new generation. ORM changes to ``Document`` and
+  ``DocumentSet`` rows are picked up automatically by the session hooks below
+  (covering the preprocessing pipeline and most endpoints); code that changes
+  documents with bulk statements calls :func:`mark_dirty` itself.
+* Redis (the broker) holds generations and entries so web replicas and Celery
+  workers agree. Without Redis an in-process store is used, which is only
+  coherent for single-process deployments — the same ones that run without a
+  broker in the first place. A Redis error on read means "no cache", never a
+  stale answer.
+* Entries also expire after ``DOCUMENT_STATS_CACHE_TTL_SECONDS`` because the
+  today/week/month buckets move with the clock, not with writes. ``0``
+  disables the cache.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .redis_broadcast import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "docstats:"
+
+# Session.info key holding the project ids whose documents the pending
+# transaction touched.
+_DIRTY_KEY = "document_stats_dirty"
+
+# In-process fallback store. Bounded so a long-running single-node deployment
+# with many projects and filter combinations can't grow it without limit.
+_LOCAL_MAX_ENTRIES = 4096
+_local_generations: dict[int, int] = {}
+_local_entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _ttl() -> int:
+    # Imported lazily: this module is imported by db/session.py, and pulling in
+    # dynamic_settings at import time would create the engine a second way.
+    from ..core.dynamic_settings import get_settings
+
+    return max(0, int(get_settings().DOCUMENT_STATS_CACHE_TTL_SECONDS))
+
+
+def _generation_key(project_id: int) -> str:
+    return f"{_KEY_PREFIX}gen:{project_id}"
+
+
+def _entry_key(project_id: int, generation: int, filters: dict[str, Any]) -> str:
+    digest = hashlib.sha256(
+        json.dumps(filters, sort_keys=True, default=str).encode()
+    ).hexdigest()[:32]
+    return f"{_KEY_PREFIX}{project_id}:{generation}:{digest}"
+
+
+def lookup(
+    project_id: int, filters: dict[str, Any]
+) -> tuple[int | None, dict[str, Any] | None]:
+    """Return ``(generation, cached_stats)`` for a project + filter set.
+
+    ``generation`` must be passed back to :func:`store` after computing the
+    stats on a miss. It is None when the cache is disabled or unreadable, in
+    which case the caller should compute without storing.
+    """
+    ttl = _ttl()
+    if ttl <= 0:
+        return None, None
+
+    client = get_redis_client()
+    if client is not None:
+        try:
+            generation = int(client.get(_generation_key(project_id)) or 0)
+            raw = client.get(_entry_key(project_id, generation, filters))
+            return generation, (json.loads(raw) if raw else None)
+        except Exception as e:
+            logger.debug("Document stats cache read failed: %s", e)
+            return None, None
+
+    now = time.monotonic()
+    with _local_lock:
+        generation = _local_generations.get(project_id, 0)
+        key = _entry_key(project_id, generation, filters)
+        hit = _local_entries.get(key)
+        if hit is None:
+            return generation, None
+        expires_at, stats = hit
+        if expires_at <= now:
+            _local_entries.pop(key, None)
+            return generation, None
+        _local_entries.move_to_end(key)
+        return generation, dict(stats)
+
+
+def store(
+    project_id: int,
+    generation: int | None,
+    filters: dict[str, Any],
+    stats: dict[str, Any],
+) -> dict[str, Any]:
+    """Cache freshly computed ``stats`` and return them with ``computed_at``.
+
+    ``computed_at`` (ISO-8601, UTC) is added here so callers can surface how
+    fresh a cached answer is. A ``generation`` of None skips the write.
+    """
+    entry = {
+        **stats,
+        "computed_at": datetime.datetime.now(datetime.UTC).isoformat(),
+    }
+    if generation is None:
+        return entry
+    ttl = _ttl()
+    if ttl <= 0:
+        return entry
+
+    key = _entry_key(project_id, generation, filters)
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.setex(key, ttl, json.dumps(entry))
+        except Exception as e:
+            logger.debug("Document stats cache write failed: %s", e)
+        return entry
+
+    with _local_lock:
+        _local_entries[key] = (time.monotonic() + ttl, entry)
+        _local_entries.move_to_end(key)
+        while len(_local_entries) > _LOCAL_MAX_ENTRIES:
+            _local_entries.popitem(last=False)
+    return entry
+
+
+def invalidate(project_id: int) -> None:
+    """Drop every cached stats entry of a project. Best-effort; never raises."""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.incr(_generation_key(project_id))
+            return
+        except Exception as e:
+            logger.debug(
+                "Could not invalidate document stats for project %s: %s",
+                project_id,
+                e,
+            )
+    with _local_lock:
+        _local_generations[project_id] = _local_generations.get(project_id, 0) + 1
+
+
+def mark_dirty(db: Session, project_id: int | None) -> None:
+    """Invalidate a project's stats once ``db``'s transaction commits.
+
+    Needed only for bulk statements (``delete(Document)``, inserts into the
+    document-set association table) — ORM changes are tracked automatically.
+    """
+    if project_id is not None:
+        db.info.setdefault(_DIRTY_KEY, set()).add(project_id)
+
+
+# ───────────────────────── session hooks ──────────────────────────
+@event.listens_for(Session, "before_flush")
+def _track_document_changes(session, flush_context, instances) -> None:
+    from ..models.project import Document, DocumentSet
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Document, DocumentSet)):
+            mark_dirty(session, obj.project_id)
+            # A document moved to another project (files.move_files) changes
+            # the counts of the project it left as well.
+            for previous in inspect(obj).attrs.project_id.history.deleted or ():
+                mark_dirty(session, previous)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session) -> None:
+    for project_id in session.info.pop(_DIRTY_KEY, ()):
+        invalidate(project_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,266 @@
+# backend/src/utils/endpoint_limits.py
+"""Request, token and concurrency limits per LLM endpoint and model.
+
+Each trial shard and each vision OCR run bounds only its own concurrency, so
+ten trials pointed at one vLLM server sent it ten times the load it was tuned
+for, and timeouts cascaded. These limits apply to an endpoint (base URL and
+model) as a whole, across every worker. ``utils/fair_scheduler.py`` enforces
+them in :func:`~.fair_scheduler.llm_slot`: the in-flight cap is its fair
+gate, and the per-minute limits are the token buckets below.
+
+Design notes:
+
+* Limits come from settings, so admins change them at runtime like any other
+  setting: ``LLM_ENDPOINT_RPM``, ``LLM_ENDPOINT_TPM`` and
+  ``LLM_ENDPOINT_MAX_CONCURRENCY`` apply to every endpoint (0 = no limit), and
+  ``LLM_ENDPOINT_LIMITS`` overrides them per endpoint with a JSON object keyed
+  by ``"<base URL>"`` or ``"<base URL>|<model>"``.
+* Requests and tokens are token buckets holding one minute of budget, so a
+  quiet endpoint takes a burst of up to a minute's worth. A call is let
+  through while the budget is positive and is charged its full estimate, so a
+  large call cannot be starved by a stream of small ones; the budget may go
+  negative and later calls wait until it refills. Once the call returns, the
+  estimate is replaced by the tokens the endpoint actually reported.
+* The buckets live in Redis and are updated by a Lua script, with the Redis
+  clock, so workers share one budget. Without Redis the same buckets are kept
+  per process.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ..core.config import settings
+from .redis_broadcast import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = "ratelimit:llm:"
+# A bucket untouched for this long is full again anyway.
+_BUCKET_TTL_MS = 120_000
+
+# KEYS: one bucket hash (level, ts) per limit
+# ARGV: limit, cost for each key, in order
+_TAKE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local wait = 0
+local levels = {}
+for i = 1, #KEYS do
+  local limit = tonumber(ARGV[2 * i - 1])
+  local cost = tonumber(ARGV[2 * i])
+  local rate = limit / 60000
+  local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+  local level = tonumber(state[1]) or limit
+  local ts = tonumber(state[2]) or now
+  level = math.min(limit, level + math.max(0, now - ts) * rate)
+  local need = math.min(cost, 1)
+  if level < need then
+    wait = math.max(wait, (need - level) / rate)
+  end
+  levels[i] = level - cost
+end
+if wait == 0 then
+  for i = 1, #KEYS do
+    redis.call('HSET', KEYS[i], 'level', levels[i], 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], ARGV[#ARGV])
+  end
+end
+return tostring(wait)
+"""
+
+# KEYS: token bucket; ARGV: limit, tokens to charge (negative refunds), ttl
+_ADJUST_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'level', 'ts')
+local level = tonumber(state[1]) or limit
+local ts = tonumber(state[2]) or now
+level = math.min(limit, level + math.max(0, now - ts) * limit / 60000)
+redis.call('HSET', KEYS[1], 'level', math.min(limit, level - tonumber(ARGV[2])), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class EndpointLimits:
+    """Limits of one endpoint and model; 0 means unlimited."""
+
+    rpm: int = 0
+    tpm: int = 0
+    max_in_flight: int = 0
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+
+
+def normalize_url(base_url: str) -> str:
+    return base_url.strip().rstrip("/").lower()
+
+
+@lru_cache(maxsize=8)
+def _overrides(raw: str) -> dict[str, dict]:
+    if not raw.strip():
+        return {}
+    try:
+        parsed = json.loads(raw)
+        if not isinstance(parsed, dict):
+            raise ValueError("expected a JSON object")
+        return {
+            "|".join(
+                part.strip() if i else normalize_url(part)
+                for i, part in enumerate(str(key).split("|", 1))
+            ): dict(value)
+            for key, value in parsed.items()
+        }
+    except (TypeError, ValueError) as e:
+        logger.warning("Ignoring invalid LLM_ENDPOINT_LIMITS: %s", e)
+        return {}
+
+
+def endpoint_limits(base_url: str, model: str | None = None) -> EndpointLimits:
+    """The limits for ``model`` on ``base_url``: the most specific entry of
+    ``LLM_ENDPOINT_LIMITS``, falling back to the global settings."""
+    overrides = _overrides(settings.LLM_ENDPOINT_LIMITS or "")
+    url = normalize_url(base_url)
+    entry = overrides.get(f"{url}|{model}") or overrides.get(url) or {}
+
+    def limit(name: str, default: int) -> int:
+        try:
+            return max(0, int(entry.get(name, default) or 0))
+        except (TypeError, ValueError):
+            return default
+
+    return EndpointLimits(
+        rpm=limit("rpm", settings.LLM_ENDPOINT_RPM),
+        tpm=limit("tpm", settings.LLM_ENDPOINT_TPM),
+        max_in_flight=limit("max_in_flight", settings.LLM_ENDPOINT_MAX_CONCURRENCY),
+    )
+
+
+def _buckets(limits: EndpointLimits, tokens: int) -> list[tuple[str, int, int]]:
+    """``(kind, limit, cost)`` of each bucket that applies."""
+    out = []
+    if limits.rpm > 0:
+        out.append(("requests", limits.rpm, 1))
+    if limits.tpm > 0:
+        out.append(("tokens", limits.tpm, max(0, int(tokens))))
+    return out
+
+
+class _LocalBuckets:
+    """Per-process buckets with the same arithmetic as the Lua scripts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._levels: dict[str, tuple[float, float]] = {}
+
+    def _level(self, key: str, limit: int, now: float) -> float:
+        level, ts = self._levels.get(key, (float(limit), now))
+        return min(limit, level + max(0.0, now - ts) * limit / 60000)
+
+    def take(self, endpoint: str, limits: EndpointLimits, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic() * 1000
+            wait = 0.0
+            levels = {}
+            for kind, limit, cost in _buckets(limits, tokens):
+                key = f"{endpoint}:{kind}"
+                level = self._level(key, limit, now)
+                need = min(cost, 1)
+                if level < need:
+                    wait = max(wait, (need - level) * 60000 / limit)
+                levels[key] = level - cost
+            if wait == 0:
+                for key, level in levels.items():
+                    self._levels[key] = (level, now)
+            return wait / 1000
+
+    def adjust(self, endpoint: str, limits: EndpointLimits, tokens: int) -> None:
+        if limits.tpm <= 0:
+            return
+        with self._lock:
+            now = time.monotonic() * 1000
+            key = f"{endpoint}:tokens"
+            level = self._level(key, limits.tpm, now)
+            self._levels[key] = (min(limits.tpm, level - tokens), now)
+
+
+class _RedisBuckets:
+    def __init__(self, client) -> None:
+        self._client = client
+        self._take = client.register_script(_TAKE_SCRIPT)
+        self._adjust = client.register_script(_ADJUST_SCRIPT)
+
+    def take(self, endpoint: str, limits: EndpointLimits, tokens: int) -> float:
+        buckets = _buckets(limits, tokens)
+        args: list = []
+        for _, limit, cost in buckets:
+            args += [limit, cost]
+        wait = self._take(
+            keys=[f"{_PREFIX}{endpoint}:{kind}" for kind, _, _ in buckets],
+            args=[*args, _BUCKET_TTL_MS],
+        )
+        return float(wait.decode() if isinstance(wait, bytes) else wait) / 1000
+
+    def adjust(self, endpoint: str, limits: EndpointLimits, tokens: int) -> None:
+        if limits.tpm <= 0:
+            return
+        self._adjust(
+            keys=[f"{_PREFIX}{endpoint}:tokens"],
+            args=[limits.tpm, tokens, _BUCKET_TTL_MS],
+        )
+
+
+_local_buckets = _LocalBuckets()
+_redis_buckets: _RedisBuckets | None = None
+_redis_buckets_lock = threading.Lock()
+
+
+def _shared_buckets() -> _RedisBuckets | None:
+    global _redis_buckets
+    client = get_redis_client()
+    if client is None:
+        return None
+    with _redis_buckets_lock:
+        if _redis_buckets is None or _redis_buckets._client is not client:
+            _redis_buckets = _RedisBuckets(client)
+        return _redis_buckets
+
+
+def take(endpoint: str, limits: EndpointLimits, tokens: int) -> float:
+    """Charge one request of ``tokens`` estimated tokens to the endpoint's
+    buckets. Returns 0 when it may go ahead, else the seconds to wait before
+    asking again (nothing is charged then)."""
+    if not limits.rate_limited:
+        return 0.0
+    shared = _shared_buckets()
+    if shared is not None:
+        try:
+            return shared.take(endpoint, limits, tokens)
+        except Exception as e:
+            logger.warning(
+                "Shared LLM rate limit unavailable, using the in-process one: %s", e
+            )
+    return _local_buckets.take(endpoint, limits, tokens)
+
+
+def adjust(endpoint: str, limits: EndpointLimits, tokens: int) -> None:
+    """Charge ``tokens`` more (or refund, if negative) to the token bucket,
+    once a call's real token count is known. Best-effort."""
+    if limits.tpm <= 0 or not tokens:
+        return
+    shared = _shared_buckets()
+    if shared is not None:
+        try:
+            shared.adjust(endpoint, limits, tokens)
+            return
+        except Exception as e:
+            logger.debug("Could not adjust the shared token bucket: %s", e)
+    _local_buckets.adjust(endpoint, limits, tokens)
@@ -2,24 +2,51 @@
 import io
 import json
 import logging
+import os
+import re
+import sqlite3
+import tempfile
 import zipfile
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from datetime import date, datetime
+from functools import lru_cache
+from itertools import compress, islice, repeat
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
-
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    cast,
+)
+
+import numpy as np
 import pandas as pd
+import rapidfuzz
+from openpyxl import load_workbook
 from pandas.errors import ParserError
+from pandas.io.parsers import TextParser
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session, selectinload
 from thefuzz import fuzz
+from thefuzz.utils import full_process
 
 from .. import models
 from ..core.config import settings
 from ..middleware.error_handlers import internal_error_message
 from .enums import ComparisonMethod, FieldType
-from .helpers import detect_text_encoding, flatten_dict
-from .json_utils import case_id_str, make_jsonable
+from .groundtruth_store import (
+    GroundTruthRows,
+    GroundTruthStore,
+    load_ground_truth_store,
+)
+from .helpers import detect_stream_encoding, flatten_dict
+from .json_utils import case_id_str, make_jsonable, strip_nul
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +65,8 @@ def _is_missing(value: Any) -> bool:
         return True
     if isinstance(value, str):
         return value == ""
+    if isinstance(value, (int, float)):
+        return value != value  # NaN; avoids pd.isna's overhead per value
     if isinstance(value, (list, tuple, dict, set)):
         return len(value) == 0
     try:
@@ -46,6 +75,182 @@ def _is_missing(value: Any) -> bool:
         return False
 
 
+# Type codes for _missing_and_lists; any other type is code 0.
+_NONE, _NUMBER, _FLOAT, _SIZED, _LIST = 1, 2, 3, 4, 5
+_TYPE_CODES = {
+    type(None): _NONE,
+    int: _NUMBER,
+    bool: _NUMBER,
+    float: _FLOAT,
+    str: _SIZED,
+    tuple: _SIZED,
+    dict: _SIZED,
+    set: _SIZED,
+    list: _LIST,
+}
+
+
+def _missing_and_lists(values: Sequence[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """``_is_missing(v)`` and ``isinstance(v, list)`` for a whole column.
+
+    Values are classified by exact type in one C-level pass; floats are then
+    tested for NaN and strings and containers for emptiness as arrays. Values
+    of any other type (subclasses included) fall back to the scalar checks.
+    """
+    n = len(values)
+    codes = np.fromiter(
+        map(_TYPE_CODES.get, map(type, values), repeat(0)), dtype=np.int8, count=n
+    )
+    missing = codes == _NONE
+    lists = codes == _LIST
+    floats = codes == _FLOAT
+    if floats.any():
+        missing[floats] = np.isnan(np.fromiter(compress(values, floats), np.float64))
+    sized = (codes == _SIZED) | lists
+    if sized.any():
+        missing[sized] = np.fromiter(map(len, compress(values, sized)), np.int64) == 0
+    for i in np.flatnonzero(codes == 0).tolist():
+        missing[i] = _is_missing(values[i])
+        lists[i] = isinstance(values[i], list)
+    return missing, lists
+
+
+def _missing_result(gt_missing: bool, pred_missing: bool) -> Optional[Dict]:
+    """The comparison record when either side is missing, else None."""
+    if gt_missing and pred_missing:
+        return {"is_correct": True, "error_type": None}
+    if pred_missing:
+        return {"is_correct": False, "error_type": "missing"}
+    if gt_missing:
+        return {"is_correct": False, "error_type": "extra"}
+    return None
+
+
+def _memoized(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """``fn`` with results remembered per distinct value, for one column.
+
+    Keyed on ``(type, value)`` so equal-but-different values (``1``, ``1.0``,
+    ``True``) that convert differently stay apart; unhashable values are
+    simply not remembered.
+    """
+    memo: Dict[Any, Any] = {}
+
+    def call(value: Any) -> Any:
+        try:
+            key = (type(value), value)
+            if key in memo:
+                return memo[key]
+        except TypeError:
+            return fn(value)
+        result = memo[key] = fn(value)
+        return result
+
+    return call
+
+
+def _max_bipartite_matching(adj: List[List[int]], n_right: int) -> int:
+    """Size of a maximum matching; ``adj[i]`` lists the right vertices left
+    vertex ``i`` may pair with.
+
+    Hopcroft–Karp with an explicit stack, so long lists cannot hit the
+    recursion limit: each phase layers the graph by BFS from the free left
+    vertices, then augments along vertex-disjoint shortest paths.
+    """
+    n_left = len(adj)
+    match_left = [-1] * n_left
+    match_right = [-1] * n_right
+    matched = 0
+    while True:
+        free = [u for u in range(n_left) if match_left[u] == -1]
+        dist = [-1] * n_left
+        for u in free:
+            dist[u] = 0
+        queue = deque(free)
+        reachable_free = False
+        while queue:
+            u = queue.popleft()
+            for v in adj[u]:
+                w = match_right[v]
+                if w == -1:
+                    reachable_free = True
+                elif dist[w] == -1:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not reachable_free:
+            return matched
+
+        # next_edge[u]: position in adj[u] of the edge to try next; the edge
+        # just taken from u is adj[u][next_edge[u] - 1].
+        next_edge = [0] * n_left
+        for root in free:
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if next_edge[u] == len(adj[u]):
+                    dist[u] = -1  # dead end for the rest of this phase
+                    stack.pop()
+                    continue
+                v = adj[u][next_edge[u]]
+                next_edge[u] += 1
+                w = match_right[v]
+                if w == -1:
+                    for x in stack:
+                        y = adj[x][next_edge[x] - 1]
+                        match_left[x] = y
+                        match_right[y] = x
+                    matched += 1
+                    break
+                if dist[w] == dist[u] + 1:
+                    stack.append(w)
+
+
+_TRUE_TOKENS = frozenset({"true", "yes", "1", "y", "t", "on"})
+_FALSE_TOKENS = frozenset({"false", "no", "0", "n", "f", "off"})
+
+# Tried in order; the first that parses wins (so "01/02/2024" is day-first).
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%m-%d-%Y",
+    "%Y%m%d",
+    "%d.%m.%Y",
+)
+
+# The directives above only consume digits (and %d's leading space), so a
+# string can only parse with the formats whose literal separators equal its
+# own non-digit characters. Trying just that group, in the order above, finds
+# the same format as trying the whole list.
+_DATE_FORMATS_BY_SEPARATORS: Dict[str, tuple[str, ...]] = {
+    seps: tuple(f for f in _DATE_FORMATS if re.sub("%.", "", f) == seps)
+    for seps in dict.fromkeys(re.sub("%.", "", f) for f in _DATE_FORMATS)
+}
+_NOT_SEPARATOR = re.compile(r"[\d\s]")
+
+# Ground-truth dates recur in every trial evaluated against them; parsed
+# values are kept process-wide, shared by all fields and evaluations.
+_DATE_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=_DATE_CACHE_SIZE)
+def _parse_date(text: str) -> Optional[date]:
+    """Parse stripped ``text`` with ``_DATE_FORMATS``, then pandas."""
+    for fmt in _DATE_FORMATS_BY_SEPARATORS.get(_NOT_SEPARATOR.sub("", text), ()):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    # Try pandas parser
+    try:
+        return pd.to_datetime(text).date()
+    except ParserError:
+        return None
+    except ValueError:
+        return None
+
+
 def _deep_merge_dicts(dst: Dict, src: Dict) -> None:
     """Recursively merge ``src`` into ``dst`` (used to combine the same
     ground-truth ID appearing across multiple Excel sheets)."""
@@ -56,12 +261,25 @@ def _deep_merge_dicts(dst: Dict, src: Dict) -> None:
             dst[k] = v
 
 
+def _mapped_gt_columns(field_mappings: Dict) -> set[str]:
+    """Top-level ground truth columns the mappings read: the field itself
+    (flat access) and its first path segment (nested access)."""
+    columns = set()
+    for mapping in field_mappings.values():
+        gt_field = mapping["gt_field"]
+        columns.add(gt_field)
+        columns.add(gt_field.replace("[]", ".0").split(".")[0])
+    return columns
+
+
 class EvaluationEngine:
     """Main evaluation engine with enhanced concurrency handling."""
 
     def __init__(self, db_session: Session):
         self.db = db_session
         self._cache = {}
+        # Ground truth stores opened by this engine, by ground truth id.
+        self._gt_stores: Dict[int, GroundTruthStore] = {}
         # Store engine for creating new sessions in parallel processing
         self.engine = db_session.bind
         # Validation warnings from the most recent evaluate_trial() call
@@ -69,6 +287,18 @@ class EvaluationEngine:
         # in the response. Reset on each call.
         self.last_warnings: List[str] = []
 
+    def close(self) -> None:
+        """Close the ground truth stores opened by this engine."""
+        stores, self._gt_stores = self._gt_stores, {}
+        for store in stores.values():
+            store.close()
+
+    def __enter__(self) -> "EvaluationEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def evaluate_trial(
         self, trial_id: int, groundtruth_id: int, force_recalculate: bool = False
     ) -> models.Evaluation:
@@ -86,33 +316,20 @@ class EvaluationEngine:
                 f"Evaluation prerequisites not met: {'; '.join(validation_result['errors'])}"
             )
 
-        # Check cache. A cached evaluation is reused only when the trial's
-        # results have not changed since it was computed — otherwise the user
-        # would silently see metrics for stale results. (Field-mapping, ID-column
-        # and ground-truth file changes already delete the cached evaluation;
-        # this guards against the trial simply being re-run.)
+        # Check cache (see find_fresh_evaluation).
+        if not force_recalculate:
+            fresh = self.find_fresh_evaluation(trial_id, groundtruth_id)
+            if fresh is not None:
+                return fresh
+        # Recomputing (forced, or results changed since the cached
+        # evaluation). Delete every existing row for this (trial, ground
+        # truth) pair first (cascade removes their EvaluationMetric
+        # children) so we never accumulate duplicate evaluations.
         existing_rows = (
             self.db.query(models.Evaluation)
             .filter_by(trial_id=trial_id, groundtruth_id=groundtruth_id)
-            .order_by(models.Evaluation.created_at.desc())
             .all()
         )
-        if existing_rows and not force_recalculate:
-            existing = existing_rows[0]
-            latest_result_update = (
-                self.db.query(func.max(models.TrialResult.updated_at))
-                .filter_by(trial_id=trial_id)
-                .scalar()
-            )
-            if (
-                latest_result_update is None
-                or existing.created_at >= latest_result_update
-            ):
-                return existing
-        # Recomputing (forced, or results changed since the cached
-        # evaluation). Delete every existing row for this (trial, ground
-        # truth) pair first (cascade removes their EvaluationMetric
-        # children) so we never accumulate duplicate evaluations.
         if existing_rows:
             for stale in existing_rows:
                 self.db.delete(stale)
@@ -128,9 +345,11 @@ class EvaluationEngine:
         if ground_truth is None:
             raise ValueError(f"GroundTruth {groundtruth_id} not found")
 
-        # Load and validate ground truth data
-        gt_data = self._load_ground_truth(ground_truth)
+        # Load and validate ground truth data (only the mapped columns)
         field_mappings = self._get_field_mappings(ground_truth, trial.schema_id)
+        gt_data = self._load_ground_truth(
+            ground_truth, columns=_mapped_gt_columns(field_mappings)
+        )
 
         # Final data consistency check
         consistency_check = self._validate_data_consistency(
@@ -175,6 +394,34 @@ class EvaluationEngine:
         self.db.commit()
         return evaluation
 
+    def find_fresh_evaluation(
+        self, trial_id: int, groundtruth_id: int
+    ) -> models.Evaluation | None:
+        """The stored evaluation of this trial/ground-truth pair, if still fresh.
+
+        A cached evaluation is reused only when the trial's results have not
+        changed since it was computed — otherwise the user would silently see
+        metrics for stale results. (Field-mapping, ID-column and ground-truth
+        file changes already delete the cached evaluation; this guards against
+        the trial simply being re-run.)
+        """
+        existing = (
+            self.db.query(models.Evaluation)
+            .filter_by(trial_id=trial_id, groundtruth_id=groundtruth_id)
+            .order_by(models.Evaluation.created_at.desc())
+            .first()
+        )
+        if existing is None:
+            return None
+        latest_result_update = (
+            self.db.query(func.max(models.TrialResult.updated_at))
+            .filter_by(trial_id=trial_id)
+            .scalar()
+        )
+        if latest_result_update is None or existing.created_at >= latest_result_update:
+            return existing
+        return None
+
     def _validate_evaluation_prerequisites(
         self, trial_id: int, groundtruth_id: int
     ) -> Dict:
@@ -216,8 +463,7 @@ class EvaluationEngine:
 
         # Validate ground truth data can be loaded
         try:
-            gt_data = self._load_ground_truth(ground_truth)
-            if not gt_data:
+            if not self._ground_truth_store(ground_truth).row_count:
                 errors.append("Ground truth data is empty or invalid")
         except Exception as e:
             errors.append(f"Failed to load ground truth data: {str(e)}")
@@ -394,27 +640,29 @@ class EvaluationEngine:
         if ground_truth.format not in ["csv", "xlsx"]:
             return []
 
-        # read raw file bytes
-        from ..dependencies import get_file
+        from ..dependencies import open_file
 
-        content = get_file(ground_truth.file_uuid)
+        with open_file(ground_truth.file_uuid) as source:
+            return self._read_columns(source, ground_truth.format)
 
+    @staticmethod
+    def _read_columns(source: BinaryIO, format_type: str) -> List[str]:
         def _norm(x):  # keep original string but trim edges
             return str(x).strip()
 
-        if ground_truth.format == "csv":
+        if format_type == "csv":
             try:
-                encoding = detect_text_encoding(
-                    content, settings.CSV_ENCODING_FALLBACK_CHAIN
+                encoding = detect_stream_encoding(
+                    source, settings.CSV_ENCODING_FALLBACK_CHAIN
                 )
-                df = pd.read_csv(io.BytesIO(content), nrows=0, encoding=encoding)
+                df = pd.read_csv(source, nrows=0, encoding=encoding)
             except Exception as e:
                 raise ValueError(f"Failed to read CSV headers: {e}")
             return [_norm(c) for c in df.columns.tolist()]
 
         # xlsx
         try:
-            xls = pd.ExcelFile(io.BytesIO(content))
+            xls = pd.ExcelFile(source)
         except Exception as e:
             raise ValueError(f"Invalid Excel file: {e}")
 
@@ -432,36 +680,26 @@ class EvaluationEngine:
                     cols.append(s)
         return cols
 
-    def _load_ground_truth(self, ground_truth: models.GroundTruth) -> Dict:
-        """Load ground truth data with caching."""
-        # Check cache
-        if ground_truth.data_cache:
-            return ground_truth.data_cache
-
-        # Load from file
-        from ..dependencies import get_file
+    def _ground_truth_store(self, ground_truth: models.GroundTruth) -> GroundTruthStore:
+        """The ground truth's columnar store, opened once per engine (until
+        :meth:`close`)."""
+        store = self._gt_stores.get(ground_truth.id)
+        if store is None:
+            store = load_ground_truth_store(self.db, ground_truth)
+            self._gt_stores[ground_truth.id] = store
+        return store
 
-        content = get_file(ground_truth.file_uuid)
-        parser = GroundTruthParser()
-
-        # Pass ID column for CSV/XLSX files
-        if ground_truth.format in ["csv", "xlsx"]:
-            data = parser.parse(
-                content, ground_truth.format, id_column=ground_truth.id_column_name
-            )
-        else:
-            data = parser.parse(content, ground_truth.format)
-
-        data = make_jsonable(data)
-
-        # Cache parsed data
-        ground_truth.data_cache = data
-        try:
-            self.db.commit()
-        except TypeError as e:
-            raise ValueError(f"Ground truth contains non-JSON-serializable values: {e}")
+    def _load_ground_truth(
+        self,
+        ground_truth: models.GroundTruth,
+        columns: Optional[Iterable[str]] = None,
+    ) -> GroundTruthRows:
+        """``{key: row}`` for every document, restricted to ``columns``.
 
-        return data
+        Reads the store artifact (built from the file on first use, see
+        ``utils/groundtruth_store.py``); parse errors raise ``ValueError``.
+        """
+        return self._ground_truth_store(ground_truth).rows(columns)
 
     def _get_field_mappings(
         self, ground_truth: models.GroundTruth, schema_id: int
@@ -489,47 +727,95 @@ class EvaluationEngine:
         document_data: Dict,
     ) -> Dict:
         """
-        Evaluate all TrialResult objects in parallel **without passing ORM
-        instances to worker threads**.  Each worker receives only primitive
-        data (document_id + prediction JSON) so no SQLAlchemy session is ever
-        touched outside the main thread.
+        Evaluate all TrialResult objects column by column.
+
+        Each document's (ground truth, prediction) pairs are resolved first;
+        every field is then compared across all documents in one
+        :meth:`ValueComparator.compare_batch` call, and the results are
+        reassembled per document in the original order. Only primitive data
+        (document_id + prediction JSON) is read from the ORM objects.
+
+        Results equal running :meth:`_evaluate_document_isolated` on each
+        document. A failure stays confined to the documents it concerns: a
+        field whose batch raises is re-compared pair by pair, and a document
+        whose pair raises gets an error result as before.
         """
-        detailed_metrics: List[Dict] = []
-        doc_evaluations: List[Dict] = []
-
-        # A modest pool avoids exhausting the Postgres connection pool
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = []
+        comparator = ValueComparator()
+        # Per document: (doc_id, pairs) or a ready error result.
+        documents: List[Any] = []
+        # Per field: (document index, pair index), ground truths, predictions.
+        columns: Dict[str, tuple[list, list, list]] = {}
 
-            for result in results:
-                # Build a plain‑Python payload
-                payload = {
-                    "document_id": result.document_id,
-                    "prediction": result.result,  # already a dict
-                }
-                future = executor.submit(
-                    self._evaluate_document_isolated,
-                    payload,
-                    gt_data,
-                    field_mappings,
-                    document_data,
+        for result in results:
+            payload = {
+                "document_id": result.document_id,
+                "prediction": result.result,  # already a dict
+            }
+            try:
+                pairs, error = self._document_field_pairs(
+                    payload, gt_data, field_mappings, document_data
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("EvaluationEngine error on doc %s", result.document_id)
+                error = self._create_error_result(
+                    result.document_id,
+                    internal_error_message(exc, prefix="Evaluation failed"),
                 )
-                futures.append((result.document_id, future))
+            if error is not None:
+                documents.append(error)
+                continue
+            for slot, (schema_field, gt_val, pred_val) in enumerate(pairs):
+                slots, gts, preds = columns.setdefault(schema_field, ([], [], []))
+                slots.append((len(documents), slot))
+                gts.append(gt_val)
+                preds.append(pred_val)
+            documents.append((result.document_id, pairs))
+
+        comparisons: Dict[tuple[int, int], Dict] = {}
+        failures: Dict[int, Exception] = {}
+        for schema_field, (slots, gts, preds) in columns.items():
+            mapping = field_mappings[schema_field]
+            args = (mapping["type"], mapping["method"], mapping["options"])
+            try:
+                outcomes = comparator.compare_batch(gts, preds, *args)
+            except Exception:  # noqa: BLE001
+                outcomes = []
+                for (doc_index, _), gt_val, pred_val in zip(slots, gts, preds):
+                    try:
+                        outcomes.append(comparator.compare(gt_val, pred_val, *args))
+                    except Exception as exc:  # noqa: BLE001
+                        failures.setdefault(doc_index, exc)
+                        outcomes.append(None)
+            comparisons.update(zip(slots, outcomes))
 
-            # Collect results
-            for doc_id, future in futures:
-                try:
-                    doc_eval = future.result()
-                    doc_evaluations.append(doc_eval)
-                    detailed_metrics.extend(doc_eval["detailed_metrics"])
-                except Exception as exc:  # noqa: BLE001
-                    logger.exception("EvaluationEngine error on doc %s", doc_id)
-                    doc_evaluations.append(
-                        self._create_error_result(
-                            doc_id,
-                            internal_error_message(exc, prefix="Evaluation failed"),
-                        )
+        detailed_metrics: List[Dict] = []
+        doc_evaluations: List[Dict] = []
+        for doc_index, entry in enumerate(documents):
+            if isinstance(entry, dict):
+                doc_evaluations.append(entry)
+                continue
+            doc_id, pairs = entry
+            if doc_index in failures:
+                exc = failures[doc_index]
+                logger.error(
+                    "EvaluationEngine error on doc %s",
+                    doc_id,
+                    exc_info=(type(exc), exc, exc.__traceback__),
+                )
+                doc_evaluations.append(
+                    self._create_error_result(
+                        doc_id,
+                        internal_error_message(exc, prefix="Evaluation failed"),
                     )
+                )
+                continue
+            doc_eval = self._document_evaluation(
+                doc_id,
+                pairs,
+                [comparisons[(doc_index, slot)] for slot in range(len(pairs))],
+            )
+            doc_evaluations.append(doc_eval)
+            detailed_metrics.extend(doc_eval["detailed_metrics"])
 
         return {
             "document_evaluations": doc_evaluations,
@@ -543,18 +829,55 @@ class EvaluationEngine:
         field_mappings: Dict,
         document_data: Dict,
     ) -> Dict:
-        """Evaluate a single document with proper JSON nested structure handling."""
+        """Evaluate a single document, one field at a time (the scalar
+        reference for :meth:`_evaluate_parallel`)."""
+        pairs, error = self._document_field_pairs(
+            result_payload, gt_data, field_mappings, document_data
+        )
+        if error is not None:
+            return error
+        comparisons = [
+            self._compare_values(
+                gt_val,
+                pred_val,
+                field_mappings[schema_field]["type"],
+                field_mappings[schema_field]["method"],
+                field_mappings[schema_field]["options"],
+            )
+            for schema_field, gt_val, pred_val in pairs
+        ]
+        return self._document_evaluation(
+            result_payload["document_id"], pairs, comparisons
+        )
+
+    def _document_field_pairs(
+        self,
+        result_payload: Dict,
+        gt_data: Dict,
+        field_mappings: Dict,
+        document_data: Dict,
+    ) -> tuple[List[tuple[str, Any, Any]], Optional[Dict]]:
+        """Resolve a document's ``(schema_field, gt_val, pred_val)`` triples
+        with proper JSON nested structure handling.
+
+        Returns ``(pairs, None)``, or ``([], error_result)`` when the document
+        cannot be evaluated at all.
+        """
         doc_id = result_payload["document_id"]
 
         # Ensure numeric ID
         try:
             doc_id_int = int(doc_id)
         except (ValueError, TypeError):
-            return self._create_error_result(doc_id, f"Invalid document ID: {doc_id}")
+            return [], self._create_error_result(
+                doc_id, f"Invalid document ID: {doc_id}"
+            )
 
         # Check we have pre-loaded metadata for this document
         if not document_data.get(doc_id_int, {}).get("exists", False):
-            return self._create_error_result(doc_id, "Document not found in database")
+            return [], self._create_error_result(
+                doc_id, "Document not found in database"
+            )
 
         doc_info = document_data[doc_id_int]
 
@@ -562,28 +885,28 @@ class EvaluationEngine:
         gt_key = self._find_document_key_by_data(doc_id_int, doc_info, gt_data)
         if gt_key is None or gt_key not in gt_data:
             filename = doc_info.get("filename", "Unknown")
-            return self._create_error_result(
+            return [], self._create_error_result(
                 doc_id,
                 f"No ground truth found for document {doc_id} (filename: {filename})",
             )
 
         gt_values = gt_data[gt_key]
 
-        # Check if ground truth is JSON (nested) or CSV (flattened)
-        is_json_gt = isinstance(gt_values, dict) and any(
-            isinstance(v, dict) for v in gt_values.values()
-        )
+        # Check if ground truth is JSON (nested) or CSV (flattened). A store
+        # read may hold only the mapped columns, so it records this per key.
+        nested_keys = getattr(gt_data, "nested_keys", None)
+        if nested_keys is not None:
+            is_json_gt = gt_key in nested_keys
+        else:
+            is_json_gt = isinstance(gt_values, dict) and any(
+                isinstance(v, dict) for v in gt_values.values()
+            )
 
         # Prepare prediction values
         pred_values = result_payload["prediction"]
+        pred_values_flat: Optional[Dict] = None
 
-        # Evaluate field-by-field
-        detailed_metrics = []
-        correct_count = 0
-        total_count = 0
-        missing_fields = []
-        incorrect_fields = []
-
+        pairs = []
         for schema_field, mapping in field_mappings.items():
             gt_field = mapping["gt_field"]
 
@@ -597,23 +920,31 @@ class EvaluationEngine:
                     continue
                 gt_val = gt_values[gt_field]
 
-                # Flatten prediction for CSV comparison
-                pred_values_flat = flatten_dict(pred_values, sep=".")
+                # Flatten prediction (once) for CSV comparison
+                if pred_values_flat is None:
+                    pred_values_flat = flatten_dict(pred_values, sep=".")
                 pred_val = pred_values_flat.get(schema_field)
 
             if gt_val is None:
                 continue  # Skip if ground truth doesn't have this field
 
-            total_count += 1
+            pairs.append((schema_field, gt_val, pred_val))
 
-            comparison = self._compare_values(
-                gt_val,
-                pred_val,
-                mapping["type"],
-                mapping["method"],
-                mapping["options"],
-            )
+        return pairs, None
+
+    def _document_evaluation(
+        self,
+        doc_id: Any,
+        pairs: List[tuple[str, Any, Any]],
+        comparisons: List[Dict],
+    ) -> Dict:
+        """Build a document's evaluation from its pairs and their comparisons."""
+        detailed_metrics = []
+        correct_count = 0
+        missing_fields = []
+        incorrect_fields = []
 
+        for (schema_field, gt_val, pred_val), comparison in zip(pairs, comparisons):
             if comparison["is_correct"]:
                 correct_count += 1
             else:
@@ -634,6 +965,7 @@ class EvaluationEngine:
                 }
             )
 
+        total_count = len(pairs)
         accuracy = correct_count / total_count if total_count else 0.0
 
         return {
@@ -677,8 +1009,10 @@ class EvaluationEngine:
         document_name = doc_info.get("document_name")
         filename = doc_info.get("filename")
 
-        # Prepare all GT keys for lower-case matching
-        gt_keys_lower = {str(k).lower(): k for k in gt_data.keys()}
+        # Prepare all GT keys for lower-case matching (prebuilt by the store)
+        gt_keys_lower = getattr(gt_data, "keys_lower", None)
+        if gt_keys_lower is None:
+            gt_keys_lower = {str(k).lower(): k for k in gt_data.keys()}
 
         # 1. Try document_name (with and without extension)
         if document_name:
@@ -752,21 +1086,263 @@ class EvaluationEngine:
         return calculator.calculate(evaluation_results)
 
 
+class _TableRows:
+    """Turn one table's dataframe blocks into ``(doc_id, values)`` rows.
+
+    - IDs are normalized with :func:`case_id_str` so they produce the same
+      keys as preprocessing's document names (e.g. 123.0 → "123").
+    - Rows that contain data but no ID, and duplicate IDs within the same
+      table, are collected while the blocks stream past and raised by
+      :meth:`check` once the table has been read, instead of silently
+      dropping/overwriting rows.
+    - Fully empty (phantom) rows are skipped.
+    """
+
+    def __init__(self, id_col: str, source: str) -> None:
+        self.id_col = id_col
+        self.source = source
+        self.rows_missing_id: List[int] = []
+        self.duplicate_ids: List[str] = []
+        self.seen: set[str] = set()
+
+    @staticmethod
+    def _cell_is_na(v: Any) -> bool:
+        # ``df.where(pd.notna(df), None)`` does not reliably yield None
+        # for nullable dtypes (pandas keeps pd.NA) — check both.
+        if v is None:
+            return True
+        try:
+            return bool(pd.isna(v))
+        except (TypeError, ValueError):
+            return False
+
+    def rows(self, df: pd.DataFrame) -> Iterator[tuple[str, Dict]]:
+        id_col = self.id_col
+        for idx, row in df.iterrows():
+            values: Dict[str, Any] = {}
+            for col in df.columns:
+                if col == id_col or self._cell_is_na(row[col]):
+                    continue
+                keys = str(col).split(".")
+                current = values
+                for key in keys[:-1]:
+                    if key not in current or not isinstance(current[key], dict):
+                        current[key] = {}
+                    current = current[key]
+                current[keys[-1]] = row[col]
+
+            raw_id = row[id_col]
+            if self._cell_is_na(raw_id) or str(raw_id).strip() == "":
+                if values:
+                    self.rows_missing_id.append(int(cast(Any, idx)))
+                continue  # fully empty (phantom) rows are skipped
+            if not values:
+                continue
+
+            doc_id = case_id_str(raw_id)
+            if doc_id in self.seen:
+                self.duplicate_ids.append(doc_id)
+                continue
+            self.seen.add(doc_id)
+            yield doc_id, make_jsonable(values)
+
+    def check(self) -> None:
+        if self.rows_missing_id:
+            raise ValueError(
+                f"{len(self.rows_missing_id)} row(s) in the ground truth "
+                f"{self.source} have data but no value in ID column "
+                f"'{self.id_col}' (row indices: {self.rows_missing_id[:10]}). "
+                "Fill in the missing IDs or choose a different ID column."
+            )
+        if self.duplicate_ids:
+            raise ValueError(
+                f"Duplicate IDs in the ground truth {self.source}: "
+                f"{sorted(set(self.duplicate_ids))[:10]}. Each row must have a "
+                "unique ID."
+            )
+
+
+class _ColumnTypes:
+    """Column dtypes of a table read in blocks, unified across the blocks.
+
+    pandas infers a column's type from the values it sees, so a block of
+    whole numbers reads as ``Int64`` where the full column is ``Float64``,
+    and an all-empty block gives no type at all. :meth:`observe` records what
+    each block looked like (after ``convert_dtypes``); :meth:`resolve` picks
+    the type one read of the whole table would have produced, plus the
+    columns that only a raw read can reproduce (types that do not combine,
+    e.g. numbers in one block and text in another).
+
+    Excel cells are typed already, and pandas treats booleans there as
+    numbers, so a boolean column with blanks becomes ``Int64`` (0/1).
+    """
+
+    _NUMERIC = {"Int64", "Float64"}
+
+    def __init__(self, excel: bool = False) -> None:
+        self.excel = excel
+        self.blocks = 0
+        # column -> {kind: dtype}, where kind is the dtype name or "na"
+        self._kinds: Dict[str, Dict[str, Any]] = {}
+        self._present: Dict[str, int] = {}
+
+    def observe(self, block: pd.DataFrame) -> None:
+        self.blocks += 1
+        for name in block.columns:
+            series = block[name]
+            kind = "na" if series.isna().all() else str(series.dtype)
+            self._kinds.setdefault(name, {}).setdefault(kind, series.dtype)
+            self._present[name] = self._present.get(name, 0) + 1
+
+    def resolve(self) -> tuple[Dict[str, Any], set[str]]:
+        """``({column: dtype}, raw columns)``."""
+        dtypes: Dict[str, Any] = {}
+        raw: set[str] = set()
+        numeric = self._NUMERIC | {"boolean"} if self.excel else self._NUMERIC
+        for name, kinds in self._kinds.items():
+            # A narrower Excel block lacks trailing columns: all empty there.
+            has_na = "na" in kinds or self._present[name] < self.blocks
+            present = {k: d for k, d in kinds.items() if k != "na"}
+            if not present:
+                continue  # empty throughout: every block types it alike
+            if len(present) == 1 and not (
+                self.excel and "boolean" in present and has_na
+            ):
+                dtypes[name] = next(iter(present.values()))
+            elif set(present) <= numeric:
+                dtypes[name] = (
+                    pd.Float64Dtype() if "Float64" in present else pd.Int64Dtype()
+                )
+            else:
+                raw.add(name)
+        return dtypes, raw
+
+
+def _typed_block(
+    block: pd.DataFrame, dtypes: Dict[str, Any], raw: set[str]
+) -> pd.DataFrame:
+    """``block`` typed as the whole table (see :class:`_ColumnTypes`)."""
+    typed = block.convert_dtypes()
+    for name in typed.columns:
+        if name in raw:
+            typed[name] = block[name].astype(object)
+        elif name in dtypes and typed[name].dtype != dtypes[name]:
+            if typed[name].isna().all():
+                typed[name] = pd.Series(None, index=typed.index, dtype=dtypes[name])
+            else:
+                typed[name] = typed[name].astype(dtypes[name])
+    return typed.where(pd.notna(typed), None)
+
+
+def _excel_cell(cell: Any) -> Any:
+    """A cell value as pandas' openpyxl reader converts it."""
+    if cell.value is None:
+        return ""
+    if cell.data_type == "e":
+        return np.nan
+    if cell.data_type == "n":
+        val = int(cell.value)
+        if val == cell.value:
+            return val
+        return float(cell.value)
+    return cell.value
+
+
+def _excel_rows(worksheet: Any) -> Iterator[list]:
+    """A read-only worksheet's converted rows, trailing empty rows dropped."""
+    worksheet.reset_dimensions()
+    blank = 0
+    for row in worksheet.rows:
+        values = [_excel_cell(cell) for cell in row]
+        while values and values[-1] == "":
+            values.pop()
+        if not values:
+            blank += 1  # only emitted if a non-empty row follows
+            continue
+        for _ in range(blank):
+            yield []
+        blank = 0
+        yield values
+
+
+class _MergedRows:
+    """``{doc_id: values}`` merged across Excel sheets, kept on disk.
+
+    The same ID on several sheets deep-merges into one document, so rows of
+    a multi-sheet workbook cannot be written out until every sheet is read.
+    They wait in a temporary SQLite file instead of memory; :meth:`items`
+    returns them in first-seen order.
+    """
+
+    def __init__(self) -> None:
+        self._dir = tempfile.TemporaryDirectory(prefix="gt-merge-")
+        self._db = sqlite3.connect(os.path.join(self._dir.name, "rows.sqlite3"))
+        self._db.execute(
+            "CREATE TABLE rows (pos INTEGER PRIMARY KEY, doc_id TEXT UNIQUE, data TEXT)"
+        )
+        self.count = 0
+
+    def merge(self, doc_id: str, values: Dict) -> None:
+        found = self._db.execute(
+            "SELECT data FROM rows WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        if found is None:
+            self._db.execute(
+                "INSERT INTO rows (doc_id, data) VALUES (?, ?)",
+                (doc_id, json.dumps(values)),
+            )
+            self.count += 1
+        else:
+            merged = json.loads(found[0])
+            _deep_merge_dicts(merged, values)
+            self._db.execute(
+                "UPDATE rows SET data = ? WHERE doc_id = ?",
+                (json.dumps(merged), doc_id),
+            )
+
+    def items(self) -> Iterator[tuple[str, Dict]]:
+        for doc_id, data in self._db.execute(
+            "SELECT doc_id, data FROM rows ORDER BY pos"
+        ):
+            yield doc_id, json.loads(data)
+
+    def close(self) -> None:
+        self._db.close()
+        self._dir.cleanup()
+
+
 class GroundTruthParser:
-    """Parser for different ground truth formats."""
+    """Parser for different ground truth formats.
+
+    :meth:`iter_documents` streams ``(doc_id, values)`` pairs from a file;
+    :meth:`parse` collects them from bytes into a dict.
+    """
 
     def parse(
         self, content: bytes, format_type: str, id_column: Optional[str] = None
     ) -> Dict:
         """Parse ground truth content based on format."""
+        return dict(self.iter_documents(io.BytesIO(content), format_type, id_column))
+
+    def iter_documents(
+        self, source: BinaryIO, format_type: str, id_column: Optional[str] = None
+    ) -> Iterator[tuple[str, Dict]]:
+        """Yield ``(doc_id, values)`` in file order from a seekable binary file.
+
+        CSV and XLSX are read ``GROUND_TRUTH_PARSE_CHUNK_ROWS`` rows at a time
+        and ZIP archives one member at a time, so memory follows the block
+        size rather than the file size; a single JSON file is parsed whole.
+        Validation errors raise ``ValueError`` as soon as the offending table
+        has been read, possibly after earlier documents were yielded.
+        """
         if format_type == "json":
-            return self._parse_json(content)
+            yield from self._parse_json(source.read()).items()
         elif format_type == "csv":
-            return self._parse_csv(content, id_column)
+            yield from self._iter_csv(source, id_column)
         elif format_type == "xlsx":
-            return self._parse_excel(content, id_column)
+            yield from self._iter_excel(source, id_column)
         elif format_type == "zip":
-            return self._parse_zip(content)
+            yield from self._iter_zip(source)
         else:
             raise ValueError(f"Unsupported format: {format_type}")
 
@@ -816,10 +1392,23 @@ class GroundTruthParser:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON: {e}")
 
-    def _parse_zip(self, content: bytes) -> Dict:
-        """Parse ZIP file with multiple JSON documents."""
-        result = {}
-        with zipfile.ZipFile(io.BytesIO(content)) as zf:
+    @staticmethod
+    def _zip_member(zf: zipfile.ZipFile, filename: str) -> tuple[str, Any]:
+        with zf.open(filename) as f:
+            try:
+                doc_data = json.loads(f.read().decode("utf-8"))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON in {filename}: {e}")
+        if "id" not in doc_data:
+            doc_id = Path(filename).stem
+            doc_data["id"] = doc_id
+        else:
+            doc_id = str(doc_data["id"])
+        return strip_nul(doc_id), doc_data
+
+    def _iter_zip(self, source: BinaryIO) -> Iterator[tuple[str, Dict]]:
+        """Parse ZIP file with multiple JSON documents, one member at a time."""
+        with zipfile.ZipFile(source) as zf:
             json_files = [
                 f
                 for f in zf.namelist()
@@ -828,210 +1417,207 @@ class GroundTruthParser:
             if not json_files:
                 raise ValueError("No JSON files found in ZIP archive")
 
+            # A later member with the same id replaces an earlier one at the
+            # earlier one's position. Only ids are kept from the first pass;
+            # the second re-reads the member that wins.
+            members: Dict[str, str] = {}
             for filename in json_files:
-                with zf.open(filename) as f:
-                    try:
-                        doc_data = json.loads(f.read().decode("utf-8"))
-                        if "id" not in doc_data:
-                            doc_id = Path(filename).stem
-                            doc_data["id"] = doc_id
-                        else:
-                            doc_id = str(doc_data["id"])
-                        result[doc_id] = doc_data
-                    except json.JSONDecodeError as e:
-                        raise ValueError(f"Invalid JSON in {filename}: {e}")
-        return make_jsonable(result)
+                doc_id, _ = self._zip_member(zf, filename)
+                members[doc_id] = filename
+            for doc_id, filename in members.items():
+                _, doc_data = self._zip_member(zf, filename)
+                yield doc_id, make_jsonable(doc_data)
 
     @staticmethod
-    def _resolve_id_column(df: pd.DataFrame, id_column: Optional[str]) -> str:
+    def _resolve_id_column(columns: List[str], id_column: Optional[str]) -> str:
         """Resolve the ID column, failing loudly when a chosen column is missing.
 
         Silently falling back to the row index when the user-selected column
         isn't found (e.g. because of a typo or a renamed header) would key
         every document by row number and make evaluation matching fail with
-        no visible cause.
+        no visible cause. ``"_index"`` means "key rows by row number".
         """
         if id_column:
-            if id_column not in df.columns:
+            if id_column not in columns:
                 raise ValueError(
                     f"ID column '{id_column}' was not found in the ground "
-                    f"truth file. Available columns: {list(df.columns)[:20]}"
+                    f"truth file. Available columns: {list(columns)[:20]}"
                 )
             return id_column
         candidates = ["document_id", "doc_id", "id", "filename", "file_name"]
-        id_col = next((c for c in candidates if c in df.columns), "_index")
-        if id_col == "_index":
-            df["_index"] = df.index
-        return id_col
-
-    @staticmethod
-    def _collect_rows(
-        df: pd.DataFrame,
-        id_col: str,
-        result: Dict[str, Dict],
-        *,
-        source: str,
-        merge: bool = False,
-    ) -> None:
-        """Convert dataframe rows into ``{doc_id: values}`` entries in ``result``.
-
-        - IDs are normalized with :func:`case_id_str` so they produce the same
-          keys as preprocessing's document names (e.g. 123.0 → "123").
-        - Rows that contain data but no ID, and duplicate IDs within the same
-          table, raise instead of silently dropping/overwriting rows.
-        - Fully empty (phantom) rows are skipped.
-        - With ``merge=True`` an ID already present in ``result`` (from an
-          earlier Excel sheet) is deep-merged instead of treated as duplicate.
-        """
-
-        def _cell_is_na(v: Any) -> bool:
-            # ``df.where(pd.notna(df), None)`` does not reliably yield None
-            # for nullable dtypes (pandas keeps pd.NA) — check both.
-            if v is None:
-                return True
+        return next((c for c in candidates if c in columns), "_index")
+
+    def _iter_csv(
+        self, source: BinaryIO, id_column: Optional[str] = None
+    ) -> Iterator[tuple[str, Dict]]:
+        """Parse CSV ground truth in two passes over row blocks: the first
+        settles each column's type (:class:`_ColumnTypes`), the second
+        yields the rows."""
+        encoding = detect_stream_encoding(source, settings.CSV_ENCODING_FALLBACK_CHAIN)
+
+        def read(**kwargs: Any) -> Any:
+            source.seek(0)
             try:
-                return bool(pd.isna(v))
-            except (TypeError, ValueError):
-                return False
-
-        rows_missing_id: List[int] = []
-        duplicate_ids: List[str] = []
-        seen: set[str] = set()
-
-        for idx, row in df.iterrows():
-            values: Dict[str, Any] = {}
-            for col in df.columns:
-                if col == id_col or _cell_is_na(row[col]):
-                    continue
-                keys = str(col).split(".")
-                current = values
-                for key in keys[:-1]:
-                    if key not in current or not isinstance(current[key], dict):
-                        current[key] = {}
-                    current = current[key]
-                current[keys[-1]] = row[col]
-
-            raw_id = row[id_col]
-            if _cell_is_na(raw_id) or str(raw_id).strip() == "":
-                if values:
-                    rows_missing_id.append(int(cast(Any, idx)))
-                continue  # fully empty (phantom) rows are skipped
-            if not values:
-                continue
-
-            doc_id = case_id_str(raw_id)
-            if doc_id in seen:
-                duplicate_ids.append(doc_id)
-                continue
-            seen.add(doc_id)
-
-            jsonable = make_jsonable(values)
-            if merge and doc_id in result:
-                _deep_merge_dicts(result[doc_id], jsonable)
-            else:
-                result[doc_id] = jsonable
-
-        if rows_missing_id:
-            raise ValueError(
-                f"{len(rows_missing_id)} row(s) in the ground truth {source} "
-                f"have data but no value in ID column '{id_col}' "
-                f"(row indices: {rows_missing_id[:10]}). Fill in the missing "
-                "IDs or choose a different ID column."
-            )
-        if duplicate_ids:
-            raise ValueError(
-                f"Duplicate IDs in the ground truth {source}: "
-                f"{sorted(set(duplicate_ids))[:10]}. Each row must have a "
-                "unique ID."
-            )
+                # Undecodable bytes are replaced rather than failing the file.
+                return pd.read_csv(
+                    source, encoding=encoding, encoding_errors="replace", **kwargs
+                )
+            except pd.errors.EmptyDataError:
+                raise ValueError("The ground truth CSV file is empty.")
 
-    def _parse_csv(self, content: bytes, id_column: Optional[str] = None) -> Dict:
-        """Parse CSV ground truth."""
-        encoding = detect_text_encoding(content, settings.CSV_ENCODING_FALLBACK_CHAIN)
-        try:
-            df = pd.read_csv(io.BytesIO(content), encoding=encoding)
-        except UnicodeDecodeError:
-            # Nothing decoded cleanly — decode leniently rather than failing.
-            cleaned = content.decode(encoding, errors="replace").encode("utf-8")
-            df = pd.read_csv(io.BytesIO(cleaned))
-        except pd.errors.EmptyDataError:
-            raise ValueError("The ground truth CSV file is empty.")
-        df = df.convert_dtypes()
-        df = df.where(pd.notna(df), None)
         # Trim header whitespace so columns match what get_available_columns
         # showed when the user picked the ID column.
-        df.columns = [str(c).strip() for c in df.columns]
-
-        id_col = self._resolve_id_column(df, id_column)
-        result: Dict[str, Dict] = {}
-        self._collect_rows(df, id_col, result, source="CSV file")
-        if not result:
+        header = list(read(nrows=0).columns)
+        id_col = self._resolve_id_column([str(c).strip() for c in header], id_column)
+
+        chunk_rows = settings.GROUND_TRUTH_PARSE_CHUNK_ROWS
+        types = _ColumnTypes()
+        with read(chunksize=chunk_rows) as blocks:
+            for block in blocks:
+                types.observe(block.convert_dtypes())
+        dtypes, raw = types.resolve()
+
+        table = _TableRows(id_col, source="CSV file")
+        found = False
+        # By position: a name key would also match a duplicate header's
+        # mangled twin ("a" and "a.1").
+        raw_dtype = {i: str for i, name in enumerate(header) if name in raw}
+        with read(chunksize=chunk_rows, dtype=raw_dtype) as blocks:
+            for block in blocks:
+                df = _typed_block(block, dtypes, raw)
+                df.columns = [str(c).strip() for c in df.columns]
+                if id_col == "_index":
+                    df["_index"] = df.index
+                for document in table.rows(df):
+                    found = True
+                    yield document
+        table.check()
+        if not found:
             raise ValueError(
                 "No documents could be parsed from the ground truth file "
                 "(no rows with both an ID and at least one value)."
             )
-        return result
 
-    def _parse_excel(self, content: bytes, id_column: Optional[str] = None) -> Dict:
-        """Parse XLSX ground truth (multi-sheet, dot notation)."""
+    @staticmethod
+    def _excel_blocks(
+        worksheet: Any,
+        chunk_rows: int,
+        width: Optional[int] = None,
+        raw: Optional[set[str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """A sheet's data rows as DataFrames of ``chunk_rows`` rows each,
+        indexed by row position as one whole-sheet read would be.
+
+        Rows are padded to ``width`` (default: the widest row of the block)
+        and parsed by pandas' ``TextParser`` exactly as ``read_excel`` does;
+        ``raw`` columns keep their cell values untyped.
+        """
+        rows = _excel_rows(worksheet)
+        header = next(rows, None)
+        if header is None:
+            return
+        dtype = dict.fromkeys(raw, object) if raw else None
+        offset = 0
+        while batch := list(islice(rows, chunk_rows)):
+            w = width or max(len(header), *(len(r) for r in batch))
+            data = [r + [""] * (w - len(r)) for r in [header, *batch]]
+            block = TextParser(
+                data, header=0, skip_blank_lines=False, dtype=dtype
+            ).read()
+            block.index = pd.RangeIndex(offset, offset + len(block))
+            offset += len(block)
+            yield block
+
+    def _iter_excel(
+        self, source: BinaryIO, id_column: Optional[str] = None
+    ) -> Iterator[tuple[str, Dict]]:
+        """Parse XLSX ground truth (multi-sheet, dot notation), streaming
+        each sheet twice with openpyxl in read-only mode."""
         try:
-            xls = pd.ExcelFile(io.BytesIO(content))
+            workbook = load_workbook(
+                source, read_only=True, data_only=True, keep_links=False
+            )
         except Exception as e:
             raise ValueError(f"Invalid Excel file: {e}")
 
-        result: Dict[str, Dict] = {}
+        chunk_rows = settings.GROUND_TRUTH_PARSE_CHUNK_ROWS
+        # The same ID appearing on different sheets deep-merges (multi-sheet
+        # dot-notation feature), so several sheets are collected first.
+        merged = _MergedRows() if len(workbook.sheetnames) > 1 else None
+        found = False
         sheets_missing_id: List[str] = []
-        for sheet_name in xls.sheet_names:
-            try:
-                df = xls.parse(sheet_name)
-            except Exception as e:
-                raise ValueError(f"Failed to read sheet '{sheet_name}': {e}")
-            if df is None or df.empty:
-                continue
-
-            df = df.convert_dtypes()
-            df = df.where(pd.notna(df), None)
-            df.columns = [str(c).strip() for c in df.columns]
-
-            if id_column:
-                if id_column not in df.columns:
-                    # A sheet without the chosen ID column can't be matched —
-                    # skip it rather than silently keying rows by row number.
-                    sheets_missing_id.append(str(sheet_name))
-                    continue
-                id_col = id_column
-            else:
-                candidates = ["document_id", "doc_id", "id", "filename", "file_name"]
-                id_col = next((c for c in candidates if c in df.columns), "_index")
-                if id_col == "_index":
-                    df["_index"] = df.index
-
-            # merge=True: the same ID appearing on different sheets deep-merges
-            # (multi-sheet dot-notation feature); duplicates within one sheet
-            # still raise inside _collect_rows.
-            self._collect_rows(
-                df,
-                id_col,
-                result,
-                source=f"Excel sheet '{sheet_name}'",
-                merge=True,
-            )
-
-        if id_column and sheets_missing_id and not result:
+        try:
+            for sheet_name in workbook.sheetnames:
+                worksheet = workbook[sheet_name]
+                try:
+                    types = _ColumnTypes(excel=True)
+                    width = 0
+                    for block in self._excel_blocks(worksheet, chunk_rows):
+                        types.observe(block.convert_dtypes())
+                        width = max(width, len(block.columns))
+                    dtypes, raw = types.resolve()
+                    first = next(
+                        self._excel_blocks(worksheet, chunk_rows, width, raw), None
+                    )
+                except Exception as e:
+                    raise ValueError(f"Failed to read sheet '{sheet_name}': {e}")
+                if first is None:
+                    continue  # header only, or an empty sheet
+
+                columns = [str(c).strip() for c in first.columns]
+                if id_column:
+                    if id_column not in columns:
+                        # A sheet without the chosen ID column can't be
+                        # matched — skip it rather than silently keying rows
+                        # by row number.
+                        sheets_missing_id.append(str(sheet_name))
+                        continue
+                    id_col = id_column
+                else:
+                    id_col = self._resolve_id_column(columns, None)
+
+                # Duplicates within one sheet still raise (_TableRows.check).
+                table = _TableRows(id_col, source=f"Excel sheet '{sheet_name}'")
+                for block in self._excel_blocks(worksheet, chunk_rows, width, raw):
+                    df = _typed_block(block, dtypes, raw)
+                    df.columns = columns
+                    if id_col == "_index":
+                        df["_index"] = df.index
+                    for doc_id, values in table.rows(df):
+                        if merged is not None:
+                            merged.merge(doc_id, values)
+                        else:
+                            found = True
+                            yield doc_id, values
+                table.check()
+
+            if merged is not None and merged.count:
+                found = True
+                yield from merged.items()
+        finally:
+            if merged is not None:
+                merged.close()
+            workbook.close()
+
+        if id_column and sheets_missing_id and not found:
             raise ValueError(
                 f"ID column '{id_column}' was not found in any sheet of the "
                 f"ground truth file (sheets: {sheets_missing_id[:10]})."
             )
-        if not result:
+        if not found:
             raise ValueError(
                 "No documents could be parsed from the ground truth file "
                 "(no rows with both an ID and at least one value)."
             )
-        return result
 
 
 class ValueComparator:
-    """Compare values with different methods."""
+    """Compare values with different methods.
+
+    :meth:`compare` scores one (ground truth, prediction) pair;
+    :meth:`compare_batch` scores a whole column (one field across every
+    document) and returns exactly the records ``compare`` would.
+    """
 
     def compare(
         self,
@@ -1048,14 +1634,9 @@ class ValueComparator:
         # scalar comparators, where it would convert to None mid-way and be
         # scored as a *substitution* (both a false positive AND false negative),
         # wrongly depressing precision on every field the model left blank.
-        gt_missing = _is_missing(gt_value)
-        pred_missing = _is_missing(pred_value)
-        if gt_missing and pred_missing:
-            return {"is_correct": True, "error_type": None}
-        if pred_missing:
-            return {"is_correct": False, "error_type": "missing"}
-        if gt_missing:
-            return {"is_correct": False, "error_type": "extra"}
+        missing = _missing_result(_is_missing(gt_value), _is_missing(pred_value))
+        if missing is not None:
+            return missing
         # Array-valued fields: compare element-wise as sets (order-independent).
         # Previously `_get_nested_value` collapsed arrays to their first element,
         # so a 5-item lab-values list scored "correct" if the first matched.
@@ -1080,6 +1661,83 @@ class ValueComparator:
         else:
             return self._exact_compare(gt_value, pred_value, options)
 
+    def compare_batch(
+        self,
+        gt_values: Sequence[Any],
+        pred_values: Sequence[Any],
+        field_type: str,
+        method: str,
+        options: Dict,
+    ) -> List[Dict]:
+        """Compare one field across many documents at once.
+
+        Returns what ``[compare(g, p, ...) for g, p in zip(...)]`` would. The
+        missing and list masks are computed once per column; pairs with a
+        missing value are scored from them and pairs with a list take the
+        scalar list comparison. The rest are converted once per distinct
+        value and compared column-wise — ``rapidfuzz.process.cpdist`` for
+        fuzzy, numpy for numeric tolerance, pre-normalised lookups for the
+        others.
+        """
+        if len(gt_values) != len(pred_values):
+            raise ValueError("gt_values and pred_values differ in length")
+        results: List[Optional[Dict]] = [None] * len(gt_values)
+        gt_missing, gt_lists = _missing_and_lists(gt_values)
+        pred_missing, pred_lists = _missing_and_lists(pred_values)
+        either = gt_missing | pred_missing
+        for i, gm, pm in zip(
+            np.flatnonzero(either).tolist(),
+            gt_missing[either].tolist(),
+            pred_missing[either].tolist(),
+        ):
+            results[i] = _missing_result(gm, pm)
+        listed = ~either & (gt_lists | pred_lists)
+        for i in np.flatnonzero(listed).tolist():
+            results[i] = self._compare_list(
+                gt_values[i], pred_values[i], field_type, method, options
+            )
+        positions = np.flatnonzero(~(either | listed)).tolist()
+        if positions:
+            convert = self._column_converter(field_type)
+            column = self._compare_converted(
+                list(map(convert, map(gt_values.__getitem__, positions))),
+                list(map(convert, map(pred_values.__getitem__, positions))),
+                method,
+                options,
+            )
+            for i, result in zip(positions, column):
+                results[i] = result
+        return cast(List[Dict], results)
+
+    def _column_converter(self, field_type: str) -> Callable[[Any], Any]:
+        """``_convert_value`` for one column of ``field_type``, whose values
+        are known not to be missing."""
+
+        if field_type not in ("number", "boolean", "date"):
+            return str
+
+        def convert(value: Any) -> Any:
+            return self._convert_present(value, field_type)
+
+        if field_type in ("boolean", "date"):
+            # Few distinct values, costly to parse: convert each once.
+            return _memoized(convert)
+        return convert
+
+    def _compare_converted(
+        self, gts: List[Any], preds: List[Any], method: str, options: Dict
+    ) -> List[Dict]:
+        """Column-wise counterpart of ``compare``'s method dispatch, for
+        converted values that are neither missing nor lists."""
+        compare_column = {
+            "fuzzy": self._fuzzy_compare_column,
+            "numeric": self._numeric_compare_column,
+            "boolean": self._boolean_compare_column,
+            "category": self._category_compare_column,
+            "date": self._date_compare_column,
+        }.get(method, self._exact_compare_column)
+        return compare_column(gts, preds, options)
+
     def _compare_list(
         self,
         gt_value: Any,
@@ -1097,45 +1755,56 @@ class ValueComparator:
         """
         gt_list = gt_value if isinstance(gt_value, list) else [gt_value]
         pred_list = pred_value if isinstance(pred_value, list) else [pred_value]
-
-        # Fast path: equal-length and every element matches in order.
-        if len(gt_list) == len(pred_list) and all(
-            self.compare(g, p, field_type, method, options)["is_correct"]
-            for g, p in zip(gt_list, pred_list)
-        ):
-            return {"is_correct": True, "error_type": None, "confidence_score": 1.0}
-
-        # Set semantics via *maximum* bipartite matching (Kuhn's algorithm).
-        # A greedy first-match loop can wrongly report "missing"/"extra" when a
-        # predicted element matches several GT elements (possible under fuzzy /
-        # numeric tolerance): it may consume an element another GT element
-        # needed, even though a complete matching exists. Maximum matching finds
-        # a complete pairing whenever one is possible.
         n_gt, n_pred = len(gt_list), len(pred_list)
-        adj: list[list[int]] = []
-        for g in gt_list:
-            matches = [
-                pi
-                for pi, p in enumerate(pred_list)
-                if self.compare(g, p, field_type, method, options)["is_correct"]
+
+        # Score every (GT, predicted) pair once. Plain elements are converted
+        # once each and compared column-wise; pairs involving a missing or
+        # nested-list element take the scalar path.
+        def plain(values: list) -> list[int]:
+            return [
+                i
+                for i, v in enumerate(values)
+                if not (_is_missing(v) or isinstance(v, list))
             ]
-            adj.append(matches)
 
-        match_pred = [-1] * n_pred  # predicted index -> matched GT index
+        gt_plain, pred_plain = plain(gt_list), plain(pred_list)
+        matches = [[False] * n_pred for _ in range(n_gt)]
+        if gt_plain and pred_plain:
+            convert = self._column_converter(field_type)
+            gt_conv = [convert(gt_list[i]) for i in gt_plain]
+            pred_conv = [convert(pred_list[i]) for i in pred_plain]
+            column = iter(
+                self._compare_converted(
+                    [g for g in gt_conv for _ in pred_conv],
+                    pred_conv * len(gt_conv),
+                    method,
+                    options,
+                )
+            )
+            for gi in gt_plain:
+                row = matches[gi]
+                for pi in pred_plain:
+                    row[pi] = next(column)["is_correct"]
+        gt_plain_set, pred_plain_set = set(gt_plain), set(pred_plain)
+        for gi, g in enumerate(gt_list):
+            for pi, p in enumerate(pred_list):
+                if gi not in gt_plain_set or pi not in pred_plain_set:
+                    matches[gi][pi] = self.compare(g, p, field_type, method, options)[
+                        "is_correct"
+                    ]
+        adj = [[pi for pi in range(n_pred) if row[pi]] for row in matches]
 
-        def _augment(gi: int, visited: list[bool]) -> bool:
-            for pi in adj[gi]:
-                if not visited[pi]:
-                    visited[pi] = True
-                    if match_pred[pi] == -1 or _augment(match_pred[pi], visited):
-                        match_pred[pi] = gi
-                        return True
-            return False
+        # Fast path: equal-length and every element matches in order.
+        if n_gt == n_pred and all(matches[i][i] for i in range(n_gt)):
+            return {"is_correct": True, "error_type": None, "confidence_score": 1.0}
 
-        matched = 0
-        for gi in range(n_gt):
-            if _augment(gi, [False] * n_pred):
-                matched += 1
+        # Set semantics via *maximum* bipartite matching. A greedy first-match
+        # loop can wrongly report "missing"/"extra" when a predicted element
+        # matches several GT elements (possible under fuzzy / numeric
+        # tolerance): it may consume an element another GT element needed,
+        # even though a complete matching exists. Maximum matching finds a
+        # complete pairing whenever one is possible.
+        matched = _max_bipartite_matching(adj, n_pred)
 
         if matched < n_gt:
             # At least one GT element has no distinct predicted match → missing.
@@ -1153,6 +1822,10 @@ class ValueComparator:
         """Convert value to appropriate type."""
         if _is_missing(value):
             return None
+        return self._convert_present(value, field_type)
+
+    def _convert_present(self, value: Any, field_type: str) -> Any:
+        """``_convert_value`` for a value that is not missing."""
         if field_type == "number":
             try:
                 return float(value)
@@ -1301,6 +1974,212 @@ class ValueComparator:
             "confidence_score": 1.0 if is_correct else 0.0,
         }
 
+    # ── Column-wise counterparts of the scalar comparators above ──────────
+    # Each takes already-converted values and must return, pair for pair,
+    # what its scalar method returns (tests/test_value_comparator_batch.py).
+
+    def _exact_compare_column(
+        self, gts: List[Any], preds: List[Any], options: Dict
+    ) -> List[Dict]:
+        if options.get("case_sensitive", False):
+            norm = _memoized(lambda v: str(v).strip())
+        else:
+            norm = _memoized(lambda v: str(v).lower().strip())
+        results = []
+        for gt, pred in zip(gts, preds):
+            is_correct = norm(gt) == norm(pred)
+            results.append(
+                {
+                    "is_correct": is_correct,
+                    "error_type": "mismatch" if not is_correct else None,
+                    "confidence_score": 1.0 if is_correct else 0.0,
+                }
+            )
+        return results
+
+    def _fuzzy_compare_column(
+        self, gts: List[Any], preds: List[Any], options: Dict
+    ) -> List[Dict]:
+        # thefuzz's scorers are rapidfuzz's plus rounding to int (half to
+        # even, as np.rint) and, for token_sort_ratio, full_process with
+        # force_ascii on both sides.
+        threshold = options.get("threshold", 85)
+        allow_partial = options.get("allow_partial_match", False)
+        lower = _memoized(lambda v: str(v).lower().strip())
+        gt_strs = [lower(v) for v in gts]
+        pred_strs = [lower(v) for v in preds]
+
+        def scores(scorer, queries, choices):
+            return np.rint(
+                rapidfuzz.process.cpdist(
+                    queries, choices, scorer=scorer, dtype=np.float64
+                )
+            )
+
+        processed = _memoized(lambda v: full_process(v, force_ascii=True))
+        score = np.maximum(
+            scores(rapidfuzz.fuzz.ratio, gt_strs, pred_strs),
+            scores(
+                rapidfuzz.fuzz.token_sort_ratio,
+                [processed(v) for v in gt_strs],
+                [processed(v) for v in pred_strs],
+            ),
+        )
+        if allow_partial:
+            score = np.maximum(
+                score, scores(rapidfuzz.fuzz.partial_ratio, gt_strs, pred_strs)
+            )
+        results = []
+        for value in score.astype(np.int64).tolist():
+            is_correct = value >= threshold
+            results.append(
+                {
+                    "is_correct": is_correct,
+                    "error_type": "fuzzy_mismatch" if not is_correct else None,
+                    "confidence_score": value / 100.0,
+                }
+            )
+        return results
+
+    def _numeric_compare_column(
+        self, gts: List[Any], preds: List[Any], options: Dict
+    ) -> List[Dict]:
+        tolerance = options.get("tolerance", 0.001)
+        relative = options.get("relative", False)
+        if not isinstance(tolerance, (int, float)):
+            return [self._numeric_compare(g, p, options) for g, p in zip(gts, preds)]
+
+        def to_float(value: Any) -> Optional[float]:
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                return None
+
+        gt_nums = [to_float(v) for v in gts]
+        pred_nums = [to_float(v) for v in preds]
+        valid = [
+            i
+            for i, (g, p) in enumerate(zip(gt_nums, pred_nums))
+            if g is not None and p is not None
+        ]
+        gt_arr = np.array([gt_nums[i] for i in valid], dtype=np.float64)
+        pred_arr = np.array([pred_nums[i] for i in valid], dtype=np.float64)
+        with np.errstate(all="ignore"):
+            diff = np.abs(gt_arr - pred_arr)
+            if relative:
+                nonzero = gt_arr != 0
+                diff = np.where(
+                    nonzero,
+                    np.abs((gt_arr - pred_arr) / np.where(nonzero, gt_arr, 1.0)),
+                    diff,
+                )
+            correct = (diff <= tolerance).tolist()
+            confidence = (1.0 - np.minimum(diff, 1.0)).tolist()
+
+        results: List[Optional[Dict]] = [None] * len(gts)
+        for i, is_correct, score in zip(valid, correct, confidence):
+            results[i] = {
+                "is_correct": is_correct,
+                "error_type": "numeric_mismatch" if not is_correct else None,
+                "confidence_score": score,
+            }
+        return [
+            result
+            if result is not None
+            else {
+                "is_correct": False,
+                "error_type": "type_error",
+                "confidence_score": 0.0,
+            }
+            for result in results
+        ]
+
+    def _boolean_compare_column(
+        self, gts: List[Any], preds: List[Any], options: Dict
+    ) -> List[Dict]:
+        to_bool = _memoized(self._to_boolean)
+        results = []
+        for gt, pred in zip(gts, preds):
+            gt_bool, pred_bool = to_bool(gt), to_bool(pred)
+            if gt_bool is None or pred_bool is None:
+                results.append(
+                    {
+                        "is_correct": False,
+                        "error_type": "type_error",
+                        "confidence_score": 0.0,
+                    }
+                )
+                continue
+            is_correct = gt_bool == pred_bool
+            results.append(
+                {
+                    "is_correct": is_correct,
+                    "error_type": "boolean_mismatch" if not is_correct else None,
+                    "confidence_score": 1.0 if is_correct else 0.0,
+                }
+            )
+        return results
+
+    def _category_compare_column(
+        self, gts: List[Any], preds: List[Any], options: Dict
+    ) -> List[Dict]:
+        mappings = options.get("mappings", {})
+        lower = _memoized(lambda v: str(v).lower().strip())
+
+        def accepted(gt_str: str) -> set:
+            valid_values = mappings[gt_str]
+            if not isinstance(valid_values, (list, tuple, set)):
+                valid_values = [valid_values]
+            return {str(v).lower().strip() for v in valid_values}
+
+        accepted = _memoized(accepted)
+        results = []
+        for gt, pred in zip(gts, preds):
+            gt_str, pred_str = lower(gt), lower(pred)
+            if gt_str == pred_str:
+                results.append(
+                    {"is_correct": True, "error_type": None, "confidence_score": 1.0}
+                )
+            elif gt_str in mappings and pred_str in accepted(gt_str):
+                results.append(
+                    {"is_correct": True, "error_type": None, "confidence_score": 0.9}
+                )
+            else:
+                results.append(
+                    {
+                        "is_correct": False,
+                        "error_type": "category_mismatch",
+                        "confidence_score": 0.0,
+                    }
+                )
+        return results
+
+    def _date_compare_column(
+        self, gts: List[Any], preds: List[Any], options: Dict
+    ) -> List[Dict]:
+        to_date = _memoized(self._to_date)
+        results = []
+        for gt, pred in zip(gts, preds):
+            gt_date, pred_date = to_date(gt), to_date(pred)
+            if gt_date is None or pred_date is None:
+                results.append(
+                    {
+                        "is_correct": False,
+                        "error_type": "date_parse_error",
+                        "confidence_score": 0.0,
+                    }
+                )
+                continue
+            is_correct = gt_date == pred_date
+            results.append(
+                {
+                    "is_correct": is_correct,
+                    "error_type": "date_mismatch" if not is_correct else None,
+                    "confidence_score": 1.0 if is_correct else 0.0,
+                }
+            )
+        return results
+
     def _to_boolean(self, value: Any) -> Optional[bool]:
         """Convert value to boolean.
 
@@ -1311,11 +2190,9 @@ class ValueComparator:
         if isinstance(value, bool):
             return value
         str_val = str(value).lower().strip()
-        true_values = {"true", "yes", "1", "y", "t", "on"}
-        false_values = {"false", "no", "0", "n", "f", "off"}
-        if str_val in true_values:
+        if str_val in _TRUE_TOKENS:
             return True
-        elif str_val in false_values:
+        elif str_val in _FALSE_TOKENS:
             return False
         else:
             # Unrecognised token — not a boolean. Returning None lets the
@@ -1326,32 +2203,11 @@ class ValueComparator:
         """Convert value to date."""
         if isinstance(value, datetime):
             return value.date()
+        if isinstance(value, date):
+            return value
         if _is_missing(value):
             return None
-        str_val = str(value).strip()
-        # Try common date formats
-        formats = [
-            "%Y-%m-%d",
-            "%d/%m/%Y",
-            "%m/%d/%Y",
-            "%Y/%m/%d",
-            "%d-%m-%Y",
-            "%m-%d-%Y",
-            "%Y%m%d",
-            "%d.%m.%Y",
-        ]
-        for fmt in formats:
-            try:
-                return datetime.strptime(str_val, fmt).date()
-            except ValueError:
-                continue
-        # Try pandas parser
-        try:
-            return pd.to_datetime(str_val).date()
-        except ParserError:
-            return None
-        except ValueError:
-            return None
+        return _parse_date(str(value).strip())
 
 
 class MetricsCalculator:
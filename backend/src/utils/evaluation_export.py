@@ -0,0 +1,285 @@
+# backend/src/utils/evaluation_export.py
+"""Streaming writers for evaluation reports (CSV, XLSX and the ZIP bundle).
+
+Field-level details are one row per document and field, so an evaluation of
+20k documents against a 40-field schema exports 800k rows. Building those as
+pandas DataFrames and in-memory workbooks held the whole report in memory
+several times over. Everything here works row by row instead.
+
+Design notes:
+
+* Report sections are plain row iterators (``summary_rows``,
+  ``field_metric_rows``, ``field_detail_rows``, ``document_metric_rows``).
+  The same iterators feed the CSV report, the XLSX workbook and the ZIP
+  entries, so the three formats cannot drift apart.
+* ``field_detail_rows`` reads ``EvaluationMetric`` as plain column tuples
+  through a server-side cursor (``yield_per``). Rows never enter the session's
+  identity map, and one query covers every evaluation of the export.
+* CSV is encoded in small chunks through :class:`SafeCsvWriter`, so every
+  cell is neutralized against formula injection, ZIP members included.
+* XLSX uses an openpyxl ``write_only`` workbook, which writes each sheet to a
+  temporary file as rows are appended. The finished workbook is saved into a
+  spooled temporary file and streamed from there. Strings that start with
+  ``=`` are stored as text, never as formulas.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import tempfile
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from typing import IO, Any
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from .csv_safety import SafeCsvWriter
+from .helpers import trial_display_label
+
+# Rows fetched per round-trip from the server-side cursor.
+_FETCH_ROWS = 1000
+# Rows encoded per CSV chunk handed to the response / ZIP member.
+_CSV_CHUNK_ROWS = 500
+# A finished workbook stays in memory up to this size, then moves to disk.
+_XLSX_SPOOL_BYTES = 8 * 1024 * 1024
+_READ_CHUNK_BYTES = 64 * 1024
+
+SUMMARY_COLUMNS = [
+    "Evaluation ID",
+    "Trial",
+    "Trial Number",
+    "Trial ID",
+    "Model",
+    "Ground Truth",
+    "Accuracy",
+    "Precision",
+    "Recall",
+    "F1 Score",
+    "Total Documents",
+    "Total Fields",
+    "Created At",
+]
+
+# Field-level metrics are exported with precision/recall/F1 alongside
+# accuracy — a researcher comparing fields usually cares more about recall
+# (what the model missed) than accuracy alone.
+FIELD_METRIC_COLUMNS = [
+    "Evaluation ID",
+    "Field Name",
+    "Accuracy",
+    "Precision",
+    "Recall",
+    "F1 Score",
+    "Total Count",
+    "Correct Count",
+    "Error Count",
+]
+
+DOCUMENT_METRIC_COLUMNS = [
+    "Evaluation ID",
+    "Document ID",
+    "Accuracy",
+    "Correct Fields",
+    "Total Fields",
+    "Missing Fields",
+    "Incorrect Fields",
+    "Error",
+]
+
+
+def field_detail_columns(include_errors: bool) -> list[str]:
+    columns = [
+        "Evaluation ID",
+        "Document ID",
+        "Field Name",
+        "Ground Truth",
+        "Prediction",
+        "Is Correct",
+    ]
+    if include_errors:
+        columns += ["Error Type", "Confidence"]
+    return columns
+
+
+def summary_rows(evaluations) -> Iterator[list]:
+    """One row per ``(evaluation, trial)`` pair, in :data:`SUMMARY_COLUMNS` order."""
+    for eval_obj, trial in evaluations:
+        gt = eval_obj.ground_truth
+        metrics = eval_obj.metrics or {}
+        yield [
+            eval_obj.id,
+            trial_display_label(trial),
+            trial.project_trial_number,
+            eval_obj.trial_id,
+            trial.llm_model,
+            gt.name if gt else "Unknown",
+            metrics.get("accuracy", 0),
+            metrics.get("precision", 0),
+            metrics.get("recall", 0),
+            metrics.get("f1_score", 0),
+            metrics.get("total_documents", 0),
+            metrics.get("total_fields", 0),
+            eval_obj.created_at.isoformat(),
+        ]
+
+
+def field_metric_rows(evaluations) -> Iterator[list]:
+    for eval_obj, _ in evaluations:
+        for field, metrics in (eval_obj.field_metrics or {}).items():
+            yield [
+                eval_obj.id,
+                field,
+                metrics.get("accuracy", 0),
+                metrics.get("precision", 0),
+                metrics.get("recall", 0),
+                metrics.get("f1_score", 0),
+                metrics.get("total_count", 0),
+                metrics.get("correct_count", 0),
+                metrics.get("error_count", 0),
+            ]
+
+
+def document_metric_rows(evaluations) -> Iterator[list]:
+    for eval_obj, _ in evaluations:
+        for doc_metrics in eval_obj.document_metrics or []:
+            yield [
+                eval_obj.id,
+                doc_metrics.get("document_id"),
+                doc_metrics.get("accuracy"),
+                doc_metrics.get("correct_fields"),
+                doc_metrics.get("total_fields"),
+                ";".join(doc_metrics.get("missing_fields", [])),
+                ";".join(doc_metrics.get("incorrect_fields", [])),
+                doc_metrics.get("error", ""),
+            ]
+
+
+def field_detail_rows(
+    db: Session, evaluation_ids: list[int], include_errors: bool = False
+) -> Iterator[list]:
+    """Stored per-field outcomes of ``evaluation_ids``, streamed.
+
+    One query for all evaluations, read through a server-side cursor in
+    batches of ``_FETCH_ROWS``. Rows are grouped by evaluation in the order
+    given, in :func:`field_detail_columns` order.
+    """
+    if not evaluation_ids:
+        return
+    metric = models.EvaluationMetric
+    columns = [
+        metric.evaluation_id,
+        metric.document_id,
+        metric.field_name,
+        metric.ground_truth_value,
+        metric.predicted_value,
+        metric.is_correct,
+    ]
+    if include_errors:
+        columns += [metric.error_type, metric.confidence_score]
+    position = case(
+        {eval_id: i for i, eval_id in enumerate(evaluation_ids)},
+        value=metric.evaluation_id,
+    )
+    result = db.execute(
+        select(*columns)
+        .where(metric.evaluation_id.in_(evaluation_ids))
+        .order_by(position, metric.id)
+        .execution_options(yield_per=_FETCH_ROWS)
+    )
+    for partition in result.partitions():
+        for row in partition:
+            yield list(row)
+
+
+def peek_rows(rows: Iterable[list]) -> Iterator[list] | None:
+    """``rows`` as an iterator, or ``None`` if it is empty (for optional sections)."""
+    iterator = iter(rows)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return None
+    return chain([first], iterator)
+
+
+def iter_csv(rows: Iterable[Iterable[Any]], encoding: str = "utf-8") -> Iterator[bytes]:
+    """Encode ``rows`` as CSV in chunks of ``_CSV_CHUNK_ROWS`` rows."""
+    buf = io.StringIO()
+    writer = SafeCsvWriter(csv.writer(buf))
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= _CSV_CHUNK_ROWS:
+            yield buf.getvalue().encode(encoding)
+            buf.seek(0)
+            buf.truncate(0)
+            pending = 0
+    if buf.tell():
+        yield buf.getvalue().encode(encoding)
+
+
+def _xlsx_cell(ws, value: Any):
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    if not isinstance(value, str):
+        return value
+    value = ILLEGAL_CHARACTERS_RE.sub("", value)
+    if not value.startswith("="):
+        return value
+    # openpyxl stores any string starting with "=" as a formula.
+    cell = WriteOnlyCell(ws, value)
+    cell.data_type = "s"
+    return cell
+
+
+def write_xlsx(
+    sheets: Iterable[tuple[str, list[str], Iterable[Iterable[Any]]]],
+) -> IO[bytes]:
+    """Write ``(sheet name, header, rows)`` sheets into a write-only workbook.
+
+    Returns a spooled temporary file positioned at the start; the caller
+    streams it (:func:`iter_file`) and closes it. Sheets are consumed lazily
+    and in order, so ``rows`` may be generators backed by database cursors.
+    """
+    wb = Workbook(write_only=True)
+    wrote_sheet = False
+    for title, header, rows in sheets:
+        ws = wb.create_sheet(title=title)
+        ws.append(header)
+        for row in rows:
+            ws.append([_xlsx_cell(ws, value) for value in row])
+        wrote_sheet = True
+    if not wrote_sheet:
+        wb.create_sheet(title="Sheet")
+    spool = tempfile.SpooledTemporaryFile(max_size=_XLSX_SPOOL_BYTES)
+    try:
+        wb.save(spool)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def file_size(fileobj: IO[bytes]) -> int:
+    """Size of a seekable file without moving its read position."""
+    position = fileobj.tell()
+    size = fileobj.seek(0, io.SEEK_END)
+    fileobj.seek(position)
+    return size
+
+
+def iter_file(fileobj: IO[bytes]) -> Iterator[bytes]:
+    """Yield ``fileobj`` in chunks, closing it once exhausted (or abandoned)."""
+    try:
+        while chunk := fileobj.read(_READ_CHUNK_BYTES):
+            yield chunk
+    finally:
+        fileobj.close()
@@ -0,0 +1,379 @@
+# backend/src/utils/evaluation_jobs.py
+"""Background batch evaluation: evaluate several trials against one ground truth.
+
+``POST /evaluation/batch`` used to evaluate up to 200 trials one after another
+inside the request, which outlived ingress timeouts and pinned a web worker the
+whole time. It now records an :class:`~..models.EvaluationJob` and returns; the
+job runs on Celery (``celery/evaluation.py``), or inline when Celery is
+disabled. Trials that finish with ``advanced_options.auto_evaluate_groundtruth_id``
+set queue the same kind of job through :func:`queue_auto_evaluation`.
+
+Design notes:
+
+* Trials of one job are evaluated in parallel, at most
+  ``EVALUATION_JOB_CONCURRENCY`` at a time. Each evaluation runs in its own
+  thread with its own session; only the coordinating thread writes the job row.
+* A trial whose stored evaluation against this ground truth is still fresh
+  (no trial result changed since it was computed) is reported as ``reused``
+  without evaluating it again, unless the job forces recalculation. Submitting
+  a job identical to one still queued or running returns that job instead of
+  starting a second.
+* Progress is published per finished trial as ``evaluation_job_update``
+  websocket messages. The coordinating thread also bumps ``updated_at`` every
+  ``_HEARTBEAT_SECONDS`` so the orphan sweeper can tell a slow job from one
+  whose worker died.
+* A redelivered job resumes: trials already recorded in ``results`` are not
+  evaluated again, and a job that already reached a terminal state is skipped.
+"""
+
+import datetime as dt
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.dynamic_settings import get_settings
+from ..db.session import db_session
+
+logger = logging.getLogger(__name__)
+
+# How often the coordinating thread refreshes ``updated_at`` while trials are
+# still being evaluated. Well inside ORPHAN_STALE_SECONDS (default 120s).
+_HEARTBEAT_SECONDS = 15.0
+
+ACTIVE_STATUSES = (
+    models.EvaluationJobStatus.PENDING,
+    models.EvaluationJobStatus.PROCESSING,
+)
+
+
+def _broadcast_job_update(
+    job: models.EvaluationJob,
+    event: str = "progress",
+    trial: dict[str, Any] | None = None,
+) -> None:
+    """Publish the job's state to the project's websocket clients (best-effort)."""
+    try:
+        from .redis_broadcast import publish_task_update
+
+        publish_task_update(
+            {
+                "type": "evaluation_job_update",
+                "job_id": job.id,
+                "project_id": job.project_id,
+                "groundtruth_id": job.groundtruth_id,
+                "source": job.source,
+                "status": job.status.value
+                if hasattr(job.status, "value")
+                else str(job.status),
+                "trials_total": len(job.trial_ids or []),
+                "trials_done": job.trials_done,
+                "trials_failed": job.trials_failed,
+                "trial": trial,
+                "event": event,
+            }
+        )
+    except Exception as e:
+        logger.error("Error broadcasting evaluation job update: %s", e, exc_info=True)
+
+
+def find_active_job(
+    db: Session,
+    *,
+    project_id: int,
+    groundtruth_id: int,
+    trial_ids: list[int],
+    force_recalculate: bool,
+) -> models.EvaluationJob | None:
+    """A queued or running job for exactly these trials, if there is one."""
+    wanted = set(trial_ids)
+    candidates = db.execute(
+        select(models.EvaluationJob)
+        .where(
+            models.EvaluationJob.project_id == project_id,
+            models.EvaluationJob.groundtruth_id == groundtruth_id,
+            models.EvaluationJob.status.in_(ACTIVE_STATUSES),
+        )
+        .order_by(models.EvaluationJob.id.desc())
+    ).scalars()
+    for job in candidates:
+        if (
+            bool(job.force_recalculate) == force_recalculate
+            and set(job.trial_ids or []) == wanted
+        ):
+            return job
+    return None
+
+
+def create_job(
+    db: Session,
+    *,
+    project_id: int,
+    groundtruth_id: int,
+    trial_ids: list[int],
+    force_recalculate: bool = False,
+    created_by_id: int | None = None,
+    source: str = "batch",
+) -> tuple[models.EvaluationJob, bool]:
+    """Record a PENDING job, or return the identical active one.
+
+    Returns ``(job, created)``. Commits; the caller dispatches new jobs with
+    :func:`dispatch_job`.
+    """
+    trial_ids = list(dict.fromkeys(trial_ids))
+    existing = find_active_job(
+        db,
+        project_id=project_id,
+        groundtruth_id=groundtruth_id,
+        trial_ids=trial_ids,
+        force_recalculate=force_recalculate,
+    )
+    if existing is not None:
+        return existing, False
+
+    job = models.EvaluationJob(
+        project_id=project_id,
+        groundtruth_id=groundtruth_id,
+        created_by_id=created_by_id,
+        trial_ids=trial_ids,
+        force_recalculate=force_recalculate,
+        source=source,
+        status=models.EvaluationJobStatus.PENDING,
+        results=[],
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _broadcast_job_update(job, "created")
+    return job, True
+
+
+def dispatch_job(job_id: int) -> str:
+    """Queue the job on Celery, or run it inline when Celery is disabled.
+
+    Returns ``"celery"`` or ``"inline"``. Raises if the broker rejects the
+    message; the caller decides how to report that (see :func:`mark_failed`).
+    """
+    from ..celery.evaluation import evaluate_trials_job
+
+    if evaluate_trials_job is None:
+        run_job(job_id)
+        return "inline"
+    evaluate_trials_job.delay(job_id)
+    return "celery"
+
+
+def mark_failed(job_id: int, message: str) -> None:
+    """Finalize a job that never ran (e.g. it could not be queued)."""
+    with db_session() as db:
+        job = db.get(models.EvaluationJob, job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return
+        job.status = models.EvaluationJobStatus.FAILED
+        job.finished_at = dt.datetime.now(dt.UTC)
+        job.results = list(job.results or []) + [
+            {
+                "trial_id": None,
+                "status": "failed",
+                "evaluation_id": None,
+                "error": message,
+            }
+        ]
+        db.commit()
+        _broadcast_job_update(job, "failed")
+
+
+def queue_auto_evaluation(db: Session, trial: models.Trial) -> None:
+    """Queue an evaluation job for a trial that just completed, if it asked for one.
+
+    Opt-in per trial via ``advanced_options.auto_evaluate_groundtruth_id``.
+    Never raises: a failure to queue must not turn a finished trial into a
+    failed one.
+    """
+    try:
+        if trial.status != models.TrialStatus.COMPLETED:
+            return
+        groundtruth_id = (trial.advanced_options or {}).get(
+            "auto_evaluate_groundtruth_id"
+        )
+        if groundtruth_id is None:
+            return
+        groundtruth = db.execute(
+            select(models.GroundTruth.id).where(
+                models.GroundTruth.id == int(groundtruth_id),
+                models.GroundTruth.project_id == trial.project_id,
+            )
+        ).scalar_one_or_none()
+        if groundtruth is None:
+            logger.warning(
+                "Trial %s: auto-evaluation ground truth %s not in project %s",
+                trial.id,
+                groundtruth_id,
+                trial.project_id,
+            )
+            return
+        job, created = create_job(
+            db,
+            project_id=trial.project_id,
+            groundtruth_id=groundtruth,
+            trial_ids=[trial.id],
+            created_by_id=trial.created_by_id,
+            source="auto",
+        )
+        if created:
+            dispatch_job(job.id)
+    except Exception:
+        logger.exception("Trial %s: could not queue auto-evaluation", trial.id)
+
+
+def _evaluate_trial(
+    project_id: int, groundtruth_id: int, trial_id: int, force_recalculate: bool
+) -> dict[str, Any]:
+    """Evaluate one trial in its own session. Never raises."""
+    from .evaluation import EvaluationEngine
+
+    outcome: dict[str, Any] = {
+        "trial_id": trial_id,
+        "status": "failed",
+        "evaluation_id": None,
+        "error": None,
+    }
+    try:
+        with db_session() as db:
+            in_project = db.execute(
+                select(models.Trial.id).where(
+                    models.Trial.id == trial_id,
+                    models.Trial.project_id == project_id,
+                )
+            ).scalar_one_or_none()
+            if in_project is None:
+                outcome["error"] = f"Trial {trial_id} not found"
+                return outcome
+
+            with EvaluationEngine(db) as engine:
+                if not force_recalculate:
+                    fresh = engine.find_fresh_evaluation(trial_id, groundtruth_id)
+                    if fresh is not None:
+                        outcome.update(status="reused", evaluation_id=fresh.id)
+                        return outcome
+
+                evaluation = engine.evaluate_trial(
+                    trial_id=trial_id,
+                    groundtruth_id=groundtruth_id,
+                    force_recalculate=force_recalculate,
+                )
+            outcome.update(status="evaluated", evaluation_id=evaluation.id)
+            return outcome
+    except Exception as e:
+        # Full error server-side; only a category-only message is stored on
+        # the job (str(e) can contain DB internals / paths).
+        logger.warning("Error evaluating trial %s: %s", trial_id, e, exc_info=True)
+        outcome["error"] = f"Error evaluating trial {trial_id}"
+        return outcome
+
+
+def _record_outcomes(job_id: int, outcomes: list[dict[str, Any]]) -> None:
+    """Append finished trials to the job and refresh its heartbeat."""
+    with db_session() as db:
+        job = db.get(models.EvaluationJob, job_id)
+        if job is None:
+            return
+        job.results.extend(outcomes)
+        job.trials_done = len(job.results)
+        job.trials_failed = sum(1 for r in job.results if r["status"] == "failed")
+        job.updated_at = dt.datetime.now(dt.UTC)
+        db.commit()
+        for outcome in outcomes:
+            _broadcast_job_update(job, "progress", trial=outcome)
+
+
+def run_job(job_id: int) -> None:
+    """Evaluate every trial of a job and finalize it. Never raises."""
+    try:
+        _run_job(job_id)
+    except Exception as exc:
+        # Something escaped the per-trial handler (DB down while loading the
+        # job, ...). Without this the job would stay PROCESSING until the
+        # orphan sweeper caught it.
+        logger.exception("Evaluation job %s: catastrophic failure", job_id)
+        from ..middleware.error_handlers import internal_error_message
+
+        try:
+            mark_failed(
+                job_id, internal_error_message(exc, prefix="Evaluation job failed")
+            )
+        except Exception:
+            logger.exception("Evaluation job %s: could not mark FAILED", job_id)
+
+
+def _run_job(job_id: int) -> None:
+    with db_session() as db:
+        job = db.get(models.EvaluationJob, job_id)
+        if job is None:
+            logger.warning("Evaluation job %s: not found, skipping", job_id)
+            return
+        if job.status not in ACTIVE_STATUSES:
+            logger.warning(
+                "Evaluation job %s: already terminal (%s), skipping re-delivery",
+                job_id,
+                job.status,
+            )
+            return
+        job.status = models.EvaluationJobStatus.PROCESSING
+        job.started_at = job.started_at or dt.datetime.now(dt.UTC)
+        db.commit()
+        _broadcast_job_update(job, "started")
+
+        project_id = job.project_id
+        groundtruth_id = job.groundtruth_id
+        force_recalculate = bool(job.force_recalculate)
+        recorded = {r.get("trial_id") for r in job.results or []}
+        remaining = [t for t in job.trial_ids or [] if t not in recorded]
+
+    if remaining:
+        workers = min(get_settings().EVALUATION_JOB_CONCURRENCY, len(remaining))
+        with ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="evaluation-job"
+        ) as pool:
+            pending = {
+                pool.submit(
+                    _evaluate_trial,
+                    project_id,
+                    groundtruth_id,
+                    trial_id,
+                    force_recalculate,
+                )
+                for trial_id in remaining
+            }
+            while pending:
+                finished, pending = wait(
+                    pending, timeout=_HEARTBEAT_SECONDS, return_when=FIRST_COMPLETED
+                )
+                # An empty batch still refreshes updated_at (heartbeat).
+                _record_outcomes(job_id, [f.result() for f in finished])
+
+    with db_session() as db:
+        job = db.get(models.EvaluationJob, job_id)
+        if job is None:
+            return
+        results = job.results or []
+        failed = sum(1 for r in results if r["status"] == "failed")
+        if results and failed == len(results):
+            job.status = models.EvaluationJobStatus.FAILED
+            event = "failed"
+        else:
+            job.status = models.EvaluationJobStatus.COMPLETED
+            event = "completed"
+        job.finished_at = dt.datetime.now(dt.UTC)
+        db.commit()
+        _broadcast_job_update(job, event)
+        logger.info(
+            "Evaluation job %s: %s (%d trials, %d failed)",
+            job_id,
+            event,
+            len(results),
+            failed,
+        )
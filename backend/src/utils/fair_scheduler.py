@@ -0,0 +1,623 @@
+# backend/src/utils/fair_scheduler.py
+"""Fair sharing of workers and LLM endpoints between concurrent trials.
+
+Celery queues are FIFO and workers prefetch one task at a time, so a trial
+that queued all of its work first kept every worker until it was done: a
+five-document trial started behind a 50k-document batch waited for the whole
+batch. Two levels of scheduling share the capacity by weight instead. A
+trial's weight is its owner's ``scheduling_weight`` times its project's (both
+1 by default, set by an admin).
+
+Design notes:
+
+* Workers: a trial no longer queues all of its shards. The shard ledger
+  (``utils/trial_shards.py``) hands each active trial a window of the
+  ``TRIAL_SHARD_SLOTS`` shard slots, in proportion to its weight and never
+  more than it has shards left (:func:`shard_windows`). The rest wait in the
+  ledger, and each settled shard tops the windows up. With as many slots as
+  worker processes, the broker holds no backlog: a new trial's first shard is
+  queued when the next running shard settles and runs on the worker that
+  frees up, while an idle system still gives one trial every slot.
+* LLM endpoints: with an in-flight limit set (``utils/endpoint_limits.py``),
+  every completion call takes a slot of its endpoint (base URL and model)
+  first, across all workers (:func:`llm_slot`), then charges the endpoint's
+  request and token buckets. Waiting calls are granted in start-time fair
+  queuing order: a call's virtual start is the later of the endpoint's virtual
+  time and its trial's last finish tag, and each call advances the trial's tag
+  by ``1 / weight``. A trial with many calls waiting therefore takes turns
+  with a trial that just arrived rather than going first, and an idle trial
+  does not bank credit.
+* The gate state lives in Redis, updated by one Lua script per attempt so
+  workers never race. Holders renew a short lease while the call runs, and
+  waiters a shorter one while they poll, so a killed worker's slots free up
+  within a minute. Without Redis (or when a script fails) the same algorithm
+  runs in process, which caps each process separately: exact for a
+  single-node setup with one worker, an approximation otherwise.
+* Calls that do not belong to a trial (vision OCR) queue as one more flow of
+  weight 1 (:func:`llm_slot_sync`, for the threaded callers).
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+from . import endpoint_limits
+from .endpoint_limits import normalize_url
+from .redis_broadcast import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = "sched:"
+_ENDPOINTS_KEY = f"{_PREFIX}endpoints"
+# A holder renews its lease every third of it, so a slot outlives its holder's
+# process by at most this long.
+_LEASE_MS = 60_000
+# A waiter polls at least every _POLL_MAX seconds; one that stopped polling
+# (cancelled, killed) loses its place after this long.
+_WAITER_TTL_MS = 10_000
+_POLL_MIN = 0.02
+_POLL_MAX = 0.5
+# Longest wait between attempts on an exhausted request or token bucket.
+_RATE_POLL_MAX = 5.0
+# Keys of an endpoint nobody used for a day expire.
+_KEY_TTL_MS = 86_400_000
+
+# KEYS: inflight (ticket -> lease expiry), waiting (ticket -> virtual start),
+#       alive (ticket -> waiter expiry), finish (flow -> finish tag),
+#       state (vtime), weights (flow -> weight), endpoints (id -> label)
+# ARGV: cap, ticket, flow, weight, lease ms, waiter ttl ms, key ttl ms,
+#       endpoint id, label (JSON base URL and model)
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local cap = tonumber(ARGV[1])
+local ticket, flow = ARGV[2], ARGV[3]
+local weight = tonumber(ARGV[4])
+redis.call('HSET', KEYS[7], ARGV[8], ARGV[9])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+for _, dead in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)) do
+  redis.call('ZREM', KEYS[2], dead)
+  redis.call('ZREM', KEYS[3], dead)
+end
+local vtime = tonumber(redis.call('HGET', KEYS[5], 'vtime') or '0')
+local start = redis.call('ZSCORE', KEYS[2], ticket)
+if start then
+  start = tonumber(start)
+else
+  start = math.max(vtime, tonumber(redis.call('HGET', KEYS[4], flow) or '0'))
+  redis.call('HSET', KEYS[4], flow, start + 1 / weight)
+  redis.call('HSET', KEYS[6], flow, ARGV[4])
+  redis.call('ZADD', KEYS[2], start, ticket)
+end
+local granted = 0
+local free = cap - redis.call('ZCARD', KEYS[1])
+if free > 0 and redis.call('ZRANK', KEYS[2], ticket) < free then
+  granted = 1
+  redis.call('ZREM', KEYS[2], ticket)
+  redis.call('ZREM', KEYS[3], ticket)
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[5]), ticket)
+  if start > vtime then
+    redis.call('HSET', KEYS[5], 'vtime', start)
+  end
+else
+  redis.call('ZADD', KEYS[3], now + tonumber(ARGV[6]), ticket)
+end
+for i = 1, 7 do
+  redis.call('PEXPIRE', KEYS[i], ARGV[7])
+end
+return granted
+"""
+
+# KEYS: inflight; ARGV: ticket, lease ms
+_RENEW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', now + tonumber(ARGV[2]), ARGV[1])
+"""
+
+
+def endpoint_id(base_url: str, model: str | None = None) -> str:
+    """Stable short id of an endpoint and model, used in Redis keys."""
+    key = f"{normalize_url(base_url)}|{model or ''}"
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _keys(endpoint: str) -> list[str]:
+    base = f"{_PREFIX}{endpoint}:"
+    return [
+        base + name
+        for name in ("inflight", "waiting", "alive", "finish", "state", "weights")
+    ]
+
+
+def _flow_of(ticket: str) -> str:
+    return ticket.partition(":")[0]
+
+
+# --------------------------------------------------------------------------- #
+# Weights and shard windows
+# --------------------------------------------------------------------------- #
+def trial_weights(db: Session, trial_ids: list[int]) -> dict[int, float]:
+    """Each trial's scheduling weight: owner weight × project weight.
+
+    A trial without an (existing) owner counts the owner weight as 1.
+    """
+    if not trial_ids:
+        return {}
+    rows = db.execute(
+        select(
+            models.Trial.id,
+            models.Project.scheduling_weight,
+            models.User.scheduling_weight,
+        )
+        .join(models.Project, models.Project.id == models.Trial.project_id)
+        .outerjoin(models.User, models.User.id == models.Trial.created_by_id)
+        .where(models.Trial.id.in_(trial_ids))
+    )
+    return {
+        trial_id: _positive(project_weight) * _positive(user_weight)
+        for trial_id, project_weight, user_weight in rows
+    }
+
+
+def _positive(weight: float | None) -> float:
+    return weight if weight and weight > 0 else 1.0
+
+
+def shard_windows(demand: dict[int, tuple[float, int]], slots: int) -> dict[int, int]:
+    """Split ``slots`` between trials by weight (weighted max-min fairness).
+
+    ``demand`` maps trial id to ``(weight, open shards)``. A trial never gets
+    more slots than it has open shards; what it leaves over goes to the
+    others by weight. Every trial with work gets at least one slot, even
+    when there are more trials than slots.
+    """
+    pending = {t: (w, n) for t, (w, n) in demand.items() if n > 0}
+    windows: dict[int, int] = {}
+    remaining = float(slots)
+    while pending:
+        total = sum(w for w, _ in pending.values())
+        satisfied = [t for t, (w, n) in pending.items() if n <= remaining * w / total]
+        if not satisfied:
+            break
+        for t in satisfied:
+            windows[t] = pending.pop(t)[1]
+            remaining -= windows[t]
+    if pending:
+        # Largest remainder: hand out the whole slots left, by weight.
+        total = sum(w for w, _ in pending.values())
+        exact = {t: remaining * w / total for t, (w, _) in pending.items()}
+        share = {t: int(x) for t, x in exact.items()}
+        leftover = int(remaining) - sum(share.values())
+        for t in sorted(exact, key=lambda t: (share[t] - exact[t], t))[:leftover]:
+            share[t] += 1
+        windows.update({t: max(1, n) for t, n in share.items()})
+    return windows
+
+
+# --------------------------------------------------------------------------- #
+# Endpoint gate
+# --------------------------------------------------------------------------- #
+class _LocalGate:
+    """In-process version of the Redis gate (same ordering, no leases: a
+    slot is released when its call ends or with the process)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, dict] = {}
+
+    def _state(self, endpoint: str) -> dict:
+        return self._endpoints.setdefault(
+            endpoint,
+            {
+                "inflight": set(),
+                "waiting": {},
+                "finish": {},
+                "weights": {},
+                "vtime": 0.0,
+            },
+        )
+
+    def try_acquire(
+        self, endpoint: str, cap: int, ticket: str, flow: str, weight: float
+    ) -> bool:
+        with self._lock:
+            state = self._state(endpoint)
+            waiting = state["waiting"]
+            start = waiting.get(ticket)
+            if start is None:
+                start = max(state["vtime"], state["finish"].get(flow, 0.0))
+                state["finish"][flow] = start + 1 / weight
+                state["weights"][flow] = weight
+                waiting[ticket] = start
+            free = cap - len(state["inflight"])
+            if free <= 0:
+                return False
+            ahead = sum(1 for t, s in waiting.items() if (s, t) < (start, ticket))
+            if ahead >= free:
+                return False
+            del waiting[ticket]
+            state["inflight"].add(ticket)
+            state["vtime"] = max(state["vtime"], start)
+            return True
+
+    def release(self, endpoint: str, ticket: str) -> None:
+        with self._lock:
+            state = self._state(endpoint)
+            state["inflight"].discard(ticket)
+            state["waiting"].pop(ticket, None)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                endpoint: {
+                    "in_flight": list(state["inflight"]),
+                    "waiting": list(state["waiting"]),
+                    "weights": dict(state["weights"]),
+                }
+                for endpoint, state in self._endpoints.items()
+            }
+
+
+class _RedisGate:
+    def __init__(self, client) -> None:
+        self._client = client
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+        self._renew = client.register_script(_RENEW_SCRIPT)
+
+    def try_acquire(
+        self,
+        endpoint: str,
+        cap: int,
+        ticket: str,
+        flow: str,
+        weight: float,
+        label: str,
+    ) -> bool:
+        granted = self._acquire(
+            keys=[*_keys(endpoint), _ENDPOINTS_KEY],
+            args=[
+                cap,
+                ticket,
+                flow,
+                weight,
+                _LEASE_MS,
+                _WAITER_TTL_MS,
+                _KEY_TTL_MS,
+                endpoint,
+                label,
+            ],
+        )
+        return bool(granted)
+
+    def renew(self, endpoint: str, ticket: str) -> None:
+        self._renew(keys=_keys(endpoint)[:1], args=[ticket, _LEASE_MS])
+
+    def release(self, endpoint: str, ticket: str) -> None:
+        inflight, waiting, alive = _keys(endpoint)[:3]
+        pipe = self._client.pipeline()
+        for key in (inflight, waiting, alive):
+            pipe.zrem(key, ticket)
+        pipe.execute()
+
+    def snapshot(self) -> dict[str, dict]:
+        out: dict[str, dict] = {}
+        for raw_endpoint, label in self._client.hgetall(_ENDPOINTS_KEY).items():
+            endpoint = _text(raw_endpoint)
+            inflight, waiting, _, _, _, weights = _keys(endpoint)
+            now_ms = time.time() * 1000
+            out[endpoint] = {
+                "label": _text(label),
+                "in_flight": [
+                    _text(t)
+                    for t in self._client.zrangebyscore(inflight, now_ms, "+inf")
+                ],
+                "waiting": [_text(t) for t in self._client.zrange(waiting, 0, -1)],
+                "weights": {
+                    _text(k): float(v) for k, v in self._client.hgetall(weights).items()
+                },
+            }
+        return out
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+_local_gate = _LocalGate()
+_local_labels: dict[str, str] = {}
+_redis_gate: _RedisGate | None = None
+_redis_gate_lock = threading.Lock()
+
+
+def _shared_gate() -> _RedisGate | None:
+    global _redis_gate
+    client = get_redis_client()
+    if client is None:
+        return None
+    with _redis_gate_lock:
+        if _redis_gate is None or _redis_gate._client is not client:
+            _redis_gate = _RedisGate(client)
+        return _redis_gate
+
+
+class LLMSlot:
+    """One LLM call's claim on its endpoint: a slot of the fair gate, then a
+    charge to the endpoint's request and token buckets.
+
+    ``tokens`` is the call's estimated token count; pass the response to
+    :meth:`record` to charge what it really used instead.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None,
+        model: str | None,
+        flow: int | str,
+        weight: float,
+        tokens: int,
+    ) -> None:
+        self.limits = (
+            endpoint_limits.endpoint_limits(base_url, model)
+            if base_url
+            else endpoint_limits.EndpointLimits()
+        )
+        self.endpoint = endpoint_id(base_url or "", model)
+        self.label = json.dumps({"base_url": base_url, "model": model})
+        self.flow = str(flow)
+        self.ticket = f"{self.flow}:{uuid.uuid4().hex}"
+        self.weight = _positive(weight)
+        self.tokens = max(0, int(tokens or 0))
+        self.gate: _RedisGate | _LocalGate | None = None
+        self.charged = False
+        # Set by release(). An attempt still running in a worker thread when
+        # its waiter is cancelled gives back whatever it takes afterwards.
+        self.closed = False
+        self._shared_tried = False
+        self._delay = _POLL_MIN
+
+    @property
+    def active(self) -> bool:
+        return self.limits.max_in_flight > 0 or self.limits.rate_limited
+
+    @property
+    def needs_renewal(self) -> bool:
+        return isinstance(self.gate, _RedisGate)
+
+    def attempt(self) -> float | None:
+        """Try to take the slot: None once it is held, else the seconds to
+        wait before the next attempt."""
+        if self.closed:
+            return None
+        if self.limits.max_in_flight > 0 and self.gate is None:
+            self.gate = self._try_gate()
+            if self.closed:
+                # Released while this attempt ran: drop the slot (or the
+                # place in line) it may just have taken.
+                self.release()
+                return None
+            if self.gate is None:
+                wait, self._delay = self._delay, min(_POLL_MAX, self._delay * 2)
+                return wait
+            if self.gate is not _local_gate:
+                # Waited on the local gate too while Redis was failing.
+                _local_gate.release(self.endpoint, self.ticket)
+        if not self.charged:
+            wait = endpoint_limits.take(self.endpoint, self.limits, self.tokens)
+            if wait > 0:
+                return min(max(wait, _POLL_MIN), _RATE_POLL_MAX)
+            self.charged = True
+        return None
+
+    def _try_gate(self) -> _RedisGate | _LocalGate | None:
+        cap = self.limits.max_in_flight
+        shared = _shared_gate()
+        if shared is not None:
+            self._shared_tried = True
+            try:
+                if shared.try_acquire(
+                    self.endpoint, cap, self.ticket, self.flow, self.weight, self.label
+                ):
+                    return shared
+                return None
+            except Exception as e:
+                logger.warning(
+                    "Shared LLM gate unavailable, using the in-process one: %s", e
+                )
+        _local_labels[self.endpoint] = self.label
+        if _local_gate.try_acquire(
+            self.endpoint, cap, self.ticket, self.flow, self.weight
+        ):
+            return _local_gate
+        return None
+
+    def renew(self) -> None:
+        if isinstance(self.gate, _RedisGate):
+            try:
+                self.gate.renew(self.endpoint, self.ticket)
+            except Exception as e:
+                logger.debug("Could not renew LLM slot %s: %s", self.ticket, e)
+
+    def record(self, response) -> None:
+        """Charge the tokens ``response`` reports instead of the estimate."""
+        usage = getattr(response, "usage", None)
+        used = getattr(usage, "total_tokens", None)
+        if self.charged and isinstance(used, int):
+            endpoint_limits.adjust(self.endpoint, self.limits, used - self.tokens)
+            self.tokens = used
+
+    def release(self) -> None:
+        """Give up the slot, or the place in line while still waiting.
+
+        Safe to call again, and while :meth:`attempt` runs in another thread.
+        """
+        self.closed = True
+        if self.limits.max_in_flight <= 0:
+            return
+        _local_gate.release(self.endpoint, self.ticket)
+        if self._shared_tried and (shared := _shared_gate()) is not None:
+            try:
+                shared.release(self.endpoint, self.ticket)
+            except Exception as e:
+                # The lease (or the waiter TTL) runs out on its own.
+                logger.debug("Could not release LLM slot %s: %s", self.ticket, e)
+
+
+@contextlib.asynccontextmanager
+async def llm_slot(
+    base_url: str | None,
+    flow: int | str,
+    weight: float = 1.0,
+    *,
+    model: str | None = None,
+    tokens: int = 0,
+) -> AsyncIterator[LLMSlot]:
+    """Hold a slot of the endpoint for the body of the ``async with``.
+
+    ``flow`` is the trial id (or a label for calls outside a trial) whose
+    turn it is in the fair queue. Waits while the endpoint is at its
+    in-flight limit or out of request/token budget; a no-op for an endpoint
+    without limits.
+    """
+    slot = LLMSlot(base_url, model, flow, weight, tokens)
+    if not slot.active:
+        yield slot
+        return
+    renewer: asyncio.Task | None = None
+    try:
+        while (wait := await asyncio.to_thread(slot.attempt)) is not None:
+            if renewer is None and slot.needs_renewal:
+                renewer = asyncio.create_task(_renew_lease(slot))
+            await asyncio.sleep(wait)
+        if renewer is None and slot.needs_renewal:
+            renewer = asyncio.create_task(_renew_lease(slot))
+        yield slot
+    finally:
+        if renewer is not None:
+            renewer.cancel()
+        slot.release()
+
+
+@contextlib.contextmanager
+def llm_slot_sync(
+    base_url: str | None,
+    flow: int | str,
+    weight: float = 1.0,
+    *,
+    model: str | None = None,
+    tokens: int = 0,
+) -> Iterator[LLMSlot]:
+    """Blocking :func:`llm_slot` for threaded callers."""
+    slot = LLMSlot(base_url, model, flow, weight, tokens)
+    if not slot.active:
+        yield slot
+        return
+    stop = threading.Event()
+    renewer: threading.Thread | None = None
+    try:
+        while (wait := slot.attempt()) is not None:
+            if renewer is None and slot.needs_renewal:
+                renewer = _start_renewer(slot, stop)
+            time.sleep(wait)
+        if renewer is None and slot.needs_renewal:
+            renewer = _start_renewer(slot, stop)
+        yield slot
+    finally:
+        stop.set()
+        slot.release()
+
+
+async def _renew_lease(slot: LLMSlot) -> None:
+    while True:
+        await asyncio.sleep(_LEASE_MS / 3000)
+        await asyncio.to_thread(slot.renew)
+
+
+def _start_renewer(slot: LLMSlot, stop: threading.Event) -> threading.Thread:
+    def renew() -> None:
+        while not stop.wait(_LEASE_MS / 3000):
+            slot.renew()
+
+    thread = threading.Thread(target=renew, name="llm-slot-lease", daemon=True)
+    thread.start()
+    return thread
+
+
+def _parse_label(label: str | None) -> dict:
+    try:
+        parsed = json.loads(label) if label else {}
+    except ValueError:
+        parsed = {"base_url": label}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def gate_snapshot() -> list[dict]:
+    """Current holders and waiters per endpoint and model, with the
+    endpoint's limits and each flow's share of the slots in use and its
+    weighted target share."""
+    shared = _shared_gate()
+    raw: dict[str, dict] = {}
+    if shared is not None:
+        try:
+            raw = shared.snapshot()
+        except Exception as e:
+            logger.warning("Could not read the shared LLM gate: %s", e)
+    for endpoint, state in _local_gate.snapshot().items():
+        if state["in_flight"] or state["waiting"]:
+            raw.setdefault(endpoint, state | {"label": _local_labels.get(endpoint)})
+
+    out = []
+    for endpoint, state in sorted(raw.items()):
+        flows: dict[str, dict] = {}
+        for field in ("in_flight", "waiting"):
+            for ticket in state[field]:
+                flow = _flow_of(ticket)
+                entry = flows.setdefault(
+                    flow,
+                    {
+                        "flow": flow,
+                        "trial_id": int(flow) if flow.isdigit() else None,
+                        "in_flight": 0,
+                        "waiting": 0,
+                        "weight": state["weights"].get(flow, 1.0),
+                    },
+                )
+                entry[field] += 1
+        in_flight = sum(f["in_flight"] for f in flows.values())
+        total_weight = sum(f["weight"] for f in flows.values())
+        for entry in flows.values():
+            entry["share"] = entry["in_flight"] / in_flight if in_flight else 0.0
+            entry["target_share"] = (
+                entry["weight"] / total_weight if total_weight else 0.0
+            )
+        label = _parse_label(state.get("label"))
+        base_url, model = label.get("base_url"), label.get("model")
+        limits = (
+            endpoint_limits.endpoint_limits(base_url, model)
+            if base_url
+            else endpoint_limits.EndpointLimits()
+        )
+        out.append(
+            {
+                "endpoint": endpoint,
+                "base_url": base_url,
+                "model": model,
+                "rpm": limits.rpm,
+                "tpm": limits.tpm,
+                "max_in_flight": limits.max_in_flight,
+                "in_flight": in_flight,
+                "waiting": sum(f["waiting"] for f in flows.values()),
+                "trials": sorted(flows.values(), key=lambda f: f["flow"]),
+            }
+        )
+    return out
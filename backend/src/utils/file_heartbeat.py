@@ -0,0 +1,136 @@
+# backend/src/utils/file_heartbeat.py
+"""Liveness heartbeats for the file tasks a process is working on.
+
+The orphan sweeper (``celery/task_signals.sweep_orphans``) fails file tasks
+whose ``last_heartbeat_at`` is older than ``ORPHAN_STALE_SECONDS``. Each
+``_process_with_timeout`` call used to keep its file alive itself, opening a
+fresh session for a one-row UPDATE on every tick. With hundreds of files in
+flight that was a steady stream of tiny transactions.
+
+Design notes:
+
+* One daemon thread per process bumps every registered file task in a single
+  ``UPDATE … WHERE id IN (…)`` per ``HEARTBEAT_INTERVAL_SECONDS``, in chunks of
+  ``_UPDATE_BATCH`` ids. ``beating(file_task_id)`` registers a file for as
+  long as its processing runs.
+* The heartbeat says "this process is alive and still holds the file", which
+  is what the sweeper needs: a crashed worker stops beating for all its files
+  at once, as before. A hung file is bounded by its own per-file timeout.
+* Registrations are counted, so the same id registered twice (a retry inside
+  the same process) stays alive until both exit. The thread sleeps while
+  nothing is registered.
+* A failed tick is logged and retried on the next one; ``ORPHAN_STALE_SECONDS``
+  spans several intervals.
+"""
+
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from sqlalchemy import update
+
+from .. import models
+from ..db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Must be comfortably shorter than the sweeper's stale-heartbeat cutoff so an
+# actively-processing file is never reaped.
+HEARTBEAT_INTERVAL_SECONDS = 15
+
+# File task ids per UPDATE statement.
+_UPDATE_BATCH = 500
+
+
+def _bump(file_task_ids: list[int]) -> None:
+    now = datetime.datetime.now(datetime.UTC)
+    with SessionLocal() as db:
+        for start in range(0, len(file_task_ids), _UPDATE_BATCH):
+            db.execute(
+                update(models.FilePreprocessingTask)
+                .where(
+                    models.FilePreprocessingTask.id.in_(
+                        file_task_ids[start : start + _UPDATE_BATCH]
+                    )
+                )
+                .values(last_heartbeat_at=now)
+            )
+        db.commit()
+
+
+class _HeartbeatService:
+    """Per-process set of in-flight file tasks, bumped by a daemon thread."""
+
+    def __init__(self) -> None:
+        self._active: Counter[int] = Counter()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="file-heartbeat", daemon=True
+            )
+            self._thread.start()
+
+    def register(self, file_task_id: int) -> None:
+        with self._cond:
+            self._ensure_thread()
+            self._active[file_task_id] += 1
+            self._cond.notify_all()
+
+    def unregister(self, file_task_id: int) -> None:
+        with self._cond:
+            self._active[file_task_id] -= 1
+            if self._active[file_task_id] <= 0:
+                del self._active[file_task_id]
+
+    def active_ids(self) -> list[int]:
+        with self._cond:
+            return sorted(self._active)
+
+    def tick(self) -> int:
+        """Bump every registered file task now; returns how many."""
+        ids = self.active_ids()
+        if ids:
+            _bump(ids)
+        return len(ids)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._active:
+                    self._cond.wait()
+                # Registrations notify too; sleep out the full interval.
+                due = time.monotonic() + HEARTBEAT_INTERVAL_SECONDS
+                while (remaining := due - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+            try:
+                self.tick()
+            except Exception as e:
+                logger.warning("File task heartbeat failed (will retry): %s", e)
+
+    def _reset_after_fork(self) -> None:
+        # A forked child (Celery prefork) inherits the registrations but not
+        # the thread; the parent's files are the parent's to keep alive.
+        self._active = Counter()
+        self._cond = threading.Condition()
+        self._thread = None
+
+
+_service = _HeartbeatService()
+os.register_at_fork(after_in_child=_service._reset_after_fork)
+
+
+@contextmanager
+def beating(file_task_id: int):
+    """Keep ``file_task_id``'s ``last_heartbeat_at`` fresh inside the block."""
+    _service.register(file_task_id)
+    try:
+        yield
+    finally:
+        _service.unregister(file_task_id)
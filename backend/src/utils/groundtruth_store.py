@@ -0,0 +1,500 @@
+# backend/src/utils/groundtruth_store.py
+"""Columnar store for parsed ground truth.
+
+The parsed ground truth used to live in the ``ground_truth.data_cache`` JSON
+column. Every evaluation, match preview and export then loaded and decoded
+the whole blob — hundreds of MB for a large registry — to read a handful of
+columns. It is now written once to a *store artifact* in file storage, and
+the row keeps only a small manifest (``GroundTruth.store_manifest``).
+
+Design notes:
+
+* The artifact is a ZIP (stdlib — no Parquet dependency) holding one
+  JSON-lines member per top-level column, aligned with ``keys.json``. Readers
+  decompress only what they need: evaluation the mapped columns, the match
+  preview the key index, previews and samples ``head.json``.
+* Exact and case-insensitive key lookups are served from sorted indexes
+  (``bisect``). The case-insensitive one keeps the *last* key per lowercase
+  spelling, like the ``{str(k).lower(): k}`` maps the matchers used to build.
+* An absent cell (empty line) stays distinct from ``null``, so rows read back
+  equal the parsed rows. Each row's "has a nested object" flag is stored as
+  well: the evaluator picks nested vs flat field access from the whole row,
+  which a column subset cannot tell.
+* The manifest records the source file and the ID column the artifact was
+  built from; a mismatch or a missing artifact means rebuild. Upload, file
+  replacement and ID-column changes drop the artifact and build the next one
+  straight away (:func:`prebuild_ground_truth_store`, which commits). Reads
+  never write: without a current artifact they get a temporary store built
+  for that read. A legacy ``data_cache`` blob is converted by
+  ``python -m backend.scripts.backfill_ground_truth_stores``.
+* Building streams: the source file is opened from storage (not read into
+  memory) and ``GroundTruthParser.iter_documents`` feeds parsed rows
+  straight into the writer, so peak memory follows the parser's block size.
+  The writer buffers each column and appends it to its own temp file in
+  batches, so it holds no open file per column. A parse error aborts the
+  build and discards the partial artifact.
+"""
+
+import io
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from functools import cached_property
+from itertools import islice
+from typing import IO, Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+# Rows kept whole in head.json for previews, samples and mapping suggestions.
+HEAD_ROWS = 20
+
+# Encoded column values the writer buffers before appending them to the
+# columns' temp files.
+_WRITE_BUFFER_BYTES = 4 * 1024 * 1024
+
+
+class _SortedIndex(Mapping[str, Any]):
+    """Read-only mapping over ``[[key, value], ...]`` sorted by key."""
+
+    def __init__(self, pairs: list) -> None:
+        self._keys = [pair[0] for pair in pairs]
+        self._values = [pair[1] for pair in pairs]
+
+    def __getitem__(self, key: str) -> Any:
+        if isinstance(key, str):
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                return self._values[i]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class GroundTruthRows(dict):
+    """``{key: row}`` for some of a ground truth's columns.
+
+    ``nested_keys`` holds the keys whose *full* row has an object value;
+    ``keys_lower`` maps lowercase keys to keys (last spelling wins).
+    """
+
+    def __init__(
+        self,
+        rows: dict,
+        *,
+        nested_keys: frozenset[str],
+        keys_lower: Mapping[str, str],
+    ) -> None:
+        super().__init__(rows)
+        self.nested_keys = nested_keys
+        self.keys_lower = keys_lower
+
+
+class _Column:
+    """A column being written: its temp file, the rows it covers so far and
+    the lines not yet appended to the file."""
+
+    __slots__ = ("path", "filled", "pending")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.filled = 0
+        self.pending: list[bytes] = []
+
+
+class GroundTruthStoreWriter:
+    """Build an artifact row by row, spilling columns to a temp directory."""
+
+    def __init__(self) -> None:
+        self._dir = tempfile.TemporaryDirectory(prefix="gt-store-")
+        self._keys: list[str] = []
+        self._seen: set[str] = set()
+        self._columns: dict[str, _Column] = {}
+        self._buffered = 0
+        self._nested: list[int] = []
+        self._head: dict[str, dict] = {}
+
+    def add(self, key: str, row: dict) -> None:
+        if key in self._seen:
+            raise ValueError(f"Duplicate ground truth key: {key!r}")
+        self._seen.add(key)
+        index = len(self._keys)
+        self._keys.append(key)
+        for name, value in row.items():
+            column = self._columns.get(name)
+            if column is None:
+                column = self._columns[name] = _Column(
+                    os.path.join(self._dir.name, f"{len(self._columns)}.jsonl")
+                )
+            line = (
+                b"\n" * (index - column.filled)
+                + json.dumps(value, ensure_ascii=False).encode()
+                + b"\n"
+            )
+            column.pending.append(line)
+            column.filled = index + 1
+            self._buffered += len(line)
+        if any(isinstance(value, dict) for value in row.values()):
+            self._nested.append(index)
+        if index < HEAD_ROWS:
+            self._head[key] = row
+        if self._buffered >= _WRITE_BUFFER_BYTES:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Append the buffered lines, opening one column file at a time."""
+        for column in self._columns.values():
+            if column.pending:
+                with open(column.path, "ab") as out:
+                    out.writelines(column.pending)
+                column.pending.clear()
+        self._buffered = 0
+
+    def finish(self, dest: IO[bytes]) -> dict:
+        """Write the artifact to ``dest``; returns its manifest."""
+        keys = self._keys
+        try:
+            for column in self._columns.values():
+                column.pending.append(b"\n" * (len(keys) - column.filled))
+            self._flush()
+            with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as zf:
+                for position, column in enumerate(self._columns.values()):
+                    zf.write(column.path, f"columns/{position}.jsonl")
+                zf.writestr("keys.json", json.dumps(keys, ensure_ascii=False))
+                zf.writestr(
+                    "index.json",
+                    json.dumps(
+                        sorted([key, i] for i, key in enumerate(keys)),
+                        ensure_ascii=False,
+                    ),
+                )
+                lower = {key.lower(): key for key in keys}
+                zf.writestr(
+                    "lower_index.json",
+                    json.dumps(sorted(lower.items()), ensure_ascii=False),
+                )
+                zf.writestr("nested.json", json.dumps(self._nested))
+                zf.writestr("head.json", json.dumps(self._head, ensure_ascii=False))
+                manifest = {
+                    "version": STORE_VERSION,
+                    "rows": len(keys),
+                    "columns": list(self._columns),
+                }
+                zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False))
+        finally:
+            self._dir.cleanup()
+        return manifest
+
+    def close(self) -> None:
+        """Discard a build that will not be finished."""
+        self._dir.cleanup()
+
+
+class GroundTruthStore:
+    """Reader over an artifact (bytes or a seekable binary file); members
+    are decoded on first use. The store owns the file: close it, or use the
+    store as a context manager."""
+
+    def __init__(self, content: bytes | IO[bytes]) -> None:
+        source = io.BytesIO(content) if isinstance(content, bytes) else content
+        self._source = source
+        try:
+            self._zip = zipfile.ZipFile(source)
+            manifest = self._json("manifest.json")
+        except BaseException:
+            source.close()
+            raise
+        if manifest.get("version") != STORE_VERSION:
+            self.close()
+            raise ValueError(
+                f"Unsupported ground truth store version {manifest.get('version')}"
+            )
+        self.columns: list[str] = manifest["columns"]
+        self.row_count: int = manifest["rows"]
+        self._members = {
+            name: f"columns/{i}.jsonl" for i, name in enumerate(self.columns)
+        }
+
+    def close(self) -> None:
+        self._zip.close()
+        self._source.close()
+
+    def __enter__(self) -> "GroundTruthStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _json(self, member: str) -> Any:
+        with self._zip.open(member) as f:
+            return json.load(f)
+
+    @cached_property
+    def keys(self) -> list[str]:
+        """Keys in file order."""
+        return self._json("keys.json")
+
+    @cached_property
+    def _index(self) -> _SortedIndex:
+        return _SortedIndex(self._json("index.json"))
+
+    @cached_property
+    def keys_lower(self) -> _SortedIndex:
+        return _SortedIndex(self._json("lower_index.json"))
+
+    @cached_property
+    def nested_keys(self) -> frozenset[str]:
+        keys = self.keys
+        return frozenset(keys[i] for i in self._json("nested.json"))
+
+    def head(self, n: int = HEAD_ROWS) -> dict:
+        """The first ``n`` (at most ``HEAD_ROWS``) rows, all columns."""
+        return dict(islice(self._json("head.json").items(), n))
+
+    def rows(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        keys: Optional[Iterable[str]] = None,
+    ) -> GroundTruthRows:
+        """Rows restricted to ``columns`` (default all) and ``keys`` (default
+        all; unknown keys are skipped). Row order follows the file."""
+        all_keys = self.keys
+        if keys is None:
+            positions: Iterable[int] = range(len(all_keys))
+            wanted = None
+        else:
+            wanted = {self._index[k] for k in keys if k in self._index}
+            positions = sorted(wanted)
+        rows: dict[str, dict] = {all_keys[i]: {} for i in positions}
+        requested = set(self.columns if columns is None else columns)
+        for name in self.columns:
+            if name not in requested:
+                continue
+            with self._zip.open(self._members[name]) as f:
+                for i, line in enumerate(f):
+                    if wanted is not None and i not in wanted:
+                        continue
+                    line = line.rstrip(b"\n")
+                    if line:
+                        rows[all_keys[i]][name] = json.loads(line)
+        return GroundTruthRows(
+            rows, nested_keys=self.nested_keys, keys_lower=self.keys_lower
+        )
+
+
+def _build_artifact(rows: Iterable[tuple[str, dict]]) -> tuple[dict, IO[bytes]]:
+    """Build an artifact from ``(key, row)`` pairs into a temporary file.
+
+    Returns ``(manifest, artifact file)``, the file rewound; the caller owns
+    it.
+    """
+    writer = GroundTruthStoreWriter()
+    try:
+        for key, row in rows:
+            writer.add(str(key), row)
+    except BaseException:
+        writer.close()
+        raise
+    tmp = tempfile.TemporaryFile()
+    try:
+        manifest = writer.finish(tmp)
+    except BaseException:
+        tmp.close()
+        raise
+    tmp.seek(0)
+    return manifest, tmp
+
+
+def write_store(rows: Iterable[tuple[str, dict]]) -> tuple[str, dict]:
+    """Build an artifact from ``(key, row)`` pairs and save it to storage.
+
+    Returns ``(storage key, manifest)``.
+    """
+    from ..dependencies import save_stream
+
+    manifest, artifact = _build_artifact(rows)
+    with artifact:
+        return save_stream(artifact), manifest
+
+
+def _is_current(manifest: Optional[dict], ground_truth: models.GroundTruth) -> bool:
+    return bool(
+        manifest
+        and manifest.get("version") == STORE_VERSION
+        and manifest.get("source_uuid") == ground_truth.file_uuid
+        and manifest.get("id_column") == _id_column(ground_truth)
+    )
+
+
+def _id_column(ground_truth: models.GroundTruth) -> Optional[str]:
+    # Only CSV/XLSX parsing takes the ID column (see GroundTruthParser.parse).
+    if ground_truth.format in ("csv", "xlsx"):
+        return ground_truth.id_column_name or None
+    return None
+
+
+def _parse_rows(ground_truth: models.GroundTruth) -> Iterator[tuple[str, dict]]:
+    from ..dependencies import open_file
+    from .evaluation import GroundTruthParser
+
+    with open_file(ground_truth.file_uuid) as source:
+        yield from GroundTruthParser().iter_documents(
+            source, ground_truth.format, id_column=_id_column(ground_truth)
+        )
+
+
+def _source_rows(ground_truth: models.GroundTruth) -> Iterable[tuple[str, dict]]:
+    if ground_truth.data_cache and ground_truth.store_manifest is None:
+        # Legacy blob, built with the current file and ID column (both
+        # cleared it when changed).
+        return dict(ground_truth.data_cache).items()
+    return _parse_rows(ground_truth)
+
+
+def load_ground_truth_store(
+    db: Session, ground_truth: models.GroundTruth
+) -> GroundTruthStore:
+    """The current store for ``ground_truth``; the caller closes it.
+
+    Without a current artifact the store is built into a temporary file for
+    this read only; nothing is saved or committed. Parse errors propagate as
+    ``ValueError`` exactly as from ``GroundTruthParser.parse``.
+    """
+    from ..dependencies import open_file
+
+    manifest = ground_truth.store_manifest
+    if _is_current(manifest, ground_truth):
+        try:
+            return GroundTruthStore(open_file(manifest["file_uuid"]))
+        except (FileNotFoundError, zipfile.BadZipFile, KeyError, ValueError):
+            logger.warning(
+                "Ground truth %s store artifact unreadable; reading the source",
+                ground_truth.id,
+                exc_info=True,
+            )
+    else:
+        logger.info(
+            "Ground truth %s has no current store; reading the source",
+            ground_truth.id,
+        )
+    _, artifact = _build_artifact(_source_rows(ground_truth))
+    return GroundTruthStore(artifact)
+
+
+def build_ground_truth_store(ground_truth: models.GroundTruth) -> Optional[str]:
+    """(Re)build the artifact from the source, save it and point the row's
+    manifest at it; the caller commits.
+
+    Returns the replaced artifact's storage key, for
+    :func:`remove_store_artifact` once the change is committed.
+    """
+    file_uuid, manifest = write_store(_source_rows(ground_truth))
+    old = (ground_truth.store_manifest or {}).get("file_uuid")
+    ground_truth.store_manifest = {
+        **manifest,
+        "file_uuid": file_uuid,
+        "source_uuid": ground_truth.file_uuid,
+        "id_column": _id_column(ground_truth),
+    }
+    ground_truth.data_cache = None
+    logger.info(
+        "Built ground truth %s store: %d rows, %d columns",
+        ground_truth.id,
+        manifest["rows"],
+        len(manifest["columns"]),
+    )
+    return old if old != file_uuid else None
+
+
+def prebuild_ground_truth_store(db: Session, ground_truth: models.GroundTruth) -> None:
+    """Build and commit the store after an upload or ID change; never raises.
+
+    A file that does not parse (yet — e.g. before the right ID column is
+    chosen) is left unbuilt; the next reader reports the parse error.
+    """
+    try:
+        old = build_ground_truth_store(ground_truth)
+    except Exception as e:
+        logger.info("Ground truth %s store not built yet: %s", ground_truth.id, e)
+        return
+    new = ground_truth.store_manifest["file_uuid"]
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        remove_store_artifact(new)
+        logger.warning(
+            "Could not save ground truth %s store", ground_truth.id, exc_info=True
+        )
+        return
+    remove_store_artifact(old)
+
+
+def drop_ground_truth_store(ground_truth: models.GroundTruth) -> Optional[str]:
+    """Forget the artifact; returns its storage key for
+    :func:`remove_store_artifact` once the change is committed."""
+    old = (ground_truth.store_manifest or {}).get("file_uuid")
+    ground_truth.store_manifest = None
+    ground_truth.data_cache = None
+    return old
+
+
+def remove_store_artifact(file_uuid: Optional[str]) -> None:
+    """Best-effort removal of an artifact from storage."""
+    from ..dependencies import remove_file
+
+    if not file_uuid:
+        return
+    try:
+        remove_file(file_uuid)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.warning(
+            "Failed to remove ground truth store %s", file_uuid, exc_info=True
+        )
+
+
+def backfill_ground_truth_stores(
+    db: Session, *, project_id: Optional[int] = None
+) -> tuple[int, int]:
+    """Build the stores of ground truths without one (legacy ``data_cache``
+    rows, files that did not parse when uploaded), one commit each.
+
+    Returns ``(built, skipped)``; a file that still does not parse is skipped.
+    """
+    query = select(models.GroundTruth.id, models.GroundTruth.store_manifest)
+    if project_id is not None:
+        query = query.where(models.GroundTruth.project_id == project_id)
+    # A cleared manifest may be SQL NULL or JSON null: filter here.
+    missing = [
+        gt_id
+        for gt_id, manifest in db.execute(query.order_by(models.GroundTruth.id))
+        if not manifest
+    ]
+    built = skipped = 0
+    for gt_id in missing:
+        ground_truth = db.get(models.GroundTruth, gt_id)
+        if ground_truth is None:
+            continue
+        prebuild_ground_truth_store(db, ground_truth)
+        if ground_truth.store_manifest is None:
+            skipped += 1
+        else:
+            built += 1
+        db.expunge(ground_truth)
+    return built, skipped
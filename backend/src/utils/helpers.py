@@ -1,11 +1,14 @@
 # backend/src/utils/helpers.py
 import base64
+import codecs
 import io
 import json
+import logging
 import mimetypes
 import zipfile
 from datetime import datetime, timezone
-from typing import Any
+from itertools import chain
+from typing import Any, BinaryIO
 
 import requests
 from PIL import Image
@@ -14,6 +17,9 @@ from sqlalchemy.orm import Session, selectinload
 
 from backend.src import models, schemas
 from backend.src.utils.api_errors import api_error
+from backend.src.utils.groundtruth_store import load_ground_truth_store
+
+logger = logging.getLogger(__name__)
 
 # If your enums/constants are here:
 
@@ -103,27 +109,51 @@ def detect_text_encoding(
     ``errors="replace"`` in that case). Shared by preprocessing and the
     ground-truth parser so both handle non-UTF-8 uploads the same way.
     """
+    return detect_stream_encoding(io.BytesIO(content), fallback_chain, use_chardet)
+
+
+# Bytes decoded at a time while checking that a file decodes cleanly.
+_DECODE_BLOCK_SIZE = 1 << 20
+
+
+def detect_stream_encoding(
+    fileobj: BinaryIO, fallback_chain: str, use_chardet: bool = True
+) -> str:
+    """:func:`detect_text_encoding` for a seekable binary file.
+
+    Each candidate is checked with an incremental decoder, block by block, so
+    the file is never held in memory. Leaves the file positioned at 0.
+    """
+
+    def decodes(encoding: str) -> bool:
+        fileobj.seek(0)
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            while block := fileobj.read(_DECODE_BLOCK_SIZE):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+            return True
+        except (UnicodeDecodeError, LookupError):
+            return False
+        finally:
+            fileobj.seek(0)
+
     if use_chardet:
         try:
             import chardet
 
-            result = chardet.detect(content[:1024])
+            result = chardet.detect(fileobj.read(1024))
+            fileobj.seek(0)
             if result and result.get("confidence", 0) > 0.7:
                 detected = result.get("encoding") or "utf-8"
-                try:
-                    content.decode(detected)
+                if decodes(detected):
                     return detected
-                except (UnicodeDecodeError, LookupError):
-                    pass
         except ImportError:
             pass
 
     for encoding in [e.strip() for e in fallback_chain.split(",") if e.strip()]:
-        try:
-            content.decode(encoding)
+        if decodes(encoding):
             return encoding
-        except (UnicodeDecodeError, LookupError):
-            continue
 
     return "utf-8"
 
@@ -215,212 +245,75 @@ def build_evaluation_zipfiles(
     zip_format="csv",  # or "xlsx"
 ):
     """
-    Yields ``(arcname, bytes)`` entries for a ZIP, using the export helpers and
-    pandas. A generator so the caller can stream the archive without holding
-    every entry (notably per-document texts) in memory at once.
-    """
-    import csv
-    import io
-
-    import pandas as pd
-
-    # --- Summary CSV/XLSX ---
-    if zip_format == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
-                "Evaluation ID",
-                "Trial",
-                "Trial Number",
-                "Trial ID",
-                "Model",
-                "Ground Truth",
-                "Accuracy",
-                "Precision",
-                "Recall",
-                "F1 Score",
-                "Total Documents",
-                "Total Fields",
-                "Created At",
-            ]
-        )
-        for eval_obj, trial in evaluations:
-            gt = db.get(models.GroundTruth, eval_obj.groundtruth_id)
-            writer.writerow(
-                [
-                    eval_obj.id,
-                    trial_display_label(trial),
-                    trial.project_trial_number,
-                    eval_obj.trial_id,
-                    trial.llm_model,
-                    gt.name if gt else "Unknown",
-                    eval_obj.metrics.get("accuracy", 0),
-                    eval_obj.metrics.get("precision", 0),
-                    eval_obj.metrics.get("recall", 0),
-                    eval_obj.metrics.get("f1_score", 0),
-                    eval_obj.metrics.get("total_documents", 0),
-                    eval_obj.metrics.get("total_fields", 0),
-                    eval_obj.created_at.isoformat(),
-                ]
-            )
-        yield (("summary.csv", output.getvalue().encode("utf-8")))
+    Yields ``(arcname, data)`` entries for :func:`~.streaming_zip.iter_zip`.
 
-    else:
-        output = io.BytesIO()
-        summary_data = []
-        for eval_obj, trial in evaluations:
-            gt = db.get(models.GroundTruth, eval_obj.groundtruth_id)
-            summary_data.append(
-                {
-                    "Evaluation ID": eval_obj.id,
-                    "Trial": trial_display_label(trial),
-                    "Trial Number": trial.project_trial_number,
-                    "Trial ID": eval_obj.trial_id,
-                    "Model": trial.llm_model,
-                    "Ground Truth": gt.name if gt else "Unknown",
-                    "Accuracy": eval_obj.metrics.get("accuracy", 0),
-                    "Precision": eval_obj.metrics.get("precision", 0),
-                    "Recall": eval_obj.metrics.get("recall", 0),
-                    "F1 Score": eval_obj.metrics.get("f1_score", 0),
-                    "Total Documents": eval_obj.metrics.get("total_documents", 0),
-                    "Total Fields": eval_obj.metrics.get("total_fields", 0),
-                    "Created At": eval_obj.created_at.isoformat(),
-                }
-            )
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-            pd.DataFrame(summary_data).to_excel(
-                writer, sheet_name="Summary", index=False
-            )
-        output.seek(0)
-        yield (("summary.xlsx", output.getvalue()))
-
-    # Field-level metrics are exported with precision/recall/F1 alongside
-    # accuracy — a researcher comparing fields usually cares more about recall
-    # (what the model missed) than accuracy alone.
-    field_metric_columns = [
-        "Evaluation ID",
-        "Field Name",
-        "Accuracy",
-        "Precision",
-        "Recall",
-        "F1 Score",
-        "Total Count",
-        "Correct Count",
-        "Error Count",
-    ]
-
-    def _field_metric_row(eval_obj, field, metrics):
-        return [
-            eval_obj.id,
-            field,
-            metrics.get("accuracy", 0),
-            metrics.get("precision", 0),
-            metrics.get("recall", 0),
-            metrics.get("f1_score", 0),
-            metrics.get("total_count", 0),
-            metrics.get("correct_count", 0),
-            metrics.get("error_count", 0),
-        ]
+    ``data`` is bytes for small members and a chunk iterator for the report
+    tables, which are produced row by row (see ``evaluation_export``): the
+    field-level details come straight off a database cursor, so no member is
+    ever held in memory whole.
+    """
+    from .evaluation_export import (
+        DOCUMENT_METRIC_COLUMNS,
+        FIELD_METRIC_COLUMNS,
+        SUMMARY_COLUMNS,
+        document_metric_rows,
+        field_detail_columns,
+        field_detail_rows,
+        field_metric_rows,
+        iter_csv,
+        iter_file,
+        peek_rows,
+        summary_rows,
+        write_xlsx,
+    )
+
+    def member(name, sheet_name, columns, rows):
+        if zip_format == "csv":
+            return f"{name}.csv", iter_csv(chain([columns], rows))
+        return f"{name}.xlsx", iter_file(write_xlsx([(sheet_name, columns, rows)]))
+
+    yield member("summary", "Summary", SUMMARY_COLUMNS, summary_rows(evaluations))
 
     # --- Field-level metrics (accuracy + precision/recall/F1 per field) ---
     if include_details:
-        field_rows = []
-        for eval_obj, _ in evaluations:
-            for field, metrics in (eval_obj.field_metrics or {}).items():
-                field_rows.append(_field_metric_row(eval_obj, field, metrics))
-        if field_rows:
-            if zip_format == "csv":
-                out = io.StringIO()
-                w = csv.writer(out)
-                w.writerow(field_metric_columns)
-                for row in field_rows:
-                    w.writerow(row)
-                yield (("field_metrics.csv", out.getvalue().encode("utf-8")))
-            else:
-                out = io.BytesIO()
-                with pd.ExcelWriter(out, engine="xlsxwriter") as writer:
-                    pd.DataFrame(field_rows, columns=field_metric_columns).to_excel(
-                        writer, sheet_name="Field Metrics", index=False
-                    )
-                out.seek(0)
-                yield (("field_metrics.xlsx", out.getvalue()))
+        rows = peek_rows(field_metric_rows(evaluations))
+        if rows is not None:
+            yield member("field_metrics", "Field Metrics", FIELD_METRIC_COLUMNS, rows)
 
-    # --- Field-by-field Details (CSV or Excel sheet) ---
+    # --- Field-by-field details (one row per document and field) ---
     if include_field_details:
-        details = []
-        for eval_obj, _ in evaluations:
-            details.extend(
-                collect_evaluation_field_level_details(db, eval_obj, include_errors)
+        rows = peek_rows(
+            field_detail_rows(
+                db, [eval_obj.id for eval_obj, _ in evaluations], include_errors
+            )
+        )
+        if rows is not None:
+            yield member(
+                "field_details",
+                "Field Details",
+                field_detail_columns(include_errors),
+                rows,
             )
-        if details:
-            if zip_format == "csv":
-                out = io.StringIO()
-                w = csv.writer(out)
-                headers = list(details[0].keys())
-                w.writerow(headers)
-                for row in details:
-                    w.writerow([row.get(h, "") for h in headers])
-                yield (("field_details.csv", out.getvalue().encode("utf-8")))
-            else:
-                out = io.BytesIO()
-                with pd.ExcelWriter(out, engine="xlsxwriter") as writer:
-                    pd.DataFrame(details).to_excel(
-                        writer, sheet_name="Field Details", index=False
-                    )
-                out.seek(0)
-                yield (("field_details.xlsx", out.getvalue()))
 
     # --- Document-level metrics ---
     if include_details:
-        doc_data = []
-        for eval_obj, _ in evaluations:
-            for doc_metrics in eval_obj.document_metrics:
-                doc_data.append(
-                    {
-                        "Evaluation ID": eval_obj.id,
-                        "Document ID": doc_metrics.get("document_id"),
-                        "Accuracy": doc_metrics.get("accuracy"),
-                        "Correct Fields": doc_metrics.get("correct_fields"),
-                        "Total Fields": doc_metrics.get("total_fields"),
-                        "Missing Fields": ";".join(
-                            doc_metrics.get("missing_fields", [])
-                        ),
-                        "Incorrect Fields": ";".join(
-                            doc_metrics.get("incorrect_fields", [])
-                        ),
-                        "Error": doc_metrics.get("error", ""),
-                    }
-                )
-        if doc_data:
-            if zip_format == "csv":
-                out = io.StringIO()
-                w = csv.writer(out)
-                headers = list(doc_data[0].keys())
-                w.writerow(headers)
-                for row in doc_data:
-                    w.writerow([row.get(h, "") for h in headers])
-                yield (("document_metrics.csv", out.getvalue().encode("utf-8")))
-            else:
-                out = io.BytesIO()
-                with pd.ExcelWriter(out, engine="xlsxwriter") as writer:
-                    pd.DataFrame(doc_data).to_excel(
-                        writer, sheet_name="Doc Metrics", index=False
-                    )
-                out.seek(0)
-                yield (("document_metrics.xlsx", out.getvalue()))
+        rows = peek_rows(document_metric_rows(evaluations))
+        if rows is not None:
+            yield member(
+                "document_metrics", "Doc Metrics", DOCUMENT_METRIC_COLUMNS, rows
+            )
 
     # --- Per-document JSONs/Texts/GT (optional) ---
     if include_document_content or include_ground_truth_content:
         # Put all docs in a subfolder, one JSON per document
+        docs_by_trial = collect_trials_document_metadata(
+            db,
+            [trial for _, trial in evaluations],
+            include_content=include_document_content,
+            include_ground_truth=include_ground_truth_content,
+        )
         for eval_obj, trial in evaluations:
-            docs = collect_trial_document_metadata(
-                db,
-                trial,
-                include_content=include_document_content,
-                include_ground_truth=include_ground_truth_content,
-            )
-            for doc in docs:
+            for doc in docs_by_trial.get(trial.id, []):
                 doc_id = (
                     doc.get("Document ID") or doc.get("document_id") or doc.get("id")
                 )
@@ -459,44 +352,50 @@ def build_evaluation_zipfiles(
                         )
 
 
-def collect_evaluation_field_level_details(
-    db: Session, evaluation: models.Evaluation, include_errors=False
+def collect_trial_document_metadata(
+    db: Session,
+    trial: models.Trial,
+    include_content: bool = False,
+    include_ground_truth: bool = False,
 ) -> list[dict[str, Any]]:
     """
-    Returns list of dicts: one per field per document, with gt/pred/error info.
+    Collects metadata for all documents in a trial. Optionally includes document text and ground truth.
     """
-    details = []
-    for metric in evaluation.detailed_metrics:
-        row = {
-            "Evaluation ID": metric.evaluation_id,
-            "Document ID": metric.document_id,
-            "Field Name": metric.field_name,
-            "Ground Truth": metric.ground_truth_value,
-            "Prediction": metric.predicted_value,
-            "Is Correct": metric.is_correct,
-        }
-        if include_errors:
-            row["Error Type"] = metric.error_type
-            row["Confidence"] = metric.confidence_score
-        details.append(row)
-    return details
+    return collect_trials_document_metadata(
+        db,
+        [trial],
+        include_content=include_content,
+        include_ground_truth=include_ground_truth,
+    ).get(trial.id, [])
 
 
-def collect_trial_document_metadata(
+def collect_trials_document_metadata(
     db: Session,
-    trial: models.Trial,
+    trials: list[models.Trial],
     include_content: bool = False,
     include_ground_truth: bool = False,
-) -> list[dict[str, Any]]:
+) -> dict[int, list[dict[str, Any]]]:
     """
-    Collects metadata for all documents in a trial. Optionally includes document text and ground truth.
+    Batched :func:`collect_trial_document_metadata`: ``{trial_id: [entry, ...]}``.
+
+    Issues the same handful of queries (results, documents, and the
+    ground-truth data when requested) however many trials are passed, so a
+    multi-evaluation export does not query per trial.
     """
-    # Fetch all TrialResults for the trial
-    results = db.query(models.TrialResult).filter_by(trial_id=trial.id).all()
+    trial_ids = list(dict.fromkeys(trial.id for trial in trials))
+    if not trial_ids:
+        return {}
+
+    results = (
+        db.query(models.TrialResult)
+        .filter(models.TrialResult.trial_id.in_(trial_ids))
+        .order_by(models.TrialResult.id)
+        .all()
+    )
 
     # Batch-load all referenced documents with original_file eager-loaded
     # (avoids N+1: previously one db.get + lazy original_file per result).
-    doc_ids = [r.document_id for r in results if r.document_id is not None]
+    doc_ids = {r.document_id for r in results if r.document_id is not None}
     document_lookup: dict[int, models.Document] = {}
     if doc_ids:
         document_lookup = {
@@ -510,8 +409,47 @@ def collect_trial_document_metadata(
             .all()
         }
 
-    docs = []
-    gt_cache = {}
+    # Ground truth for a trial comes from its first evaluation (usually one
+    # evaluation per trial/gt). Only the rows these documents can match are
+    # read from each GT's store, once per GT.
+    gt_data_by_trial: dict[int, dict] = {}
+    if include_ground_truth:
+        gt_id_by_trial: dict[int, int] = {}
+        for trial_id, groundtruth_id in db.execute(
+            select(models.Evaluation.trial_id, models.Evaluation.groundtruth_id)
+            .where(models.Evaluation.trial_id.in_(trial_ids))
+            .order_by(models.Evaluation.id)
+        ):
+            gt_id_by_trial.setdefault(trial_id, groundtruth_id)
+        gt_data: dict[int, dict] = {}
+        if gt_id_by_trial:
+            wanted_keys = {str(doc.id) for doc in document_lookup.values()} | {
+                str(doc.document_name)
+                for doc in document_lookup.values()
+                if doc.document_name is not None
+            }
+            for ground_truth in db.execute(
+                select(models.GroundTruth).where(
+                    models.GroundTruth.id.in_(set(gt_id_by_trial.values()))
+                )
+            ).scalars():
+                try:
+                    with load_ground_truth_store(db, ground_truth) as store:
+                        gt_data[ground_truth.id] = store.rows(keys=wanted_keys)
+                except Exception:
+                    logger.warning(
+                        "Ground truth %s unavailable for export",
+                        ground_truth.id,
+                        exc_info=True,
+                    )
+                    gt_data[ground_truth.id] = {}
+        gt_data_by_trial = {
+            trial_id: gt_data[gt_id]
+            for trial_id, gt_id in gt_id_by_trial.items()
+            if gt_id in gt_data
+        }
+
+    docs_by_trial: dict[int, list[dict[str, Any]]] = {}
     # For each result/document, gather metadata
     for result in results:
         doc = document_lookup.get(result.document_id)
@@ -526,22 +464,17 @@ def collect_trial_document_metadata(
         if include_content:
             entry["Document Content"] = doc.text
         # Optionally attach ground truth for that doc
-        if include_ground_truth and trial.evaluations:
-            eval_obj = trial.evaluations[0]  # usually one evaluation per trial/gt
-            gt = db.get(models.GroundTruth, eval_obj.groundtruth_id)
-            if gt:
-                if gt.id not in gt_cache:
-                    gt_cache[gt.id] = gt.data_cache or {}
-                gt_data = gt_cache[gt.id]
-                # Try to match the document by doc_name or file_name
-                key = (
-                    str(doc.document_name)
-                    if doc.document_name is not None and doc.document_name in gt_data
-                    else str(doc.id)
-                )
-                entry["Ground Truth"] = gt_data.get(key)
-        docs.append(entry)
-    return docs
+        gt_data = gt_data_by_trial.get(result.trial_id)
+        if gt_data is not None:
+            # Try to match the document by doc_name or file_name
+            key = (
+                str(doc.document_name)
+                if doc.document_name is not None and doc.document_name in gt_data
+                else str(doc.id)
+            )
+            entry["Ground Truth"] = gt_data.get(key)
+        docs_by_trial.setdefault(result.trial_id, []).append(entry)
+    return docs_by_trial
 
 
 def extract_leaf_paths_from_dict(data, parent=""):
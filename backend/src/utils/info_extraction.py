@@ -13,7 +13,7 @@ import datetime as dt
 import json
 import logging
 import re
-import unicodedata
+from dataclasses import dataclass
 from types import SimpleNamespace
 from typing import Any, Literal
 from urllib.parse import urlparse
@@ -38,6 +38,11 @@ from ..middleware.error_handlers import (
     internal_error_message,
     record_internal_error,
 )
+from ..utils.document_prompt import (
+    estimate_tokens,
+    load_prompt_text,
+    sanitize_for_prompt,
+)
 from ..utils.enums import TrialResultStatus
 from ..utils.evidence import (
     augment_schema_with_evidence,
@@ -45,6 +50,7 @@ from ..utils.evidence import (
     evidence_requested,
     split_evidence,
 )
+from ..utils.fair_scheduler import llm_slot, llm_slot_sync
 from ..utils.prompt_text import (
     DEFAULT_PROMPT_LANGUAGE,
     has_own_guard,
@@ -557,65 +563,123 @@ def update_trial_progress(db, trial_id: int) -> None:
 
 
 # =============================================================================
-# Input sanitization
+# Message + request building
 # =============================================================================
 
-# Keep only LF (\n). Excludes TAB (\t) and CR (\r) so they can be handled explicitly.
-_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
-
-# Unicode non-characters (optional but harmless)
-_NONCHAR_RE = re.compile(
-    r"[﷐-﷯￾￿"
-    r"\U0001FFFE-\U0001FFFF"
-    r"\U0002FFFE-\U0002FFFF"
-    r"\U0003FFFE-\U0003FFFF"
-    r"\U0004FFFE-\U0004FFFF"
-    r"\U0005FFFE-\U0005FFFF"
-    r"\U0006FFFE-\U0006FFFF"
-    r"\U0007FFFE-\U0007FFFF"
-    r"\U0008FFFE-\U0008FFFF"
-    r"\U0009FFFE-\U0009FFFF"
-    r"\U000AFFFE-\U000AFFFF"
-    r"\U000BFFFE-\U000BFFFF"
-    r"\U000CFFFE-\U000CFFFF"
-    r"\U000DFFFE-\U000DFFFF"
-    r"\U000EFFFE-\U000EFFFF"
-    r"\U0010FFFE-\U0010FFFF]"
-)
+_DOCUMENT_PLACEHOLDER = "{document_content}"
 
+#: ``advanced_options["prompt_layout"]`` values. "classic" (the default) keeps
+#: the historical message layout. "prefix_cache" puts every static part of the
+#: request (system prompt, injection guard, schema, evidence instructions)
+#: before the document, so the requests of a trial share one byte-identical
+#: prefix that vLLM automatic prefix caching and hosted prompt caching reuse.
+PROMPT_LAYOUTS = ("classic", "prefix_cache")
+DEFAULT_PROMPT_LAYOUT = "classic"
 
-def sanitize_for_prompt(text: str, *, collapse_space: bool = False) -> str:
-    """Hardened sanitizer to prevent raw control chars being copied into JSON."""
-    if text is None:
-        return ""
 
-    # Ensure it's valid Unicode
-    if isinstance(text, bytes):
-        text = text.decode("utf-8", "replace")
+def resolve_prompt_layout(advanced_options: dict | None) -> str:
+    """The trial's prompt layout, defaulting to the classic one."""
+    raw = (advanced_options or {}).get("prompt_layout")
+    return raw if raw in PROMPT_LAYOUTS else DEFAULT_PROMPT_LAYOUT
+
 
-    # Normalize (composed form)
-    text = unicodedata.normalize("NFC", text)
+@dataclass(frozen=True)
+class PromptPrefix:
+    """A trial's messages with the document left out, for the prefix layout.
 
-    # Normalize line endings and tabs *before* control filtering
-    text = text.replace("\r", "\n").replace("\t", "    ")
+    ``system`` holds everything static: the user's system prompt behind the
+    injection guard, then the schema and the evidence instructions. The user
+    message is ``user_head`` + document + ``user_tail``, where the head is the
+    user prompt up to its first ``{document_content}`` (or up to the appended
+    document markers).
+    """
 
-    # Remove dangerous C0 controls except LF (\n)
-    text = _CONTROL_CHARS_RE.sub("", text)
+    system: str
+    user_head: str
+    user_tail: str
 
-    # Strip Unicode non-characters
-    text = _NONCHAR_RE.sub("", text)
+    def messages(self, document_text: str, *, sanitized: bool = False) -> list[dict]:
+        clean_doc = (
+            document_text
+            if sanitized
+            else sanitize_for_prompt(document_text, collapse_space=False)
+        )
+        user = (
+            self.user_head
+            + clean_doc
+            + self.user_tail.replace(_DOCUMENT_PLACEHOLDER, clean_doc)
+        )
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": user},
+        ]
 
-    # (Optional) tame pathological whitespace
-    if collapse_space:
-        text = re.sub(r"\n{4,}", "\n\n\n", text)
-        text = re.sub(r"[ \t]{3,}", "  ", text)
 
-    return text
+def render_prompt_prefix(
+    prompt: Any,
+    schema_definition: dict | None = None,
+    *,
+    evidence: bool = False,
+    language: str = DEFAULT_PROMPT_LANGUAGE,
+) -> PromptPrefix | None:
+    """Render the static part of a prefix-layout request once per trial.
 
+    Returns None when the system prompt itself contains ``{document_content}``:
+    the user chose to put the document there, so the request keeps the
+    classic layout. Unlike the classic layout, the injection guard is added
+    even without a system prompt, since the system message always exists here.
+    """
+    system_prompt = prompt.system_prompt or ""
+    if _DOCUMENT_PLACEHOLDER in system_prompt:
+        return None
+
+    if not system_prompt:
+        system = injection_guard(language).strip()
+    elif has_own_guard(system_prompt):
+        system = system_prompt
+    else:
+        system = injection_guard(language) + system_prompt
+    user_prompt = prompt.user_prompt or ""
+    if schema_definition and "{schema" not in user_prompt.lower():
+        schema_json = json.dumps(schema_definition, indent=2)
+        system += f"\n\n{schema_intro(language)}\n```json\n{schema_json}\n```"
+    if evidence:
+        system += evidence_instruction(language)
 
-# =============================================================================
-# Message + request building
-# =============================================================================
+    if _DOCUMENT_PLACEHOLDER in user_prompt:
+        user_head, user_tail = user_prompt.split(_DOCUMENT_PLACEHOLDER, 1)
+    else:
+        user_head = f"{user_prompt}\n\n" if user_prompt else ""
+        user_head += "--- DOCUMENT CONTENT ---\n"
+        user_tail = "\n--- END DOCUMENT ---"
+    return PromptPrefix(system=system, user_head=user_head, user_tail=user_tail)
+
+
+def _trial_prompt_prefix(
+    trial_id: int,
+    prefix_cache: dict[int, PromptPrefix | None] | None,
+    prompt: Any,
+    schema_definition: dict,
+    advanced_options: dict | None,
+    *,
+    evidence: bool,
+    language: str,
+) -> PromptPrefix | None:
+    """The trial's :class:`PromptPrefix` under the prefix layout, else None.
+
+    ``prefix_cache`` (one dict per trial run) keeps the rendered prefix, so
+    every document of the trial reuses the same one.
+    """
+    if resolve_prompt_layout(advanced_options) != "prefix_cache":
+        return None
+    if prefix_cache is not None and trial_id in prefix_cache:
+        return prefix_cache[trial_id]
+    prefix = render_prompt_prefix(
+        prompt, schema_definition, evidence=evidence, language=language
+    )
+    if prefix_cache is not None:
+        prefix_cache[trial_id] = prefix
+    return prefix
 
 
 def _build_messages(
@@ -625,6 +689,8 @@ def _build_messages(
     *,
     evidence: bool = False,
     language: str = DEFAULT_PROMPT_LANGUAGE,
+    prefix: PromptPrefix | None = None,
+    sanitized: bool = False,
 ) -> list[dict]:
     """
     Inject the document text into user/system prompt templates.
@@ -644,9 +710,21 @@ def _build_messages(
             fields, in which case the instruction explaining them is appended
         language: Language for the instructions this function appends, so a
             German prompt over a German report isn't diluted with English
+        prefix: The trial's rendered prefix layout (see
+            :func:`render_prompt_prefix`); when given, the other prompt
+            arguments are already part of it
+        sanitized: ``document_text`` is already prompt-ready (stored by
+            utils/document_prompt.py), so it is not sanitized again
     """
-    placeholder = "{document_content}"
-    clean_doc = sanitize_for_prompt(document_text, collapse_space=False)
+    if prefix is not None:
+        return prefix.messages(document_text, sanitized=sanitized)
+
+    placeholder = _DOCUMENT_PLACEHOLDER
+    clean_doc = (
+        document_text
+        if sanitized
+        else sanitize_for_prompt(document_text, collapse_space=False)
+    )
 
     msgs: list[dict[str, str]] = []
 
@@ -856,6 +934,26 @@ def _pick_better_response(first: Any, second: Any, schema_def: dict | None) -> A
     )
 
 
+def _prompt_token_counts(response: Any) -> tuple[int, int]:
+    """``(prompt tokens, cached prompt tokens)`` a call reported in its usage.
+
+    The cached count comes from ``usage.prompt_tokens_details.cached_tokens``
+    (OpenAI, and vLLM with prompt token details enabled); providers that omit
+    either count contribute 0.
+    """
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        cached = details.get("cached_tokens")
+    else:
+        cached = getattr(details, "cached_tokens", None)
+    return (
+        prompt_tokens if isinstance(prompt_tokens, int) else 0,
+        cached if isinstance(cached, int) else 0,
+    )
+
+
 def _retry_advanced_options(response: Any, advanced_options: dict | None) -> dict:
     """Advanced options for a length retry, based on what the first call used."""
     choice = _first_choice(response)
@@ -881,15 +979,17 @@ def _load_extraction_inputs(
 ) -> tuple[str, dict, Any]:
     """Load the inputs needed for an LLM extraction call from ``session``.
 
-    Returns ``(document_text, schema_def, prompt_obj)``. Uses the schema/prompt
+    Returns ``(document_text, schema_def, prompt_obj)``, where the text is the
+    document's stored prompt-ready text (see utils/document_prompt.py). Uses
+    the schema/prompt
     snapshot frozen at trial creation so the stored result matches the record
     shown to the user; falls back to the live rows for trials created before
     snapshots existed. Intended to be called within a short-lived session that
     is closed before the (slow) LLM call, so the DB connection is released.
     """
     trial = session.get(models.Trial, trial_id)
-    document = session.get(models.Document, document_id)
-    if not (trial and document):
+    document_text = load_prompt_text(session, document_id)
+    if trial is None or document_text is None:
         raise ValueError("trial / document not found")
 
     schema_def = (trial.schema_snapshot or {}).get("schema_definition")
@@ -908,7 +1008,13 @@ def _load_extraction_inputs(
     if schema_def is None or prompt_obj is None:
         raise ValueError("schema / prompt not found")
 
-    return document.text, schema_def, prompt_obj
+    return document_text, schema_def, prompt_obj
+
+
+def _request_token_estimate(kwargs: dict) -> int:
+    """Rough prompt size of a completion request, charged to the endpoint's
+    token budget until the response reports the real usage."""
+    return estimate_tokens(json.dumps(kwargs.get("messages"), ensure_ascii=False))
 
 
 async def extract_info_single_doc_async(
@@ -922,12 +1028,20 @@ async def extract_info_single_doc_async(
     project_id: int,
     advanced_options: dict | None = None,
     base_url: str | None = None,
-) -> None:
+    prefix_cache: dict[int, PromptPrefix | None] | None = None,
+    scheduling_weight: float = 1.0,
+) -> tuple[int, int]:
     """Async extraction for a single document.
 
     Loads inputs and stores the result with short-lived sessions, so no DB
     connection is held open during the (potentially long) LLM call — under
     concurrency that would idle a large share of the connection pool.
+
+    ``prefix_cache`` is shared by the documents of one trial run (see
+    :func:`_trial_prompt_prefix`). Returns ``(prompt tokens, cached prompt
+    tokens)`` summed over the document's LLM calls. Each LLM call waits for a
+    slot of its endpoint, granted by ``scheduling_weight``, and for its
+    request/token budget (see ``utils/fair_scheduler.py``).
     """
     # Phase 1: load inputs with a short-lived session, then release it.
     with db_session() as session:
@@ -945,22 +1059,38 @@ async def extract_info_single_doc_async(
         augment_schema_with_evidence(schema_def) if evidence else schema_def
     )
     language = resolve_prompt_language(advanced_options)
-
-    # Phase 2: the LLM call — no DB session held.
-    kwargs = _completion_kwargs(
-        llm_model,
+    messages = _build_messages(
+        prompt_obj,
+        document_text,
         request_schema,
-        _build_messages(
+        evidence=evidence,
+        language=language,
+        sanitized=True,
+        prefix=_trial_prompt_prefix(
+            trial_id,
+            prefix_cache,
             prompt_obj,
-            document_text,
             request_schema,
+            advanced_options,
             evidence=evidence,
             language=language,
         ),
-        advanced_options,
-        base_url,
     )
-    response = await client.chat.completions.create(**kwargs)
+
+    # Phase 2: the LLM call — no DB session held.
+    kwargs = _completion_kwargs(
+        llm_model, request_schema, messages, advanced_options, base_url
+    )
+    async with llm_slot(
+        base_url,
+        trial_id,
+        scheduling_weight,
+        model=llm_model,
+        tokens=_request_token_estimate(kwargs),
+    ) as slot:
+        response = await client.chat.completions.create(**kwargs)
+        slot.record(response)
+    prompt_tokens, cached_tokens = _prompt_token_counts(response)
 
     # Retry once with a bumped token cap when the cap is what ruined the result.
     retried_for_length = _needs_length_retry(response, request_schema)
@@ -968,17 +1098,22 @@ async def extract_info_single_doc_async(
         bumped_kwargs = _completion_kwargs(
             llm_model,
             request_schema,
-            _build_messages(
-                prompt_obj,
-                document_text,
-                request_schema,
-                evidence=evidence,
-                language=language,
-            ),
+            messages,
             _retry_advanced_options(response, advanced_options),
             base_url,
         )
-        retry_response = await client.chat.completions.create(**bumped_kwargs)
+        async with llm_slot(
+            base_url,
+            trial_id,
+            scheduling_weight,
+            model=llm_model,
+            tokens=_request_token_estimate(bumped_kwargs),
+        ) as slot:
+            retry_response = await client.chat.completions.create(**bumped_kwargs)
+            slot.record(retry_response)
+        retry_prompt, retry_cached = _prompt_token_counts(retry_response)
+        prompt_tokens += retry_prompt
+        cached_tokens += retry_cached
         response = _pick_better_response(response, retry_response, request_schema)
 
     # Phase 3: store the result with a fresh short-lived session.
@@ -993,6 +1128,7 @@ async def extract_info_single_doc_async(
             retried_for_length=retried_for_length,
             evidence=evidence,
         )
+    return prompt_tokens, cached_tokens
 
 
 def extract_info_single_doc(
@@ -1010,8 +1146,8 @@ def extract_info_single_doc(
 ) -> None:
     """Sync extraction for a single document."""
     trial = db_session.get(models.Trial, trial_id)
-    document = db_session.get(models.Document, document_id)
-    if not (trial and document):
+    document_text = load_prompt_text(db_session, document_id)
+    if trial is None or document_text is None:
         raise ValueError("trial / document not found")
 
     # Use the schema/prompt snapshot frozen at trial creation so the stored
@@ -1039,6 +1175,23 @@ def extract_info_single_doc(
         augment_schema_with_evidence(schema_def) if evidence else schema_def
     )
     language = resolve_prompt_language(advanced_options)
+    messages = _build_messages(
+        prompt_obj,
+        document_text,
+        request_schema,
+        evidence=evidence,
+        language=language,
+        sanitized=True,
+        prefix=_trial_prompt_prefix(
+            trial_id,
+            None,
+            prompt_obj,
+            request_schema,
+            advanced_options,
+            evidence=evidence,
+            language=language,
+        ),
+    )
 
     with OpenAI(
         api_key=api_key,
@@ -1053,19 +1206,16 @@ def extract_info_single_doc(
         ),
     ) as client:
         kwargs = _completion_kwargs(
-            llm_model,
-            request_schema,
-            _build_messages(
-                prompt_obj,
-                document.text,
-                request_schema,
-                evidence=evidence,
-                language=language,
-            ),
-            advanced_options,
-            base_url,
+            llm_model, request_schema, messages, advanced_options, base_url
         )
-        response = client.chat.completions.create(**kwargs)
+        with llm_slot_sync(
+            base_url,
+            trial_id,
+            model=llm_model,
+            tokens=_request_token_estimate(kwargs),
+        ) as slot:
+            response = client.chat.completions.create(**kwargs)
+            slot.record(response)
 
         # Retry once with a bumped token cap when the cap is what ruined the
         # result (see _needs_length_retry).
@@ -1074,13 +1224,18 @@ def extract_info_single_doc(
             bumped_kwargs = _completion_kwargs(
                 llm_model,
                 request_schema,
-                _build_messages(
-                    prompt_obj, document.text, request_schema, evidence=evidence
-                ),
+                messages,
                 _retry_advanced_options(response, advanced_options),
                 base_url,
             )
-            retry_response = client.chat.completions.create(**bumped_kwargs)
+            with llm_slot_sync(
+                base_url,
+                trial_id,
+                model=llm_model,
+                tokens=_request_token_estimate(bumped_kwargs),
+            ) as slot:
+                retry_response = client.chat.completions.create(**bumped_kwargs)
+                slot.record(retry_response)
             response = _pick_better_response(response, retry_response, request_schema)
 
     _store_result(
@@ -0,0 +1,216 @@
+# backend/src/utils/ocr_cache.py
+"""OCR results reused across projects and re-runs.
+
+Users upload the same PDFs into several projects and re-run preprocessing
+with unchanged engine settings, and each run sent identical bytes through
+docling-serve, Mistral or a vision LLM again. A finished conversion is a pure
+function of the file's bytes and the engine settings, so the pipeline keeps
+the result and answers the next request for the same bytes from the database.
+
+Design notes:
+
+* An entry is keyed by a digest of (file hash, engine, model, options hash).
+  The file hash is ``File.file_hash``, the SHA-256 computed at upload, so a
+  lookup needs no file read. ``options`` holds every setting that changes the
+  output (OCR languages, forced OCR, prompt, endpoint, …); a change to any of
+  them is simply a different key.
+* The payload is the text plus page metadata as zlib-compressed JSON.
+  ``size_bytes`` is the compressed size, which is what counts against
+  ``OCR_CACHE_MAX_MB``. After each insert the least recently used entries are
+  deleted until the total fits; a hit moves ``last_used_at``. ``0`` disables
+  the cache.
+* Reads and writes go through the pipeline's session inside a SAVEPOINT, so
+  a concurrent insert of the same key, or any other database error, costs
+  the cache entry and never the file being processed.
+* A project with ``ocr_cache_enabled`` off neither reads nor stores entries:
+  a hit would reveal that someone else already processed the same bytes.
+  Switching it off does not remove earlier contributions; an admin can clear
+  the cache (``DELETE /admin/ocr-cache``).
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..models import OCRCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Entries deleted per DELETE statement during eviction.
+_EVICT_BATCH = 500
+
+
+@dataclass(frozen=True)
+class CachedOCR:
+    """A conversion result as stored: text, per-page text, engine extras."""
+
+    text: str
+    pages: list[str] = field(default_factory=list)
+    meta: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    file_hash: str
+    engine: str
+    model: str | None
+    options_hash: str
+
+    @property
+    def digest(self) -> str:
+        return _digest([self.file_hash, self.engine, self.model, self.options_hash])
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def max_bytes() -> int:
+    # Imported lazily so admin changes apply without a restart.
+    from ..core.dynamic_settings import get_settings
+
+    return max(0, int(get_settings().OCR_CACHE_MAX_MB)) * 1024 * 1024
+
+
+def make_key(
+    project,
+    file_hash: str | None,
+    engine: str,
+    model: str | None = None,
+    options: dict[str, Any] | None = None,
+) -> CacheKey | None:
+    """The key for a conversion, or None if ``project`` may not use the cache."""
+    if not file_hash or max_bytes() <= 0 or not project.ocr_cache_enabled:
+        return None
+    return CacheKey(file_hash, engine, model, _digest(options or {}))
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.UTC)
+
+
+def contains(db: Session, key: CacheKey) -> bool:
+    """Whether ``key`` has an entry, without counting it as a use."""
+    try:
+        return (
+            db.scalar(
+                select(OCRCacheEntry.id).where(OCRCacheEntry.cache_key == key.digest)
+            )
+            is not None
+        )
+    except SQLAlchemyError as e:
+        logger.warning("OCR cache lookup failed: %s", e)
+        return False
+
+
+def lookup(db: Session, key: CacheKey) -> CachedOCR | None:
+    """The cached result for ``key``, marking it recently used. Never raises."""
+    try:
+        with db.begin_nested():
+            row = db.execute(
+                select(OCRCacheEntry.id, OCRCacheEntry.payload).where(
+                    OCRCacheEntry.cache_key == key.digest
+                )
+            ).one_or_none()
+            if row is None:
+                return None
+            data = json.loads(zlib.decompress(row.payload))
+            db.execute(
+                update(OCRCacheEntry)
+                .where(OCRCacheEntry.id == row.id)
+                .values(last_used_at=_now(), hit_count=OCRCacheEntry.hit_count + 1)
+            )
+    except (SQLAlchemyError, zlib.error, ValueError) as e:
+        logger.warning("OCR cache lookup failed: %s", e)
+        return None
+    return CachedOCR(
+        text=data["text"], pages=data.get("pages") or [], meta=data.get("meta") or {}
+    )
+
+
+def store(db: Session, key: CacheKey, result: CachedOCR) -> None:
+    """Cache ``result`` under ``key`` and evict down to the budget. Never raises."""
+    budget = max_bytes()
+    payload = zlib.compress(
+        json.dumps(
+            {"text": result.text, "pages": result.pages, "meta": result.meta},
+            default=str,
+        ).encode()
+    )
+    if not budget or len(payload) > budget:
+        return
+    try:
+        with db.begin_nested():
+            db.add(
+                OCRCacheEntry(
+                    cache_key=key.digest,
+                    file_hash=key.file_hash,
+                    engine=key.engine,
+                    model=key.model,
+                    options_hash=key.options_hash,
+                    payload=payload,
+                    size_bytes=len(payload),
+                    hit_count=0,
+                    last_used_at=_now(),
+                )
+            )
+        with db.begin_nested():
+            evict(db, budget)
+    except SQLAlchemyError as e:
+        # Typically another worker stored the same key first.
+        logger.info("OCR cache store skipped: %s", e)
+
+
+def evict(db: Session, budget: int) -> int:
+    """Delete least recently used entries until the total fits ``budget``."""
+    total = db.scalar(select(func.coalesce(func.sum(OCRCacheEntry.size_bytes), 0)))
+    excess = total - budget
+    if excess <= 0:
+        return 0
+    doomed = []
+    for entry_id, size in db.execute(
+        select(OCRCacheEntry.id, OCRCacheEntry.size_bytes).order_by(
+            OCRCacheEntry.last_used_at, OCRCacheEntry.id
+        )
+    ):
+        doomed.append(entry_id)
+        excess -= size
+        if excess <= 0:
+            break
+    for start in range(0, len(doomed), _EVICT_BATCH):
+        db.execute(
+            delete(OCRCacheEntry).where(
+                OCRCacheEntry.id.in_(doomed[start : start + _EVICT_BATCH])
+            )
+        )
+    return len(doomed)
+
+
+def stats(db: Session) -> dict[str, int]:
+    entries, size, hits = db.execute(
+        select(
+            func.count(OCRCacheEntry.id),
+            func.coalesce(func.sum(OCRCacheEntry.size_bytes), 0),
+            func.coalesce(func.sum(OCRCacheEntry.hit_count), 0),
+        )
+    ).one()
+    return {
+        "entries": entries,
+        "size_bytes": size,
+        "max_bytes": max_bytes(),
+        "hits": hits,
+    }
+
+
+def clear(db: Session) -> int:
+    """Delete every entry; returns how many there were. Caller commits."""
+    return db.execute(delete(OCRCacheEntry)).rowcount
@@ -4,40 +4,56 @@ import datetime
 import io
 import logging
 import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Any, List, cast
 
 import httpx2
 import pandas as pd
 from openai import OpenAI
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
 from sqlalchemy.exc import OperationalError
-from sqlalchemy.orm import Session, defer
+from sqlalchemy.orm import Session, aliased, defer
 
 from .. import models
 from ..core.config import settings
-from ..db.session import db_session
+from ..db.session import SessionLocal, db_session
 from ..dependencies import get_file
 from ..middleware.error_handlers import (
     internal_error_message,
     operational_error_message,
 )
+from . import file_heartbeat
 from .helpers import _make_aware, detect_text_encoding
 from .json_utils import case_id_str as _case_id_str
 from .json_utils import strip_nul as _strip_nul
+from .ocr_cache import CachedOCR
 from .url_safety import enforce_endpoint_allowlist, validate_user_endpoint
 
 logger = logging.getLogger(__name__)
 
-# How often _process_with_timeout bumps file_task.last_heartbeat_at while
-# waiting for a file to finish. Must be comfortably shorter than the sweeper's
-# stale-heartbeat cutoff so an actively-processing file is never reaped.
-_HEARTBEAT_INTERVAL_SECONDS = 15
-
 # Sentinel pushed to the result queue by the worker thread when it fails, so the
 # poller wakes immediately (instead of blocking a full heartbeat interval) and
 # raises the real exception carried on the separate exception queue.
 _WORKER_ERROR = object()
 
+# File task ids per query in find_conflicting_file_tasks.
+_CONFLICT_BATCH = 500
+
+# How often process() commits the task's progress counters (and broadcasts)
+# while files run on its worker pool, instead of once per finished file.
+_PROGRESS_COMMIT_INTERVAL_SECONDS = 3
+
+# File types _route_pdf_image treats as images.
+_IMAGE_FILE_TYPES = (
+    models.FileType.IMAGE_PNG,
+    models.FileType.IMAGE_JPEG,
+    "image/png",
+    "image/jpeg",
+    "image/jpg",
+)
+
 
 def _json_safe(value: Any) -> Any:
     """Recursively convert a value into something ``json.dumps`` can handle.
@@ -68,8 +84,82 @@ def _json_safe(value: Any) -> Any:
     return _strip_nul(str(value))
 
 
+def engine_concurrency(additional_settings: dict | None) -> tuple[int, int]:
+    """``(max concurrent files, per-file timeout)`` for a configuration's engine.
+
+    Shared by the Celery chunk runner and :meth:`PreprocessingPipeline.process`
+    so both paths hold the same per-engine caps.
+    """
+    additional = additional_settings or {}
+    ocr_engine = additional.get("ocr_engine", "docling_tesseract")
+    extraction_mode = additional.get("extraction_mode", "auto")
+    if ocr_engine == "mistral_ocr" or extraction_mode == "high_accuracy_remote":
+        return (
+            settings.MISTRAL_OCR_MAX_CONCURRENT_FILES,
+            settings.MISTRAL_OCR_FILE_TIMEOUT_SECONDS,
+        )
+    if ocr_engine == "llm_vision":
+        return (
+            settings.VISION_OCR_MAX_CONCURRENT_FILES,
+            settings.VISION_OCR_FILE_TIMEOUT_SECONDS,
+        )
+    # Default to docling-serve or general limit
+    return (
+        min(
+            settings.DOCLING_SERVE_MAX_CONCURRENT_FILES,
+            settings.PREPROCESS_MAX_CONCURRENT_FILES,
+        ),
+        settings.DOCLING_SERVE_FILE_TIMEOUT_SECONDS,
+    )
+
+
+def find_conflicting_file_tasks(
+    db: Session, configuration_id: int, file_task_ids: list[int]
+) -> dict[int, int]:
+    """Which of ``file_task_ids`` another in-flight file task may conflict with.
+
+    Maps each file task that shares its file and configuration with a
+    PENDING/IN_PROGRESS file task elsewhere to that task's id, in one query
+    per ``_CONFLICT_BATCH`` ids. Run once per chunk; ``_process_file_task``
+    then re-checks only the flagged files (both sides of a race are flagged
+    and the per-file check settles it as before). A conflicting task created
+    after this screen is left to the dispatch endpoint, which already rejects
+    overlapping requests.
+    """
+    this = models.FilePreprocessingTask
+    other = aliased(models.FilePreprocessingTask)
+    conflicts: dict[int, int] = {}
+    for start in range(0, len(file_task_ids), _CONFLICT_BATCH):
+        rows = db.execute(
+            select(this.id, func.min(other.id))
+            .join(other, and_(other.file_id == this.file_id, other.id != this.id))
+            .join(
+                models.PreprocessingTask,
+                models.PreprocessingTask.id == other.preprocessing_task_id,
+            )
+            .where(
+                this.id.in_(file_task_ids[start : start + _CONFLICT_BATCH]),
+                models.PreprocessingTask.configuration_id == configuration_id,
+                other.status.in_(
+                    [
+                        models.PreprocessingStatus.PENDING,
+                        models.PreprocessingStatus.IN_PROGRESS,
+                    ]
+                ),
+            )
+            .group_by(this.id)
+        )
+        conflicts.update({file_task_id: other_id for file_task_id, other_id in rows})
+    return conflicts
+
+
 class PreprocessingPipeline:
-    """Flexible preprocessing pipeline for different file types."""
+    """Flexible preprocessing pipeline for different file types.
+
+    ``clients_from`` makes this a worker of another pipeline's pool (see
+    :meth:`process`): it borrows that pipeline's OpenAI, docling-serve and
+    vision clients instead of building and closing its own.
+    """
 
     MAX_ROWS_PER_FILE = 100000  # Fail-safe limit
     BATCH_SIZE = 1000  # Process documents in batches
@@ -80,6 +170,9 @@ class PreprocessingPipeline:
         task_id: int,
         api_key: str | None = None,
         base_url: str | None = None,
+        mistral_batch_results: dict[int, Any] | None = None,
+        clients_from: "PreprocessingPipeline | None" = None,
+        conflict_candidates: dict[int, int] | None = None,
     ):
         self.db = db
         task = db.get(models.PreprocessingTask, task_id)
@@ -90,12 +183,33 @@ class PreprocessingPipeline:
         self.cancelled = False
         self.client = None
         self._docling_serve_client = None
+        # File id -> MistralOCRResult already OCR'd by a batch job
+        # (:meth:`prefetch_mistral_batch`); consumed by _process_with_mistral_ocr.
+        self._mistral_batch_results = (
+            mistral_batch_results if mistral_batch_results is not None else {}
+        )
         # Set when a per-file timeout leaves a zombie worker thread holding
         # `self.db`; the main loop must abort and finalize via fresh sessions.
         self._timeout_abort = False
-
-        # Store API credentials in task metadata if custom ones provided
-        if api_key and base_url:
+        # Bytes and PdfProfile of the file in progress, loaded once and
+        # shared by routing and the engines (see _file_content/_pdf_profile).
+        self._file_contents: dict[int, bytes] = {}
+        self._pdf_profiles: dict[int, Any] = {}
+        # File task id -> possibly conflicting file task, from
+        # find_conflicting_file_tasks; None re-checks every file.
+        self._conflict_candidates = conflict_candidates
+        # Engine clients are created lazily under this lock and shared with
+        # the worker pipelines of process()'s pool.
+        self._clients_from = clients_from
+        self._clients_lock = threading.Lock()
+        self._vision_services: dict[tuple, Any] = {}
+
+        if clients_from is not None:
+            # A pool worker: the parent already validated and audited any
+            # custom credentials.
+            self.client = clients_from.client
+        elif api_key and base_url:
+            # Store API credentials in task metadata if custom ones provided.
             # Validate the user-supplied custom endpoint against the SSRF
             # policy (block cloud-metadata + non-http(s) schemes). System
             # defaults (the elif branch) are trusted and not validated here.
@@ -137,10 +251,22 @@ class PreprocessingPipeline:
         DoclingServeClient are never closed otherwise; in the Celery path a new
         pipeline is constructed per file task, so leaking them accumulates open
         sockets/file descriptors across a long-running worker. Safe to call when
-        the clients were never created (they stay ``None``).
+        the clients were never created (they stay ``None``). A pool worker
+        leaves the clients it borrowed to their owner.
         """
+        self._release_file_inputs()
         client = self.client
         self.client = None
+        if self._clients_from is not None:
+            return
+        with self._clients_lock:
+            vision_services = list(self._vision_services.values())
+            self._vision_services.clear()
+        for service in vision_services:
+            try:
+                service.close()
+            except Exception:
+                logger.debug("Error closing vision OCR service", exc_info=True)
         if client is not None:
             close = getattr(client, "close", None)
             if close is not None:
@@ -200,6 +326,25 @@ class PreprocessingPipeline:
         self.db.commit()
 
         try:
+            max_workers, _ = engine_concurrency(self.config.additional_settings)
+            pending_ids = list(
+                self.db.execute(
+                    select(models.FilePreprocessingTask.id)
+                    .where(
+                        models.FilePreprocessingTask.preprocessing_task_id
+                        == self.task.id,
+                        models.FilePreprocessingTask.status
+                        == models.PreprocessingStatus.PENDING,
+                    )
+                    .order_by(models.FilePreprocessingTask.id)
+                ).scalars()
+            )
+            self._conflict_candidates = find_conflicting_file_tasks(
+                self.db, self.config.id, pending_ids
+            )
+            if max_workers > 1 and len(pending_ids) > 1:
+                self._process_in_pool(pending_ids, max_workers)
+
             # ───── process every file task ──────────────────────────────────
             for file_task in self.task.file_tasks:
                 if self.check_cancelled():
@@ -310,6 +455,124 @@ class PreprocessingPipeline:
             # so per-file-task pipelines in the Celery path don't leak pools.
             self.close()
 
+    def _process_in_pool(self, file_task_ids: list[int], max_workers: int) -> None:
+        """Run ``file_task_ids`` on up to ``max_workers`` threads.
+
+        Each file gets a worker pipeline on a session of its own that borrows
+        this pipeline's engine clients. Files are handed out one at a time as
+        slots free up, so a cancellation only waits for the files in flight.
+        The task's counters are committed (and broadcast) at most every
+        ``_PROGRESS_COMMIT_INTERVAL_SECONDS``; the final tally in
+        :meth:`process` recomputes them anyway.
+
+        A timed-out file fails on its own, as in the Celery path: its
+        zombie thread only holds that worker's session, so the other files
+        keep going. Files this leaves PENDING (after a cancel) fall through
+        to :meth:`process`'s own loop.
+        """
+        task_id = self.task.id
+        processed = self.task.processed_files or 0
+        failed = self.task.failed_files or 0
+        queued = iter(file_task_ids)
+        running: set = set()
+        dirty = False
+        last_commit = time.monotonic()
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"preprocess-{task_id}"
+        ) as pool:
+
+            def submit_next() -> None:
+                file_task_id = next(queued, None)
+                if file_task_id is not None:
+                    running.add(
+                        pool.submit(self._run_pool_file_task, task_id, file_task_id)
+                    )
+
+            for _ in range(max_workers):
+                submit_next()
+            while running:
+                done, _ = wait(
+                    running,
+                    timeout=_PROGRESS_COMMIT_INTERVAL_SECONDS,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    running.discard(future)
+                    status = future.result()
+                    if status == models.PreprocessingStatus.COMPLETED:
+                        processed += 1
+                        dirty = True
+                    elif status == models.PreprocessingStatus.FAILED:
+                        failed += 1
+                        dirty = True
+                if self.check_cancelled():
+                    queued = iter(())
+                for _ in done:
+                    submit_next()
+                now = time.monotonic()
+                if dirty and (
+                    not running
+                    or now - last_commit >= _PROGRESS_COMMIT_INTERVAL_SECONDS
+                ):
+                    # Assigned, not incremented: check_cancelled() refreshes
+                    # the task and would drop unflushed increments.
+                    self.task.processed_files = processed
+                    self.task.failed_files = failed
+                    self.db.commit()
+                    self._broadcast_update("progress")
+                    dirty = False
+                    last_commit = now
+
+        # The workers changed the file tasks in their own sessions.
+        self.db.expire_all()
+
+    def _run_pool_file_task(self, task_id: int, file_task_id: int):
+        """Process one file of :meth:`_process_in_pool`; returns its final status.
+
+        Never raises: an error outside ``_process_file_task``'s own handling
+        fails the file in a fresh session, like the Celery path.
+        """
+        db = SessionLocal()
+        worker = None
+        try:
+            worker = PreprocessingPipeline(
+                db,
+                task_id,
+                mistral_batch_results=self._mistral_batch_results,
+                clients_from=self,
+                conflict_candidates=self._conflict_candidates,
+            )
+            file_task = db.get(models.FilePreprocessingTask, file_task_id)
+            if (
+                file_task is None
+                or file_task.status != models.PreprocessingStatus.PENDING
+                or worker.check_cancelled()
+            ):
+                return None
+            worker._process_file_task(file_task)
+            if worker._timeout_abort:
+                return models.PreprocessingStatus.FAILED
+            return file_task.status
+        except Exception as e:
+            logger.error(
+                "Error processing file task %s: %s", file_task_id, e, exc_info=True
+            )
+            if worker is None or not worker._timeout_abort:
+                db.rollback()
+            self._fail_file_task_fresh(
+                file_task_id,
+                internal_error_message(e, prefix="File processing failed"),
+            )
+            return models.PreprocessingStatus.FAILED
+        finally:
+            if worker is not None:
+                worker.close()
+            # After a timeout the zombie thread still owns the session; it is
+            # released once that thread lets go of it.
+            if worker is None or not worker._timeout_abort:
+                db.close()
+
     def _fail_file_task_fresh(self, file_task_id: int, message: str) -> None:
         """Mark a single file task FAILED in a fresh session.
 
@@ -498,30 +761,66 @@ class PreprocessingPipeline:
 
     def _get_docling_serve_client(self):
         """Lazily initialise and return the docling-serve HTTP client."""
-        if self._docling_serve_client is None:
-            from ..services.docling_serve_client import DoclingServeClient
-
-            additional = self.config.additional_settings or {}
+        if self._clients_from is not None:
+            return self._clients_from._get_docling_serve_client()
+        with self._clients_lock:
+            if self._docling_serve_client is None:
+                from ..services.docling_serve_client import DoclingServeClient
+
+                self._docling_serve_client = DoclingServeClient(
+                    base_url=settings.DOCLING_SERVE_URL,
+                    timeout_seconds=settings.DOCLING_SERVE_TIMEOUT_SECONDS,
+                    max_retries=settings.DOCLING_SERVE_MAX_RETRIES,
+                    default_ocr_langs=self._docling_ocr_langs(),
+                    slice_pages=settings.DOCLING_SERVE_SLICE_PAGES,
+                    max_concurrent_requests=settings.DOCLING_SERVE_MAX_CONCURRENT_REQUESTS,
+                )
+            return self._docling_serve_client
 
-            base_url = settings.DOCLING_SERVE_URL
-            timeout = settings.DOCLING_SERVE_TIMEOUT_SECONDS
-            max_retries = settings.DOCLING_SERVE_MAX_RETRIES
-
-            # OCR languages from settings or additional_settings
-            ocr_langs = additional.get("docling_ocr_languages")
-            if ocr_langs is None:
-                # Default to "auto" for automatic language detection
-                ocr_langs = "auto"
-            # If ocr_langs is already a string (e.g., "auto") or list, use it as-is
-
-            self._docling_serve_client = DoclingServeClient(
-                base_url=base_url,
-                timeout_seconds=timeout,
-                max_retries=max_retries,
-                default_ocr_langs=ocr_langs,
-            )
+    def _docling_ocr_langs(self) -> list[str] | str:
+        """OCR languages for docling-serve from additional_settings."""
+        additional = self.config.additional_settings or {}
+        ocr_langs = additional.get("docling_ocr_languages")
+        if ocr_langs is None:
+            # Default to "auto" for automatic language detection
+            ocr_langs = "auto"
+        # If ocr_langs is already a string (e.g., "auto") or list, use it as-is
+        return ocr_langs
+
+    def _cached_ocr(
+        self,
+        file: models.File,
+        engine: str,
+        convert,
+        *,
+        model: str | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[CachedOCR, bool]:
+        """``convert()``'s result, or the cached one for identical bytes.
+
+        ``engine``, ``model`` and ``options`` (everything else that changes
+        the output) complete the cache key; see utils/ocr_cache.py. Returns
+        ``(result, cache_hit)``. A result whose ``meta`` marks it
+        ``incomplete`` is returned but not stored.
+        """
+        from . import ocr_cache
 
-        return self._docling_serve_client
+        key = ocr_cache.make_key(
+            self.task.project, file.file_hash, engine, model, options
+        )
+        if key is not None:
+            cached = ocr_cache.lookup(self.db, key)
+            if cached is not None:
+                logger.info(
+                    "OCR cache hit for %s (%s); skipping the engine",
+                    file.file_name,
+                    engine,
+                )
+                return cached, True
+        result = convert()
+        if key is not None and not result.meta.get("incomplete"):
+            ocr_cache.store(self.db, key, result)
+        return result, False
 
     def _check_duplicate_case_ids(self, file: models.File, df: pd.DataFrame) -> None:
         """Check for duplicate case IDs before processing."""
@@ -611,6 +910,8 @@ class PreprocessingPipeline:
 
     def _process_file_task(self, file_task: models.FilePreprocessingTask):
         """Process a single file task with timeout protection."""
+        # Drop the previous file's bytes before loading this one's.
+        self._release_file_inputs()
         file_task_id = file_task.id  # local copy; safe to use after a timeout
         file_task.status = models.PreprocessingStatus.IN_PROGRESS
         now = datetime.datetime.now(datetime.UTC)
@@ -628,23 +929,30 @@ class PreprocessingPipeline:
             # Safety check: detect if another task is already processing this file
             # with the same config (race condition protection for simultaneous requests)
             # This is a final safety net - the API endpoint should have already rejected
-            # such requests, but this catches any remaining race conditions
-            conflicting_task = (
-                self.db.query(models.FilePreprocessingTask)
-                .join(models.PreprocessingTask)
-                .filter(
-                    models.FilePreprocessingTask.file_id == file.id,
-                    models.PreprocessingTask.configuration_id == self.config.id,
-                    models.FilePreprocessingTask.id != file_task.id,
-                    models.FilePreprocessingTask.status.in_(
-                        [
-                            models.PreprocessingStatus.PENDING,
-                            models.PreprocessingStatus.IN_PROGRESS,
-                        ]
-                    ),
+            # such requests, but this catches any remaining race conditions. When
+            # the run screened its files up front (find_conflicting_file_tasks),
+            # only the files flagged there are re-checked here.
+            conflicting_task = None
+            if (
+                self._conflict_candidates is None
+                or file_task.id in self._conflict_candidates
+            ):
+                conflicting_task = (
+                    self.db.query(models.FilePreprocessingTask)
+                    .join(models.PreprocessingTask)
+                    .filter(
+                        models.FilePreprocessingTask.file_id == file.id,
+                        models.PreprocessingTask.configuration_id == self.config.id,
+                        models.FilePreprocessingTask.id != file_task.id,
+                        models.FilePreprocessingTask.status.in_(
+                            [
+                                models.PreprocessingStatus.PENDING,
+                                models.PreprocessingStatus.IN_PROGRESS,
+                            ]
+                        ),
+                    )
+                    .first()
                 )
-                .first()
-            )
             if conflicting_task:
                 # Another task is already processing this file with the same config
                 # Cancel this task to avoid duplicate document creation
@@ -792,11 +1100,11 @@ class PreprocessingPipeline:
         Uses threading-based timeout which works in all contexts (including
         threaded Celery workers and test environments).
 
-        While waiting, bumps ``file_task.last_heartbeat_at`` every
-        ``_HEARTBEAT_INTERVAL_SECONDS`` so the orphan sweeper can distinguish a
-        slow-but-alive file from a dead worker. The heartbeat uses a separate
-        session and a bulk UPDATE (not ``self.db``) to avoid contending with
-        the worker thread, which may be using ``self.db``.
+        While waiting, the file is registered with the process's heartbeat
+        service (``utils/file_heartbeat.py``), which bumps
+        ``last_heartbeat_at`` for all in-flight files in one UPDATE per
+        interval, so the orphan sweeper can distinguish a slow-but-alive file
+        from a dead worker.
 
         Args:
             func: The processing function to call.
@@ -811,9 +1119,6 @@ class PreprocessingPipeline:
             TimeoutError: If processing exceeds timeout.
         """
         import queue
-        import threading
-
-        from sqlalchemy import update
 
         result_queue = queue.Queue()
         exception_queue = queue.Queue()
@@ -845,58 +1150,31 @@ class PreprocessingPipeline:
                     exception_queue.put(e)
                     result_queue.put(_WORKER_ERROR)
 
-        def _heartbeat():
-            now = datetime.datetime.now(datetime.UTC)
-            with db_session() as fresh_db:
-                fresh_db.execute(
-                    update(models.FilePreprocessingTask)
-                    .where(models.FilePreprocessingTask.id == file_task.id)
-                    .values(last_heartbeat_at=now)
-                )
-                fresh_db.commit()
-
         thread = threading.Thread(target=target, daemon=True)
         thread.start()
 
-        deadline = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
-            seconds=timeout_seconds
-        )
-        while True:
-            # Poll with a short timeout so we can heartbeat regularly without
-            # delaying detection of completion/exception.
-            remaining = (deadline - datetime.datetime.now(datetime.UTC)).total_seconds()
-            if remaining <= 0:
+        with file_heartbeat.beating(file_task.id):
+            try:
+                result = result_queue.get(timeout=timeout_seconds)
+            except queue.Empty:
                 # Timed out. Surface a worker exception if one arrived; only
                 # report a timeout if the worker is genuinely still running.
                 try:
                     exc = exception_queue.get_nowait()
-                    raise exc
                 except queue.Empty:
                     raise TimeoutError(
                         f"Processing exceeded {timeout_seconds}s timeout for file {file.file_name}"
-                    )
-            try:
-                result = result_queue.get(
-                    timeout=min(_HEARTBEAT_INTERVAL_SECONDS, remaining)
-                )
-                # A fast worker failure would otherwise sit unread on the separate
-                # exception_queue until the full per-file timeout elapsed — making a
-                # file that failed in milliseconds (e.g. a validation error like
-                # duplicate case IDs or missing text columns) look like it
-                # "processed" for minutes. The worker pushes _WORKER_ERROR here to
-                # wake us immediately; raise the real exception it carried.
-                if result is _WORKER_ERROR:
-                    raise exception_queue.get_nowait()
-                return result
-            except queue.Empty:
-                # Still running — bump the heartbeat and keep waiting.
-                try:
-                    _heartbeat()
-                except Exception as e:
-                    logger.debug(
-                        "Heartbeat update failed for file task %s: %s", file_task.id, e
-                    )
-                continue
+                    ) from None
+                raise exc
+        # A fast worker failure would otherwise sit unread on the separate
+        # exception_queue until the full per-file timeout elapsed — making a
+        # file that failed in milliseconds (e.g. a validation error like
+        # duplicate case IDs or missing text columns) look like it
+        # "processed" for minutes. The worker pushes _WORKER_ERROR here to
+        # wake us immediately; raise the real exception it carried.
+        if result is _WORKER_ERROR:
+            raise exception_queue.get_nowait()
+        return result
 
     def _route_pdf_image(
         self, file: models.File, file_task: models.FilePreprocessingTask
@@ -919,33 +1197,12 @@ class PreprocessingPipeline:
         Backwards compatibility:
         - ocr_engine="ocrmypdf" or "tesseract" -> treated as extraction_mode="auto"
         """
-        additional = self.config.additional_settings or {}
-
-        # Support both new extraction_mode and legacy ocr_engine settings
-        extraction_mode = additional.get("extraction_mode", "auto")
-        force_ocr = additional.get("force_ocr", False)
-        remote_fallback = additional.get("remote_ocr_fallback", False)
-
-        # Backwards compatibility: map legacy ocr_engine values to extraction_mode
-        ocr_engine = additional.get("ocr_engine", None)
-        if ocr_engine and extraction_mode == "auto":
-            if ocr_engine in {"ocrmypdf", "docling_tesseract", "tesseract"}:
-                extraction_mode = "auto"  # Use local Tesseract via docling-serve
-            elif ocr_engine == "mistral_ocr":
-                extraction_mode = "high_accuracy_remote"
-                remote_fallback = True
-            elif ocr_engine == "llm_vision":
-                extraction_mode = "high_accuracy_remote"
-                remote_fallback = True
+        extraction_mode, force_ocr, remote_fallback, ocr_engine = (
+            self._ocr_routing_settings()
+        )
 
         is_pdf = file.file_type == models.FileType.APPLICATION_PDF
-        is_image = file.file_type in [
-            models.FileType.IMAGE_PNG,
-            models.FileType.IMAGE_JPEG,
-            "image/png",
-            "image/jpeg",
-            "image/jpg",
-        ]
+        is_image = file.file_type in _IMAGE_FILE_TYPES
 
         if is_pdf:
             return self._process_pdf(
@@ -969,24 +1226,103 @@ class PreprocessingPipeline:
 
         raise ValueError(f"Unsupported file type for OCR/extraction: {file.file_type}")
 
-    def _check_password_protected_pdf(self, file_content: bytes) -> bool:
-        """Check if a PDF is password-protected using pypdf.
+    def _ocr_routing_settings(self) -> tuple[str, bool, bool, str | None]:
+        """``(extraction_mode, force_ocr, remote_fallback, ocr_engine)`` for routing."""
+        additional = self.config.additional_settings or {}
 
-        Args:
-            file_content: Raw PDF file bytes.
+        # Support both new extraction_mode and legacy ocr_engine settings
+        extraction_mode = additional.get("extraction_mode", "auto")
+        force_ocr = additional.get("force_ocr", False)
+        remote_fallback = additional.get("remote_ocr_fallback", False)
 
-        Returns:
-            True if PDF is password-protected, False otherwise.
+        # Backwards compatibility: map legacy ocr_engine values to extraction_mode
+        ocr_engine = additional.get("ocr_engine", None)
+        if ocr_engine and extraction_mode == "auto":
+            if ocr_engine in {"ocrmypdf", "docling_tesseract", "tesseract"}:
+                extraction_mode = "auto"  # Use local Tesseract via docling-serve
+            elif ocr_engine == "mistral_ocr":
+                extraction_mode = "high_accuracy_remote"
+                remote_fallback = True
+            elif ocr_engine == "llm_vision":
+                extraction_mode = "high_accuracy_remote"
+                remote_fallback = True
+        return extraction_mode, force_ocr, remote_fallback, ocr_engine
+
+    def _remote_ocr_engine(self, ocr_engine: str | None) -> str | None:
+        """The remote engine (``"mistral_ocr"``/``"llm_vision"``) to use, if any.
+
+        Respects the requested engine, then falls back to whichever is usable.
+        Checks actual usability (per-task credentials or global config), not
+        just the *_ENABLED flag — a run configured per-task shouldn't be
+        blocked at routing.
         """
-        try:
-            from pypdf import PdfReader
+        mistral_usable = self._mistral_ocr_usable()
+        vision_usable = self._llm_vision_ocr_usable()
+        if ocr_engine == "mistral_ocr" and mistral_usable:
+            return "mistral_ocr"
+        elif ocr_engine == "llm_vision" and vision_usable:
+            return "llm_vision"
+        elif mistral_usable:
+            return "mistral_ocr"
+        elif vision_usable:
+            return "llm_vision"
+        return None
+
+    def _routes_to_mistral_ocr(self, file: models.File, file_content: bytes) -> bool:
+        """Whether :meth:`_route_pdf_image` would send ``file`` to Mistral OCR.
+
+        Mirrors the remote-OCR conditions of :meth:`_process_pdf` and
+        :meth:`_process_image`, without side effects.
+        """
+        extraction_mode, force_ocr, remote_fallback, ocr_engine = (
+            self._ocr_routing_settings()
+        )
+        if extraction_mode != "high_accuracy_remote" or not remote_fallback:
+            return False
+        if self._remote_ocr_engine(ocr_engine) != "mistral_ocr":
+            return False
+        if file.file_type in _IMAGE_FILE_TYPES:
+            return True
+        if file.file_type != models.FileType.APPLICATION_PDF or force_ocr:
+            return False
+        from ..services.pdf_profile import inspect_pdf
 
-            reader = PdfReader(io.BytesIO(file_content))
-            return reader.is_encrypted
-        except Exception:
-            # If we can't read the PDF, assume it's not password-protected
-            # (it might be corrupted or invalid)
+        # Not memoized: this runs for a whole chunk ahead of processing.
+        profile = inspect_pdf(
+            file_content, max_pages_to_check=settings.PDF_MAX_PAGES_FOR_TEXT_PROBE
+        )
+        if profile.encrypted and not settings.PDF_HANDLE_PASSWORD_PROTECTED:
             return False
+        return not profile.has_embedded_text(
+            min_chars=settings.DOCLING_MIN_EXTRACTED_CHARS_PDF
+        )
+
+    def _file_content(self, file: models.File) -> bytes:
+        """The file's bytes, read from storage once per file."""
+        content = self._file_contents.get(file.id)
+        if content is None:
+            content = self._file_contents[file.id] = get_file(file.file_uuid)
+        return content
+
+    def _pdf_profile(self, file: models.File):
+        """The file's :class:`PdfProfile`, inspected once per file.
+
+        Encryption, embedded-text and page checks all read this instead of
+        re-parsing the bytes; see services/pdf_profile.py.
+        """
+        profile = self._pdf_profiles.get(file.id)
+        if profile is None:
+            from ..services.pdf_profile import inspect_pdf
+
+            profile = self._pdf_profiles[file.id] = inspect_pdf(
+                self._file_content(file),
+                max_pages_to_check=settings.PDF_MAX_PAGES_FOR_TEXT_PROBE,
+            )
+        return profile
+
+    def _release_file_inputs(self) -> None:
+        self._file_contents.clear()
+        self._pdf_profiles.clear()
 
     def _process_pdf(
         self,
@@ -1010,10 +1346,11 @@ class PreprocessingPipeline:
         Returns:
             List of created Document objects.
         """
-        file_content = get_file(file.file_uuid)
+        file_content = self._file_content(file)
+        profile = self._pdf_profile(file)
 
         # Check for password-protected PDF
-        if self._check_password_protected_pdf(file_content):
+        if profile.encrypted:
             if settings.PDF_HANDLE_PASSWORD_PROTECTED:
                 logger.warning(
                     "PDF %s is password-protected. OCR will be attempted but may fail.",
@@ -1040,12 +1377,8 @@ class PreprocessingPipeline:
             and not settings.MISTRAL_OCR_ENABLED
             and not settings.VISION_OCR_ENABLED
         ):
-            from ..services.pdf_text_probe import has_embedded_text
-
-            has_text = has_embedded_text(
-                file_content,
-                min_chars=settings.DOCLING_MIN_EXTRACTED_CHARS_PDF,
-                max_pages_to_check=settings.PDF_MAX_PAGES_FOR_TEXT_PROBE,
+            has_text = profile.has_embedded_text(
+                min_chars=settings.DOCLING_MIN_EXTRACTED_CHARS_PDF
             )
 
             if has_text:
@@ -1104,14 +1437,7 @@ class PreprocessingPipeline:
         if extraction_mode == "force_ocr" or force_ocr:
             if not docling_serve_available():
                 # Fall back to pypdf for embedded text, or fail
-                file_content = get_file(file.file_uuid)
-                from ..services.pdf_text_probe import has_embedded_text
-
-                has_text = has_embedded_text(
-                    file_content,
-                    min_chars=min_chars_pdf,
-                    max_pages_to_check=8,
-                )
+                has_text = profile.has_embedded_text(min_chars=min_chars_pdf)
                 if has_text:
                     return self._process_pdf_with_pypdf(file, file_task, file_content)
                 else:
@@ -1129,14 +1455,7 @@ class PreprocessingPipeline:
         if extraction_mode == "fast_local_ocr":
             if not docling_serve_available():
                 # Fall back to pypdf for embedded text, or fail
-                file_content = get_file(file.file_uuid)
-                from ..services.pdf_text_probe import has_embedded_text
-
-                has_text = has_embedded_text(
-                    file_content,
-                    min_chars=min_chars_pdf,
-                    max_pages_to_check=8,
-                )
+                has_text = profile.has_embedded_text(min_chars=min_chars_pdf)
                 if has_text:
                     return self._process_pdf_with_pypdf(file, file_task, file_content)
                 else:
@@ -1152,16 +1471,7 @@ class PreprocessingPipeline:
 
         # Auto mode - check for embedded text first
         if extraction_mode == "auto":
-            file_content = get_file(file.file_uuid)
-
-            # Use local pypdf probe (no Docling import needed)
-            from ..services.pdf_text_probe import has_embedded_text
-
-            has_text = has_embedded_text(
-                file_content,
-                min_chars=min_chars_pdf,
-                max_pages_to_check=8,
-            )
+            has_text = profile.has_embedded_text(min_chars=min_chars_pdf)
 
             if has_text and not force_ocr:
                 # Use docling-serve without OCR if available, otherwise use pypdf directly
@@ -1196,14 +1506,7 @@ class PreprocessingPipeline:
                     )
                 else:
                     # Fall back to pypdf for embedded text, or fail
-                    file_content = get_file(file.file_uuid)
-                    from ..services.pdf_text_probe import has_embedded_text
-
-                    has_text = has_embedded_text(
-                        file_content,
-                        min_chars=min_chars_pdf,
-                        max_pages_to_check=8,
-                    )
+                    has_text = profile.has_embedded_text(min_chars=min_chars_pdf)
                     if has_text:
                         return self._process_pdf_with_pypdf(
                             file, file_task, file_content
@@ -1216,14 +1519,7 @@ class PreprocessingPipeline:
 
             # Check if we can avoid remote OCR (embedded text exists)
             if not force_ocr:
-                file_content = get_file(file.file_uuid)
-                from ..services.pdf_text_probe import has_embedded_text
-
-                has_text = has_embedded_text(
-                    file_content,
-                    min_chars=min_chars_pdf,
-                    max_pages_to_check=8,
-                )
+                has_text = profile.has_embedded_text(min_chars=min_chars_pdf)
 
                 if has_text:
                     # Use local docling-serve without OCR if available, otherwise pypdf
@@ -1234,21 +1530,11 @@ class PreprocessingPipeline:
                             file, file_task, file_content
                         )
 
-            # Use remote OCR - respect the original ocr_engine setting. Check
-            # actual usability (per-task credentials or global config), not just
-            # the *_ENABLED flag — a run configured per-task shouldn't be blocked
-            # at routing.
-            mistral_usable = self._mistral_ocr_usable()
-            vision_usable = self._llm_vision_ocr_usable()
-            if ocr_engine == "mistral_ocr" and mistral_usable:
-                return self._process_with_mistral_ocr(file, file_task)
-            elif ocr_engine == "llm_vision" and vision_usable:
-                return self._process_with_llm_vision_ocr(file, file_task)
-            elif mistral_usable:
-                # Fallback to Mistral if no specific engine requested
+            # Use remote OCR - respect the original ocr_engine setting.
+            remote_engine = self._remote_ocr_engine(ocr_engine)
+            if remote_engine == "mistral_ocr":
                 return self._process_with_mistral_ocr(file, file_task)
-            elif vision_usable:
-                # Fallback to Vision if no specific engine requested
+            elif remote_engine == "llm_vision":
                 return self._process_with_llm_vision_ocr(file, file_task)
             else:
                 # Remote fallback requested but not configured - fail clearly.
@@ -1308,20 +1594,11 @@ class PreprocessingPipeline:
         """
         # High accuracy remote mode - use remote OCR if enabled
         if extraction_mode == "high_accuracy_remote" and remote_fallback:
-            # Respect the original ocr_engine setting. Check actual usability
-            # (per-task credentials or global config), not just the *_ENABLED
-            # flag — a run configured per-task shouldn't be blocked at routing.
-            mistral_usable = self._mistral_ocr_usable()
-            vision_usable = self._llm_vision_ocr_usable()
-            if ocr_engine == "mistral_ocr" and mistral_usable:
+            # Respect the original ocr_engine setting.
+            remote_engine = self._remote_ocr_engine(ocr_engine)
+            if remote_engine == "mistral_ocr":
                 return self._process_with_mistral_ocr(file, file_task)
-            elif ocr_engine == "llm_vision" and vision_usable:
-                return self._process_with_llm_vision_ocr(file, file_task)
-            elif mistral_usable:
-                # Fallback to Mistral if no specific engine requested
-                return self._process_with_mistral_ocr(file, file_task)
-            elif vision_usable:
-                # Fallback to Vision if no specific engine requested
+            elif remote_engine == "llm_vision":
                 return self._process_with_llm_vision_ocr(file, file_task)
             # Remote fallback requested but not usable - fall through to local
             if ocr_engine == "llm_vision":
@@ -1344,13 +1621,12 @@ class PreprocessingPipeline:
             # Check if local Docling fallback is available
             if settings.DOCLING_LOCAL_FALLBACK:
                 # Use local Docling directly
-                from ..dependencies import get_file
                 from ..services.docling_serve_client import (
                     DoclingServeError,
                     _convert_with_local_docling,
                 )
 
-                file_content = get_file(file.file_uuid)
+                file_content = self._file_content(file)
                 mime_type = (
                     "image/png"
                     if file.file_type == models.FileType.IMAGE_PNG
@@ -1419,8 +1695,6 @@ class PreprocessingPipeline:
         """
         from ..services.docling_serve_client import DoclingServeError
 
-        file_content = get_file(file.file_uuid)
-
         # Determine MIME type from file type
         mime_type_map = {
             models.FileType.IMAGE_PNG: "image/png",
@@ -1431,18 +1705,31 @@ class PreprocessingPipeline:
         }
         mime_type = mime_type_map.get(file.file_type, "image/png")
 
-        client = self._get_docling_serve_client()
-
-        try:
-            result = client.convert_image_tesseract(
-                file_content=file_content,
-                filename=file.file_name,
-                mime_type=mime_type,
-            )
-        except DoclingServeError as e:
-            raise ValueError(
-                internal_error_message(e, prefix="docling-serve image OCR failed")
-            )
+        def convert() -> CachedOCR:
+            file_content = self._file_content(file)
+            client = self._get_docling_serve_client()
+            try:
+                result = client.convert_image_tesseract(
+                    file_content=file_content,
+                    filename=file.file_name,
+                    mime_type=mime_type,
+                )
+            except DoclingServeError as e:
+                raise ValueError(
+                    internal_error_message(e, prefix="docling-serve image OCR failed")
+                )
+            return CachedOCR(text=result.text)
+
+        result, cache_hit = self._cached_ocr(
+            file,
+            "docling_serve_tesseract",
+            convert,
+            options={
+                "input": mime_type,
+                "force_ocr": True,
+                "ocr_langs": self._docling_ocr_langs(),
+            },
+        )
 
         doc = self._build_pdf_document(
             file=file,
@@ -1455,6 +1742,7 @@ class PreprocessingPipeline:
                 "force_ocr": True,
                 "engine_used": "docling_serve",
                 "file_type": file.file_type,
+                "ocr_cache_hit": cache_hit,
             },
         )
 
@@ -1487,21 +1775,33 @@ class PreprocessingPipeline:
         """
         from ..services.docling_serve_client import DoclingServeError
 
-        file_content = get_file(file.file_uuid)
-        client = self._get_docling_serve_client()
-
-        try:
-            result = client.convert_pdf_tesseract(
-                file_content=file_content,
-                filename=file.file_name,
-                force_ocr=force_full_page_ocr,
-            )
-        except DoclingServeError as e:
-            raise ValueError(
-                internal_error_message(
-                    e, prefix="docling-serve Tesseract extraction failed"
+        def convert() -> CachedOCR:
+            file_content = self._file_content(file)
+            client = self._get_docling_serve_client()
+            try:
+                result = client.convert_pdf_tesseract(
+                    file_content=file_content,
+                    filename=file.file_name,
+                    force_ocr=force_full_page_ocr,
                 )
-            )
+            except DoclingServeError as e:
+                raise ValueError(
+                    internal_error_message(
+                        e, prefix="docling-serve Tesseract extraction failed"
+                    )
+                )
+            return CachedOCR(text=result.text, meta={"page_ranges": result.page_ranges})
+
+        result, cache_hit = self._cached_ocr(
+            file,
+            "docling_serve_tesseract",
+            convert,
+            options={
+                "input": "application/pdf",
+                "force_ocr": force_full_page_ocr,
+                "ocr_langs": self._docling_ocr_langs(),
+            },
+        )
 
         doc = self._build_pdf_document(
             file=file,
@@ -1517,6 +1817,7 @@ class PreprocessingPipeline:
             extra_metadata={
                 "force_ocr": force_full_page_ocr,
                 "engine_used": "docling_serve",
+                "ocr_cache_hit": cache_hit,
             },
         )
 
@@ -1539,18 +1840,23 @@ class PreprocessingPipeline:
         """
         from ..services.docling_serve_client import DoclingServeError
 
-        file_content = get_file(file.file_uuid)
-        client = self._get_docling_serve_client()
+        def convert() -> CachedOCR:
+            file_content = self._file_content(file)
+            client = self._get_docling_serve_client()
+            try:
+                result = client.convert_pdf_no_ocr(
+                    file_content=file_content,
+                    filename=file.file_name,
+                )
+            except DoclingServeError as e:
+                raise ValueError(
+                    internal_error_message(e, prefix="docling-serve extraction failed")
+                )
+            return CachedOCR(text=result.text, meta={"page_ranges": result.page_ranges})
 
-        try:
-            result = client.convert_pdf_no_ocr(
-                file_content=file_content,
-                filename=file.file_name,
-            )
-        except DoclingServeError as e:
-            raise ValueError(
-                internal_error_message(e, prefix="docling-serve extraction failed")
-            )
+        result, cache_hit = self._cached_ocr(
+            file, "docling_serve", convert, options={"input": "application/pdf"}
+        )
 
         doc = self._build_pdf_document(
             file=file,
@@ -1563,6 +1869,7 @@ class PreprocessingPipeline:
                 "embedded_text_detected": True,
                 "force_ocr": False,
                 "engine_used": "docling_serve",
+                "ocr_cache_hit": cache_hit,
             },
         )
 
@@ -2049,11 +2356,9 @@ class PreprocessingPipeline:
             base_url = str(self.client.base_url)
         return bool(api_key and base_url)
 
-    def _process_with_mistral_ocr(
-        self, file: models.File, file_task: models.FilePreprocessingTask
-    ) -> List[models.Document]:
-        """Process file using Mistral OCR API."""
-        from ..services.mistral_ocr_service import MistralOCRError, MistralOCRService
+    def _mistral_ocr_service(self):
+        """``(MistralOCRService, model)`` for this task's credentials."""
+        from ..services.mistral_ocr_service import MistralOCRService
 
         additional = self.config.additional_settings or {}
 
@@ -2081,13 +2386,108 @@ class PreprocessingPipeline:
             model=model,
             max_retries=settings.MISTRAL_OCR_MAX_RETRIES,
         )
-        file_content = get_file(file.file_uuid)
-        try:
-            result = service.process(file_content)
-        except MistralOCRError as e:
-            # Raw provider errors can carry endpoint/response internals —
-            # error-log them and surface only the category + error id.
-            raise ValueError(internal_error_message(e, prefix="Mistral OCR failed"))
+        return service, model
+
+    @staticmethod
+    def _mistral_ocr_cache_options() -> dict[str, Any]:
+        return {"base_url": settings.MISTRAL_API_BASE}
+
+    def prefetch_mistral_batch(self, file_task_ids: list[int]) -> dict[int, Any]:
+        """OCR the Mistral-bound files among ``file_task_ids`` as one batch job.
+
+        Returns ``{file_id: MistralOCRResult}`` for the files the job
+        converted, to hand to the pipelines that process those files. Files
+        the job failed on are left out and get OCR'd one by one as usual.
+        Files with a cached OCR result are skipped. Returns an empty dict when
+        nothing routes to Mistral or the task is cancelled meanwhile.
+
+        Raises:
+            MistralOCRError: If the job as a whole fails or times out.
+        """
+        from . import ocr_cache
+
+        if not self._mistral_ocr_usable():
+            return {}
+        service, model = self._mistral_ocr_service()
+        file_tasks = self.db.scalars(
+            select(models.FilePreprocessingTask)
+            .where(
+                models.FilePreprocessingTask.id.in_(file_task_ids),
+                models.FilePreprocessingTask.status
+                == models.PreprocessingStatus.PENDING,
+            )
+            .order_by(models.FilePreprocessingTask.id)
+        ).all()
+
+        def documents():
+            seen: set[int] = set()
+            for file_task in file_tasks:
+                file = file_task.file
+                if file.id in seen:
+                    continue
+                seen.add(file.id)
+                key = ocr_cache.make_key(
+                    self.task.project,
+                    file.file_hash,
+                    "mistral_ocr",
+                    model,
+                    self._mistral_ocr_cache_options(),
+                )
+                if key is not None and ocr_cache.contains(self.db, key):
+                    continue
+                content = get_file(file.file_uuid)
+                if self._routes_to_mistral_ocr(file, content):
+                    yield str(file.id), content
+
+        results = service.process_batch(
+            documents(),
+            poll_interval=settings.MISTRAL_OCR_BATCH_POLL_SECONDS,
+            timeout=settings.MISTRAL_OCR_BATCH_TIMEOUT_SECONDS,
+            should_cancel=self.check_cancelled,
+        )
+        prefetched = {}
+        for key, result in results.items():
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Mistral batch OCR failed for file %s; it will be OCR'd "
+                    "on its own: %s",
+                    key,
+                    result,
+                )
+            else:
+                prefetched[int(key)] = result
+        return prefetched
+
+    def _process_with_mistral_ocr(
+        self, file: models.File, file_task: models.FilePreprocessingTask
+    ) -> List[models.Document]:
+        """Process file using Mistral OCR API."""
+        from ..services.mistral_ocr_service import MistralOCRError
+
+        service, model = self._mistral_ocr_service()
+        prefetched = self._mistral_batch_results.pop(file.id, None)
+
+        def convert() -> CachedOCR:
+            result = prefetched
+            if result is None:
+                file_content = self._file_content(file)
+                try:
+                    result = service.process(file_content)
+                except MistralOCRError as e:
+                    # Raw provider errors can carry endpoint/response internals —
+                    # error-log them and surface only the category + error id.
+                    raise ValueError(
+                        internal_error_message(e, prefix="Mistral OCR failed")
+                    )
+            return CachedOCR(text=result.text, pages=result.pages)
+
+        result, cache_hit = self._cached_ocr(
+            file,
+            "mistral_ocr",
+            convert,
+            model=model,
+            options=self._mistral_ocr_cache_options(),
+        )
 
         doc = self._get_or_create_document(
             file=file,
@@ -2101,18 +2501,29 @@ class PreprocessingPipeline:
                 "extraction_method": "mistral_ocr",
                 "model": model,
                 "mistral_model": model,
+                "ocr_cache_hit": cache_hit,
             },
         )
         return [doc]
 
+    def _vision_ocr_service(self, **kwargs):
+        """The run's ``LLMVisionOCRService`` for these settings, created once."""
+        if self._clients_from is not None:
+            return self._clients_from._vision_ocr_service(**kwargs)
+        from ..services.llm_vision_ocr_service import LLMVisionOCRService
+
+        key = tuple(sorted(kwargs.items()))
+        with self._clients_lock:
+            service = self._vision_services.get(key)
+            if service is None:
+                service = self._vision_services[key] = LLMVisionOCRService(**kwargs)
+            return service
+
     def _process_with_llm_vision_ocr(
         self, file: models.File, file_task: models.FilePreprocessingTask
     ) -> List[models.Document]:
         """Process file using a Vision LLM API."""
-        from ..services.llm_vision_ocr_service import (
-            LLMVisionOCRError,
-            LLMVisionOCRService,
-        )
+        from ..services.llm_vision_ocr_service import LLMVisionOCRError
 
         additional = self.config.additional_settings or {}
 
@@ -2153,45 +2564,67 @@ class PreprocessingPipeline:
         prompt = additional.get("vision_prompt") or settings.VISION_OCR_PROMPT
         max_image_dim = additional.get("vision_max_image_dim", 2048)
 
-        # Pass retry settings and concurrency from config. Use the service as a
-        # context manager so its OpenAI/httpx2 client is closed after use (this
-        # method runs per file; leaking the client accumulates connection pools).
-        file_content = get_file(file.file_uuid)
-        is_pdf = file.file_type == models.FileType.APPLICATION_PDF
-        try:
-            with LLMVisionOCRService(
-                api_key=api_key,
-                base_url=base_url,
-                model=model,
-                prompt=prompt,
-                max_image_dim=max_image_dim,
-                max_retries=settings.VISION_OCR_MAX_RETRIES,
-                max_concurrency=settings.VISION_OCR_MAX_CONCURRENT_FILES,
-            ) as service:
+        def convert() -> CachedOCR:
+            # Pass retry settings and concurrency from config. The service
+            # (and its OpenAI/httpx2 client) is reused for every file of the
+            # run and closed with the pipeline.
+            file_content = self._file_content(file)
+            is_pdf = file.file_type == models.FileType.APPLICATION_PDF
+            try:
+                service = self._vision_ocr_service(
+                    api_key=api_key,
+                    base_url=base_url,
+                    model=model,
+                    prompt=prompt,
+                    max_image_dim=max_image_dim,
+                    max_retries=settings.VISION_OCR_MAX_RETRIES,
+                    max_concurrency=settings.VISION_OCR_MAX_CONCURRENT_FILES,
+                )
                 result = service.process(file_content, is_pdf=is_pdf)
-        except LLMVisionOCRError as e:
-            # Raw provider errors can carry endpoint/response internals —
-            # error-log them and surface only the category + error id.
-            raise ValueError(internal_error_message(e, prefix="Vision LLM OCR failed"))
-
-        # Surface partial failures as warnings on the file task. The per-page
-        # error strings come straight from the provider and can leak
-        # endpoint/internal detail — store them in the error log and show
-        # only a safe summary with the error id.
-        if result.failed_pages > 0:
-            safe_summary = operational_error_message(
-                detail="; ".join(str(err) for err in result.errors)[:2000],
-                prefix=(
-                    f"{result.failed_pages} of {result.total_pages} page(s) failed OCR"
-                ),
-            )
-            self._add_file_task_warnings(
-                file_task,
-                [safe_summary],
-                failed_pages=result.failed_pages,
-                total_pages=result.total_pages,
+            except LLMVisionOCRError as e:
+                # Raw provider errors can carry endpoint/response internals —
+                # error-log them and surface only the category + error id.
+                raise ValueError(
+                    internal_error_message(e, prefix="Vision LLM OCR failed")
+                )
+
+            # Surface partial failures as warnings on the file task. The
+            # per-page error strings come straight from the provider and can
+            # leak endpoint/internal detail — store them in the error log and
+            # show only a safe summary with the error id.
+            if result.failed_pages > 0:
+                safe_summary = operational_error_message(
+                    detail="; ".join(str(err) for err in result.errors)[:2000],
+                    prefix=(
+                        f"{result.failed_pages} of {result.total_pages} "
+                        "page(s) failed OCR"
+                    ),
+                )
+                self._add_file_task_warnings(
+                    file_task,
+                    [safe_summary],
+                    failed_pages=result.failed_pages,
+                    total_pages=result.total_pages,
+                )
+            # A result with failed pages is not cached, so a re-run retries them.
+            return CachedOCR(
+                text=result.text,
+                pages=result.pages,
+                meta={"incomplete": result.failed_pages > 0},
             )
 
+        result, cache_hit = self._cached_ocr(
+            file,
+            "llm_vision",
+            convert,
+            model=model,
+            options={
+                "base_url": base_url,
+                "prompt": prompt,
+                "max_image_dim": max_image_dim,
+            },
+        )
+
         doc = self._get_or_create_document(
             file=file,
             file_task=file_task,
@@ -2204,6 +2637,7 @@ class PreprocessingPipeline:
                 "extraction_method": "llm_vision_ocr",
                 "model": model,
                 "vision_model": model,
+                "ocr_cache_hit": cache_hit,
             },
         )
         return [doc]
@@ -0,0 +1,236 @@
+# backend/src/utils/principal_cache.py
+"""Signed-in users cached per API process for request authorization.
+
+``get_current_user`` used to load the user row on every authenticated request,
+and the project gates then read the project's shares on top. The frontend
+polls several endpoints while a run is in flight, so that was a steady stream
+of identical queries for answers that only change when a user is edited,
+changes their password or is (un)shared a project.
+
+Design notes:
+
+* An entry holds the user's authorization columns (``_COLUMNS``) and their
+  project grants ``{project_id: permission}``. It never holds the password
+  hash: attributes outside ``_COLUMNS`` load from the database when a request
+  first touches them.
+* Entries are stamped with the user's *security version*. With Redis the
+  version is a per-user counter there, read once per request, so a change
+  committed by any replica or worker retires every process's entry
+  immediately. Without Redis the counter is process-local, which is coherent
+  for the single-process deployments that run without a broker; the TTL
+  (``PRINCIPAL_CACHE_TTL_SECONDS``) bounds anything else. A Redis error means
+  "no cache", never a stale answer.
+* The version is bumped *after* the changing transaction commits, by the
+  session hooks below: they watch ``User`` rows (the cached columns and the
+  password hash) and ``ProjectShare`` rows. Code that changes either with bulk
+  statements calls :func:`mark_dirty`. A reader racing the commit can only
+  store its answer under the old version, which nobody reads again.
+* A token carrying a newer ``token_version`` than the cached one (issued right
+  after a password change on another replica, say) forces a reload.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from types import MappingProxyType
+from typing import Any
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from .redis_broadcast import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "authz:ver:"
+
+# Session.info key holding the user ids whose authorization the pending
+# transaction changed.
+_DIRTY_KEY = "principal_cache_dirty"
+
+# User columns copied into an entry. Everything authorization and the common
+# response paths read; deliberately not hashed_password.
+_COLUMNS = (
+    "id",
+    "email",
+    "full_name",
+    "role",
+    "is_active",
+    "token_version",
+    "preferred_language",
+)
+# Changes to these invalidate the entry (the password hash is not cached, but
+# changing it must still end cached sessions alongside the token_version bump).
+_WATCHED = _COLUMNS + ("hashed_password",)
+
+# Bounded so a deployment with many users can't grow it without limit.
+_LOCAL_MAX_ENTRIES = 4096
+_local_versions: dict[int, int] = {}
+_entries: OrderedDict[int, tuple[float, int, dict[str, Any], MappingProxyType]] = (
+    OrderedDict()
+)
+_lock = threading.Lock()
+
+
+def _ttl() -> int:
+    # Imported lazily: this module is imported by db/session.py (see
+    # document_stats for the same constraint).
+    from ..core.dynamic_settings import get_settings
+
+    return max(0, int(get_settings().PRINCIPAL_CACHE_TTL_SECONDS))
+
+
+def _current_version(user_id: int) -> int | None:
+    """The user's security version, or None if it cannot be read."""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            return int(client.get(f"{_KEY_PREFIX}{user_id}") or 0)
+        except Exception as e:
+            logger.debug("Principal cache version read failed: %s", e)
+            return None
+    with _lock:
+        return _local_versions.get(user_id, 0)
+
+
+def _load(db: Session, user_id: int) -> tuple[dict[str, Any], MappingProxyType] | None:
+    from ..models.project import ProjectShare
+    from ..models.user import User
+
+    row = (
+        db.execute(
+            select(*(getattr(User, name) for name in _COLUMNS)).where(
+                User.id == user_id
+            )
+        )
+        .mappings()
+        .one_or_none()
+    )
+    if row is None:
+        return None
+    grants = {
+        project_id: getattr(permission, "value", permission)
+        for project_id, permission in db.execute(
+            select(ProjectShare.project_id, ProjectShare.permission).where(
+                ProjectShare.user_id == user_id
+            )
+        )
+    }
+    return dict(row), MappingProxyType(grants)
+
+
+def _attach(db: Session, columns: dict[str, Any], grants: MappingProxyType):
+    """A persistent ``User`` in ``db`` built from cached columns, no query."""
+    from ..models.user import User
+
+    existing = db.identity_map.get(db.identity_key(User, columns["id"]))
+    if existing is not None:
+        user = existing
+    else:
+        user = User(**columns)
+        # Resets attribute history as though loaded from a row; columns not in
+        # the entry are marked expired and load on first access.
+        make_transient_to_detached(user)
+        db.add(user)
+    user.project_grants = grants
+    return user
+
+
+def get_user(db: Session, user_id: int, token_version: int = 0):
+    """The ``User`` for an authenticated request, from cache when possible.
+
+    Returns None when no such user exists. The returned instance belongs to
+    ``db`` and can be modified and committed like any loaded row. With the
+    cache disabled this is a plain ``SELECT`` of the user.
+    """
+    from ..models.user import User
+
+    if _ttl() <= 0:
+        return db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+
+    version = _current_version(user_id)
+    if version is not None:
+        now = time.monotonic()
+        with _lock:
+            hit = _entries.get(user_id)
+            if hit is not None:
+                expires_at, cached_version, columns, grants = hit
+                if (
+                    expires_at > now
+                    and cached_version == version
+                    and columns["token_version"] >= token_version
+                ):
+                    _entries.move_to_end(user_id)
+                    return _attach(db, columns, grants)
+                _entries.pop(user_id, None)
+
+    loaded = _load(db, user_id)
+    if loaded is None:
+        return None
+    columns, grants = loaded
+    if version is not None:
+        with _lock:
+            _entries[user_id] = (time.monotonic() + _ttl(), version, columns, grants)
+            _entries.move_to_end(user_id)
+            while len(_entries) > _LOCAL_MAX_ENTRIES:
+                _entries.popitem(last=False)
+    return _attach(db, columns, grants)
+
+
+def invalidate(user_id: int) -> None:
+    """Retire every process's cached entry for a user. Never raises."""
+    with _lock:
+        _entries.pop(user_id, None)
+        _local_versions[user_id] = _local_versions.get(user_id, 0) + 1
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.incr(f"{_KEY_PREFIX}{user_id}")
+        except Exception as e:
+            logger.debug(
+                "Could not invalidate cached principal for user %s: %s", user_id, e
+            )
+
+
+def mark_dirty(db: Session, user_id: int | None) -> None:
+    """Invalidate a user's cached principal once ``db``'s transaction commits.
+
+    Needed only for bulk statements — ORM changes to ``User`` and
+    ``ProjectShare`` rows are tracked automatically.
+    """
+    if user_id is not None:
+        db.info.setdefault(_DIRTY_KEY, set()).add(user_id)
+
+
+# ───────────────────────── session hooks ──────────────────────────
+@event.listens_for(Session, "before_flush")
+def _track_principal_changes(session, flush_context, instances) -> None:
+    from ..models.project import ProjectShare
+    from ..models.user import User
+
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in _WATCHED):
+                mark_dirty(session, obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            mark_dirty(session, obj.id)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, ProjectShare):
+            mark_dirty(session, obj.user_id)
+            for previous in inspect(obj).attrs.user_id.history.deleted or ():
+                mark_dirty(session, previous)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session) -> None:
+    for user_id in session.info.pop(_DIRTY_KEY, ()):
+        invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,119 @@
+# backend/src/utils/project_recipients.py
+"""Who receives a project's realtime task updates, cached per web process.
+
+The Redis subscriber in ``main.py`` resolves the recipients (the owner plus
+every collaborator) of *every* task-update message. A large trial heartbeats
+several times a second, so resolving from the database each time turned the
+fan-out into a steady stream of owner/share queries for answers that change
+only when someone shares, unshares or transfers the project.
+
+Design notes:
+
+* Entries live for ``_TTL_SECONDS``. The TTL is a safety net, not the
+  invalidation mechanism: share/unshare/ownership changes call
+  :func:`recipients_changed`, which drops the local entry and publishes on the
+  settings-invalidation channel so every other web replica drops its copy too.
+  Celery workers listen on that channel as well and ignore the message type.
+* Each project carries a version that :func:`invalidate` bumps. A resolver
+  only stores its DB answer if the version is unchanged since it started, so
+  an invalidation that lands mid-query can't be overwritten by the pre-change
+  membership it raced with.
+* A failed lookup (DB unavailable) is not cached — the caller delivers to
+  admins only, and the next message retries.
+"""
+
+import logging
+import threading
+import time
+
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+_TTL_SECONDS = 60.0
+
+_cache: dict[int, tuple[float, frozenset[int]]] = {}
+_versions: dict[int, int] = {}
+_lock = threading.Lock()
+
+
+def _load(project_id: int) -> frozenset[int]:
+    from ..db.session import SessionLocal
+    from ..models.project import Project, ProjectShare
+
+    db = SessionLocal()
+    try:
+        recipients = set(
+            db.execute(
+                select(Project.owner_id).where(Project.id == project_id)
+            ).scalars()
+        )
+        recipients.update(
+            db.execute(
+                select(ProjectShare.user_id).where(
+                    ProjectShare.project_id == project_id
+                )
+            ).scalars()
+        )
+        recipients.discard(None)
+        return frozenset(recipients)
+    finally:
+        db.close()
+
+
+def peek(project_id: int) -> frozenset[int] | None:
+    """Cached recipients, or None on a miss. Never touches the database, so
+    the async subscriber can call it on the event loop."""
+    with _lock:
+        hit = _cache.get(project_id)
+        if hit is not None and hit[0] > time.monotonic():
+            return hit[1]
+    return None
+
+
+def get_recipients(project_id: int) -> frozenset[int]:
+    """Owner and collaborator user ids of a project (cached).
+
+    Raises whatever the DB raises on a miss; the caller decides how to degrade.
+    """
+    now = time.monotonic()
+    with _lock:
+        hit = _cache.get(project_id)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        version = _versions.get(project_id, 0)
+
+    recipients = _load(project_id)
+
+    with _lock:
+        if _versions.get(project_id, 0) == version:
+            _cache[project_id] = (time.monotonic() + _TTL_SECONDS, recipients)
+    return recipients
+
+
+def invalidate(project_id: int | None) -> None:
+    """Drop this process's cached recipients for a project.
+
+    ``None`` (a broadcast without a project id) is ignored.
+    """
+    if project_id is None:
+        return
+    with _lock:
+        _cache.pop(project_id, None)
+        _versions[project_id] = _versions.get(project_id, 0) + 1
+
+
+def recipients_changed(project_id: int) -> None:
+    """Invalidate a project's recipients here and on every other web replica.
+
+    Call after the transaction that changed the owner or the shares has
+    committed. Best-effort across processes: without Redis only the local
+    entry is dropped and other replicas catch up within ``_TTL_SECONDS``.
+    """
+    invalidate(project_id)
+    try:
+        from .redis_broadcast import publish_project_recipients_invalidate
+
+        publish_project_recipients_invalidate(project_id)
+    except Exception as e:
+        logger.debug("Could not broadcast recipient invalidation: %s", e)
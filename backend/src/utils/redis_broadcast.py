@@ -5,10 +5,16 @@ import json
 import logging
 import threading
 import time
+from collections.abc import Callable
 from typing import Any
 
 import redis
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis-py without asyncio support
+    aioredis = None
+
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -104,12 +110,68 @@ def new_dedicated_redis_client() -> redis.Redis | None:
     return _new_redis_client()
 
 
+def new_async_subscriber_client() -> "aioredis.Redis | None":
+    """Create an asyncio Redis client for the web process's subscriber.
+
+    Returns None when the broker isn't Redis or redis-py lacks asyncio
+    support (the caller then falls back to the threaded poller). Does not
+    connect: connection errors surface in the subscriber's reconnect loop.
+    No socket timeout, since the subscriber blocks on reads; TCP keepalive and
+    the periodic health check let a dead connection surface as an error.
+    """
+    broker_url = settings.CELERY_BROKER_URL
+    if aioredis is None or not broker_url.startswith("redis://"):
+        return None
+    return aioredis.from_url(
+        broker_url,
+        socket_connect_timeout=2,
+        socket_timeout=None,
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+
+
+# In-process delivery of task updates for deployments without Redis. The web
+# process registers a listener (main.py) so updates published from its own
+# threads — inline preprocessing, the bypass-Celery path — still reach
+# WebSocket clients. Listeners must be cheap and thread-safe: they are called
+# on the publishing thread.
+_local_listeners: list[Callable[[dict[str, Any]], None]] = []
+
+
+def add_local_listener(listener: Callable[[dict[str, Any]], None]) -> None:
+    _local_listeners.append(listener)
+
+
+def remove_local_listener(listener: Callable[[dict[str, Any]], None]) -> None:
+    try:
+        _local_listeners.remove(listener)
+    except ValueError:
+        pass
+
+
+def _deliver_locally(message: dict[str, Any]) -> bool:
+    delivered = False
+    for listener in list(_local_listeners):
+        try:
+            listener(message)
+            delivered = True
+        except Exception as e:
+            logger.debug(f"Local task-update listener failed: {e}")
+    return delivered
+
+
 def _publish(
     message: dict[str, Any], label: str, channel: str = TASK_UPDATE_CHANNEL
 ) -> bool:
     client = get_redis_client()
     if not client:
         logger.debug(f"Redis client not available for {label} pub/sub")
+        # Only task updates have an in-process audience; control messages
+        # (settings/recipient invalidation) are already applied locally by
+        # the caller.
+        if channel == TASK_UPDATE_CHANNEL:
+            return _deliver_locally(message)
         return False
     try:
         client.publish(channel, json.dumps(message))
@@ -202,6 +264,20 @@ def publish_settings_invalidate() -> bool:
     )
 
 
+def publish_project_recipients_invalidate(project_id: int) -> bool:
+    """Tell every web replica that a project's owner or shares changed.
+
+    Rides the settings-invalidation channel (every web replica already
+    subscribes to it); the receiving side drops its cached realtime recipients
+    for the project (see utils/project_recipients.py). Workers ignore it.
+    """
+    return _publish(
+        {"type": "project_recipients_invalidate", "project_id": project_id},
+        "project_recipients_invalidate",
+        channel=SETTINGS_INVALIDATE_CHANNEL,
+    )
+
+
 def subscribe_settings_invalidate():
     """Return a pubsub subscribed to the settings-invalidation channel.
 
@@ -0,0 +1,462 @@
+# backend/src/utils/trial_shards.py
+"""Shard ledger of a Celery trial run.
+
+A Celery trial used to run as one ``extract_info_celery`` task, with every
+document in one ``asyncio.run`` on one worker process: a 50k-document trial
+stayed on that process while other workers idled, and a crash lost the whole
+run. The task now only plans the run. It splits the documents into shards of
+``TRIAL_SHARD_SIZE``, records them in ``trial_shards`` and queues
+``extract_trial_shard`` tasks on the ``default`` queue, so every idle worker
+can take a shard (see ``celery/info_extraction.py``). How many shards of each
+trial are queued at a time is the fair scheduler's call
+(:func:`queue_next_shards`, ``utils/fair_scheduler.py``).
+
+Design notes:
+
+* A worker claims a shard by moving it from PENDING to PROCESSING in one
+  conditional UPDATE. A duplicated or redelivered message finds the shard
+  already claimed and exits. Planning is idempotent too: a redelivered planner
+  re-queues the shards still open instead of writing new ones.
+* ``queued_at`` marks the shards handed to Celery. The others wait in the
+  ledger until a settled shard frees a slot of their trial's window; the
+  conditional UPDATE that sets ``queued_at`` makes each shard queued once.
+  A shard whose message could not be sent is unqueued again; one still
+  PENDING long after it was queued, while no shard of its trial runs, lost
+  its message (e.g. the sender died right after marking it) and the sweeper
+  sends it again.
+* A running shard bumps ``heartbeat_at`` with the trial's progress heartbeat.
+  The orphan sweeper puts a shard whose heartbeat went stale back to PENDING
+  and queues it again, up to ``TRIAL_SHARD_MAX_ATTEMPTS`` claims; after that
+  the shard is FAILED. Documents that already succeeded are skipped on the
+  next attempt, so a lost worker costs at most the rest of one shard.
+* The trial is finalized exactly once, by whoever settles its last open shard:
+  :func:`claim_finalization` sets ``finished_at`` only while it is NULL and no
+  shard is open. The sweeper claims trials whose finalizer died the same way.
+* ``max_concurrency`` bounds the LLM requests of the whole trial, not of each
+  shard: a trial's window is at most ``max_concurrency`` shards, and each
+  shard runs ``max_concurrency`` divided by the most shards of its trial that
+  can run at once (:func:`shard_concurrency`).
+* Token counts and per-document failures are kept per shard and summed into
+  the trial when it is finalized. A shard's failures are replaced on each
+  attempt, so a document that succeeded on a later attempt is not reported.
+"""
+
+import datetime as dt
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from .. import models
+from .fair_scheduler import shard_windows, trial_weights
+
+logger = logging.getLogger(__name__)
+
+TrialShard = models.TrialShard
+TrialStatus = models.TrialStatus
+
+OPEN_STATUSES = (TrialStatus.PENDING, TrialStatus.PROCESSING)
+
+# Upper bound on per-trial LLM concurrency. Each concurrent document holds an
+# in-flight HTTP connection + response buffer; an unbounded value (user sets
+# max_concurrency=100000) would exhaust FDs/connections/memory in one worker.
+# 32 is comfortably above the default of 8 and any realistic trial.
+MAX_TRIAL_CONCURRENCY = 32
+DEFAULT_TRIAL_CONCURRENCY = 8
+
+
+def _now() -> dt.datetime:
+    return dt.datetime.now(dt.UTC)
+
+
+def split_documents(document_ids: list[int], shard_size: int) -> list[list[int]]:
+    """``document_ids`` in order, ``shard_size`` per shard."""
+    size = max(1, shard_size)
+    return [document_ids[i : i + size] for i in range(0, len(document_ids), size)]
+
+
+def has_shards(db: Session, trial_id: int) -> bool:
+    return bool(db.scalar(select(exists().where(TrialShard.trial_id == trial_id))))
+
+
+def plan_shards(
+    db: Session, trial_id: int, document_ids: list[int], shard_size: int
+) -> list[int]:
+    """Write the trial's shard ledger unless it exists; return its open shards.
+
+    A trial without documents gets no shards (and nothing to run).
+    """
+    if not has_shards(db, trial_id):
+        db.add_all(
+            TrialShard(trial_id=trial_id, shard_index=index, document_ids=chunk)
+            for index, chunk in enumerate(split_documents(document_ids, shard_size))
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent delivery of the same planner wrote the ledger first.
+            db.rollback()
+    return open_shards(db, trial_id)
+
+
+def open_shards(db: Session, trial_id: int) -> list[int]:
+    """Ids of the trial's PENDING and PROCESSING shards, in document order."""
+    return list(
+        db.scalars(
+            select(TrialShard.id)
+            .where(
+                TrialShard.trial_id == trial_id, TrialShard.status.in_(OPEN_STATUSES)
+            )
+            .order_by(TrialShard.shard_index)
+        )
+    )
+
+
+def trial_concurrency(advanced_options: dict | None) -> int:
+    """The trial's ``max_concurrency``, clamped to 1..MAX_TRIAL_CONCURRENCY."""
+    limit = DEFAULT_TRIAL_CONCURRENCY
+    if advanced_options and isinstance(advanced_options, dict):
+        limit = int(advanced_options.get("max_concurrency", limit))
+    return min(max(limit, 1), MAX_TRIAL_CONCURRENCY)
+
+
+def shard_concurrency(
+    advanced_options: dict | None, open_count: int, slots: int
+) -> int:
+    """LLM requests one shard of a trial may have in flight.
+
+    At most ``min(max_concurrency, open shards, slots)`` shards of the trial
+    run at once (:func:`trial_windows` caps the window), so each gets an
+    even part of the trial's ``max_concurrency``. ``open_count`` only shrinks
+    while the trial runs, so shards started later never push the trial over
+    its limit.
+    """
+    limit = trial_concurrency(advanced_options)
+    return max(1, limit // max(1, min(limit, open_count, slots)))
+
+
+def queued_shards(db: Session, trial_id: int) -> list[int]:
+    """Ids of the trial's open shards already handed to Celery."""
+    return list(
+        db.scalars(
+            select(TrialShard.id)
+            .where(
+                TrialShard.trial_id == trial_id,
+                TrialShard.status.in_(OPEN_STATUSES),
+                TrialShard.queued_at.is_not(None),
+            )
+            .order_by(TrialShard.shard_index)
+        )
+    )
+
+
+def trial_demand(db: Session) -> dict[int, tuple[float, int, int]]:
+    """``(weight, open shards, queued open shards)`` per trial with open
+    shards."""
+    rows = db.execute(
+        select(
+            TrialShard.trial_id,
+            func.count(),
+            func.count(TrialShard.queued_at),
+        )
+        .where(TrialShard.status.in_(OPEN_STATUSES))
+        .group_by(TrialShard.trial_id)
+    ).all()
+    weights = trial_weights(db, [row[0] for row in rows])
+    return {
+        trial_id: (weights.get(trial_id, 1.0), open_count, queued)
+        for trial_id, open_count, queued in rows
+    }
+
+
+def trial_windows(
+    db: Session, demand: dict[int, tuple[float, int, int]], slots: int
+) -> dict[int, int]:
+    """Each trial's shard window: its weighted share of ``slots``, at most
+    its ``max_concurrency`` shards."""
+    options = dict(
+        db.execute(
+            select(models.Trial.id, models.Trial.advanced_options).where(
+                models.Trial.id.in_(list(demand))
+            )
+        ).all()
+    )
+    return shard_windows(
+        {
+            t: (w, min(n, trial_concurrency(options.get(t))))
+            for t, (w, n, _) in demand.items()
+        },
+        slots,
+    )
+
+
+def queue_next_shards(db: Session, slots: int) -> list[tuple[int, int]]:
+    """Mark waiting shards queued until every trial fills its window.
+
+    Returns the ``(trial_id, shard_id)`` pairs marked, for the caller to hand
+    to Celery. Concurrent callers may overfill a window by a shard or two
+    (it shrinks back as shards settle) but never queue a shard twice.
+    """
+    demand = trial_demand(db)
+    windows = trial_windows(db, demand, slots)
+    marked: list[tuple[int, int]] = []
+    for trial_id, window in sorted(windows.items()):
+        take = window - demand[trial_id][2]
+        if take <= 0:
+            continue
+        candidates = db.scalars(
+            select(TrialShard.id)
+            .where(
+                TrialShard.trial_id == trial_id,
+                TrialShard.status == TrialStatus.PENDING,
+                TrialShard.queued_at.is_(None),
+            )
+            .order_by(TrialShard.shard_index)
+            .limit(take)
+        ).all()
+        now = _now()
+        for shard_id in candidates:
+            if db.execute(
+                update(TrialShard)
+                .where(TrialShard.id == shard_id, TrialShard.queued_at.is_(None))
+                .values(queued_at=now)
+            ).rowcount:
+                marked.append((trial_id, shard_id))
+    db.commit()
+    return marked
+
+
+def unqueue_shards(db: Session, shard_ids: list[int]) -> None:
+    """Return PENDING shards whose Celery message was never sent to the
+    waiting state, so a later :func:`queue_next_shards` queues them again."""
+    if shard_ids:
+        db.execute(
+            update(TrialShard)
+            .where(
+                TrialShard.id.in_(shard_ids),
+                TrialShard.status == TrialStatus.PENDING,
+            )
+            .values(queued_at=None)
+        )
+        db.commit()
+
+
+def requeue_lost_shards(
+    db: Session, *, queued_before: dt.datetime
+) -> list[tuple[int, int]]:
+    """PENDING shards queued before ``queued_before`` and never claimed.
+
+    A queued shard may simply wait in the broker behind the running shards of
+    its trial (windows give every trial a slot and can overfill), so one only
+    counts as lost while no shard of its trial is PROCESSING: then nothing
+    ahead of it holds a slot, yet it was not picked up. Its message was lost
+    (the process that marked it died before sending it, or the broker dropped
+    it). Each is stamped queued again and returned as a ``(trial_id,
+    shard_id)`` pair for the caller to send anew; should the old message still
+    arrive, the shard still runs once.
+    """
+    running = aliased(TrialShard)
+    lost_shard = (
+        TrialShard.status == TrialStatus.PENDING,
+        TrialShard.queued_at < queued_before,
+        ~exists().where(
+            running.trial_id == TrialShard.trial_id,
+            running.status == TrialStatus.PROCESSING,
+        ),
+    )
+    rows = db.execute(
+        select(TrialShard.trial_id, TrialShard.id)
+        .where(*lost_shard)
+        .order_by(TrialShard.id)
+    ).all()
+    now = _now()
+    lost: list[tuple[int, int]] = []
+    for trial_id, shard_id in rows:
+        if db.execute(
+            update(TrialShard)
+            .where(TrialShard.id == shard_id, *lost_shard)
+            .values(queued_at=now)
+        ).rowcount:
+            lost.append((trial_id, shard_id))
+    db.commit()
+    return lost
+
+
+def claim_shard(db: Session, shard_id: int) -> TrialShard | None:
+    """Take a PENDING shard for this worker; None if it is not PENDING."""
+    now = _now()
+    claimed = db.execute(
+        update(TrialShard)
+        .where(TrialShard.id == shard_id, TrialShard.status == TrialStatus.PENDING)
+        .values(
+            status=TrialStatus.PROCESSING,
+            attempts=TrialShard.attempts + 1,
+            started_at=now,
+            heartbeat_at=now,
+            finished_at=None,
+        )
+    ).rowcount
+    db.commit()
+    return db.get(TrialShard, shard_id) if claimed else None
+
+
+def heartbeat_shard(db: Session, shard_id: int) -> None:
+    db.execute(
+        update(TrialShard)
+        .where(TrialShard.id == shard_id, TrialShard.status == TrialStatus.PROCESSING)
+        .values(heartbeat_at=_now())
+    )
+    db.commit()
+
+
+def finish_shard(
+    db: Session,
+    shard_id: int,
+    status: TrialStatus,
+    *,
+    failures: dict[str, str],
+    prompt_tokens: int = 0,
+    cached_prompt_tokens: int = 0,
+) -> bool:
+    """Settle a claimed shard. False if it was no longer PROCESSING (the
+    sweeper re-queued it after its heartbeat went stale)."""
+    settled = db.execute(
+        update(TrialShard)
+        .where(TrialShard.id == shard_id, TrialShard.status == TrialStatus.PROCESSING)
+        .values(
+            status=status,
+            failures=failures,
+            prompt_tokens=TrialShard.prompt_tokens + prompt_tokens,
+            cached_prompt_tokens=TrialShard.cached_prompt_tokens + cached_prompt_tokens,
+            finished_at=_now(),
+        )
+    ).rowcount
+    db.commit()
+    if not settled:
+        logger.warning("Trial shard %s was re-queued before it settled", shard_id)
+    return bool(settled)
+
+
+def cancel_pending_shards(db: Session, trial_id: int) -> int:
+    """Settle the trial's queued shards as CANCELLED so the trial can be
+    finalized without waiting for workers to pick them up."""
+    cancelled = db.execute(
+        update(TrialShard)
+        .where(
+            TrialShard.trial_id == trial_id,
+            TrialShard.status == TrialStatus.PENDING,
+        )
+        .values(status=TrialStatus.CANCELLED, finished_at=_now())
+    ).rowcount
+    db.commit()
+    return cancelled
+
+
+def claim_finalization(db: Session, trial_id: int) -> bool:
+    """True for exactly one caller once no shard of the trial is open."""
+    open_shard = exists().where(
+        TrialShard.trial_id == trial_id, TrialShard.status.in_(OPEN_STATUSES)
+    )
+    claimed = db.execute(
+        update(models.Trial)
+        .where(
+            models.Trial.id == trial_id,
+            models.Trial.finished_at.is_(None),
+            ~open_shard,
+        )
+        .values(finished_at=_now())
+    ).rowcount
+    db.commit()
+    return bool(claimed)
+
+
+def shard_totals(db: Session, trial_id: int) -> tuple[dict[str, str], dict[str, int]]:
+    """The trial's failures and token counts, summed over its shards."""
+    failures: dict[str, str] = {}
+    totals = {"prompt_tokens": 0, "cached_prompt_tokens": 0}
+    rows = db.execute(
+        select(
+            TrialShard.failures,
+            TrialShard.prompt_tokens,
+            TrialShard.cached_prompt_tokens,
+        )
+        .where(TrialShard.trial_id == trial_id)
+        .order_by(TrialShard.shard_index)
+    )
+    for row in rows:
+        failures.update(row.failures or {})
+        totals["prompt_tokens"] += row.prompt_tokens or 0
+        totals["cached_prompt_tokens"] += row.cached_prompt_tokens or 0
+    return failures, totals
+
+
+def reopen_stale_shards(
+    db: Session,
+    *,
+    max_attempts: int,
+    failure: Callable[[], str],
+    stale_before: dt.datetime | None = None,
+    trial_ids: list[int] | None = None,
+) -> tuple[list[tuple[int, int]], set[int]]:
+    """Put PROCESSING shards whose worker is gone back to PENDING.
+
+    Selects shards whose heartbeat is older than ``stale_before`` and/or that
+    belong to ``trial_ids``. A shard already claimed ``max_attempts`` times
+    is FAILED instead, recording ``failure()``. Returns the re-opened
+    ``(trial_id, shard_id)`` pairs, for the caller to queue again, and the ids
+    of trials with a shard failed here (their last shard may now be settled).
+    """
+    stale = [TrialShard.status == TrialStatus.PROCESSING]
+    if stale_before is not None:
+        stale.append(TrialShard.heartbeat_at < stale_before)
+    query = select(
+        TrialShard.id,
+        TrialShard.trial_id,
+        TrialShard.shard_index,
+        TrialShard.attempts,
+        TrialShard.failures,
+    ).where(*stale)
+    if trial_ids is not None:
+        query = query.where(TrialShard.trial_id.in_(trial_ids))
+    reopened: list[tuple[int, int]] = []
+    exhausted: set[int] = set()
+    for shard in db.execute(query.order_by(TrialShard.id)).all():
+        # Conditional, like claim_shard: a shard finished (or heartbeating
+        # again) since the select keeps its status.
+        reopen = update(TrialShard).where(TrialShard.id == shard.id, *stale)
+        if (shard.attempts or 0) >= max_attempts:
+            reopen = reopen.values(
+                status=TrialStatus.FAILED,
+                finished_at=_now(),
+                failures=(shard.failures or {})
+                | {f"_shard_{shard.shard_index}": failure()},
+            )
+            if db.execute(reopen).rowcount == 1:
+                exhausted.add(shard.trial_id)
+        else:
+            # Queued anew by the caller (see requeue_lost_shards).
+            reopen = reopen.values(status=TrialStatus.PENDING, queued_at=_now())
+            if db.execute(reopen).rowcount == 1:
+                reopened.append((shard.trial_id, shard.id))
+    db.commit()
+    return reopened, exhausted
+
+
+def settled_unfinalized_trials(
+    db: Session, *, stale_before: dt.datetime | None = None
+) -> list[int]:
+    """Trials with a ledger, no open shard and no ``finished_at``: their last
+    shard settled but the finalizer did not run."""
+    open_shard = exists().where(
+        TrialShard.trial_id == models.Trial.id, TrialShard.status.in_(OPEN_STATUSES)
+    )
+    query = select(models.Trial.id).where(
+        models.Trial.finished_at.is_(None),
+        exists().where(TrialShard.trial_id == models.Trial.id),
+        ~open_shard,
+    )
+    if stale_before is not None:
+        query = query.where(models.Trial.updated_at < stale_before)
+    return list(db.scalars(query))
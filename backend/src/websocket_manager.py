@@ -1,8 +1,30 @@
 # backend/src/websocket_manager.py
-"""WebSocket connection manager for real-time task updates."""
-
+"""WebSocket connection manager for real-time task updates.
+
+Design notes:
+
+* Every socket has its own outbound queue (:class:`_Outbox`) drained by a
+  dedicated writer task. Broadcasting only enqueues, so a slow client delays
+  nobody but itself — previously each ``send_json`` was awaited in turn and one
+  stalled mobile connection held up a whole project's progress updates.
+* A broadcast is serialized once and the same text frame is queued on every
+  recipient socket, instead of ``send_json`` re-encoding it per socket.
+* Progress heartbeats (``event == "progress"``) for the same task or trial
+  supersede each other: while one is still queued, a newer one replaces it in
+  place. Lifecycle events (started, completed, failed, …) are never dropped or
+  reordered.
+* A queue that fills up anyway, or a single send that blocks for longer than
+  ``SLOW_CLIENT_TIMEOUT_SECONDS``, closes the socket with 1013 ("Try Again
+  Later"). The client reconnects and refetches state, which is cheaper than
+  buffering an unbounded backlog for it.
+"""
+
+import asyncio
+import itertools
+import json
 import logging
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
 from typing import Dict, Set
 
 from fastapi import WebSocket
@@ -18,6 +40,140 @@ logger = logging.getLogger(__name__)
 # code 1013 ("Try Again Later") so the client can back off.
 MAX_CONNECTIONS_PER_USER = 10
 
+# Messages that may wait on one socket. Superseded progress updates are
+# coalesced, so reaching this means the client has fallen far behind on
+# distinct events; it is disconnected rather than buffered without bound.
+MAX_PENDING_MESSAGES = 256
+
+# A single frame that takes longer than this to send marks the client as too
+# slow to keep; the socket is closed and the client reconnects.
+SLOW_CLIENT_TIMEOUT_SECONDS = 10.0
+
+# Close code for sockets dropped for being too slow (same as the cap above).
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+_ENTITY_IDS = {
+    "preprocessing_update": "task_id",
+    "trial_update": "trial_id",
+    "evaluation_job_update": "job_id",
+}
+
+
+def _serialize(message: dict) -> str:
+    # Same encoding as Starlette's WebSocket.send_json, done once per broadcast.
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def _entity_key(message: dict) -> tuple | None:
+    """The task/trial/job a message describes, or None for other messages."""
+    kind = message.get("type")
+    id_field = _ENTITY_IDS.get(kind)
+    if id_field is None or message.get(id_field) is None:
+        return None
+    return (kind, message[id_field])
+
+
+class _Outbox:
+    """One socket's outbound queue and the writer task that drains it."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        on_exit: "Callable[[_Outbox, bool], None]",
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self._on_exit = on_exit
+        # seq -> (frame, entity key it may be coalesced under)
+        self._pending: OrderedDict[int, tuple[str, Hashable | None]] = OrderedDict()
+        # entity key -> seq of its queued, still-replaceable progress frame
+        self._slots: dict[Hashable, int] = {}
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._writer: asyncio.Task | None = None
+        self.closed = False
+
+    def put(self, text: str, entity: Hashable | None, progress: bool) -> bool:
+        """Queue a frame. Returns False if the queue is full."""
+        if self.closed:
+            return True
+        if entity is not None:
+            if progress:
+                seq = self._slots.get(entity)
+                if seq is not None and seq in self._pending:
+                    self._pending[seq] = (text, entity)
+                    return True
+            else:
+                # A lifecycle event freezes the queued progress frame before
+                # it: a later progress frame must be queued after the event,
+                # not folded into a slot that is delivered ahead of it.
+                self._slots.pop(entity, None)
+        if len(self._pending) >= MAX_PENDING_MESSAGES:
+            return False
+
+        seq = next(self._seq)
+        self._pending[seq] = (text, entity)
+        if entity is not None and progress:
+            self._slots[entity] = seq
+        self._idle.clear()
+        self._ready.set()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    async def _run(self) -> None:
+        slow = False
+        try:
+            while True:
+                while not self._pending:
+                    self._idle.set()
+                    self._ready.clear()
+                    await self._ready.wait()
+                seq, (text, entity) = self._pending.popitem(last=False)
+                if entity is not None and self._slots.get(entity) == seq:
+                    del self._slots[entity]
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), SLOW_CLIENT_TIMEOUT_SECONDS
+                )
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"WebSocket for user {self.user_id} blocked for more than "
+                f"{SLOW_CLIENT_TIMEOUT_SECONDS}s on send; closing"
+            )
+            slow = True
+        except Exception as e:
+            logger.warning(f"Failed to send to user {self.user_id}: {e}")
+        self._on_exit(self, slow)
+
+    async def close_slow(self) -> None:
+        """Close the socket with 1013 so the client reconnects."""
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(
+                    code=SLOW_CLIENT_CLOSE_CODE, reason="Client too slow"
+                ),
+                1.0,
+            )
+        except Exception:
+            pass
+
+    def shutdown(self) -> None:
+        """Stop the writer and drop whatever is still queued."""
+        self.closed = True
+        self._pending.clear()
+        self._slots.clear()
+        self._idle.set()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    async def wait_idle(self) -> None:
+        await self._idle.wait()
+
 
 class ConnectionManager:
     """Manages WebSocket connections for broadcasting task updates."""
@@ -27,6 +183,11 @@ class ConnectionManager:
         self._active_connections: Dict[int, Set[WebSocket]] = {}
         # Store all connections for admin broadcasts
         self._admin_connections: Set[WebSocket] = set()
+        # Outbound queue per socket
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        # Close tasks for sockets dropped from a broadcast (kept referenced
+        # so they aren't garbage-collected mid-close).
+        self._closing: Set[asyncio.Task] = set()
 
     async def connect(
         self,
@@ -62,13 +223,14 @@ class ConnectionManager:
             self._active_connections[user_id] = set()
 
         self._active_connections[user_id].add(websocket)
+        self._outboxes[websocket] = _Outbox(websocket, user_id, self._writer_exited)
 
         if is_admin:
             self._admin_connections.add(websocket)
 
         # Presence lives here rather than in the WebSocket route because this is
         # the only place that knows how many sockets a user still holds — and
-        # sockets are also dropped from inside this class when a broadcast fails.
+        # sockets are also dropped from inside this class when a send fails.
         presence.mark_online(user_id)
 
         logger.info(f"WebSocket connected for user {user_id}")
@@ -83,6 +245,10 @@ class ConnectionManager:
 
         self._admin_connections.discard(websocket)
 
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox is not None:
+            outbox.shutdown()
+
         # Only the last socket going away means the user left; closing one of
         # several open tabs must not report them away.
         if user_id not in self._active_connections:
@@ -94,40 +260,68 @@ class ConnectionManager:
         """Whether this process holds any live socket for the user."""
         return bool(self._active_connections.get(user_id))
 
-    async def broadcast_to_user(self, user_id: int, message: dict):
-        """Send a message to all connections for a specific user."""
-        if user_id not in self._active_connections:
+    def _writer_exited(self, outbox: _Outbox, slow: bool) -> None:
+        """A socket's writer hit a send error or timed out: drop the socket."""
+        if self._outboxes.get(outbox.websocket) is not outbox:
             return
+        self.disconnect(outbox.websocket, outbox.user_id)
+        if slow:
+            self._close_in_background(outbox)
+
+    def _close_in_background(self, outbox: _Outbox) -> None:
+        task = asyncio.get_running_loop().create_task(outbox.close_slow())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _enqueue(self, websockets: Iterable[WebSocket], message: dict) -> None:
+        """Queue one serialized copy of ``message`` on each socket."""
+        text = None
+        entity = _entity_key(message)
+        progress = message.get("event") == "progress"
+        for websocket in websockets:
+            outbox = self._outboxes.get(websocket)
+            if outbox is None:
+                continue
+            if text is None:
+                text = _serialize(message)
+            if not outbox.put(text, entity, progress):
+                logger.warning(
+                    f"WebSocket for user {outbox.user_id} has "
+                    f"{MAX_PENDING_MESSAGES} unsent messages; closing"
+                )
+                self.disconnect(websocket, outbox.user_id)
+                self._close_in_background(outbox)
+
+    async def send_text(self, websocket: WebSocket, text: str):
+        """Queue a raw text frame (e.g. the keepalive ``pong``) on one socket.
+
+        Goes through the socket's queue so it is never sent concurrently with
+        a broadcast frame by the writer task.
+        """
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            await websocket.send_text(text)
+        elif not outbox.put(text, None, False):
+            self.disconnect(websocket, outbox.user_id)
+            self._close_in_background(outbox)
+
+    async def drain(self, timeout: float | None = None):
+        """Wait until every queued message has been handed to its socket."""
+        waits = [outbox.wait_idle() for outbox in list(self._outboxes.values())]
+        if not waits:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+        except asyncio.TimeoutError:
+            pass
 
-        disconnected = set()
-        for websocket in self._active_connections[user_id]:
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send to user {user_id}: {e}")
-                disconnected.add(websocket)
-
-        # Clean up disconnected sockets
-        for ws in disconnected:
-            self.disconnect(ws, user_id)
+    async def broadcast_to_user(self, user_id: int, message: dict):
+        """Send a message to all connections for a specific user."""
+        self._enqueue(list(self._active_connections.get(user_id, ())), message)
 
     async def broadcast_to_admin(self, message: dict):
         """Send a message to all admin connections."""
-        disconnected = set()
-        for websocket in self._admin_connections:
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send to admin: {e}")
-                disconnected.add(websocket)
-
-        # Clean up disconnected sockets
-        for ws in disconnected:
-            # Find user_id for this websocket
-            for uid, sockets in self._active_connections.items():
-                if ws in sockets:
-                    self.disconnect(ws, uid)
-                    break
+        self._enqueue(list(self._admin_connections), message)
 
     async def broadcast_to_all(self, message: dict):
         """Send a message to all connected clients.
@@ -140,19 +334,7 @@ class ConnectionManager:
             :meth:`broadcast_to_project`, which filters by ownership so a user
             can't observe another user's task progress.
         """
-        disconnected = []
-
-        for user_id, sockets in list(self._active_connections.items()):
-            for websocket in sockets:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    logger.warning(f"Failed to send to user {user_id}: {e}")
-                    disconnected.append((websocket, user_id))
-
-        # Clean up disconnected sockets
-        for ws, uid in disconnected:
-            self.disconnect(ws, uid)
+        self._enqueue(list(self._outboxes), message)
 
     async def broadcast_to_project(
         self, recipient_ids: "int | None | Iterable[int]", message: dict
@@ -179,43 +361,12 @@ class ConnectionManager:
         else:
             recipients = set(recipient_ids)
 
-        disconnected = []
         # A socket that is both an admin connection and a member's connection
         # must receive the message once, not twice.
-        sent: set = set()
-
-        # Admin connections always receive project updates.
-        for websocket in list(self._admin_connections):
-            try:
-                await websocket.send_json(message)
-                sent.add(websocket)
-            except Exception as e:
-                logger.warning(f"Failed to send to admin: {e}")
-                disconnected.append((websocket, None))
-
-        # Members' connections (if any) receive their project's updates.
+        targets: set[WebSocket] = set(self._admin_connections)
         for user_id in recipients:
-            for websocket in list(self._active_connections.get(user_id, ())):
-                if websocket in sent:
-                    continue
-                try:
-                    await websocket.send_json(message)
-                    sent.add(websocket)
-                except Exception as e:
-                    logger.warning(f"Failed to send to user {user_id}: {e}")
-                    disconnected.append((websocket, user_id))
-
-        for ws, uid in disconnected:
-            if uid is not None:
-                self.disconnect(ws, uid)
-            else:
-                # Admin socket: find its user id for cleanup.
-                for cand_uid, sockets in self._active_connections.items():
-                    if ws in sockets:
-                        self.disconnect(ws, cand_uid)
-                        break
-                else:
-                    self._admin_connections.discard(ws)
+            targets.update(self._active_connections.get(user_id, ()))
+        self._enqueue(targets, message)
 
 
 # Global singleton instance
@@ -0,0 +1,170 @@
+# backend/tests/test_audit_writer.py
+"""The batched audit writer behind ``record_audit``.
+
+The suite runs with ``AUDIT_WRITE_MODE=sync`` (tests/.env) so API tests can
+read their audit rows back immediately. These tests switch individual writers
+to the async path and drive the queue directly.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def audit():
+    """Lazy import — app modules must not be imported at module scope."""
+    from backend.src.utils import audit
+
+    return audit
+
+
+@pytest.fixture
+def cfg(monkeypatch):
+    """Set writer settings for one test: ``cfg(AUDIT_BATCH_SIZE=3, ...)``."""
+    from backend.src.core import config
+
+    def _set(**values):
+        for name, value in values.items():
+            monkeypatch.setattr(config._get_settings(), name, value)
+
+    return _set
+
+
+def _row(audit, marker, **overrides):
+    from backend.src.utils.enums import AuditAction, AuditOutcome
+
+    row = dict(
+        actor_user_id=None,
+        actor_email="writer@example.com",
+        actor_ip=None,
+        action=AuditAction.ACCESS_DENIED,
+        resource_type=marker,
+        resource_id=None,
+        project_id=None,
+        outcome=AuditOutcome.DENIED,
+        detail=None,
+        request_id=None,
+    )
+    row.update(overrides)
+    return row
+
+
+def _count(marker):
+    from sqlalchemy import func, select
+
+    from backend.src.db.session import SessionLocal
+    from backend.src.models.audit import AuditLog
+
+    with SessionLocal() as db:
+        return db.execute(
+            select(func.count())
+            .select_from(AuditLog)
+            .where(AuditLog.resource_type == marker)
+        ).scalar_one()
+
+
+def test_async_mode_queues_and_flush_writes(audit, cfg):
+    from backend.src.utils.enums import AuditAction
+
+    cfg(AUDIT_WRITE_MODE="async", AUDIT_FLUSH_INTERVAL_MS=60000)
+    marker = f"async-{uuid.uuid4().hex[:8]}"
+
+    for i in range(5):
+        audit.record_audit(AuditAction.LOGIN_SUCCESS, resource_type=marker)
+    audit.flush_audit_queue()
+
+    assert _count(marker) == 5
+    assert audit.audit_writer_stats()["pending"] == 0
+
+
+def test_writer_thread_inserts_full_batches(audit, cfg, monkeypatch):
+    cfg(AUDIT_BATCH_SIZE=3, AUDIT_FLUSH_INTERVAL_MS=60000)
+    batches = []
+    monkeypatch.setattr(audit, "_insert_rows", lambda rows: batches.append(len(rows)))
+    writer = audit._AuditWriter()
+
+    for i in range(7):
+        writer.submit(_row(audit, "batch"))
+    deadline = time.monotonic() + 5
+    while sum(batches) < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Two full batches went out; the seventh row waits for its interval.
+    assert batches == [3, 3]
+    assert writer.stats()["pending"] == 1
+    writer.flush()
+    assert batches == [3, 3, 1]
+
+
+def test_writer_flushes_partial_batch_after_interval(audit, cfg, monkeypatch):
+    cfg(AUDIT_BATCH_SIZE=100, AUDIT_FLUSH_INTERVAL_MS=20)
+    batches = []
+    monkeypatch.setattr(audit, "_insert_rows", lambda rows: batches.append(len(rows)))
+    writer = audit._AuditWriter()
+
+    writer.submit(_row(audit, "interval"))
+    deadline = time.monotonic() + 5
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert batches == [1]
+
+
+def test_drop_policy_counts_rows_that_do_not_fit(audit, cfg, monkeypatch):
+    cfg(AUDIT_QUEUE_MAX_ROWS=2, AUDIT_OVERFLOW_POLICY="drop")
+    writer = audit._AuditWriter()
+    # No writer thread: the queue only fills.
+    monkeypatch.setattr(writer, "_ensure_thread", lambda: None)
+
+    for _ in range(5):
+        writer.submit(_row(audit, "drop"))
+
+    assert writer.stats() == {"pending": 2, "dropped": 3}
+
+
+def test_block_policy_waits_for_room(audit, cfg, monkeypatch):
+    cfg(AUDIT_QUEUE_MAX_ROWS=1, AUDIT_OVERFLOW_POLICY="block")
+    monkeypatch.setattr(audit, "_insert_rows", lambda rows: None)
+    writer = audit._AuditWriter()
+    monkeypatch.setattr(writer, "_ensure_thread", lambda: None)
+
+    writer.submit(_row(audit, "block"))
+    threading.Timer(0.05, writer.flush).start()
+    started = time.monotonic()
+    writer.submit(_row(audit, "block"))  # blocks until the flush makes room
+
+    assert time.monotonic() - started >= 0.04
+    assert writer.stats() == {"pending": 1, "dropped": 0}
+
+
+def test_block_policy_gives_up_after_timeout(audit, cfg, monkeypatch):
+    cfg(AUDIT_QUEUE_MAX_ROWS=1, AUDIT_OVERFLOW_POLICY="block")
+    monkeypatch.setattr(audit, "_BLOCK_TIMEOUT_SECONDS", 0.05)
+    writer = audit._AuditWriter()
+    monkeypatch.setattr(writer, "_ensure_thread", lambda: None)
+
+    writer.submit(_row(audit, "block"))
+    writer.submit(_row(audit, "block"))
+
+    assert writer.stats() == {"pending": 1, "dropped": 1}
+
+
+def test_bad_row_does_not_discard_its_batch(audit):
+    marker = f"partial-{uuid.uuid4().hex[:8]}"
+    rows = [_row(audit, marker) for _ in range(3)]
+    rows[1]["action"] = None  # violates NOT NULL
+
+    audit._insert_rows(rows)
+
+    assert _count(marker) == 2
+
+
+def test_writer_status_endpoint(client, api_url, admin_headers):
+    resp = client.get(f"{api_url}/admin/audit/writer", headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["mode"] == "sync"
+    assert body["dropped"] >= 0
@@ -9,14 +9,17 @@ Two layers, no real network:
    direct + nested output, missing keys, malformed warnings). Zero mocking.
 
 2. The public ``convert_*`` methods and ``_convert`` HTTP path — the constructed
-   client's internal ``httpx.Client`` (``client._client``) is replaced with a
-   ``MagicMock`` whose ``.post(...)`` returns a fake response, so we can assert
-   the multipart ``data``/``files`` assembly, the success/error/retry branches,
-   and the rich ``DoclingServeError`` attributes without any I/O. ``time.sleep``
-   is patched so retry backoff is instant.
+   client's internal ``httpx.AsyncClient`` (``client._client``) is replaced
+   with an ``AsyncMock`` whose ``.post(...)`` returns a fake response, so we can
+   assert the multipart ``data``/``files`` assembly, the success/error/retry
+   branches, and the rich ``DoclingServeError`` attributes without any I/O.
+   ``base_retry_delay=0`` makes retry backoff instant.
+
+Page-range slicing runs against a local stand-in server instead, in
+test_docling_serve_slicing.py.
 """
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 
 import httpx
 import pytest
@@ -50,9 +53,10 @@ class FakeResponse:
 
 
 def make_client(**kwargs) -> DoclingServeClient:
-    """Build a client and swap its httpx client for a MagicMock."""
+    """Build a client and swap its httpx client for an AsyncMock."""
+    kwargs.setdefault("base_retry_delay", 0)
     client = DoclingServeClient("http://docling.local", **kwargs)
-    client._client = MagicMock()
+    client._client = AsyncMock()
     return client
 
 
@@ -199,15 +203,15 @@ class TestConstructor:
 
     def test_context_manager_closes_client(self):
         c = DoclingServeClient("http://x.local")
-        c._client = MagicMock()
+        c._client = AsyncMock()
         with c as ctx:
             assert ctx is c
-        c._client.close.assert_called_once()
+        c._client.aclose.assert_awaited_once()
 
     def test_close_delegates(self):
         c = make_client()
         c.close()
-        c._client.close.assert_called_once()
+        c._client.aclose.assert_awaited_once()
 
 
 # --------------------------------------------------------------------------- #
@@ -342,8 +346,7 @@ class TestErrorBranches:
         # single attempt when max_retries=0
         assert client._client.post.call_count == 1
 
-    def test_timeout_retries_then_raises(self, monkeypatch):
-        monkeypatch.setattr("time.sleep", lambda *a, **k: None)
+    def test_timeout_retries_then_raises(self):
         client = make_client(max_retries=1)
         client._client.post.side_effect = httpx.TimeoutException("t/o")
 
@@ -354,8 +357,7 @@ class TestErrorBranches:
         # max_retries=1 -> 2 attempts total
         assert client._client.post.call_count == 2
 
-    def test_timeout_then_success(self, monkeypatch):
-        monkeypatch.setattr("time.sleep", lambda *a, **k: None)
+    def test_timeout_then_success(self):
         client = make_client(max_retries=1)
         client._client.post.side_effect = [
             httpx.TimeoutException("t/o"),
@@ -0,0 +1,223 @@
+# backend/tests/test_docling_serve_slicing.py
+"""Page-range slicing in ``DoclingServeClient`` against a stand-in server.
+
+The stand-in is a real HTTP server on localhost that speaks just enough of
+docling-serve's ``/v1/convert/file``: it reads the uploaded PDF with pypdf and
+answers with one Markdown paragraph per page. Tests can delay responses and
+make given slices fail, and the server records how many requests it had open
+at once.
+"""
+
+import email.parser
+import email.policy
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pymupdf
+import pytest
+from pypdf import PdfReader
+
+from backend.src.services.docling_serve_client import (
+    DoclingServeClient,
+    DoclingServeError,
+)
+
+
+class StandInServer:
+    def __init__(self):
+        self.delay = 0.0
+        self.delays: dict[str, float] = {}  # uploaded filename -> seconds
+        self.failures: dict[str, int] = {}  # uploaded filename -> 503s left
+        self.requests: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def handle(self, content_type: str, body: bytes) -> tuple[int, dict]:
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        upload = next(p for p in message.iter_parts() if p.get_filename())
+        filename = upload.get_filename()
+        with self._lock:
+            self.requests.append(filename)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(filename, self.delay))
+            with self._lock:
+                if self.failures.get(filename, 0) > 0:
+                    self.failures[filename] -= 1
+                    return 503, {"detail": "worker busy"}
+            try:
+                reader = PdfReader(io.BytesIO(upload.get_payload(decode=True)))
+            except Exception:
+                return 422, {"detail": "not a PDF"}
+            pages = [page.extract_text().strip() for page in reader.pages]
+            return 200, {
+                "document": {"md_content": "\n\n".join(p for p in pages if p)},
+                "warnings": [f"{filename}: ok"],
+            }
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def server():
+    stand_in = StandInServer()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            status, payload = stand_in.handle(self.headers["Content-Type"], body)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    stand_in.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield stand_in
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def make_client(server):
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault("base_retry_delay", 0)
+        client = DoclingServeClient(server.url, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def make_pdf(pages: int, blank: set[int] = frozenset()) -> bytes:
+    doc = pymupdf.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        if number not in blank:
+            page.insert_text((72, 72), f"Page {number}")
+    return doc.tobytes()
+
+
+def test_large_pdf_is_converted_in_slices_and_reassembled_in_order(server, make_client):
+    # The first slice answers last, so completion order is not page order.
+    server.delays = {"scan.p1-3.pdf": 0.3}
+    client = make_client(slice_pages=3)
+
+    result = client.convert_pdf_no_ocr(make_pdf(10), "scan.pdf")
+
+    assert sorted(server.requests) == sorted(
+        ["scan.p1-3.pdf", "scan.p4-6.pdf", "scan.p7-9.pdf", "scan.p10-10.pdf"]
+    )
+    assert result.text == "\n\n".join(f"Page {n}" for n in range(1, 11))
+    assert result.page_ranges == [(1, 3), (4, 6), (7, 9), (10, 10)]
+    assert result.raw_response["page_count"] == 10
+    assert [s["pages"] for s in result.raw_response["slices"]] == [
+        [1, 3],
+        [4, 6],
+        [7, 9],
+        [10, 10],
+    ]
+    assert result.warnings[0] == "scan.p1-3.pdf: ok"
+
+
+def test_slices_run_concurrently_up_to_the_server_limit(server, make_client):
+    server.delay = 0.2
+    pdf = make_pdf(8)
+
+    started = time.monotonic()
+    make_client(slice_pages=1, max_concurrent_requests=4).convert_pdf_no_ocr(
+        pdf, "a.pdf"
+    )
+    elapsed = time.monotonic() - started
+
+    assert server.max_active == 4
+    assert elapsed < 8 * server.delay * 0.6  # two rounds, not eight
+
+
+def test_server_limit_is_shared_by_concurrent_conversions(server, make_client):
+    server.delay = 0.1
+    pdf = make_pdf(4)
+    clients = [make_client(slice_pages=1, max_concurrent_requests=2) for _ in range(3)]
+
+    threads = [
+        threading.Thread(target=c.convert_pdf_no_ocr, args=(pdf, f"{i}.pdf"))
+        for i, c in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.requests) == 12
+    assert server.max_active == 2
+
+
+def test_only_the_failed_slice_is_retried(server, make_client):
+    server.failures = {"doc.p4-6.pdf": 1}
+    client = make_client(slice_pages=3, max_retries=1)
+
+    result = client.convert_pdf_no_ocr(make_pdf(7), "doc.pdf")
+
+    assert sorted(server.requests) == sorted(
+        ["doc.p1-3.pdf", "doc.p4-6.pdf", "doc.p4-6.pdf", "doc.p7-7.pdf"]
+    )
+    assert result.text.split("\n\n") == [f"Page {n}" for n in range(1, 8)]
+
+
+def test_a_slice_out_of_retries_fails_the_conversion(server, make_client):
+    server.failures = {"doc.p4-6.pdf": 5}
+    client = make_client(slice_pages=3, max_retries=1)
+
+    with pytest.raises(DoclingServeError) as exc:
+        client.convert_pdf_no_ocr(make_pdf(6), "doc.pdf")
+
+    assert exc.value.status_code == 503
+    assert exc.value.filename == "doc.p4-6.pdf"
+    assert server.requests.count("doc.p1-3.pdf") == 1
+
+
+def test_blank_slices_contribute_nothing(server, make_client):
+    client = make_client(slice_pages=2)
+
+    result = client.convert_pdf_no_ocr(make_pdf(5, blank={3, 4}), "doc.pdf")
+
+    assert result.text == "Page 1\n\nPage 2\n\nPage 5"
+
+
+def test_short_pdf_is_sent_whole(server, make_client):
+    client = make_client(slice_pages=3)
+
+    result = client.convert_pdf_no_ocr(make_pdf(3), "short.pdf")
+
+    assert server.requests == ["short.pdf"]
+    assert result.page_ranges == []
+    assert result.raw_response["document"]["md_content"] == result.text
+
+
+def test_unreadable_pdf_is_sent_whole(server, make_client):
+    client = make_client(slice_pages=1)
+
+    with pytest.raises(DoclingServeError) as exc:
+        client.convert_pdf_no_ocr(b"%PDF-1.4 not really", "broken.pdf")
+
+    assert exc.value.status_code == 422
+    assert set(server.requests) == {"broken.pdf"}
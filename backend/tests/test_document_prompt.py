@@ -0,0 +1,113 @@
+# backend/tests/test_document_prompt.py
+"""Tests for the stored prompt-ready document text (utils/document_prompt.py).
+
+The session hook fills the prompt columns when a document is written or its
+text changes; ``load_prompt_text`` serves them to extraction and falls back
+to sanitizing at read time for documents the backfill has not reached yet.
+"""
+
+import hashlib
+
+from sqlalchemy import update
+
+DIRTY = "a\r\nb\tc\x00d"
+CLEAN = "a\n\nb    cd"
+
+
+def _document(session, project_id, text):
+    from backend.src import models
+
+    doc = models.Document(project_id=project_id, text=text, document_name="d.txt")
+    session.add(doc)
+    session.commit()
+    return doc
+
+
+def test_prompt_fields_store_text_only_when_sanitizing_changes_it():
+    from backend.src.utils.document_prompt import (
+        SANITIZER_VERSION,
+        prompt_fields,
+        prompt_ready_text,
+    )
+
+    dirty = prompt_fields(DIRTY)
+    assert dirty["prompt_text"] == CLEAN
+    assert dirty["prompt_text_version"] == SANITIZER_VERSION
+    assert dirty["prompt_text_sha256"] == hashlib.sha256(CLEAN.encode()).hexdigest()
+    assert dirty["prompt_token_estimate"] == 3
+
+    assert prompt_fields("clean text")["prompt_text"] is None
+    assert prompt_ready_text("clean text", None, SANITIZER_VERSION) == "clean text"
+    # An unknown version is sanitized again rather than trusted.
+    assert prompt_ready_text(DIRTY, "stale", None) == CLEAN
+
+
+def test_hook_fills_columns_on_insert_and_text_change(user_headers, make_project):
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.document_prompt import SANITIZER_VERSION, load_prompt_text
+
+    project_id = make_project(user_headers)["id"]
+    with SessionLocal() as session:
+        doc = _document(session, project_id, DIRTY)
+        assert doc.prompt_text == CLEAN
+        assert doc.prompt_text_version == SANITIZER_VERSION
+        assert load_prompt_text(session, doc.id) == CLEAN
+
+        doc.text = "now clean"
+        session.commit()
+        assert doc.prompt_text is None
+        assert load_prompt_text(session, doc.id) == "now clean"
+        sha = doc.prompt_text_sha256
+
+        # Other updates leave the prompt columns alone.
+        doc.document_name = "renamed.txt"
+        session.commit()
+        assert doc.prompt_text_sha256 == sha
+
+        assert load_prompt_text(session, -1) is None
+
+
+def test_backfill_fills_stale_rows_and_keeps_updated_at(user_headers, make_project):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.document_prompt import (
+        SANITIZER_VERSION,
+        backfill_prompt_text,
+        load_prompt_text,
+    )
+
+    project_id = make_project(user_headers)["id"]
+    with SessionLocal() as session:
+        ids = [_document(session, project_id, t).id for t in (DIRTY, "ok", DIRTY)]
+        # As written before the columns existed.
+        session.execute(
+            update(models.Document)
+            .where(models.Document.id.in_(ids))
+            .values(
+                prompt_text=None,
+                prompt_text_version=None,
+                prompt_token_estimate=None,
+                prompt_text_sha256=None,
+            )
+        )
+        session.commit()
+        before = {
+            d.id: d.updated_at
+            for d in session.query(models.Document).filter(models.Document.id.in_(ids))
+        }
+        # Read-time fallback until the backfill runs.
+        assert load_prompt_text(session, ids[0]) == CLEAN
+
+        assert backfill_prompt_text(session, batch_size=2, project_id=project_id) == 3
+        assert backfill_prompt_text(session, project_id=project_id) == 0
+
+        session.expire_all()
+        docs = (
+            session.query(models.Document)
+            .filter(models.Document.id.in_(ids))
+            .order_by(models.Document.id)
+            .all()
+        )
+        assert [d.prompt_text for d in docs] == [CLEAN, None, CLEAN]
+        assert {d.prompt_text_version for d in docs} == {SANITIZER_VERSION}
+        assert {d.id: d.updated_at for d in docs} == before
@@ -733,3 +733,72 @@ def test_cascade_delete_keeps_shared_document_sets(
         assert db.get(DocumentSet, solo_set_id) is None
     finally:
         db.close()
+
+
+def test_document_list_stats_cached_and_invalidated(
+    client, api_url, admin_headers, make_project, upload_file
+):
+    """The list's counts are served from the per-project stats cache until a
+    document changes; every mutation path below must invalidate it on commit."""
+    headers = admin_headers
+    pid = make_project(headers, name="StatsCacheProj")["id"]
+    file_ids = [
+        upload_file(headers, pid, content=f"text {i}".encode(), name=f"st{i}.txt")[
+            "id"
+        ]
+        for i in range(2)
+    ]
+    resp = client.post(
+        f"{api_url}/project/{pid}/preprocess",
+        headers=headers,
+        json={
+            "file_ids": file_ids,
+            "inline_config": {"name": "StatsCfg"},
+            "bypass_celery": True,
+        },
+    )
+    assert resp.status_code == 200
+
+    def _list(**params):
+        resp = client.get(
+            f"{api_url}/project/{pid}/document", headers=headers, params=params
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    first = _list()
+    assert first["total"] == 2
+    assert first["today_count"] == 2
+    assert first["stats_computed_at"]
+    # Unchanged project: the second poll is a cache hit.
+    assert _list()["stats_computed_at"] == first["stats_computed_at"]
+
+    # A search is counted live but still reports the (cached) buckets.
+    searched = _list(search="st0")
+    assert searched["total"] == 1
+    assert searched["today_count"] == 2
+
+    # Moving documents between sets changes the per-set counts.
+    doc_ids = [d["id"] for d in first["items"]]
+    set_id = client.post(
+        f"{api_url}/project/{pid}/document-set",
+        headers=headers,
+        json={"name": "StatsSet", "document_ids": doc_ids[:1]},
+    ).json()["id"]
+    assert _list(document_set_id=set_id)["total"] == 1
+    client.patch(
+        f"{api_url}/project/{pid}/document-set/{set_id}",
+        headers=headers,
+        json={"document_ids": doc_ids},
+    )
+    assert _list(document_set_id=set_id)["total"] == 2
+
+    # Deleting a document drops it from the cached totals immediately.
+    resp = client.delete(
+        f"{api_url}/project/{pid}/document/{doc_ids[0]}?cascade=true",
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    after = _list()
+    assert after["total"] == 1
+    assert after["today_count"] == 1
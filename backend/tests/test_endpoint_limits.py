@@ -0,0 +1,87 @@
+# backend/tests/test_endpoint_limits.py
+"""Tests for the per-endpoint LLM limits (utils/endpoint_limits.py).
+
+The buckets are tested in process (no Redis in the test environment); the
+Redis buckets run the same arithmetic in a Lua script.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def local_limits(monkeypatch):
+    """The in-process buckets and gate, starting empty."""
+    from ..src.utils import endpoint_limits, fair_scheduler
+
+    monkeypatch.setattr(endpoint_limits, "_shared_buckets", lambda: None)
+    monkeypatch.setattr(fair_scheduler, "_shared_gate", lambda: None)
+    monkeypatch.setattr(
+        endpoint_limits, "_local_buckets", endpoint_limits._LocalBuckets()
+    )
+    return endpoint_limits
+
+
+def test_overrides_by_endpoint_and_model(monkeypatch):
+    from ..src.core import config
+    from ..src.utils.endpoint_limits import EndpointLimits, endpoint_limits
+
+    live = config._get_settings()
+    monkeypatch.setattr(live, "LLM_ENDPOINT_RPM", 100)
+    monkeypatch.setattr(live, "LLM_ENDPOINT_MAX_CONCURRENCY", 8)
+    monkeypatch.setattr(
+        live,
+        "LLM_ENDPOINT_LIMITS",
+        json.dumps(
+            {
+                "http://VLLM:8000/v1/": {"max_in_flight": 48, "tpm": 1000},
+                "http://vllm:8000/v1|small": {"rpm": 5},
+            }
+        ),
+    )
+
+    assert endpoint_limits("http://vllm:8000/v1", "big") == EndpointLimits(
+        rpm=100, tpm=1000, max_in_flight=48
+    )
+    assert endpoint_limits("http://vllm:8000/v1", "small") == EndpointLimits(
+        rpm=5, tpm=0, max_in_flight=8
+    )
+    assert endpoint_limits("http://other/v1") == EndpointLimits(
+        rpm=100, max_in_flight=8
+    )
+
+    monkeypatch.setattr(live, "LLM_ENDPOINT_LIMITS", "not json")
+    assert endpoint_limits("http://vllm:8000/v1").max_in_flight == 8
+
+
+def test_request_and_token_buckets(local_limits):
+    from ..src.utils.endpoint_limits import EndpointLimits, adjust, take
+
+    rpm = EndpointLimits(rpm=2)
+    assert take("ep", rpm, 0) == take("ep", rpm, 0) == 0
+    # The third request within the minute waits about half a minute.
+    assert 29 < take("ep", rpm, 0) <= 30
+
+    tpm = EndpointLimits(tpm=600)
+    # A call larger than the budget still goes through on a positive
+    # balance, and the debt makes the next one wait.
+    assert take("big", tpm, 1000) == 0
+    assert take("big", tpm, 10) > 0
+    # The response reported fewer tokens than estimated: refund the rest.
+    adjust("big", tpm, -900)
+    assert take("big", tpm, 10) == 0
+
+
+def test_sync_slot_charges_reported_usage(local_limits, monkeypatch):
+    from types import SimpleNamespace
+
+    from ..src.core import config
+    from ..src.utils.fair_scheduler import llm_slot_sync
+
+    monkeypatch.setattr(config._get_settings(), "LLM_ENDPOINT_TPM", 100)
+    with llm_slot_sync("http://llm/v1", "ocr", model="v", tokens=10) as slot:
+        slot.record(SimpleNamespace(usage=SimpleNamespace(total_tokens=150)))
+    # 100 - 150: the endpoint is in debt until the bucket refills.
+    limits = slot.limits
+    assert local_limits.take(slot.endpoint, limits, 1) > 0
@@ -0,0 +1,65 @@
+# backend/tests/test_evaluation_export.py
+"""The streaming report writers in ``utils/evaluation_export.py``.
+
+The endpoint-level behaviour (sections, ordering, query counts) is covered in
+test_evaluations_api.py; these pin the writers themselves.
+"""
+
+import csv
+import io
+
+import openpyxl
+import pytest
+
+
+@pytest.fixture
+def export():
+    """Lazy import — app modules must not be imported at module scope."""
+    from backend.src.utils import evaluation_export
+
+    return evaluation_export
+
+
+def test_iter_csv_emits_bounded_chunks_and_neutralizes_formulas(export, monkeypatch):
+    monkeypatch.setattr(export, "_CSV_CHUNK_ROWS", 2)
+    rows = [["id", "value"]] + [[i, f"=cmd{i}"] for i in range(4)]
+
+    chunks = list(export.iter_csv(iter(rows)))
+
+    assert len(chunks) == 3  # 5 rows in chunks of 2
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert parsed[0] == ["id", "value"]
+    assert parsed[1] == ["0", "'=cmd0"]
+    assert len(parsed) == 5
+
+
+def test_write_xlsx_stores_values_as_text_not_formulas(export):
+    rows = iter(
+        [
+            ['=HYPERLINK("http://evil")', 1, None],
+            ["bad\x07char", True, {"a": [1, 2]}],
+        ]
+    )
+
+    workbook = export.write_xlsx([("Sheet A", ["text", "n", "other"], rows)])
+    size = export.file_size(workbook)
+    data = b"".join(export.iter_file(workbook))
+
+    assert workbook.closed
+    assert len(data) == size
+    sheet = openpyxl.load_workbook(io.BytesIO(data))["Sheet A"]
+    values = list(sheet.values)
+    assert values[0] == ("text", "n", "other")
+    assert values[1] == ('=HYPERLINK("http://evil")', 1, None)
+    assert sheet["A2"].data_type == "s"
+    assert values[2] == ("badchar", True, '{"a": [1, 2]}')
+
+
+def test_write_xlsx_without_sheets_is_still_a_workbook(export):
+    data = b"".join(export.iter_file(export.write_xlsx([])))
+    assert openpyxl.load_workbook(io.BytesIO(data)).sheetnames == ["Sheet"]
+
+
+def test_peek_rows_distinguishes_empty_sections(export):
+    assert export.peek_rows(iter([])) is None
+    assert list(export.peek_rows(iter([[1], [2]]))) == [[1], [2]]
@@ -0,0 +1,230 @@
+# backend/tests/test_evaluation_jobs.py
+"""The background batch-evaluation runner (utils/evaluation_jobs.py).
+
+The end-to-end path (endpoint → inline job → stored evaluations) is covered in
+test_evaluations_api.py. These tests replace the per-trial evaluation with a
+stub to pin the runner itself: deduplication, bounded parallelism, progress
+broadcasts, resume after redelivery, and final status.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Lazy import — app modules must not be imported at module scope."""
+    from backend.src.core import config
+    from backend.src.utils import evaluation_jobs
+
+    monkeypatch.setattr(config._get_settings(), "EVALUATION_JOB_CONCURRENCY", 2)
+    return evaluation_jobs
+
+
+@pytest.fixture
+def events(jobs, monkeypatch):
+    """Broadcast events, recorded instead of published."""
+    recorded = []
+    monkeypatch.setattr(
+        jobs,
+        "_broadcast_job_update",
+        lambda job, event="progress", trial=None: recorded.append(event),
+    )
+    return recorded
+
+
+@pytest.fixture
+def db():
+    from backend.src.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def target(db):
+    """A project and ground truth to attach jobs to: ``(project_id, gt_id)``."""
+    from sqlalchemy import select
+
+    from backend.src import models
+
+    owner_id = db.execute(
+        select(models.User.id).where(models.User.email == "admin@example.com")
+    ).scalar_one()
+    project = models.Project(name="Evaluation jobs", owner_id=owner_id)
+    db.add(project)
+    db.flush()
+    gt = models.GroundTruth(
+        project_id=project.id, name="gt", format="csv", file_uuid=uuid.uuid4().hex
+    )
+    db.add(gt)
+    db.commit()
+    return project.id, gt.id
+
+
+def _stub_outcome(trial_id, status="evaluated"):
+    return {
+        "trial_id": trial_id,
+        "status": status,
+        "evaluation_id": None if status == "failed" else 1000 + trial_id,
+        "error": "boom" if status == "failed" else None,
+    }
+
+
+def _load(job_id):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+
+    with SessionLocal() as session:
+        job = session.get(models.EvaluationJob, job_id)
+        session.expunge(job)
+        return job
+
+
+def test_identical_active_job_is_reused(jobs, events, db, target):
+    project_id, gt_id = target
+
+    first, created = jobs.create_job(
+        db, project_id=project_id, groundtruth_id=gt_id, trial_ids=[1, 2, 2]
+    )
+    again, created_again = jobs.create_job(
+        db, project_id=project_id, groundtruth_id=gt_id, trial_ids=[2, 1]
+    )
+    forced, created_forced = jobs.create_job(
+        db,
+        project_id=project_id,
+        groundtruth_id=gt_id,
+        trial_ids=[1, 2],
+        force_recalculate=True,
+    )
+
+    assert created and not created_again and created_forced
+    assert first.trial_ids == [1, 2]
+    assert again.id == first.id
+    assert forced.id != first.id
+    assert events == ["created", "created"]
+
+
+def test_run_job_bounds_parallelism_and_reports_each_trial(
+    jobs, events, db, target, monkeypatch
+):
+    from backend.src import models
+
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def evaluate(project_id, groundtruth_id, trial_id, force_recalculate):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return _stub_outcome(trial_id)
+
+    monkeypatch.setattr(jobs, "_evaluate_trial", evaluate)
+    project_id, gt_id = target
+    job, _ = jobs.create_job(
+        db, project_id=project_id, groundtruth_id=gt_id, trial_ids=list(range(1, 7))
+    )
+
+    jobs.run_job(job.id)
+
+    job = _load(job.id)
+    assert active["max"] == 2
+    assert job.status == models.EvaluationJobStatus.COMPLETED
+    assert sorted(r["trial_id"] for r in job.results) == [1, 2, 3, 4, 5, 6]
+    assert (job.trials_done, job.trials_failed) == (6, 0)
+    assert job.started_at is not None and job.finished_at is not None
+    assert events[:2] == ["created", "started"]
+    assert events.count("progress") == 6
+    assert events[-1] == "completed"
+
+
+def test_redelivered_job_skips_recorded_trials(jobs, events, db, target, monkeypatch):
+    from backend.src import models
+
+    seen = []
+
+    def evaluate(project_id, groundtruth_id, trial_id, force_recalculate):
+        seen.append(trial_id)
+        return _stub_outcome(trial_id)
+
+    monkeypatch.setattr(jobs, "_evaluate_trial", evaluate)
+    project_id, gt_id = target
+    job, _ = jobs.create_job(
+        db, project_id=project_id, groundtruth_id=gt_id, trial_ids=[1, 2, 3]
+    )
+    # A worker died after recording trial 2.
+    job.status = models.EvaluationJobStatus.PROCESSING
+    job.results = [_stub_outcome(2)]
+    job.trials_done = 1
+    db.commit()
+
+    jobs.run_job(job.id)
+    jobs.run_job(job.id)  # already terminal: a no-op
+
+    job = _load(job.id)
+    assert sorted(seen) == [1, 3]
+    assert job.status == models.EvaluationJobStatus.COMPLETED
+    assert sorted(r["trial_id"] for r in job.results) == [1, 2, 3]
+
+
+def test_job_fails_only_when_every_trial_failed(jobs, events, db, target, monkeypatch):
+    from backend.src import models
+
+    project_id, gt_id = target
+    monkeypatch.setattr(
+        jobs,
+        "_evaluate_trial",
+        lambda p, g, trial_id, f: _stub_outcome(
+            trial_id, "failed" if trial_id < 10 else "reused"
+        ),
+    )
+    all_failed, _ = jobs.create_job(
+        db, project_id=project_id, groundtruth_id=gt_id, trial_ids=[1, 2]
+    )
+    mixed, _ = jobs.create_job(
+        db, project_id=project_id, groundtruth_id=gt_id, trial_ids=[3, 10]
+    )
+
+    jobs.run_job(all_failed.id)
+    jobs.run_job(mixed.id)
+
+    all_failed, mixed = _load(all_failed.id), _load(mixed.id)
+    assert all_failed.status == models.EvaluationJobStatus.FAILED
+    assert all_failed.trials_failed == 2
+    assert mixed.status == models.EvaluationJobStatus.COMPLETED
+    assert (mixed.trials_done, mixed.trials_failed) == (2, 1)
+
+
+def test_completed_trial_queues_auto_evaluation(jobs, events, db, target, monkeypatch):
+    from backend.src import models
+
+    dispatched = []
+    monkeypatch.setattr(jobs, "dispatch_job", dispatched.append)
+    project_id, gt_id = target
+
+    def trial(trial_id, status, groundtruth_id):
+        return models.Trial(
+            id=trial_id,
+            project_id=project_id,
+            status=status,
+            advanced_options={"auto_evaluate_groundtruth_id": groundtruth_id},
+        )
+
+    jobs.queue_auto_evaluation(db, trial(501, models.TrialStatus.FAILED, gt_id))
+    jobs.queue_auto_evaluation(db, trial(502, models.TrialStatus.COMPLETED, 999999))
+    jobs.queue_auto_evaluation(db, trial(503, models.TrialStatus.COMPLETED, gt_id))
+
+    assert len(dispatched) == 1
+    job = _load(dispatched[0])
+    assert job.source == "auto"
+    assert job.trial_ids == [503]
+    assert job.groundtruth_id == gt_id
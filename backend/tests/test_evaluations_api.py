@@ -11,7 +11,12 @@ per test and the resulting ids are reused across many assertions. A couple of
 lightweight negative tests only need a bare project.
 """
 
+import csv
+import io
 import json
+import zipfile
+
+import openpyxl
 
 from .fake_llm import make_fake_openai
 from .test_evaluation_pipeline import (
@@ -147,6 +152,7 @@ def _build_evaluated_pipeline(client, api_url, headers, files_base_path):
     return {
         "project_id": project_id,
         "schema_id": schema_id,
+        "prompt_id": prompt_id,
         "trial_id": trial_id,
         "groundtruth_id": gt_id,
         "doc_ids": doc_ids,
@@ -338,7 +344,9 @@ def test_evaluations_api_endpoints(
     assert r.status_code == 404
 
     # --- BATCH ----------------------------------------------------------
-    # Cached (force_recalculate=False): should reuse the existing evaluation id.
+    # The batch endpoint queues an evaluation job; with Celery disabled (as in
+    # tests) the job runs before the response, which carries its outcome.
+    # Cached (force_recalculate=False): the existing evaluation is reused.
     r = client.post(
         f"{api_url}/project/{project_id}/evaluation/batch",
         headers=headers,
@@ -348,13 +356,32 @@ def test_evaluations_api_endpoints(
             "force_recalculate": False,
         },
     )
+    assert r.status_code == 202, r.text
+    job = r.json()
+    assert job["status"] == "completed"
+    assert job["trials_done"] == 1 and job["trials_failed"] == 0
+    assert job["results"] == [
+        {
+            "trial_id": trial_id,
+            "status": "reused",
+            "evaluation_id": eval1_id,
+            "error": None,
+        }
+    ]
+
+    # The job can be read back.
+    r = client.get(
+        f"{api_url}/project/{project_id}/evaluation/jobs/{job['id']}", headers=headers
+    )
     assert r.status_code == 200, r.text
-    batch = r.json()
-    assert isinstance(batch, list) and len(batch) == 1
-    assert batch[0]["id"] == eval1_id
-    assert batch[0]["trial_id"] == trial_id
+    assert r.json()["results"] == job["results"]
+    r = client.get(
+        f"{api_url}/project/{project_id}/evaluation/jobs/999999", headers=headers
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"]["code"] == "evaluations.job_not_found"
 
-    # force_recalculate=True: deletes the cached row and returns a *fresh* eval.
+    # force_recalculate=True: deletes the cached row and creates a *fresh* eval.
     r = client.post(
         f"{api_url}/project/{project_id}/evaluation/batch",
         headers=headers,
@@ -364,19 +391,22 @@ def test_evaluations_api_endpoints(
             "force_recalculate": True,
         },
     )
-    assert r.status_code == 200, r.text
-    fresh = r.json()[0]
-    assert fresh["id"] != eval1_id
-    assert fresh["trial_id"] == trial_id
-    eval1_id = fresh["id"]  # eval1_id was deleted by the recalculation
+    assert r.status_code == 202, r.text
+    outcome = r.json()["results"][0]
+    assert outcome["status"] == "evaluated"
+    assert outcome["evaluation_id"] != eval1_id
+    eval1_id = outcome["evaluation_id"]  # eval1_id was deleted by the recalculation
 
-    # Batch with an unknown trial only → all failed → 400.
+    # Batch with an unknown trial only → the job fails.
     r = client.post(
         f"{api_url}/project/{project_id}/evaluation/batch",
         headers=headers,
         json={"trial_ids": [999999], "groundtruth_id": gt_id},
     )
-    assert r.status_code == 400
+    assert r.status_code == 202, r.text
+    job = r.json()
+    assert job["status"] == "failed"
+    assert job["results"][0]["error"] == "Trial 999999 not found"
 
     # Batch with an unknown ground truth → 404.
     r = client.post(
@@ -675,3 +705,134 @@ def test_download_unknown_evaluation_ids(client, api_url, admin_headers, make_pr
         params={"evaluation_ids": ["abc"], "format": "csv"},
     )
     assert r.status_code == 400
+
+
+def _count_statements(fn):
+    """Run ``fn`` and return how many SQL statements the app engine executed."""
+    from sqlalchemy import event
+
+    from backend.src.db.session import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_compare_and_download_query_count_is_independent_of_evaluation_count(
+    client, api_url, files_base_path, admin_headers, monkeypatch
+):
+    """Comparing or exporting three evaluations issues exactly as many queries
+    as one: evaluations, trials, ground truths, metric rows and aggregates are
+    loaded in batches, never per evaluation."""
+    monkeypatch.setattr(
+        "backend.src.utils.info_extraction.OpenAI",
+        make_fake_openai(
+            completion_hook=_gt_completion_hook(files_base_path / _GT_NAME)
+        ),
+    )
+    headers = admin_headers
+    ctx = _build_evaluated_pipeline(client, api_url, headers, files_base_path)
+    project_id = ctx["project_id"]
+
+    trial_ids = [ctx["trial_id"]]
+    for _ in range(2):
+        trial_ids.append(
+            client.post(
+                f"{api_url}/project/{project_id}/trial",
+                headers=headers,
+                json={
+                    "schema_id": ctx["schema_id"],
+                    "prompt_id": ctx["prompt_id"],
+                    "document_ids": ctx["doc_ids"],
+                    "bypass_celery": True,
+                    **_LLM_CREDS,
+                },
+            ).json()["id"]
+        )
+    r = client.post(
+        f"{api_url}/project/{project_id}/evaluation/batch",
+        headers=headers,
+        json={"trial_ids": trial_ids[1:], "groundtruth_id": ctx["groundtruth_id"]},
+    )
+    assert r.status_code == 202, r.text
+    eval_ids = [ctx["evaluation"]["id"]] + sorted(
+        o["evaluation_id"] for o in r.json()["results"]
+    )
+    assert len(eval_ids) == 3
+
+    def compare(ids):
+        r = client.get(
+            f"{api_url}/project/{project_id}/evaluation/compare",
+            headers=headers,
+            params={"evaluation_ids": ids},
+        )
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    def download(ids, fmt):
+        r = client.get(
+            f"{api_url}/project/{project_id}/evaluations/download",
+            headers=headers,
+            params={
+                "evaluation_ids": ids,
+                "format": fmt,
+                "include_field_details": True,
+                "include_errors": True,
+                "include_document_content": True,
+                "include_ground_truth_content": True,
+            },
+        )
+        assert r.status_code == 200, r.text
+        return r.content
+
+    single = _count_statements(lambda: compare(eval_ids[:1]))
+    assert _count_statements(lambda: compare(eval_ids)) == single
+    for fmt in ("csv", "xlsx", "zip"):
+        single = _count_statements(lambda: download(eval_ids[:1], fmt))
+        assert _count_statements(lambda: download(eval_ids, fmt)) == single, fmt
+
+    # The SQL aggregates agree with the stored per-field metrics, and the
+    # response keeps the requested order.
+    comparison = compare(list(reversed(eval_ids)))
+    assert [e["id"] for e in comparison["evaluations"]] == list(reversed(eval_ids))
+    stored = client.get(
+        f"{api_url}/project/{project_id}/evaluation/{eval_ids[0]}", headers=headers
+    ).json()["fields"]
+    assert set(comparison["field_comparison"]) == set(stored)
+    for field, entries in comparison["field_comparison"].items():
+        entry = next(e for e in entries if e["evaluation_id"] == eval_ids[0])
+        assert entry["total_count"] == stored[field]["total_count"]
+        assert entry["correct_count"] == stored[field]["correct_count"]
+        assert entry["accuracy"] == stored[field]["accuracy"]
+    summary = next(e for e in comparison["evaluations"] if e["id"] == eval_ids[0])
+    assert summary["documents_evaluated"] == len(ctx["doc_ids"])
+
+    # Streamed exports: field-by-field details follow the requested order in
+    # every format, with one row per stored metric.
+    order = list(reversed(eval_ids))
+    per_eval = sum(stored[f]["total_count"] for f in stored)
+    csv_rows = list(csv.reader(io.StringIO(download(order, "csv").decode("utf-8"))))
+    start = csv_rows.index(["Field-by-Field Details"]) + 2
+    end = csv_rows.index([], start)
+    detail_ids = [int(row[0]) for row in csv_rows[start:end]]
+    assert detail_ids == sorted(detail_ids, key=order.index)
+    assert len(detail_ids) == per_eval * len(eval_ids)
+
+    workbook = openpyxl.load_workbook(io.BytesIO(download(order, "xlsx")))
+    sheet = list(workbook["Field Details"].values)
+    assert sheet[0][:3] == ("Evaluation ID", "Document ID", "Field Name")
+    assert [row[0] for row in sheet[1:]] == detail_ids
+
+    with zipfile.ZipFile(io.BytesIO(download(order, "zip"))) as archive:
+        member = archive.read("field_details.csv").decode("utf-8")
+    assert [int(row[0]) for row in list(csv.reader(io.StringIO(member)))[1:]] == (
+        detail_ids
+    )
@@ -0,0 +1,160 @@
+# backend/tests/test_fair_scheduler.py
+"""Tests for the fair trial scheduler (utils/fair_scheduler.py).
+
+The endpoint gate is tested in process (no Redis in the test environment);
+the Redis gate runs the same ordering in a Lua script.
+"""
+
+import asyncio
+
+
+def test_shard_windows_are_weighted_and_work_conserving():
+    from ..src.utils.fair_scheduler import shard_windows
+
+    assert shard_windows({1: (1.0, 100), 2: (1.0, 100)}, 16) == {1: 8, 2: 8}
+    assert shard_windows({1: (3.0, 100), 2: (1.0, 100)}, 16) == {1: 12, 2: 4}
+    # A small trial leaves what it cannot use to the others.
+    assert shard_windows({1: (1.0, 100), 2: (1.0, 2)}, 16) == {1: 14, 2: 2}
+    # More trials than slots: every trial still gets one.
+    assert shard_windows({1: (1.0, 5), 2: (1.0, 5), 3: (1.0, 5)}, 2) == {
+        1: 1,
+        2: 1,
+        3: 1,
+    }
+    assert shard_windows({1: (1.0, 0)}, 4) == {}
+
+
+def test_local_gate_lets_a_new_trial_go_before_a_backlog():
+    from ..src.utils.fair_scheduler import _LocalGate
+
+    gate = _LocalGate()
+    assert gate.try_acquire("ep", 1, "1:a", 1, 1.0)
+    # Trial 1 has a backlog of three calls when trial 2 shows up with one.
+    for ticket in ("1:b", "1:c", "1:d", "2:a"):
+        assert not gate.try_acquire("ep", 1, ticket, int(ticket[0]), 1.0)
+
+    order = []
+    held = "1:a"
+    for _ in range(4):
+        gate.release("ep", held)
+        held = next(
+            t
+            for t in ("1:b", "1:c", "1:d", "2:a")
+            if t not in order and gate.try_acquire("ep", 1, t, int(t[0]), 1.0)
+        )
+        order.append(held)
+    assert order == ["2:a", "1:b", "1:c", "1:d"]
+
+
+def test_llm_slot_caps_concurrent_calls_per_endpoint(monkeypatch):
+    from ..src.core import config
+    from ..src.utils import endpoint_limits, fair_scheduler
+
+    monkeypatch.setattr(config._get_settings(), "LLM_ENDPOINT_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(fair_scheduler, "_shared_gate", lambda: None)
+    monkeypatch.setattr(endpoint_limits, "_shared_buckets", lambda: None)
+    running, peak, seen = 0, 0, []
+
+    async def call(trial_id):
+        nonlocal running, peak
+        async with fair_scheduler.llm_slot(
+            "http://llm:8000/v1", trial_id, 1.0, model="m"
+        ):
+            running += 1
+            peak = max(peak, running)
+            snapshot = fair_scheduler.gate_snapshot()
+            seen.append(snapshot[0]["in_flight"])
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def main():
+        await asyncio.gather(*(call(t) for t in (1, 1, 1, 2, 2)))
+        # Another model on the same server has its own slots.
+        async with fair_scheduler.llm_slot("http://llm:8000/v1", 3, model="n"):
+            pass
+
+    asyncio.run(main())
+    assert peak == 2
+    assert max(seen) == 2
+    assert fair_scheduler.gate_snapshot() == []
+
+
+def test_cancelled_waiter_does_not_leak_a_slot_granted_after_release(monkeypatch):
+    import threading
+
+    from ..src.core import config
+    from ..src.utils import endpoint_limits, fair_scheduler
+
+    monkeypatch.setattr(config._get_settings(), "LLM_ENDPOINT_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(fair_scheduler, "_shared_gate", lambda: None)
+    monkeypatch.setattr(endpoint_limits, "_shared_buckets", lambda: None)
+    gate = fair_scheduler._LocalGate()
+    monkeypatch.setattr(fair_scheduler, "_local_gate", gate)
+    entered, proceed, done = threading.Event(), threading.Event(), threading.Event()
+    acquire = gate.try_acquire
+
+    def slow_acquire(*args):
+        entered.set()
+        proceed.wait(5)
+        try:
+            return acquire(*args)
+        finally:
+            done.set()
+
+    monkeypatch.setattr(gate, "try_acquire", slow_acquire)
+
+    async def call():
+        async with fair_scheduler.llm_slot("http://llm:8000/v1", 1, model="m"):
+            pass
+
+    async def main():
+        task = asyncio.create_task(call())
+        await asyncio.to_thread(entered.wait, 5)
+        # Cancelled (e.g. by the trial's cancellation watcher) mid-attempt;
+        # the attempt then takes the free slot after the release.
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        proceed.set()
+        await asyncio.to_thread(done.wait, 5)
+
+    asyncio.run(main())
+    assert done.is_set()
+    # Nothing holds or waits for the endpoint's one slot.
+    assert all(
+        not state["in_flight"] and not state["waiting"]
+        for state in gate.snapshot().values()
+    )
+
+
+def test_admin_sets_weights_and_reads_shares(
+    client, api_url, admin_headers, user_headers, make_project
+):
+    project_id = make_project(user_headers)["id"]
+    url = f"{api_url}/admin/scheduler"
+
+    resp = client.put(
+        f"{url}/weights", headers=admin_headers, json={"projects": {project_id: 4}}
+    )
+    assert resp.status_code == 200, resp.text
+    # Other tests may leave weights on their own projects.
+    assert resp.json()["projects"][str(project_id)] == 4.0
+
+    assert (
+        client.put(
+            f"{url}/weights", headers=admin_headers, json={"users": {"1": 0}}
+        ).status_code
+        == 422
+    )
+    assert (
+        client.put(
+            f"{url}/weights", headers=admin_headers, json={"projects": {"999999": 2}}
+        ).status_code
+        == 404
+    )
+    assert client.get(url, headers=user_headers).status_code == 403
+
+    status = client.get(url, headers=admin_headers).json()
+    assert status["weights"]["projects"][str(project_id)] == 4.0
+    assert {"shard_slots", "endpoint_max_concurrency", "trials", "endpoints"} <= set(
+        status
+    )
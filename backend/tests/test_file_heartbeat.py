@@ -0,0 +1,168 @@
+# backend/tests/test_file_heartbeat.py
+"""The per-process file heartbeat (utils/file_heartbeat.py) and the
+once-per-chunk conflict screen (``find_conflicting_file_tasks``)."""
+
+import threading
+import types
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def file_tasks(user_headers, make_project, upload_file):
+    """``make(configs)`` -> file task ids, one task per configuration index.
+
+    Every task covers the same uploaded file; equal indices share a
+    configuration.
+    """
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+
+    project = make_project(user_headers, name="Heartbeat")
+    upload = upload_file(user_headers, project["id"], content=b"x", name="a.txt")
+
+    def make(configs: list[int]) -> list[int]:
+        ids = []
+        with SessionLocal() as db:
+            cfgs = {}
+            for index in configs:
+                if index not in cfgs:
+                    cfgs[index] = models.PreprocessingConfiguration(
+                        project_id=project["id"], name=f"cfg {index}"
+                    )
+                    db.add(cfgs[index])
+                    db.flush()
+                task = models.PreprocessingTask(
+                    project_id=project["id"],
+                    configuration_id=cfgs[index].id,
+                    total_files=1,
+                )
+                db.add(task)
+                db.flush()
+                ft = models.FilePreprocessingTask(
+                    preprocessing_task_id=task.id, file_id=upload["id"]
+                )
+                db.add(ft)
+                db.flush()
+                ids.append(ft.id)
+            db.commit()
+        return ids
+
+    return make
+
+
+def _statements(fn, kind: str) -> list[str]:
+    """The ``kind`` (``"UPDATE"``, ``"SELECT"``) statements ``fn()`` ran."""
+    from backend.src.db.session import engine
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith(kind):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def test_one_update_bumps_every_file_in_flight(file_tasks):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils import file_heartbeat
+
+    ids = file_tasks([0, 1, 2])
+    with file_heartbeat.beating(ids[0]), file_heartbeat.beating(ids[1]):
+        with file_heartbeat.beating(ids[1]):
+            pass  # nested registration of the same id keeps it alive
+        assert file_heartbeat._service.active_ids() == ids[:2]
+        statements = _statements(file_heartbeat._service.tick, "UPDATE")
+    assert file_heartbeat._service.active_ids() == []
+
+    assert len(statements) == 1
+    with SessionLocal() as db:
+        beats = {
+            ft_id: db.get(models.FilePreprocessingTask, ft_id).last_heartbeat_at
+            for ft_id in ids
+        }
+    assert beats[ids[0]] and beats[ids[1]] and beats[ids[2]] is None
+
+
+def test_a_running_file_is_registered_until_it_returns():
+    from backend.src.utils import file_heartbeat
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    pipeline = PreprocessingPipeline.__new__(PreprocessingPipeline)
+    pipeline._timeout_abort = False
+    file = types.SimpleNamespace(file_name="a.txt")
+    file_task = types.SimpleNamespace(id=987654)
+    seen = []
+    release = threading.Event()
+
+    def run(_file, _file_task):
+        release.wait(5)
+        return ["doc"]
+
+    waiter = threading.Thread(
+        target=lambda: seen.append(
+            pipeline._process_with_timeout(run, file, file_task, timeout_seconds=10)
+        )
+    )
+    waiter.start()
+    try:
+        for _ in range(100):
+            if 987654 in file_heartbeat._service.active_ids():
+                break
+            threading.Event().wait(0.01)
+        assert 987654 in file_heartbeat._service.active_ids()
+    finally:
+        release.set()
+        waiter.join()
+    assert seen == [["doc"]]
+    assert 987654 not in file_heartbeat._service.active_ids()
+
+
+def test_conflicts_are_found_for_a_whole_chunk_in_one_query(file_tasks):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.preprocessing import find_conflicting_file_tasks
+
+    same_a, same_b, other = file_tasks([0, 0, 1])
+    with SessionLocal() as db:
+        config_id = db.get(
+            models.FilePreprocessingTask, same_a
+        ).preprocessing_task.configuration_id
+        conflicts = {}
+        queries = _statements(
+            lambda: conflicts.update(
+                find_conflicting_file_tasks(db, config_id, [same_a, same_b])
+            ),
+            "SELECT",
+        )
+
+    assert conflicts == {same_a: same_b, same_b: same_a}
+    assert other not in conflicts
+    assert len(queries) == 1
+
+
+def test_the_second_of_two_overlapping_runs_still_processes(file_tasks):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    first, second = file_tasks([0, 0])
+    outcome = {}
+    for ft_id in (first, second):
+        with SessionLocal() as db:
+            task_id = db.get(models.FilePreprocessingTask, ft_id).preprocessing_task_id
+            PreprocessingPipeline(db, task_id).process()
+        with SessionLocal() as db:
+            outcome[ft_id] = db.get(models.FilePreprocessingTask, ft_id)
+
+    assert outcome[first].status == models.PreprocessingStatus.CANCELLED
+    assert "already being processed" in outcome[first].error_message
+    assert outcome[second].status == models.PreprocessingStatus.COMPLETED
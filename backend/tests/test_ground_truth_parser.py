@@ -3,7 +3,9 @@
 No DB, no network — the parser works on in-memory ``bytes``. These tests cover
 every ``parse`` dispatch branch (json / csv / xlsx / zip / unsupported) plus the
 row-collection edge cases (missing IDs, duplicates, dot-notation nesting,
-multi-sheet merge, auto ID-column resolution) and the error paths.
+multi-sheet merge, auto ID-column resolution) and the error paths. The
+streaming section checks that reading CSV/XLSX in small row blocks gives the
+same documents as one whole-file read.
 
 CSV parsing reads ``settings.CSV_ENCODING_FALLBACK_CHAIN`` at call time, so the
 parser is imported lazily inside a helper (matching the sibling evaluation
@@ -320,3 +322,88 @@ def test_excel_real_fixture_file():
     assert len(result) == 8
     assert "9874562.pdf" in result
     assert result["9874562.pdf"]["location"] == "main"
+
+
+# ─── streaming ──────────────────────────────────────────────────────────────
+
+
+def _parse_in_blocks(monkeypatch, content, fmt, id_column=None, rows=2):
+    from ..src.core import config
+
+    monkeypatch.setattr(config._get_settings(), "GROUND_TRUTH_PARSE_CHUNK_ROWS", rows)
+    return list(_parser().iter_documents(io.BytesIO(content), fmt, id_column))
+
+
+# Column types only settle across blocks: "n" is whole in the first block and
+# fractional later, "mixed" turns from numbers to text, "late" is empty at
+# first, "flag" is boolean with a blank.
+TYPED = pd.DataFrame(
+    {
+        "id": ["d1", "d2", "d3", "d4", "d5"],
+        "n": [1, 2, 3.5, None, 4],
+        "mixed": [1, 2, "x", None, 3],
+        "late": [None, None, None, "v", None],
+        "flag": [True, False, None, True, True],
+        "a.b": [1, None, 2, None, 3],
+    }
+)
+
+
+@pytest.mark.parametrize("rows", [1, 2, 3])
+def test_csv_in_blocks_matches_whole_file(monkeypatch, rows):
+    content = TYPED.to_csv(index=False).encode()
+    expected = _parser().parse(content, "csv", id_column="id")
+
+    documents = _parse_in_blocks(monkeypatch, content, "csv", "id", rows)
+
+    assert documents == list(expected.items())
+    assert expected["d3"] == {"n": 3.5, "mixed": "x", "a": {"b": 2}}
+    assert expected["d1"]["n"] == 1.0 and expected["d1"]["mixed"] == "1"
+
+
+def test_csv_in_blocks_keeps_row_index_ids_and_duplicate_headers(monkeypatch):
+    content = b"v,v,w\n1,2.5,a\n,3,\n4,x,b\n"
+    expected = _parser().parse(content, "csv")
+
+    assert _parse_in_blocks(monkeypatch, content, "csv", rows=1) == list(
+        expected.items()
+    )
+    assert list(expected) == ["0", "1", "2"]
+
+
+def test_csv_in_blocks_reports_duplicates_across_blocks(monkeypatch):
+    content = b"id,v\nD1,1\nD2,2\nD1,3\n"
+    with pytest.raises(ValueError, match="Duplicate IDs"):
+        _parse_in_blocks(monkeypatch, content, "csv", "id", rows=1)
+
+
+@pytest.mark.parametrize("rows", [1, 2, 10000])
+def test_excel_in_blocks_matches_whole_file(monkeypatch, rows):
+    content = _xlsx_bytes(
+        {
+            "s1": TYPED,
+            "s2": pd.DataFrame({"id": ["d5", "d9"], "extra.x": [None, 7.5]}),
+        }
+    )
+    expected = _parser().parse(content, "xlsx", id_column="id")
+
+    documents = _parse_in_blocks(monkeypatch, content, "xlsx", "id", rows)
+
+    assert documents == list(expected.items())
+    # A boolean column with a blank reads as 0/1, as pandas does.
+    assert expected["d1"]["flag"] == 1
+    # d5 merged across sheets; d9 only on the second one.
+    assert list(expected) == ["d1", "d2", "d3", "d4", "d5", "d9"]
+    assert expected["d9"] == {"extra": {"x": 7.5}}
+
+
+def test_zip_duplicate_id_keeps_last_member_at_first_position():
+    content = _zip_bytes(
+        {
+            "a.json": json.dumps({"id": "X", "v": 1}),
+            "b.json": json.dumps({"id": "Y", "v": 2}),
+            "c.json": json.dumps({"id": "X", "v": 3}),
+        }
+    )
+    documents = list(_parser().iter_documents(io.BytesIO(content), "zip"))
+    assert documents == [("X", {"id": "X", "v": 3}), ("Y", {"id": "Y", "v": 2})]
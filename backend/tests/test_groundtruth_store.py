@@ -0,0 +1,282 @@
+# backend/tests/test_groundtruth_store.py
+"""Tests for the columnar ground truth store (utils/groundtruth_store.py).
+
+Unit tests round-trip rows through the writer and reader; the API tests check
+that the artifact is built at upload / ID-column change, migrated from a
+legacy ``data_cache`` blob by the backfill, and removed with its ground truth.
+"""
+
+import io
+import json
+import os
+import uuid
+
+import pytest
+
+ROWS = {
+    "Doc1.pdf": {"name": "Ann", "age": 41, "note": None},
+    "doc2.pdf": {"name": "Bő", "labs": {"hb": 12.5, "list": [1, "x"]}},
+    "DOC1.PDF": {"age": "n/a"},
+    "3": {},
+}
+
+
+def _store(rows=ROWS):
+    from ..src.utils.groundtruth_store import GroundTruthStore, GroundTruthStoreWriter
+
+    writer = GroundTruthStoreWriter()
+    for key, row in rows.items():
+        writer.add(key, row)
+    buffer = io.BytesIO()
+    manifest = writer.finish(buffer)
+    return GroundTruthStore(buffer.getvalue()), manifest
+
+
+def test_round_trip_keeps_rows_absent_cells_and_order():
+    store, manifest = _store()
+
+    assert manifest["rows"] == 4
+    assert store.columns == ["name", "age", "note", "labs"]
+    assert store.keys == list(ROWS)
+    rows = store.rows()
+    assert rows == ROWS
+    assert list(rows) == list(ROWS)
+    # null stays null; a missing column stays missing.
+    assert "note" in rows["Doc1.pdf"] and "note" not in rows["doc2.pdf"]
+    assert store.head(2) == dict(list(ROWS.items())[:2])
+
+
+def test_column_and_key_subsets():
+    store, _ = _store()
+
+    rows = store.rows(columns=["age"], keys=["DOC1.PDF", "3", "missing"])
+    assert rows == {"DOC1.PDF": {"age": "n/a"}, "3": {}}
+    # Row nesting is judged on the whole row, not the loaded columns.
+    assert store.rows(columns=["name"]).nested_keys == {"doc2.pdf"}
+    # Last spelling wins per lowercase key, like {str(k).lower(): k}.
+    assert dict(store.keys_lower) == {
+        "doc1.pdf": "DOC1.PDF",
+        "doc2.pdf": "doc2.pdf",
+        "3": "3",
+    }
+    assert 3 not in store.keys_lower
+
+
+def test_duplicate_key_is_rejected():
+    from ..src.utils.groundtruth_store import GroundTruthStoreWriter
+
+    writer = GroundTruthStoreWriter()
+    writer.add("a", {})
+    with pytest.raises(ValueError):
+        writer.add("a", {})
+
+
+def test_wide_rows_are_written_in_batches(monkeypatch):
+    from ..src.utils import groundtruth_store
+
+    # Flush after every row; one file per column would need 3000 open files.
+    monkeypatch.setattr(groundtruth_store, "_WRITE_BUFFER_BYTES", 1)
+    rows = {
+        f"doc{i}": {f"c{j}": i * j for j in range(3000) if (i + j) % 3}
+        for i in range(4)
+    }
+    store, manifest = _store(rows)
+    with store:
+        assert len(manifest["columns"]) == 3000
+        assert store.rows() == rows
+        assert store.rows(columns=["c1"], keys=["doc3"]) == {"doc3": {"c1": 3}}
+
+
+def test_engine_pairs_from_mapped_columns_match_full_rows():
+    from ..src.utils.evaluation import EvaluationEngine, _mapped_gt_columns
+
+    engine = EvaluationEngine.__new__(EvaluationEngine)
+    store, _ = _store()
+    mappings = {
+        "name": {
+            "gt_field": "name",
+            "type": "string",
+            "method": "exact",
+            "options": {},
+        },
+        "labs.hb": {
+            "gt_field": "labs.hb",
+            "type": "number",
+            "method": "numeric",
+            "options": {},
+        },
+        "labs.list": {
+            "gt_field": "labs.list[]",
+            "type": "string",
+            "method": "exact",
+            "options": {},
+        },
+    }
+    assert _mapped_gt_columns(mappings) == {"name", "labs", "labs.hb", "labs.list[]"}
+    subset = store.rows(columns=_mapped_gt_columns(mappings))
+    payload = {
+        "document_id": 7,
+        "prediction": {"name": "Bő", "labs": {"hb": 12, "list": [1]}},
+    }
+    documents = {7: {"exists": True, "document_name": "doc2.pdf"}}
+
+    assert engine._document_field_pairs(
+        payload, subset, mappings, documents
+    ) == engine._document_field_pairs(payload, ROWS, mappings, documents)
+
+
+# --------------------------------------------------------------------------- #
+# Lifecycle through the API
+# --------------------------------------------------------------------------- #
+def _gt_url(api_url, project_id, suffix=""):
+    return f"{api_url}/project/{project_id}/groundtruth{suffix}"
+
+
+def _ground_truth(gt_id):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+
+    with SessionLocal() as session:
+        gt = session.get(models.GroundTruth, gt_id)
+        session.expunge(gt)
+        return gt
+
+
+def _stored(file_uuid):
+    local_dir = os.environ.get("LOCAL_DIRECTORY")
+    return os.path.exists(os.path.join(local_dir, file_uuid)) if local_dir else None
+
+
+def test_store_follows_upload_id_column_and_delete(
+    client, api_url, user_headers, make_project, files_base_path
+):
+    project_id = make_project(user_headers)["id"]
+    with open(files_base_path / "reports_with_groundtruth.csv", "rb") as f:
+        gt_id = client.post(
+            _gt_url(api_url, project_id),
+            headers=user_headers,
+            files={"file": ("gt.csv", f, "text/csv")},
+            data={"format": "csv"},
+        ).json()["id"]
+
+    resp = client.put(
+        _gt_url(api_url, project_id, f"/{gt_id}/id-column"),
+        headers=user_headers,
+        json={"id_column": "id"},
+    )
+    assert resp.status_code == 200, resp.text
+    gt = _ground_truth(gt_id)
+    manifest = gt.store_manifest
+    assert manifest["id_column"] == "id"
+    assert manifest["source_uuid"] == gt.file_uuid
+    assert "cough" in manifest["columns"] and manifest["rows"] > 0
+    assert gt.data_cache is None
+    assert _stored(manifest["file_uuid"]) is not False
+
+    # A new ID column rebuilds the store and drops the old artifact.
+    client.put(
+        _gt_url(api_url, project_id, f"/{gt_id}/id-column"),
+        headers=user_headers,
+        json={"id_column": "report"},
+    )
+    rebuilt = _ground_truth(gt_id).store_manifest
+    assert rebuilt["id_column"] == "report"
+    assert rebuilt["file_uuid"] != manifest["file_uuid"]
+    assert _stored(manifest["file_uuid"]) is not True
+
+    resp = client.delete(
+        _gt_url(api_url, project_id, f"/{gt_id}"), headers=user_headers
+    )
+    assert resp.status_code == 200, resp.text
+    assert _stored(rebuilt["file_uuid"]) is not True
+
+
+def _upload_with_store(client, api_url, headers, project_id, files_base_path):
+    """Upload a CSV ground truth and build its store; return the artifact."""
+    with open(files_base_path / "reports_with_groundtruth.csv", "rb") as f:
+        gt_id = client.post(
+            _gt_url(api_url, project_id),
+            headers=headers,
+            files={"file": ("gt.csv", f, "text/csv")},
+            data={"format": "csv"},
+        ).json()["id"]
+    resp = client.put(
+        _gt_url(api_url, project_id, f"/{gt_id}/id-column"),
+        headers=headers,
+        json={"id_column": "id"},
+    )
+    assert resp.status_code == 200, resp.text
+    store_uuid = _ground_truth(gt_id).store_manifest["file_uuid"]
+    assert _stored(store_uuid) is not False
+    return store_uuid
+
+
+def test_store_is_removed_with_its_project_and_owner(
+    client, api_url, login, admin_headers, user_headers, make_project, files_base_path
+):
+    from backend.src.utils.enums import UserRole
+
+    from .helpers import restore_user
+
+    project_id = make_project(user_headers)["id"]
+    store_uuid = _upload_with_store(
+        client, api_url, user_headers, project_id, files_base_path
+    )
+    resp = client.delete(f"{api_url}/project/{project_id}", headers=user_headers)
+    assert resp.status_code == 200, resp.text
+    assert _stored(store_uuid) is not True
+
+    email, password = f"gt-owner-{uuid.uuid4().hex[:8]}@example.com", "Gtowner1pass"
+    restore_user(email, password, UserRole.user)
+    owner_headers = login(email, password)
+    project_id = make_project(owner_headers)["id"]
+    store_uuid = _upload_with_store(
+        client, api_url, owner_headers, project_id, files_base_path
+    )
+    user_id = client.get(f"{api_url}/user/me", headers=owner_headers).json()["id"]
+    resp = client.delete(f"{api_url}/user/{user_id}", headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+    assert _stored(store_uuid) is not True
+
+
+def test_legacy_data_cache_is_read_then_converted_by_the_backfill(
+    client, api_url, user_headers, make_project
+):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.groundtruth_store import (
+        backfill_ground_truth_stores,
+        load_ground_truth_store,
+    )
+
+    project_id = make_project(user_headers)["id"]
+    legacy = {"a.pdf": {"x": 1}, "b.pdf": {"x": None, "y": {"z": "w"}}}
+    with SessionLocal() as session:
+        # The source file is never read: the cached parse is converted.
+        gt = models.GroundTruth(
+            project_id=project_id,
+            name="legacy",
+            format="json",
+            file_uuid=uuid.uuid4().hex,
+            data_cache=json.loads(json.dumps(legacy)),
+        )
+        session.add(gt)
+        session.commit()
+
+        # Reads never write: the row keeps its blob.
+        with load_ground_truth_store(session, gt) as store:
+            assert store.rows() == legacy
+        assert not session.dirty
+        session.refresh(gt)
+        assert gt.data_cache == legacy and not gt.store_manifest
+
+        assert backfill_ground_truth_stores(session, project_id=project_id) == (1, 0)
+        gt = session.get(models.GroundTruth, gt.id)
+        assert gt.data_cache is None and gt.store_manifest["rows"] == 2
+        assert _stored(gt.store_manifest["file_uuid"]) is not False
+        # Later reads open the artifact.
+        with load_ground_truth_store(session, gt) as store:
+            assert store.rows(columns=["x"]) == {
+                "a.pdf": {"x": 1},
+                "b.pdf": {"x": None},
+            }
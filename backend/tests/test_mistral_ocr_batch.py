@@ -0,0 +1,296 @@
+# backend/tests/test_mistral_ocr_batch.py
+"""The shared Mistral client and batch OCR in ``services/mistral_ocr_service.py``.
+
+Unlike test_mistral_ocr_service.py, these run the real Mistral SDK against a
+local fake of the API (an ``httpx.MockTransport``), so request shapes and
+response parsing are the SDK's own. The fake "OCRs" a document by splitting
+its text on form feeds into pages (binary files become one stand-in page); a
+document containing ``FAIL`` is reported in the batch job's error file.
+"""
+
+import email.parser
+import email.policy
+import itertools
+import json
+
+import httpx
+import pytest
+from mistralai.client import Mistral
+
+from backend.src.services import mistral_ocr_service as mod
+from backend.src.services.mistral_ocr_service import (
+    MistralOCRError,
+    MistralOCRResult,
+    MistralOCRService,
+)
+
+
+class FakeMistralAPI:
+    def __init__(self, polls_until_done: int = 2):
+        self.polls_until_done = polls_until_done
+        self.files: dict[str, bytes] = {}
+        self.jobs: dict[str, dict] = {}
+        self.calls: list[tuple[str, str]] = []
+        self._ids = itertools.count(1)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        method, path = request.method, request.url.path
+        self.calls.append((method, path))
+        parts = path.strip("/").split("/")[1:]  # drop "v1"
+        if (method, parts) == ("POST", ["files"]):
+            return self._upload(request)
+        if method == "GET" and parts[0] == "files" and parts[-1] == "url":
+            return httpx.Response(200, json={"url": f"https://fake/{parts[1]}"})
+        if method == "GET" and parts[0] == "files" and parts[-1] == "content":
+            # Streamed like a real download: the body is not read up front.
+            return httpx.Response(200, stream=httpx.ByteStream(self.files[parts[1]]))
+        if (method, parts) == ("POST", ["ocr"]):
+            body = json.loads(request.content)
+            return httpx.Response(200, json=self._ocr(body))
+        if (method, parts) == ("POST", ["batch", "jobs"]):
+            return self._create_job(json.loads(request.content))
+        if method == "GET" and parts[:2] == ["batch", "jobs"]:
+            return self._poll_job(parts[2])
+        if (
+            method == "POST"
+            and parts[:2] == ["batch", "jobs"]
+            and parts[-1] == "cancel"
+        ):
+            self.jobs[parts[2]]["status"] = "CANCELLED"
+            return httpx.Response(200, json=self.jobs[parts[2]])
+        return httpx.Response(404, json={"detail": f"{method} {path}"})
+
+    def _upload(self, request):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode()
+            + request.read()
+        )
+        upload = next(p for p in message.iter_parts() if p.get_filename())
+        file_id = f"file-{next(self._ids)}"
+        self.files[file_id] = upload.get_payload(decode=True)
+        return httpx.Response(
+            200,
+            json={
+                "id": file_id,
+                "object": "file",
+                "size_bytes": len(self.files[file_id]),
+                "created_at": 0,
+                "filename": upload.get_filename(),
+                "purpose": "ocr",
+                "sample_type": "ocr_input",
+                "source": "upload",
+            },
+        )
+
+    def _ocr(self, body):
+        content = self.files[body["document"]["document_url"].rsplit("/", 1)[1]]
+        try:
+            pages = content.decode().split("\f")
+        except UnicodeDecodeError:  # a real scan: one page of stand-in text
+            pages = [f"scanned {len(content)} bytes"]
+        return {
+            "model": "mistral-ocr-latest",
+            "usage_info": {"pages_processed": len(pages)},
+            "pages": [
+                {"index": i, "markdown": page, "images": [], "dimensions": None}
+                for i, page in enumerate(pages)
+            ],
+        }
+
+    def _create_job(self, body):
+        job_id = f"job-{next(self._ids)}"
+        self.jobs[job_id] = {
+            "id": job_id,
+            "object": "batch",
+            "input_files": [],
+            "endpoint": body["endpoint"],
+            "model": body["model"],
+            "errors": [],
+            "status": "QUEUED",
+            "created_at": 0,
+            "total_requests": len(body["requests"]),
+            "completed_requests": 0,
+            "succeeded_requests": 0,
+            "failed_requests": 0,
+            "requests": body["requests"],
+            "polls": 0,
+        }
+        return httpx.Response(200, json=self._public(job_id))
+
+    def _poll_job(self, job_id):
+        job = self.jobs[job_id]
+        job["polls"] += 1
+        if job["status"] in ("QUEUED", "RUNNING"):
+            job["status"] = "RUNNING"
+            if job["polls"] >= self.polls_until_done:
+                self._finish(job)
+        return httpx.Response(200, json=self._public(job_id))
+
+    def _finish(self, job):
+        output, errors = [], []
+        for request in job["requests"]:
+            document_url = request["body"]["document"]["document_url"]
+            file_id = document_url.rsplit("/", 1)[1]
+            if b"FAIL" in self.files[file_id]:
+                errors.append(
+                    {"custom_id": request["custom_id"], "error": "unreadable"}
+                )
+            else:
+                output.append(
+                    {
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": self._ocr(request["body"]),
+                        },
+                        "error": None,
+                    }
+                )
+        for name, lines in (("output_file", output), ("error_file", errors)):
+            if lines:
+                file_id = f"file-{next(self._ids)}"
+                self.files[file_id] = "\n".join(map(json.dumps, lines)).encode()
+                job[name] = file_id
+        job["status"] = "SUCCESS"
+        job["succeeded_requests"] = len(output)
+        job["failed_requests"] = len(errors)
+
+    def _public(self, job_id):
+        return {
+            k: v for k, v in self.jobs[job_id].items() if k not in ("requests", "polls")
+        }
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeMistralAPI()
+    constructed = []
+
+    def client_factory(**kwargs):
+        constructed.append(kwargs)
+        return Mistral(
+            client=httpx.Client(transport=httpx.MockTransport(fake)), **kwargs
+        )
+
+    fake.constructed = constructed
+    monkeypatch.setattr(mod, "Mistral", client_factory)
+    monkeypatch.setattr(mod.time, "sleep", lambda seconds: None)
+    mod._shared_clients.clear()
+    yield fake
+    mod._shared_clients.clear()
+
+
+def _service(**kwargs):
+    return MistralOCRService(api_key="test-key", retry_delay=0, **kwargs)
+
+
+def test_files_share_one_long_lived_client(api):
+    first = _service().process(b"%PDF one\fpage two")
+    second = _service().process(b"%PDF another")
+
+    assert first.text == "%PDF one\n\npage two"
+    assert second.pages == ["%PDF another"]
+    assert len(api.constructed) == 1
+
+
+def test_batch_returns_results_per_document(api):
+    documents = [("a", b"%PDF a1\fa2"), ("b", b"%PDF FAIL"), ("c", b"%PDF c1")]
+
+    results = _service().process_batch(iter(documents), poll_interval=0)
+
+    assert results["a"] == MistralOCRResult(
+        text="%PDF a1\n\na2", pages=["%PDF a1", "a2"]
+    )
+    assert results["c"].text == "%PDF c1"
+    assert isinstance(results["b"], MistralOCRError)
+    (job,) = api.jobs.values()
+    assert job["endpoint"] == "/v1/ocr"
+    assert [r["custom_id"] for r in job["requests"]] == ["a", "b", "c"]
+    assert ("POST", "/v1/ocr") not in api.calls  # no per-file OCR requests
+    assert len(api.constructed) == 1
+
+
+def test_batch_past_its_timeout_is_cancelled(api):
+    api.polls_until_done = 10**6
+
+    with pytest.raises(MistralOCRError, match="did not finish"):
+        _service().process_batch([("a", b"%PDF a")], poll_interval=0, timeout=0)
+
+    assert [job["status"] for job in api.jobs.values()] == ["CANCELLED"]
+
+
+def test_batch_stops_when_the_task_is_cancelled(api):
+    api.polls_until_done = 10**6
+    checks = iter([False, False, True])
+
+    with pytest.raises(MistralOCRError, match="cancelled"):
+        _service().process_batch(
+            [("a", b"%PDF a")], poll_interval=0, should_cancel=lambda: next(checks)
+        )
+
+    (job,) = api.jobs.values()
+    assert job["status"] == "CANCELLED"
+    assert job["polls"] == 2
+
+
+def test_pipeline_prefetches_only_the_files_routed_to_mistral(
+    api, monkeypatch, user_headers, make_project, upload_file, files_base_path
+):
+    from backend.src import models
+    from backend.src.core import config
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    monkeypatch.setattr(config._get_settings(), "MISTRAL_OCR_ENABLED", True)
+    project = make_project(user_headers, name="Mistral batch")
+    uploads = {
+        name: upload_file(
+            user_headers, project["id"], path=files_base_path / name, content_type=ct
+        )
+        for name, ct in (
+            ("9874562_text.pdf", "application/pdf"),
+            ("9874562_notext.pdf", "application/pdf"),
+            ("9874562.png", "image/png"),
+        )
+    }
+    with SessionLocal() as db:
+        cfg = models.PreprocessingConfiguration(
+            project_id=project["id"],
+            name="Mistral batch",
+            additional_settings={
+                "ocr_engine": "mistral_ocr",
+                "mistral_api_key": "test-key",
+            },
+        )
+        db.add(cfg)
+        db.flush()
+        task = models.PreprocessingTask(
+            project_id=project["id"], configuration_id=cfg.id, total_files=3
+        )
+        db.add(task)
+        db.flush()
+        file_tasks = [
+            models.FilePreprocessingTask(
+                preprocessing_task_id=task.id, file_id=upload["id"]
+            )
+            for upload in uploads.values()
+        ]
+        db.add_all(file_tasks)
+        db.commit()
+
+        pipeline = PreprocessingPipeline(db, task.id)
+        results = pipeline.prefetch_mistral_batch([ft.id for ft in file_tasks])
+
+        ids = {name: upload["id"] for name, upload in uploads.items()}
+        assert set(results) == {ids["9874562_notext.pdf"], ids["9874562.png"]}
+        (job,) = api.jobs.values()
+        assert len(job["requests"]) == 2
+
+        png = db.get(models.File, ids["9874562.png"])
+        expected = results[png.id].text
+        consumer = PreprocessingPipeline(db, task.id, mistral_batch_results=results)
+        docs = consumer._process_with_mistral_ocr(png, file_tasks[2])
+
+        assert [doc.text for doc in docs] == [expected]
+        assert png.id not in results  # consumed
+        assert ("POST", "/v1/ocr") not in api.calls
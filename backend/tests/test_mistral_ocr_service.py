@@ -2,13 +2,11 @@
 """Unit tests for ``services/mistral_ocr_service.py``.
 
 The real Mistral SDK is never hit: ``mistral_ocr_service.Mistral`` (the class
-bound in the module) is patched with a ``MagicMock`` whose context-manager
-``__enter__`` yields a stub client. The service opens a fresh
-``with Mistral(...) as mistral:`` block for each of its three API calls
-(``files.upload`` -> ``files.get_signed_url`` -> ``ocr.process``); because
-calling a ``MagicMock`` returns the same ``return_value`` every time, all three
-blocks share a single stub client which we shape via SimpleNamespace return
-values.
+bound in the module) is patched with a ``MagicMock`` whose ``return_value`` is
+the stub client. The service keeps one client per credentials in a process
+cache (cleared around every test) and makes its three API calls
+(``files.upload`` -> ``files.get_signed_url`` -> ``ocr.process``) on it; we
+shape the stub via SimpleNamespace return values.
 
 ``time.sleep`` is patched module-wide (autouse) so retry backoff is instant.
 
@@ -39,6 +37,14 @@ from backend.src.services.mistral_ocr_service import (
 # --------------------------------------------------------------------------- #
 # Fixtures / helpers
 # --------------------------------------------------------------------------- #
+@pytest.fixture(autouse=True)
+def _fresh_clients():
+    """Drop cached SDK clients so each test sees its own patched class."""
+    mod._shared_clients.clear()
+    yield
+    mod._shared_clients.clear()
+
+
 @pytest.fixture(autouse=True)
 def _instant_sleep():
     """Make retry backoff instant for every test."""
@@ -71,7 +77,7 @@ def _configure_client(
 
     Returns the stub client mock (``ctx``) so tests can assert call args.
     """
-    ctx = mistral_cls.return_value.__enter__.return_value
+    ctx = mistral_cls.return_value
     ctx.files.upload.return_value = types.SimpleNamespace(id=upload_id)
     ctx.files.get_signed_url.return_value = types.SimpleNamespace(url=signed_url)
     if pages is None and markdown is not None:
@@ -257,7 +263,7 @@ class TestProcessHappyPath:
     def test_upload_failure_wrapped(self):
         svc = _make_service(max_retries=0)
         with mock.patch.object(mod, "Mistral") as mistral_cls:
-            ctx = mistral_cls.return_value.__enter__.return_value
+            ctx = mistral_cls.return_value
             ctx.files.upload.side_effect = _status_exc(500)
             with pytest.raises(MistralOCRError) as ei:
                 svc.process(b"%PDF-1.7 body")
@@ -0,0 +1,202 @@
+# backend/tests/test_ocr_cache.py
+"""The OCR result cache (utils/ocr_cache.py) and its use by the pipeline.
+
+The pipeline tests stand a counting fake in for docling-serve, so a second
+conversion of the same bytes is visible as a missing engine call.
+"""
+
+import secrets
+
+import pytest
+from sqlalchemy import delete, func, select
+
+NOTEXT_PDF = "9874562_notext.pdf"
+
+
+@pytest.fixture
+def cache_settings(monkeypatch):
+    from backend.src.core import config
+    from backend.src.db.session import SessionLocal
+    from backend.src.models import OCRCacheEntry
+
+    live = config._get_settings()
+    monkeypatch.setattr(live, "OCR_CACHE_MAX_MB", 1)
+    with SessionLocal() as db:
+        db.execute(delete(OCRCacheEntry))
+        db.commit()
+    yield live
+    with SessionLocal() as db:
+        db.execute(delete(OCRCacheEntry))
+        db.commit()
+
+
+class _Project:
+    ocr_cache_enabled = True
+
+
+def _key(file_hash, **options):
+    from backend.src.utils import ocr_cache
+
+    return ocr_cache.make_key(_Project(), file_hash, "engine", "model", options)
+
+
+def test_round_trip_is_compressed_and_keyed_by_options(cache_settings):
+    from backend.src.db.session import SessionLocal
+    from backend.src.models import OCRCacheEntry
+    from backend.src.utils import ocr_cache
+
+    result = ocr_cache.CachedOCR(
+        text="Findings: unremarkable.\n\n" * 500,
+        pages=["Findings: unremarkable."] * 500,
+        meta={"page_ranges": [[1, 500]]},
+    )
+    with SessionLocal() as db:
+        ocr_cache.store(db, _key("a" * 64, langs="de"), result)
+        db.commit()
+
+        assert ocr_cache.lookup(db, _key("a" * 64, langs="de")) == result
+        assert ocr_cache.lookup(db, _key("a" * 64, langs="en")) is None
+        assert ocr_cache.lookup(db, _key("b" * 64, langs="de")) is None
+        entry = db.scalar(select(OCRCacheEntry))
+        assert entry.size_bytes < len(result.text) / 10
+        assert entry.hit_count == 1
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(cache_settings):
+    from backend.src.db.session import SessionLocal
+    from backend.src.models import OCRCacheEntry
+    from backend.src.utils import ocr_cache
+
+    def incompressible():  # ~400 KB compressed; the budget holds two
+        return ocr_cache.CachedOCR(text=secrets.token_urlsafe(400_000))
+
+    with SessionLocal() as db:
+        ocr_cache.store(db, _key("a" * 64), incompressible())
+        ocr_cache.store(db, _key("b" * 64), incompressible())
+        assert ocr_cache.lookup(db, _key("a" * 64)) is not None  # a is now newer
+        ocr_cache.store(db, _key("c" * 64), incompressible())
+        db.commit()
+
+        assert ocr_cache.contains(db, _key("a" * 64))
+        assert not ocr_cache.contains(db, _key("b" * 64))
+        assert ocr_cache.contains(db, _key("c" * 64))
+        total = db.scalar(select(func.sum(OCRCacheEntry.size_bytes)))
+        assert total <= ocr_cache.max_bytes()
+
+
+def test_zero_budget_disables_the_cache(cache_settings):
+    cache_settings.OCR_CACHE_MAX_MB = 0
+    assert _key("a" * 64) is None
+
+
+class _CountingDocling:
+    def __init__(self):
+        self.calls = 0
+
+    def convert_pdf_tesseract(self, file_content, filename, force_ocr=False):
+        from backend.src.services.docling_serve_client import DoclingServeResult
+
+        self.calls += 1
+        return DoclingServeResult(text=f"OCR of {len(file_content)} bytes")
+
+
+@pytest.fixture
+def run_pipeline(
+    cache_settings,
+    monkeypatch,
+    user_headers,
+    make_project,
+    upload_file,
+    files_base_path,
+):
+    """Upload the scanned PDF into a new project and preprocess it."""
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    docling = _CountingDocling()
+    monkeypatch.setattr(cache_settings, "DOCLING_SERVE_ENABLED", True)
+    monkeypatch.setattr(
+        PreprocessingPipeline, "_get_docling_serve_client", lambda self: docling
+    )
+
+    def run(ocr_cache_enabled=True):
+        project = make_project(user_headers, name="OCR cache")
+        upload = upload_file(
+            user_headers,
+            project["id"],
+            path=files_base_path / NOTEXT_PDF,
+            content_type="application/pdf",
+        )
+        with SessionLocal() as db:
+            db.get(models.Project, project["id"]).ocr_cache_enabled = ocr_cache_enabled
+            cfg = models.PreprocessingConfiguration(
+                project_id=project["id"],
+                name="Local OCR",
+                additional_settings={"extraction_mode": "fast_local_ocr"},
+            )
+            db.add(cfg)
+            db.flush()
+            task = models.PreprocessingTask(
+                project_id=project["id"], configuration_id=cfg.id, total_files=1
+            )
+            db.add(task)
+            db.flush()
+            file_task = models.FilePreprocessingTask(
+                preprocessing_task_id=task.id, file_id=upload["id"]
+            )
+            db.add(file_task)
+            db.commit()
+
+            pipeline = PreprocessingPipeline(db, task.id)
+            (doc,) = pipeline._route_pdf_image(file_task.file, file_task)
+            db.commit()
+            return doc.text, doc.meta_data
+
+    run.docling = docling
+    return run
+
+
+def test_same_bytes_in_another_project_skip_the_engine(run_pipeline):
+    first_text, first_meta = run_pipeline()
+    second_text, second_meta = run_pipeline()
+
+    assert run_pipeline.docling.calls == 1
+    assert second_text == first_text
+    assert first_meta["ocr_cache_hit"] is False
+    assert second_meta["ocr_cache_hit"] is True
+
+
+def test_opted_out_project_neither_reads_nor_stores(run_pipeline):
+    from backend.src.db.session import SessionLocal
+    from backend.src.models import OCRCacheEntry
+
+    run_pipeline(ocr_cache_enabled=False)
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count(OCRCacheEntry.id))) == 0
+
+    run_pipeline()
+    _, meta = run_pipeline(ocr_cache_enabled=False)
+
+    assert run_pipeline.docling.calls == 3
+    assert meta["ocr_cache_hit"] is False
+
+
+def test_admin_can_inspect_and_clear_the_cache(
+    cache_settings, client, api_url, admin_headers, user_headers
+):
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils import ocr_cache
+
+    with SessionLocal() as db:
+        ocr_cache.store(db, _key("a" * 64), ocr_cache.CachedOCR(text="x"))
+        db.commit()
+
+    url = f"{api_url}/admin/ocr-cache"
+    assert client.get(url, headers=user_headers).status_code == 403
+    status = client.get(url, headers=admin_headers).json()
+    assert status["entries"] == 1
+    assert status["max_bytes"] == 1024 * 1024
+
+    assert client.delete(url, headers=admin_headers).json() == {"deleted": 1}
+    assert client.get(url, headers=admin_headers).json()["entries"] == 0
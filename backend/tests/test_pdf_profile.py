@@ -0,0 +1,139 @@
+# backend/tests/test_pdf_profile.py
+"""``inspect_pdf`` (services/pdf_profile.py) and the pipeline's use of it."""
+
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from backend.src.services.pdf_profile import inspect_pdf
+
+FILES = Path(__file__).parent / "files"
+
+
+def _pdf(pages: int = 1, *, text: str = "Page text. " * 20, **save_kwargs) -> bytes:
+    doc = pymupdf.open()
+    for _ in range(pages):
+        doc.new_page().insert_textbox(pymupdf.Rect(72, 72, 520, 770), text)
+    return doc.tobytes(**save_kwargs)
+
+
+def test_text_pdf_profile():
+    profile = inspect_pdf((FILES / "9874562_text.pdf").read_bytes())
+
+    assert profile.readable and not profile.encrypted
+    assert profile.page_count == 2
+    assert [(round(p.width), round(p.height), p.rotation) for p in profile.pages] == [
+        (595, 842, 0),
+        (595, 842, 0),
+    ]
+    assert profile.has_embedded_text(min_chars=100)
+    assert profile.pages[0].text_density > 10
+    assert profile.image_coverage < 0.1
+
+
+def test_scanned_pdf_profile():
+    profile = inspect_pdf((FILES / "9874562_notext.pdf").read_bytes())
+
+    assert profile.page_count == 2
+    assert not profile.has_embedded_text(min_chars=1)
+    assert [p.text_chars for p in profile.pages] == [0, 0]
+    assert profile.image_coverage == pytest.approx(1.0)
+
+
+def test_only_sampled_pages_are_read_for_text():
+    profile = inspect_pdf(_pdf(20), max_pages_to_check=4)
+
+    assert profile.page_count == len(profile.pages) == 20
+    assert [p.index for p in profile.sampled_pages] == [0, 6, 13, 19]
+    assert profile.pages[1].text is None and profile.pages[1].text_density is None
+
+
+def test_rotation_is_reported():
+    doc = pymupdf.open(stream=_pdf(2), filetype="pdf")
+    doc[1].set_rotation(90)
+
+    profile = inspect_pdf(doc.tobytes())
+
+    assert [p.rotation for p in profile.pages] == [0, 90]
+
+
+def test_encryption():
+    locked = inspect_pdf(
+        _pdf(encryption=pymupdf.PDF_ENCRYPT_AES_256, owner_pw="o", user_pw="u")
+    )
+    owner_only = inspect_pdf(_pdf(encryption=pymupdf.PDF_ENCRYPT_AES_256, owner_pw="o"))
+
+    assert locked.encrypted and locked.needs_password
+    assert not locked.has_embedded_text(min_chars=1)
+    # Opens without a password, but still counts as encrypted, as with pypdf.
+    assert owner_only.encrypted and not owner_only.needs_password
+    assert owner_only.has_embedded_text(min_chars=100)
+
+
+def test_unreadable_bytes():
+    profile = inspect_pdf(b"%PDF-1.4 not really")
+
+    assert not profile.readable
+    assert profile.page_count == 0
+    assert not profile.has_embedded_text(min_chars=1)
+
+
+def test_pipeline_reads_and_parses_a_pdf_once(
+    monkeypatch, user_headers, make_project, upload_file, files_base_path
+):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.services import pdf_profile
+    from backend.src.utils import preprocessing
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    project = make_project(user_headers, name="PDF profile")
+    upload = upload_file(
+        user_headers,
+        project["id"],
+        path=files_base_path / "9874562_text.pdf",
+        content_type="application/pdf",
+    )
+    reads, inspections = [], []
+    monkeypatch.setattr(
+        preprocessing,
+        "get_file",
+        lambda uuid, _real=preprocessing.get_file: reads.append(uuid) or _real(uuid),
+    )
+    monkeypatch.setattr(
+        pdf_profile,
+        "inspect_pdf",
+        lambda content, _real=pdf_profile.inspect_pdf, **kw: (
+            inspections.append(kw) or _real(content, **kw)
+        ),
+    )
+    with SessionLocal() as db:
+        cfg = models.PreprocessingConfiguration(
+            project_id=project["id"],
+            name="Remote fallback",
+            # Encryption check, embedded-text probe, then pypdf extraction.
+            additional_settings={
+                "extraction_mode": "high_accuracy_remote",
+                "remote_ocr_fallback": False,
+            },
+        )
+        db.add(cfg)
+        db.flush()
+        task = models.PreprocessingTask(
+            project_id=project["id"], configuration_id=cfg.id, total_files=1
+        )
+        db.add(task)
+        db.flush()
+        file_task = models.FilePreprocessingTask(
+            preprocessing_task_id=task.id, file_id=upload["id"]
+        )
+        db.add(file_task)
+        db.commit()
+
+        pipeline = PreprocessingPipeline(db, task.id)
+        (doc,) = pipeline._route_pdf_image(file_task.file, file_task)
+
+    assert "Medical History" in doc.text
+    assert len(reads) == 1
+    assert len(inspections) == 1
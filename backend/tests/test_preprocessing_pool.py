@@ -0,0 +1,167 @@
+# backend/tests/test_preprocessing_pool.py
+"""``PreprocessingPipeline.process`` running files on its worker pool.
+
+Text files stand in for OCR'd ones: ``_process_text_file`` is wrapped to
+record how many files run at once, so the tests need no OCR engine.
+"""
+
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def pool_task(monkeypatch, user_headers, make_project, upload_file):
+    """Build a preprocessing task over ``n`` text files; returns its id."""
+    from backend.src import models
+    from backend.src.core import config
+    from backend.src.db.session import SessionLocal
+
+    monkeypatch.setattr(config._get_settings(), "DOCLING_SERVE_MAX_CONCURRENT_FILES", 3)
+
+    def make(n: int) -> int:
+        project = make_project(user_headers, name="Pool")
+        uploads = [
+            upload_file(
+                user_headers,
+                project["id"],
+                content=f"Report {i}: no acute findings.".encode(),
+                name=f"report_{i}.txt",
+            )
+            for i in range(n)
+        ]
+        with SessionLocal() as db:
+            cfg = models.PreprocessingConfiguration(
+                project_id=project["id"], name="Text", additional_settings={}
+            )
+            db.add(cfg)
+            db.flush()
+            task = models.PreprocessingTask(
+                project_id=project["id"], configuration_id=cfg.id, total_files=n
+            )
+            db.add(task)
+            db.flush()
+            db.add_all(
+                models.FilePreprocessingTask(
+                    preprocessing_task_id=task.id, file_id=upload["id"]
+                )
+                for upload in uploads
+            )
+            db.commit()
+            return task.id
+
+    return make
+
+
+@pytest.fixture
+def text_files(monkeypatch):
+    """Wrap ``_process_text_file``; ``hook(pipeline, file)`` runs first."""
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    real = PreprocessingPipeline._process_text_file
+    state = {"active": 0, "peak": 0, "hook": None, "pipelines": []}
+    lock = threading.Lock()
+
+    def wrapped(self, file, file_task):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["pipelines"].append(self)
+        try:
+            time.sleep(0.2)
+            if state["hook"]:
+                state["hook"](self, file)
+            return real(self, file, file_task)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    monkeypatch.setattr(PreprocessingPipeline, "_process_text_file", wrapped)
+    return state
+
+
+def _run(task_id):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    with SessionLocal() as db:
+        PreprocessingPipeline(db, task_id).process()
+    with SessionLocal() as db:
+        task = db.get(models.PreprocessingTask, task_id)
+        return task, {ft.file_name: ft for ft in task.file_tasks}
+
+
+def test_files_run_concurrently_up_to_the_engine_cap(pool_task, text_files):
+    from backend.src.models import PreprocessingStatus
+
+    task, file_tasks = _run(pool_task(7))
+
+    assert text_files["peak"] == 3
+    assert task.status == PreprocessingStatus.COMPLETED
+    assert task.processed_files == 7 and task.failed_files == 0
+    assert {ft.status for ft in file_tasks.values()} == {PreprocessingStatus.COMPLETED}
+    assert all(ft.document_count == 1 for ft in file_tasks.values())
+
+
+def test_workers_share_the_engine_clients(pool_task, text_files):
+    services = []
+    text_files["hook"] = lambda pipeline, file: services.append(
+        pipeline._vision_ocr_service(api_key="k", base_url="http://vision.test/v1")
+    )
+
+    _run(pool_task(4))
+
+    assert len(services) == 4 and len({id(s) for s in services}) == 1
+    assert services[0].client is None  # closed with the owning pipeline
+    owners = {id(p._clients_from) for p in text_files["pipelines"]}
+    assert len(owners) == 1 and None not in owners
+
+
+def test_cancel_stops_handing_out_files(pool_task, text_files):
+    from backend.src import models
+    from backend.src.db.session import SessionLocal
+
+    task_id = pool_task(9)
+
+    def cancel(pipeline, file):
+        with SessionLocal() as db:
+            db.get(models.PreprocessingTask, task_id).is_cancelled = True
+            db.commit()
+
+    text_files["hook"] = cancel
+
+    _, file_tasks = _run(task_id)
+
+    started = len(text_files["pipelines"])
+    assert 1 <= started <= 3  # only the files already in flight
+    completed = [
+        ft
+        for ft in file_tasks.values()
+        if ft.status == models.PreprocessingStatus.COMPLETED
+    ]
+    assert len(completed) < 9
+
+
+def test_a_timed_out_file_fails_alone(monkeypatch, pool_task, text_files):
+    from backend.src.models import PreprocessingStatus
+    from backend.src.utils.preprocessing import PreprocessingPipeline
+
+    monkeypatch.setattr(
+        PreprocessingPipeline, "_get_file_timeout", lambda self, file, mode=None: 1
+    )
+
+    def stall(pipeline, file):
+        if file.file_name == "report_0.txt":
+            time.sleep(2.5)
+
+    text_files["hook"] = stall
+
+    task, file_tasks = _run(pool_task(4))
+
+    assert file_tasks["report_0.txt"].status == PreprocessingStatus.FAILED
+    assert "timed out" in file_tasks["report_0.txt"].error_message
+    others = [ft.status for name, ft in file_tasks.items() if name != "report_0.txt"]
+    assert others == [PreprocessingStatus.COMPLETED] * 3
+    assert task.processed_files == 3 and task.failed_files == 1
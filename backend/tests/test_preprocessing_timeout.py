@@ -18,8 +18,8 @@ def _bare_pipeline():
 
     ``_process_with_timeout`` only needs ``self._timeout_abort`` (read by the
     worker thread) plus ``file.file_name`` / ``file_task.id`` on its arguments;
-    the DB-backed heartbeat is only reached while a file is genuinely still
-    running, which the fast paths below never hit. Imported lazily (not at module
+    the heartbeat service only writes once a file has run for a full interval,
+    which the fast paths below never reach. Imported lazily (not at module
     top level) so config/DB env set up by conftest fixtures is in place first.
     """
     from ..src.utils.preprocessing import PreprocessingPipeline
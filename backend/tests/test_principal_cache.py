@@ -0,0 +1,162 @@
+# backend/tests/test_principal_cache.py
+"""The per-process cache of signed-in users behind ``get_current_user``
+(utils/principal_cache.py).
+
+There is no Redis in the test environment, so these exercise the
+process-local security versions. The session hooks that bump them are the
+same either way.
+"""
+
+import pytest
+from sqlalchemy import event, select
+
+from .conftest import USER_CREDS
+
+OTHER = ("another@example.com", "Anotherpassword1")
+
+
+@pytest.fixture
+def statements():
+    """Record the SQL of every statement run while the returned list is live."""
+    from backend.src.db.session import engine
+
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _auth_queries(recorded):
+    return [s for s in recorded if "FROM users" in s or "FROM project_shares" in s]
+
+
+def _set_user(email, **values):
+    from backend.src.db.session import SessionLocal
+    from backend.src.models.user import User
+
+    with SessionLocal() as db:
+        user = db.execute(select(User).where(User.email == email)).scalar_one()
+        for name, value in values.items():
+            setattr(user, name, value)
+        db.commit()
+
+
+def test_repeat_requests_need_no_auth_queries(
+    client, api_url, user_headers, make_project, statements
+):
+    project = make_project(user_headers, name="Principal cache")
+    url = f"{api_url}/project/{project['id']}/document"
+
+    assert client.get(url, headers=user_headers).status_code == 200
+    statements.clear()
+    assert client.get(url, headers=user_headers).status_code == 200
+
+    assert _auth_queries(statements) == []
+
+
+def test_deactivation_takes_effect_on_the_next_request(client, api_url, login):
+    headers = login(*OTHER)
+    assert client.get(f"{api_url}/user/me", headers=headers).status_code == 200
+
+    _set_user(OTHER[0], is_active=False)
+    try:
+        resp = client.get(f"{api_url}/user/me", headers=headers)
+        assert resp.status_code == 401
+        assert resp.json()["detail"]["code"] == "core.account_deactivated"
+    finally:
+        _set_user(OTHER[0], is_active=True)
+
+
+def test_role_change_takes_effect_on_the_next_request(client, api_url, user_headers):
+    url = f"{api_url}/admin/audit/writer"
+    assert client.get(url, headers=user_headers).status_code == 403
+
+    _set_user(USER_CREDS[0], role="admin")
+    try:
+        assert client.get(url, headers=user_headers).status_code == 200
+    finally:
+        _set_user(USER_CREDS[0], role="user")
+    assert client.get(url, headers=user_headers).status_code == 403
+
+
+def test_share_changes_reach_the_cached_grants(
+    client, api_url, user_headers, login, make_project
+):
+    other = login(*OTHER)
+    project = make_project(user_headers, name="Principal grants")
+    url = f"{api_url}/project/{project['id']}"
+    assert client.get(url, headers=other).status_code == 403  # cached: no grant
+
+    resp = client.post(
+        f"{url}/share",
+        headers=user_headers,
+        json={"email": OTHER[0], "permission": "read"},
+    )
+    assert resp.status_code == 200, resp.text
+    assert client.get(url, headers=other).json()["access_level"] == "read"
+
+    share_id = resp.json()["id"]
+    resp = client.delete(f"{url}/share/{share_id}", headers=user_headers)
+    assert resp.status_code in (200, 204), resp.text
+    assert client.get(url, headers=other).status_code == 403
+
+
+def test_newer_token_forces_a_reload(client, api_url):
+    from backend.src.db.session import SessionLocal
+    from backend.src.models.user import User
+    from backend.src.utils import principal_cache
+
+    with SessionLocal() as db:
+        user_id = db.execute(select(User.id).where(User.email == OTHER[0])).scalar_one()
+        cached = principal_cache.get_user(db, user_id)
+        version = cached.token_version
+        # Another process bumped token_version without this one hearing of it.
+        principal_cache._entries[user_id][2]["token_version"] = version - 1
+
+    with SessionLocal() as db:
+        assert principal_cache.get_user(db, user_id, version).token_version == version
+
+
+def test_disabled_cache_loads_a_plain_user(monkeypatch):
+    from backend.src.core import config
+    from backend.src.db.session import SessionLocal
+    from backend.src.models.user import User
+    from backend.src.utils import principal_cache
+
+    monkeypatch.setattr(config._get_settings(), "PRINCIPAL_CACHE_TTL_SECONDS", 0)
+    with SessionLocal() as db:
+        user_id = db.execute(select(User.id).where(User.email == OTHER[0])).scalar_one()
+        user = principal_cache.get_user(db, user_id)
+
+    assert user.email == OTHER[0]
+    assert user.project_grants is None
+
+
+def test_deleting_a_project_drops_its_cached_grants(
+    client, api_url, user_headers, login, make_project
+):
+    from backend.src.db.session import SessionLocal
+    from backend.src.models.user import User
+    from backend.src.utils import principal_cache
+
+    other = login(*OTHER)
+    project = make_project(user_headers, name="Principal deleted project")
+    url = f"{api_url}/project/{project['id']}"
+    resp = client.post(
+        f"{url}/share",
+        headers=user_headers,
+        json={"email": OTHER[0], "permission": "read"},
+    )
+    assert resp.status_code == 200, resp.text
+    assert client.get(url, headers=other).json()["access_level"] == "read"
+
+    # The shares go with a bulk delete, which the session hooks don't see.
+    resp = client.delete(url, headers=user_headers)
+    assert resp.status_code in (200, 204), resp.text
+    with SessionLocal() as db:
+        user_id = db.execute(select(User.id).where(User.email == OTHER[0])).scalar_one()
+        assert project["id"] not in principal_cache.get_user(db, user_id).project_grants
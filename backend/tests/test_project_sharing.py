@@ -454,6 +454,54 @@ class TestVisibility:
         assert project["id"] not in [p["id"] for p in listed]
 
 
+# --------------------------------------------------------------------------- #
+# Realtime recipients
+# --------------------------------------------------------------------------- #
+class TestRealtimeRecipients:
+    """Task updates fan out to a cached recipient set; shares must refresh it."""
+
+    def test_share_and_revoke_refresh_cached_recipients(
+        self, client, api_url, owner_headers, make_project, share
+    ):
+        from backend.src.utils import project_recipients
+
+        project = make_project(owner_headers, name="Realtime Project")
+        owner_only = project_recipients.get_recipients(project["id"])
+        assert len(owner_only) == 1
+
+        created = share(owner_headers, project["id"], permission="read")
+        collab_id = created["user"]["id"]
+        # Served from the cache, which the share must have invalidated.
+        assert project_recipients.peek(project["id"]) is None
+        assert collab_id in project_recipients.get_recipients(project["id"])
+
+        resp = client.delete(
+            f"{api_url}/project/{project['id']}/share/{created['id']}",
+            headers=owner_headers,
+        )
+        assert resp.status_code == 200, resp.text
+        assert project_recipients.get_recipients(project["id"]) == owner_only
+
+    def test_invalidation_racing_a_lookup_is_not_overwritten(self, monkeypatch):
+        from backend.src.utils import project_recipients
+
+        def stale_load(project_id):
+            # Membership changes while the query is in flight.
+            project_recipients.invalidate(project_id)
+            return frozenset({1})
+
+        monkeypatch.setattr(project_recipients, "_load", stale_load)
+        assert project_recipients.get_recipients(987654) == frozenset({1})
+        assert project_recipients.peek(987654) is None
+
+    def test_invalidation_without_a_project_id_is_ignored(self):
+        from backend.src.utils import project_recipients
+
+        # A malformed broadcast must not grow the version table.
+        project_recipients.invalidate(None)
+        assert None not in project_recipients._versions
+
+
 # --------------------------------------------------------------------------- #
 # Cross-project activity feed
 # --------------------------------------------------------------------------- #
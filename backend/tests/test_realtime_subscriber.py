@@ -0,0 +1,241 @@
+# backend/tests/test_realtime_subscriber.py
+"""Tests for the web process's realtime relay in ``main.py``.
+
+Covers batch decoding/dispatch, the ``redis.asyncio`` subscriber's reconnect
+loop (driven by a fake client — there is no Redis in the test environment),
+and the in-process broadcaster used when Redis is absent. Async code is run
+with ``asyncio.run`` (no pytest-asyncio in this repo).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.src.utils import redis_broadcast
+
+
+@pytest.fixture
+def main():
+    """``backend.src.main``, imported after the test environment is set up."""
+    from backend.src import main
+
+    return main
+
+
+@pytest.fixture
+def broadcasts(monkeypatch, main):
+    """Record ``manager.broadcast_to_project`` calls instead of sending."""
+    calls = []
+
+    async def record(recipients, message):
+        calls.append((set(recipients), message))
+
+    monkeypatch.setattr(main.manager, "broadcast_to_project", record)
+    return calls
+
+
+# --------------------------------------------------------------------------- #
+# Decoding and dispatch
+# --------------------------------------------------------------------------- #
+def test_decode_batch_skips_malformed_payloads(main):
+    decoded = main._decode_batch([b'{"a": 1}', "not json", '"scalar"', '{"b": 2}'])
+    assert decoded == [{"a": 1}, {"b": 2}]
+
+
+def test_dispatch_resolves_each_project_once_and_applies_control_messages(
+    main, monkeypatch, broadcasts
+):
+    resolved = []
+    reloads = []
+    invalidated = []
+
+    def resolve(data):
+        resolved.append(data["project_id"])
+        return {100 + data["project_id"]}
+
+    monkeypatch.setattr(main, "_resolve_project_recipients", resolve)
+    monkeypatch.setattr(main.project_recipients, "peek", lambda pid: None)
+    monkeypatch.setattr(main.project_recipients, "invalidate", invalidated.append)
+    monkeypatch.setattr(
+        "backend.src.core.dynamic_settings.reload_settings_cache",
+        lambda broadcast=True: reloads.append(broadcast),
+    )
+
+    asyncio.run(
+        main._dispatch_realtime(
+            [
+                {"type": "trial_update", "project_id": 1, "n": 1},
+                {"type": "settings_invalidate"},
+                {"type": "trial_update", "project_id": 1, "n": 2},
+                {"type": "project_recipients_invalidate", "project_id": 2},
+                {"type": "settings_invalidate"},
+                {"type": "preprocessing_update", "project_id": 2, "n": 3},
+            ]
+        )
+    )
+
+    assert reloads == [False]  # once per batch, never re-broadcast
+    assert invalidated == [2]
+    assert sorted(resolved) == [1, 2]
+    assert [(r, m["n"]) for r, m in broadcasts] == [
+        ({101}, 1),
+        ({101}, 2),
+        ({102}, 3),
+    ]
+
+
+def test_dispatch_serves_cached_recipients_without_resolving(
+    main, monkeypatch, broadcasts
+):
+    monkeypatch.setattr(main.project_recipients, "peek", lambda pid: frozenset({5}))
+
+    def fail(data):
+        raise AssertionError("cache hit must not resolve")
+
+    monkeypatch.setattr(main, "_resolve_project_recipients", fail)
+
+    asyncio.run(main._dispatch_realtime([{"type": "trial_update", "project_id": 9}]))
+
+    assert broadcasts == [({5}, {"type": "trial_update", "project_id": 9})]
+
+
+# --------------------------------------------------------------------------- #
+# redis.asyncio subscriber
+# --------------------------------------------------------------------------- #
+class FakePubSub:
+    def __init__(self, messages, fail=False):
+        self._messages = list(messages)
+        self._fail = fail
+        self.patterns = []
+        self.channels = []
+        self.closed = False
+
+    async def psubscribe(self, *patterns):
+        if self._fail:
+            raise ConnectionError("Connection refused")
+        self.patterns.extend(patterns)
+
+    async def subscribe(self, *channels):
+        self.channels.extend(channels)
+
+    async def listen(self):
+        while self._messages:
+            yield self._messages.pop(0)
+        await asyncio.Event().wait()  # block like an idle connection
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        return self._messages.pop(0) if self._messages else None
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return self._pubsub
+
+    async def aclose(self):
+        pass
+
+
+def _pmessage(payload):
+    return {
+        "type": "pmessage",
+        "pattern": b"task_updates*",
+        "channel": b"task_updates",
+        "data": json.dumps(payload).encode(),
+    }
+
+
+def test_subscriber_reconnects_and_dispatches_buffered_messages_as_one_batch(
+    main, monkeypatch
+):
+    broken = FakePubSub([], fail=True)
+    healthy = FakePubSub(
+        [
+            _pmessage({"type": "trial_update", "project_id": 1}),
+            _pmessage({"type": "trial_update", "project_id": 2}),
+            {
+                "type": "message",
+                "channel": b"settings_invalidate",
+                "data": b'{"type": "settings_invalidate"}',
+            },
+        ]
+    )
+    clients = [FakeClient(broken), FakeClient(healthy)]
+    monkeypatch.setattr(
+        redis_broadcast, "new_async_subscriber_client", lambda: clients.pop(0)
+    )
+    monkeypatch.setattr(main, "_SUBSCRIBER_BACKOFF_BASE_SECONDS", 0.0)
+
+    batches = []
+
+    async def record(messages):
+        batches.append(messages)
+
+    monkeypatch.setattr(main, "_dispatch_realtime", record)
+
+    async def scenario():
+        task = asyncio.create_task(main._redis_subscriber_task())
+        for _ in range(100):
+            if batches:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    assert broken.closed
+    assert healthy.patterns == ["task_updates*"]
+    assert healthy.channels == ["settings_invalidate"]
+    assert batches == [
+        [
+            {"type": "trial_update", "project_id": 1},
+            {"type": "trial_update", "project_id": 2},
+            {"type": "settings_invalidate"},
+        ]
+    ]
+    assert healthy.closed
+
+
+def test_subscriber_exits_when_broker_is_not_redis(main, monkeypatch):
+    monkeypatch.setattr(redis_broadcast, "new_async_subscriber_client", lambda: None)
+    asyncio.run(asyncio.wait_for(main._redis_subscriber_task(), 1))
+
+
+# --------------------------------------------------------------------------- #
+# In-process broadcaster (no Redis)
+# --------------------------------------------------------------------------- #
+def test_local_broadcaster_relays_updates_published_without_redis(
+    main, monkeypatch, broadcasts
+):
+    monkeypatch.setattr(redis_broadcast, "get_redis_client", lambda: None)
+    monkeypatch.setattr(main.project_recipients, "peek", lambda pid: frozenset({3}))
+
+    async def scenario():
+        task = asyncio.create_task(main._local_broadcast_task())
+        await asyncio.sleep(0)
+        # Published from a worker thread, as inline preprocessing does.
+        published = await asyncio.to_thread(
+            redis_broadcast.publish_task_update,
+            {"type": "preprocessing_update", "project_id": 4},
+        )
+        for _ in range(100):
+            if broadcasts:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return published
+
+    assert asyncio.run(scenario()) is True
+    assert broadcasts == [({3}, {"type": "preprocessing_update", "project_id": 4})]
+    # The listener is unregistered once the task stops.
+    assert redis_broadcast._local_listeners == []
@@ -85,6 +85,26 @@ class TestNonRedisBroker:
         assert rb.publish_task_update({"a": 1}) is False
         from_url.assert_not_called()
 
+    def test_task_updates_go_to_local_listeners_without_redis(
+        self, monkeypatch, settings_inst
+    ):
+        monkeypatch.setattr(settings_inst, "CELERY_BROKER_URL", "memory://")
+        received = []
+        rb.add_local_listener(received.append)
+        try:
+            assert rb.publish_task_update({"a": 1}) is True
+            # Control messages are applied locally by their callers already.
+            assert rb.publish_settings_invalidate() is False
+        finally:
+            rb.remove_local_listener(received.append)
+        assert received == [{"a": 1}]
+
+    def test_async_subscriber_client_is_none_for_non_redis_broker(
+        self, monkeypatch, settings_inst
+    ):
+        monkeypatch.setattr(settings_inst, "CELERY_BROKER_URL", "amqp://guest@rabbit//")
+        assert rb.new_async_subscriber_client() is None
+
 
 # --------------------------------------------------------------------------- #
 # Happy path
@@ -121,6 +141,16 @@ class TestHappyPath:
         assert channel == rb.SETTINGS_INVALIDATE_CHANNEL
         assert json.loads(payload) == {"type": "settings_invalidate"}
 
+    def test_publish_project_recipients_invalidate(self, redis_broker, mock_from_url):
+        _, client = mock_from_url
+        assert rb.publish_project_recipients_invalidate(7) is True
+        channel, payload = client.publish.call_args.args
+        assert channel == rb.SETTINGS_INVALIDATE_CHANNEL
+        assert json.loads(payload) == {
+            "type": "project_recipients_invalidate",
+            "project_id": 7,
+        }
+
 
 # --------------------------------------------------------------------------- #
 # Client caching
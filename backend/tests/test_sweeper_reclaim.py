@@ -8,7 +8,8 @@ decision rules can be pinned without a broker:
   that never heartbeated), no reap while the heartbeat is fresh, parent
   finalization ONLY when no sibling file task is still in flight (no
   FAILED→COMPLETED status flap), completed-only processed_files counters,
-  and stuck-trial finalization via updated_at with the _sweeper failure marker.
+  stuck-trial finalization via updated_at with the _sweeper failure marker,
+  and the same updated_at rule for evaluation jobs.
 - reclaim_orphaned_on_startup: role scoping (preprocess vs default), the
   bypass_celery exclusion (a worker restart says nothing about a trial running
   inside the web process), and counter semantics on reclaimed tasks.
@@ -324,6 +325,44 @@ def test_sweep_fails_stuck_trial_and_spares_fresh_one(db):
     _finalize_leftovers(db, fresh, fresh_bypass)
 
 
+def test_sweep_fails_stuck_evaluation_job_and_spares_fresh_one(db):
+    from ..src import models
+    from ..src.celery.task_signals import sweep_orphans
+
+    project = models.Project(name="Sweep Eval Jobs", owner_id=_admin_user_id())
+    db.add(project)
+    db.flush()
+    gt = models.GroundTruth(
+        project_id=project.id, name="gt", format="csv", file_uuid=uuid.uuid4().hex
+    )
+    db.add(gt)
+    db.flush()
+    stuck, fresh = (
+        models.EvaluationJob(
+            project_id=project.id,
+            groundtruth_id=gt.id,
+            trial_ids=[1],
+            status=models.EvaluationJobStatus.PROCESSING,
+            results=[],
+            updated_at=updated_at,
+        )
+        for updated_at in (_old(), _now())
+    )
+    db.add_all([stuck, fresh])
+    db.commit()
+
+    sweep_orphans()
+
+    stuck, fresh = _fresh(db, stuck), _fresh(db, fresh)
+    assert stuck.status == models.EvaluationJobStatus.FAILED
+    assert stuck.finished_at is not None
+    assert "interrupted" in stuck.results[-1]["error"]
+    assert fresh.status == models.EvaluationJobStatus.PROCESSING
+
+    fresh.status = models.EvaluationJobStatus.COMPLETED
+    db.commit()
+
+
 # ---------------------------------------------------------------------------
 # reclaim_orphaned_on_startup
 # ---------------------------------------------------------------------------
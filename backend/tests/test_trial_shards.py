@@ -0,0 +1,402 @@
+# backend/tests/test_trial_shards.py
+"""Tests for sharded Celery trials (utils/trial_shards.py and the shard runner
+in celery/info_extraction.py).
+
+The ledger functions and ``run_trial_shard`` are plain functions, importable
+with DISABLE_CELERY=True; the LLM call is replaced by a fake that stores a
+successful result, and shard dispatch by a recorder.
+"""
+
+import datetime
+
+import pytest
+from sqlalchemy import func, select, update
+
+
+def _old():
+    return datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=2)
+
+
+@pytest.fixture
+def db():
+    from ..src.db.session import SessionLocal
+
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def make_trial(db, user_headers, make_project):
+    """Factory for PROCESSING Celery trials over three documents."""
+    from ..src import models
+
+    def make():
+        project_id = make_project(user_headers)["id"]
+        docs = [
+            models.Document(
+                project_id=project_id, text=f"doc {i}", document_name=f"{i}"
+            )
+            for i in range(3)
+        ]
+        schema = models.Schema(
+            project_id=project_id, schema_name="s", schema_definition={}
+        )
+        prompt = models.Prompt(project_id=project_id, name="p")
+        db.add_all([*docs, schema, prompt])
+        db.flush()
+        number = db.scalar(
+            select(func.coalesce(func.max(models.Trial.project_trial_number), 0)).where(
+                models.Trial.project_id == project_id
+            )
+        )
+        row = models.Trial(
+            project_id=project_id,
+            project_trial_number=number + 1,
+            schema_id=schema.id,
+            prompt_id=prompt.id,
+            llm_model="m",
+            base_url="http://localhost:9",
+            document_ids=[d.id for d in docs],
+            status=models.TrialStatus.PROCESSING,
+        )
+        row.api_key = "k"
+        db.add(row)
+        db.commit()
+        return row
+
+    return make
+
+
+@pytest.fixture
+def trial(make_trial):
+    return make_trial()
+
+
+@pytest.fixture
+def fake_extract(monkeypatch):
+    """Store a successful result per document instead of calling the LLM."""
+    from ..src import models
+    from ..src.celery import info_extraction
+    from ..src.db.session import SessionLocal
+    from ..src.utils.enums import TrialResultStatus
+
+    async def extract(*, trial_id, document_id, **_):
+        with SessionLocal() as session:
+            session.add(
+                models.TrialResult(
+                    trial_id=trial_id,
+                    document_id=document_id,
+                    result={"ok": True},
+                    status=TrialResultStatus.SUCCESS,
+                )
+            )
+            session.commit()
+        return 10, 4
+
+    monkeypatch.setattr(info_extraction, "extract_info_single_doc_async", extract)
+
+
+def _shards(db, trial_id):
+    from ..src import models
+
+    db.expire_all()
+    return list(
+        db.scalars(
+            select(models.TrialShard)
+            .where(models.TrialShard.trial_id == trial_id)
+            .order_by(models.TrialShard.shard_index)
+        )
+    )
+
+
+def test_plan_is_idempotent_and_claim_runs_a_shard_once(db, trial):
+    from ..src.utils.trial_shards import claim_shard, plan_shards, split_documents
+
+    assert split_documents([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    assert split_documents([], 2) == []
+
+    first = plan_shards(db, trial.id, trial.document_ids, 2)
+    assert plan_shards(db, trial.id, trial.document_ids, 1) == first
+    shards = _shards(db, trial.id)
+    assert [s.document_ids for s in shards] == [
+        trial.document_ids[:2],
+        trial.document_ids[2:],
+    ]
+
+    assert claim_shard(db, first[0]).attempts == 1
+    assert claim_shard(db, first[0]) is None
+
+
+def test_last_shard_finalizes_the_trial(db, trial, fake_extract):
+    from ..src import models
+    from ..src.celery.info_extraction import run_trial_shard
+    from ..src.utils.trial_shards import plan_shards
+
+    first, second = plan_shards(db, trial.id, trial.document_ids, 2)
+
+    run_trial_shard(trial.id, first)
+    db.expire_all()
+    assert db.get(models.Trial, trial.id).finished_at is None
+    # A redelivered message for a settled shard does nothing.
+    run_trial_shard(trial.id, first)
+
+    run_trial_shard(trial.id, second)
+    db.expire_all()
+    done = db.get(models.Trial, trial.id)
+    assert done.status == models.TrialStatus.COMPLETED
+    assert done.docs_done == 3
+    assert done.meta["prompt_tokens"] == 30
+    assert done.meta["cached_prompt_tokens"] == 12
+    assert [s.status for s in _shards(db, trial.id)] == [
+        models.TrialStatus.COMPLETED,
+        models.TrialStatus.COMPLETED,
+    ]
+
+
+def test_cancelled_trial_settles_queued_shards(db, trial):
+    from ..src import models
+    from ..src.celery.info_extraction import run_trial_shard
+    from ..src.utils.trial_shards import plan_shards
+
+    first, _ = plan_shards(db, trial.id, trial.document_ids, 2)
+    trial.cancel()
+    db.commit()
+
+    run_trial_shard(trial.id, first)
+
+    assert {s.status for s in _shards(db, trial.id)} == {models.TrialStatus.CANCELLED}
+    assert db.get(models.Trial, trial.id).finished_at is not None
+
+
+def test_sweeper_requeues_stale_shard_then_gives_up(db, trial, monkeypatch):
+    from ..src import models
+    from ..src.celery import info_extraction
+    from ..src.celery.task_signals import sweep_orphans
+    from ..src.core import config
+    from ..src.utils.trial_shards import (
+        claim_shard,
+        finish_shard,
+        plan_shards,
+        queue_next_shards,
+    )
+
+    monkeypatch.setattr(config._get_settings(), "TRIAL_SHARD_MAX_ATTEMPTS", 2)
+    queued = []
+    monkeypatch.setattr(
+        info_extraction,
+        "dispatch_shards",
+        lambda trial_id, shard_ids: queued.append((trial_id, list(shard_ids))),
+    )
+    first, second = plan_shards(db, trial.id, trial.document_ids, 2)
+    queue_next_shards(db, 16)
+    claim_shard(db, second)
+    finish_shard(db, second, models.TrialStatus.COMPLETED, failures={})
+
+    def _lose_worker():
+        claim_shard(db, first)
+        shard = db.get(models.TrialShard, first)
+        shard.heartbeat_at = _old()
+        # A stale trial heartbeat too: the ledger, not updated_at, decides.
+        db.get(models.Trial, trial.id).updated_at = _old()
+        db.commit()
+
+    _lose_worker()
+    sweep_orphans()
+    shards = _shards(db, trial.id)
+    assert shards[0].status == models.TrialStatus.PENDING
+    assert queued == [(trial.id, [first])]
+    assert db.get(models.Trial, trial.id).status == models.TrialStatus.PROCESSING
+
+    _lose_worker()
+    sweep_orphans()
+    shards = _shards(db, trial.id)
+    assert shards[0].status == models.TrialStatus.FAILED
+    assert len(queued) == 1
+    finalized = db.get(models.Trial, trial.id)
+    assert finalized.status == models.TrialStatus.FAILED
+    assert "_shard_0" in finalized.meta["failures"]
+
+
+def test_sweeper_keeps_a_shard_finished_after_it_looked_stale(db, trial):
+    from ..src import models
+    from ..src.db.session import SessionLocal
+    from ..src.utils.trial_shards import (
+        claim_shard,
+        finish_shard,
+        plan_shards,
+        reopen_stale_shards,
+    )
+
+    first, _ = plan_shards(db, trial.id, trial.document_ids, 2)
+    claim_shard(db, first)
+    db.get(models.TrialShard, first).heartbeat_at = _old()
+    db.commit()
+
+    def finish_meanwhile():
+        # The worker was slow, not dead: it settles the shard right after
+        # the sweeper selected it.
+        with SessionLocal() as worker:
+            finish_shard(worker, first, models.TrialStatus.COMPLETED, failures={})
+        return "gone"
+
+    reopened, exhausted = reopen_stale_shards(
+        db,
+        max_attempts=1,
+        failure=finish_meanwhile,
+        stale_before=datetime.datetime.now(datetime.UTC),
+        trial_ids=[trial.id],
+    )
+    assert (reopened, exhausted) == ([], set())
+    db.expire_all()
+    shard = db.get(models.TrialShard, first)
+    assert shard.status == models.TrialStatus.COMPLETED
+    assert not shard.failures
+
+
+def test_queued_shards_follow_trial_weights(db, make_trial):
+    from ..src import models
+    from ..src.utils.trial_shards import (
+        OPEN_STATUSES,
+        plan_shards,
+        queue_next_shards,
+    )
+
+    # Slots are shared by every trial in the DB: settle other tests' shards.
+    db.execute(
+        update(models.TrialShard)
+        .where(models.TrialShard.status.in_(OPEN_STATUSES))
+        .values(status=models.TrialStatus.CANCELLED)
+    )
+    db.commit()
+    heavy, light = make_trial(), make_trial()
+    for t in (heavy, light):
+        plan_shards(db, t.id, t.document_ids, 1)
+
+    # Two slots, equal weights: one shard each; the rest wait in the ledger.
+    assert sorted(t for t, _ in queue_next_shards(db, 2)) == [heavy.id, light.id]
+    assert queue_next_shards(db, 2) == []
+
+    project = db.get(models.Project, heavy.project_id)
+    project.scheduling_weight = 3
+    db.commit()
+    try:
+        # Four slots at 3:1 — the heavy trial's window grows to all its shards.
+        assert [t for t, _ in queue_next_shards(db, 4)] == [heavy.id, heavy.id]
+        queued = {
+            t.id: sum(s.queued_at is not None for s in _shards(db, t.id))
+            for t in (heavy, light)
+        }
+        assert queued == {heavy.id: 3, light.id: 1}
+    finally:
+        project.scheduling_weight = 1.0
+        db.commit()
+
+
+def test_shards_whose_message_was_lost_are_queued_again(db, trial, monkeypatch):
+    from ..src import models
+    from ..src.celery import info_extraction
+    from ..src.celery.task_signals import sweep_orphans
+    from ..src.utils.trial_shards import OPEN_STATUSES, plan_shards
+
+    db.execute(
+        update(models.TrialShard)
+        .where(
+            models.TrialShard.status.in_(OPEN_STATUSES),
+            models.TrialShard.trial_id != trial.id,
+        )
+        .values(status=models.TrialStatus.CANCELLED)
+    )
+    db.commit()
+    first, second = plan_shards(db, trial.id, trial.document_ids, 2)
+
+    def broker_down(trial_id, shard_ids):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(info_extraction, "dispatch_shards", broker_down)
+    with pytest.raises(ConnectionError):
+        info_extraction.queue_waiting_shards()
+    # Not sent, so not counted against the trial's window.
+    assert [s.queued_at for s in _shards(db, trial.id)] == [None, None]
+
+    queued = []
+    monkeypatch.setattr(
+        info_extraction,
+        "dispatch_shards",
+        lambda trial_id, shard_ids: queued.append((trial_id, list(shard_ids))),
+    )
+    assert info_extraction.queue_waiting_shards() == 2
+    # The sender died after marking the shards: the sweeper sends them again.
+    for shard in _shards(db, trial.id):
+        shard.queued_at = _old()
+    db.commit()
+    queued.clear()
+    sweep_orphans()
+    assert queued == [(trial.id, [first, second])]
+    # ...once: they were stamped again when re-sent.
+    queued.clear()
+    sweep_orphans()
+    assert queued == []
+
+
+def test_shard_waiting_behind_a_running_shard_is_not_resent(db, trial, monkeypatch):
+    from ..src import models
+    from ..src.celery import info_extraction
+    from ..src.celery.task_signals import sweep_orphans
+    from ..src.utils.trial_shards import OPEN_STATUSES, claim_shard, plan_shards
+
+    db.execute(
+        update(models.TrialShard)
+        .where(
+            models.TrialShard.status.in_(OPEN_STATUSES),
+            models.TrialShard.trial_id != trial.id,
+        )
+        .values(status=models.TrialStatus.CANCELLED)
+    )
+    db.commit()
+    queued = []
+    monkeypatch.setattr(
+        info_extraction,
+        "dispatch_shards",
+        lambda trial_id, shard_ids: queued.append((trial_id, list(shard_ids))),
+    )
+    first, second = plan_shards(db, trial.id, trial.document_ids, 2)
+    assert info_extraction.queue_waiting_shards() == 2
+    claim_shard(db, first)
+    # The second shard waits in the broker past the cutoff while the first
+    # one runs (its heartbeat is fresh): it is not lost.
+    db.get(models.TrialShard, second).queued_at = _old()
+    db.commit()
+    queued.clear()
+    sweep_orphans()
+    assert queued == []
+    assert db.get(models.TrialShard, second).status == models.TrialStatus.PENDING
+
+
+def test_max_concurrency_bounds_the_whole_trial(db, trial):
+    from ..src import models
+    from ..src.utils.trial_shards import (
+        OPEN_STATUSES,
+        plan_shards,
+        queue_next_shards,
+        shard_concurrency,
+    )
+
+    db.execute(
+        update(models.TrialShard)
+        .where(models.TrialShard.status.in_(OPEN_STATUSES))
+        .values(status=models.TrialStatus.CANCELLED)
+    )
+    trial.advanced_options = {"max_concurrency": 2}
+    db.commit()
+    plan_shards(db, trial.id, trial.document_ids, 1)
+
+    # Three shards and four free slots, but only two shards run at once...
+    assert len(queue_next_shards(db, 4)) == 2
+    # ...each with one request in flight.
+    assert shard_concurrency(trial.advanced_options, 3, 4) == 1
+    # Fewer shards than the limit share it out.
+    assert shard_concurrency({"max_concurrency": 32}, 3, 4) == 10
+    assert shard_concurrency({"max_concurrency": 32}, 100, 4) == 8
+    assert shard_concurrency({"max_concurrency": 32}, 1, 4) == 32
+    assert shard_concurrency(None, 100, 1) == 8
@@ -11,6 +11,10 @@ to lock in two scoring decisions that matter for medical/lab data:
   ``False``. "maybe" vs "unknown" is a *type error*, not a correct match.
 """
 
+from datetime import date, datetime
+
+import pytest
+
 
 def _comparator():
     # Lazy import so test collection doesn't trigger the app's settings init
@@ -224,6 +228,55 @@ def test_list_numeric_tolerance_per_element():
     assert r["is_correct"] is True
 
 
+def test_list_long_chain_needs_no_recursion():
+    """Each gt element matches its own and the next prediction; pairing them
+    all needs one augmenting path as long as the list, which a recursive
+    search cannot follow past the recursion limit."""
+    import sys
+
+    n = 400
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(300)
+    try:
+        # gt i is within tolerance of i - 0.5 and i + 0.5. Taken from the top
+        # down, every gt grabs i - 0.5, so gt 0 (the only one that can use
+        # -0.5) has to shift every earlier pairing along by one.
+        r = _list_compare(
+            [float(i) for i in reversed(range(n))],
+            [i + 0.5 for i in range(n - 1)] + [-0.5],
+            field_type="number",
+            method="numeric",
+            options={"tolerance": 0.5},
+        )
+    finally:
+        sys.setrecursionlimit(limit)
+    assert r["is_correct"] is True
+
+
+def test_max_bipartite_matching_matches_brute_force():
+    import itertools
+    import random
+
+    from ..src.utils.evaluation import _max_bipartite_matching
+
+    rng = random.Random(0)
+    for _ in range(300):
+        n_left, n_right = rng.randint(0, 6), rng.randint(0, 6)
+        adj = [
+            [v for v in range(n_right) if rng.random() < 0.35] for _ in range(n_left)
+        ]
+        edges = [(u, v) for u in range(n_left) for v in adj[u]]
+        best = 0
+        for k in range(min(n_left, n_right), 0, -1):
+            if any(
+                len({u for u, _ in combo}) == k == len({v for _, v in combo})
+                for combo in itertools.combinations(edges, k)
+            ):
+                best = k
+                break
+        assert _max_bipartite_matching(adj, n_right) == best, adj
+
+
 # ─── Numeric relative tolerance + gt=0 fallback ─────────────────────────────
 
 
@@ -267,3 +320,72 @@ def test_date_multiple_formats_match():
 def test_date_parse_error():
     r = _compare("not-a-date", "2020-01-01", field_type="date", method="date")
     assert r["error_type"] == "date_parse_error"
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("01/02/2024", date(2024, 2, 1)),  # ambiguous: day-first wins
+        ("12/31/2024", date(2024, 12, 31)),  # only month-first fits
+        ("2024/01/02", date(2024, 1, 2)),
+        ("02-01-2024", date(2024, 1, 2)),
+        ("20240131", date(2024, 1, 31)),
+        ("31.12.1999", date(1999, 12, 31)),
+        ("Jan 5 2020", date(2020, 1, 5)),  # pandas fallback
+        ("2020-13-45", None),
+    ],
+)
+def test_date_format_precedence(text, expected):
+    assert _comparator()._to_date(text) == expected
+
+
+def test_date_parsing_matches_trying_every_format_in_order():
+    """Only the formats sharing a string's separators are tried; the result
+    must equal trying the whole list in order, as parsing used to."""
+    import random
+
+    import pandas as pd
+
+    from ..src.utils.evaluation import _DATE_FORMATS
+
+    def reference(text):
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt).date()
+            except ValueError:
+                continue
+        try:
+            return pd.to_datetime(text).date()
+        except ValueError:
+            return None
+
+    rng = random.Random(0)
+    texts = ["".join(rng.choice("0123/-. ") for _ in range(10)) for _ in range(2000)]
+    comparator = _comparator()
+    for text in texts:
+        text = text.strip()
+        got, want = comparator._to_date(text), reference(text)
+        assert got == want or (pd.isna(got) and pd.isna(want)), text
+
+
+def test_date_strings_are_parsed_once(monkeypatch):
+    from ..src.utils import evaluation
+
+    evaluation._parse_date.cache_clear()
+    calls = []
+    real = evaluation.datetime
+
+    class CountingDatetime(real):
+        @classmethod
+        def strptime(cls, text, fmt):
+            calls.append(text)
+            return real.strptime(text, fmt)
+
+    monkeypatch.setattr(evaluation, "datetime", CountingDatetime)
+    comparator = _comparator()
+    for _ in range(3):
+        comparator.compare_batch(
+            ["2024-01-31"] * 50, ["31/01/2024"] * 50, "date", "date", {}
+        )
+
+    assert sorted(calls) == ["2024-01-31", "31/01/2024"]
@@ -0,0 +1,276 @@
+# backend/tests/test_value_comparator_batch.py
+"""Differential tests: ``ValueComparator.compare_batch`` vs ``compare``.
+
+The batch path re-implements every comparison method column-wise (rapidfuzz
+``cpdist`` for fuzzy, numpy for numeric), so each test builds a column of
+awkward values and asserts the batch returns exactly the scalar records —
+same keys, same booleans, same float confidences.
+"""
+
+import math
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+
+# Values that exercise conversion, missing handling, case/whitespace,
+# non-ASCII (token_sort_ratio's force_ascii), numbers-as-strings, NaN and
+# lists (the scalar list path).
+VALUES = [
+    None,
+    "",
+    float("nan"),
+    [],
+    0,
+    1,
+    1.0,
+    True,
+    False,
+    -3.5,
+    1e-9,
+    "0",
+    "1",
+    "1.0005",
+    "2.5",
+    "-2.5",
+    "1e3",
+    "inf",
+    "abc",
+    "yes",
+    "No",
+    " TRUE ",
+    "maybe",
+    "Cancer",
+    "non-cancer",
+    "cancer ",
+    "Malignant neoplasm",
+    "neoplasm, malignant",
+    "Größe über",
+    "Grosse uber",
+    "café",
+    "2024-01-31",
+    "31/01/2024",
+    "Jan 31 2024",
+    "not a date",
+    date(2024, 1, 31),
+    ["a", "b"],
+    ["b", "a", "c"],
+    {"k": "v"},
+    # Empty containers and numpy scalars (the batch's missing mask
+    # classifies by exact type and falls back for the rest).
+    {},
+    (),
+    np.float64("nan"),
+    np.str_(""),
+]
+
+CASES = [
+    ("string", "exact", {}),
+    ("string", "exact", {"case_sensitive": True}),
+    ("string", "fuzzy", {}),
+    ("string", "fuzzy", {"threshold": 60}),
+    ("string", "fuzzy", {"threshold": 85, "allow_partial_match": True}),
+    ("number", "numeric", {}),
+    ("number", "numeric", {"tolerance": 0.01, "relative": True}),
+    ("number", "numeric", {"tolerance": 0}),
+    ("string", "numeric", {"tolerance": 0.5}),
+    ("boolean", "boolean", {}),
+    ("string", "boolean", {}),
+    ("category", "category", {}),
+    (
+        "category",
+        "category",
+        {"mappings": {"cancer": ["malignant neoplasm", "Carcinoma"], "yes": "1"}},
+    ),
+    ("date", "date", {}),
+    ("string", "date", {}),
+    ("string", "unknown-method", {}),
+]
+
+
+def _comparator():
+    from ..src.utils.evaluation import ValueComparator
+
+    return ValueComparator()
+
+
+def _assert_same(gts, preds, field_type, method, options):
+    comparator = _comparator()
+    expected = [
+        comparator.compare(g, p, field_type, method, options)
+        for g, p in zip(gts, preds)
+    ]
+    actual = comparator.compare_batch(gts, preds, field_type, method, options)
+    assert len(actual) == len(expected)
+    for g, p, got, want in zip(gts, preds, actual, expected):
+        assert _nan_safe(got) == _nan_safe(want), (g, p)
+        assert type(got["is_correct"]) is type(want["is_correct"]), (g, p)
+        if "confidence_score" in want:
+            assert type(got["confidence_score"]) is type(want["confidence_score"])
+
+
+def _nan_safe(record):
+    # inf vs inf scores NaN confidence on both paths; NaN != NaN.
+    return {
+        k: "nan" if isinstance(v, float) and math.isnan(v) else v
+        for k, v in record.items()
+    }
+
+
+@pytest.mark.parametrize("field_type,method,options", CASES)
+def test_every_value_pair(field_type, method, options):
+    pairs = [(g, p) for g in VALUES for p in VALUES]
+    gts, preds = zip(*pairs)
+    _assert_same(list(gts), list(preds), field_type, method, options)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_strings_fuzzy(seed):
+    rng = random.Random(seed)
+    alphabet = "abcde fgh-ÄéØ,.'"
+
+    def word():
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+
+    gts = [word() for _ in range(300)]
+    # Mostly near-misses of the ground truth so scores straddle the threshold.
+    preds = [
+        g[: rng.randint(0, len(g))] + word()[:3] if rng.random() < 0.7 else word()
+        for g in gts
+    ]
+    for options in ({}, {"threshold": 70, "allow_partial_match": True}):
+        _assert_same(gts, preds, "string", "fuzzy", options)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_numbers(seed):
+    rng = random.Random(seed)
+    gts = [
+        rng.choice([0, 0.0, rng.uniform(-1e3, 1e3), rng.randint(-5, 5)])
+        for _ in range(300)
+    ]
+    preds = [
+        rng.choice([g, g * (1 + rng.uniform(-0.02, 0.02)), str(g), g + 1e-4])
+        for g in gts
+    ]
+    for options in ({}, {"tolerance": 0.01, "relative": True}, {"tolerance": 1}):
+        _assert_same(gts, preds, "number", "numeric", options)
+
+
+def test_length_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        _comparator().compare_batch(["a"], [], "string", "exact", {})
+
+
+def test_engine_batch_matches_per_document_evaluation():
+    from ..src.utils.evaluation import EvaluationEngine
+
+    engine = EvaluationEngine.__new__(EvaluationEngine)
+    rng = random.Random(7)
+    field_mappings = {
+        "name": {
+            "gt_field": "name",
+            "type": "string",
+            "method": "fuzzy",
+            "options": {},
+        },
+        "dose": {
+            "gt_field": "dose",
+            "type": "number",
+            "method": "numeric",
+            "options": {"tolerance": 0.05, "relative": True},
+        },
+        "smoker": {
+            "gt_field": "smoker",
+            "type": "boolean",
+            "method": "boolean",
+            "options": {},
+        },
+        "seen": {"gt_field": "seen", "type": "date", "method": "date", "options": {}},
+        "code": {
+            "gt_field": "code",
+            "type": "string",
+            "method": "exact",
+            "options": {},
+        },
+    }
+    gt_data, document_data, results = {}, {}, []
+    for doc_id in range(1, 61):
+        gt_data[f"doc_{doc_id}"] = {
+            "name": rng.choice(["Alice Smith", "Bob", "Éva Kovács"]),
+            "dose": rng.choice([0, 2.5, "10", None]),
+            "smoker": rng.choice(["yes", "no", "unknown"]),
+            "seen": rng.choice(["2024-01-31", "31/01/2024", "bad"]),
+            "code": rng.choice(["A1", "b2", ["x", "y"]]),
+        }
+        document_data[doc_id] = {"exists": doc_id % 13 != 0}
+        prediction = {
+            "name": rng.choice(
+                ["alice smith", "Smith Alice", "Bob", "Eva Kovacs", None]
+            ),
+            "dose": rng.choice([0, 2.51, "10.2", "n/a", None]),
+            "smoker": rng.choice([True, False, "Y", "maybe"]),
+            "seen": rng.choice(["2024-01-31", "Jan 31 2024", ""]),
+            "code": rng.choice(["a1", "B2", ["y", "x"]]),
+        }
+        results.append(_Result(doc_id, prediction))
+    results.append(_Result("not-an-id", {}))
+
+    batched = engine._evaluate_parallel(results, gt_data, field_mappings, document_data)
+
+    expected = [
+        engine._evaluate_document_isolated(
+            {"document_id": r.document_id, "prediction": r.result},
+            gt_data,
+            field_mappings,
+            document_data,
+        )
+        for r in results
+    ]
+    assert batched["document_evaluations"] == expected
+    assert batched["detailed_metrics"] == [
+        m for doc in expected for m in doc.get("detailed_metrics", [])
+    ]
+
+
+def test_engine_failure_stays_with_its_document(monkeypatch):
+    from ..src.utils import evaluation
+    from ..src.utils.evaluation import EvaluationEngine, ValueComparator
+
+    real = ValueComparator.compare
+
+    def compare(self, gt, pred, *args):
+        if pred == "boom":
+            raise RuntimeError("boom")
+        return real(self, gt, pred, *args)
+
+    def compare_batch(self, gts, preds, *args):
+        return [compare(self, g, p, *args) for g, p in zip(gts, preds)]
+
+    monkeypatch.setattr(ValueComparator, "compare", compare)
+    monkeypatch.setattr(ValueComparator, "compare_batch", compare_batch)
+    monkeypatch.setattr(evaluation, "internal_error_message", lambda e, prefix: prefix)
+    engine = EvaluationEngine.__new__(EvaluationEngine)
+    mappings = {
+        "a": {"gt_field": "a", "type": "string", "method": "exact", "options": {}}
+    }
+
+    out = engine._evaluate_parallel(
+        [_Result(1, {"a": "x"}), _Result(2, {"a": "boom"}), _Result(3, {"a": "y"})],
+        {"1": {"a": "x"}, "2": {"a": "x"}, "3": {"a": "x"}},
+        mappings,
+        {i: {"exists": True} for i in (1, 2, 3)},
+    )
+
+    docs = out["document_evaluations"]
+    assert [d["document_id"] for d in docs] == [1, 2, 3]
+    assert docs[0]["accuracy"] == 1.0 and docs[2]["accuracy"] == 0.0
+    assert docs[1]["error"] == "Evaluation failed"
+    assert [m["document_id"] for m in out["detailed_metrics"]] == [1, 3]
+
+
+class _Result:
+    def __init__(self, document_id, result):
+        self.document_id = document_id
+        self.result = result
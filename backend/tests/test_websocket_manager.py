@@ -3,14 +3,20 @@
 
 ``pytest-asyncio`` is NOT installed in this repo, so the async methods are
 driven with ``asyncio.run(...)`` and the WebSocket is a ``unittest.mock``
-``AsyncMock`` (its ``accept`` / ``send_json`` / ``close`` coroutines are
+``AsyncMock`` (its ``accept`` / ``send_text`` / ``close`` coroutines are
 awaitable). Every test builds a FRESH ``ConnectionManager()`` so no state
 leaks between tests (the module-level ``manager`` singleton is never touched).
+
+Broadcasts only enqueue; each socket's writer task sends. A broadcast and the
+drain that waits for the writers therefore run in the same event loop
+(``deliver``), since the writers die with the loop that started them.
 """
 
 import asyncio
+import json
 from unittest.mock import AsyncMock
 
+from backend.src import websocket_manager
 from backend.src.websocket_manager import (
     MAX_CONNECTIONS_PER_USER,
     ConnectionManager,
@@ -22,7 +28,7 @@ from backend.src.websocket_manager import (
 # Helpers
 # --------------------------------------------------------------------------- #
 def make_ws():
-    """A WebSocket double whose accept/send_json/close are awaitable."""
+    """A WebSocket double whose accept/send_text/close are awaitable."""
     return AsyncMock()
 
 
@@ -32,6 +38,21 @@ def connect(mgr, ws, user_id, is_admin=False, subprotocol=None):
     )
 
 
+def deliver(mgr, broadcast):
+    """Run a broadcast coroutine and wait for the writers to send it."""
+
+    async def _run():
+        await broadcast
+        await mgr.drain(timeout=5)
+
+    asyncio.run(_run())
+
+
+def sent(ws):
+    """The decoded JSON frames a socket was sent, in order."""
+    return [json.loads(call.args[0]) for call in ws.send_text.await_args_list]
+
+
 # --------------------------------------------------------------------------- #
 # connect()
 # --------------------------------------------------------------------------- #
@@ -175,19 +196,19 @@ class TestBroadcastToUser:
         connect(mgr, b, user_id=1)
 
         msg = {"type": "update", "x": 1}
-        asyncio.run(mgr.broadcast_to_user(1, msg))
+        deliver(mgr, mgr.broadcast_to_user(1, msg))
 
-        a.send_json.assert_awaited_once_with(msg)
-        b.send_json.assert_awaited_once_with(msg)
+        assert sent(a) == [msg]
+        assert sent(b) == [msg]
 
     def test_unknown_user_sends_nothing(self):
         mgr = ConnectionManager()
         ws = make_ws()
         connect(mgr, ws, user_id=1)
 
-        asyncio.run(mgr.broadcast_to_user(999, {"a": 1}))
+        deliver(mgr, mgr.broadcast_to_user(999, {"a": 1}))
 
-        ws.send_json.assert_not_awaited()
+        ws.send_text.assert_not_awaited()
 
     def test_does_not_send_to_other_users(self):
         mgr = ConnectionManager()
@@ -195,20 +216,20 @@ class TestBroadcastToUser:
         connect(mgr, mine, user_id=1)
         connect(mgr, theirs, user_id=2)
 
-        asyncio.run(mgr.broadcast_to_user(1, {"a": 1}))
+        deliver(mgr, mgr.broadcast_to_user(1, {"a": 1}))
 
-        mine.send_json.assert_awaited_once()
-        theirs.send_json.assert_not_awaited()
+        mine.send_text.assert_awaited_once()
+        theirs.send_text.assert_not_awaited()
 
     def test_failing_socket_is_cleaned_up(self):
         mgr = ConnectionManager()
         good, bad = make_ws(), make_ws()
-        bad.send_json.side_effect = RuntimeError("connection reset")
+        bad.send_text.side_effect = RuntimeError("connection reset")
         connect(mgr, good, user_id=1)
         connect(mgr, bad, user_id=1)
 
         # Must not propagate the exception.
-        asyncio.run(mgr.broadcast_to_user(1, {"a": 1}))
+        deliver(mgr, mgr.broadcast_to_user(1, {"a": 1}))
 
         # Failing socket removed, healthy one retained.
         assert bad not in mgr._active_connections[1]
@@ -217,12 +238,12 @@ class TestBroadcastToUser:
     def test_all_sockets_failing_drops_user_entry(self):
         mgr = ConnectionManager()
         a, b = make_ws(), make_ws()
-        a.send_json.side_effect = RuntimeError("boom")
-        b.send_json.side_effect = RuntimeError("boom")
+        a.send_text.side_effect = RuntimeError("boom")
+        b.send_text.side_effect = RuntimeError("boom")
         connect(mgr, a, user_id=1)
         connect(mgr, b, user_id=1)
 
-        asyncio.run(mgr.broadcast_to_user(1, {"a": 1}))
+        deliver(mgr, mgr.broadcast_to_user(1, {"a": 1}))
 
         assert 1 not in mgr._active_connections
 
@@ -239,27 +260,27 @@ class TestBroadcastToAdmin:
         connect(mgr, plain, user_id=2, is_admin=False)
 
         msg = {"type": "admin"}
-        asyncio.run(mgr.broadcast_to_admin(msg))
+        deliver(mgr, mgr.broadcast_to_admin(msg))
 
-        admin.send_json.assert_awaited_once_with(msg)
-        plain.send_json.assert_not_awaited()
+        assert sent(admin) == [msg]
+        plain.send_text.assert_not_awaited()
 
     def test_no_admins_sends_nothing(self):
         mgr = ConnectionManager()
         plain = make_ws()
         connect(mgr, plain, user_id=2)
 
-        asyncio.run(mgr.broadcast_to_admin({"a": 1}))
+        deliver(mgr, mgr.broadcast_to_admin({"a": 1}))
 
-        plain.send_json.assert_not_awaited()
+        plain.send_text.assert_not_awaited()
 
     def test_failing_admin_socket_is_cleaned_up(self):
         mgr = ConnectionManager()
         admin = make_ws()
-        admin.send_json.side_effect = RuntimeError("gone")
+        admin.send_text.side_effect = RuntimeError("gone")
         connect(mgr, admin, user_id=5, is_admin=True)
 
-        asyncio.run(mgr.broadcast_to_admin({"a": 1}))
+        deliver(mgr, mgr.broadcast_to_admin({"a": 1}))
 
         # Removed from both buckets via disconnect().
         assert admin not in mgr._admin_connections
@@ -278,28 +299,28 @@ class TestBroadcastToAll:
         connect(mgr, c, user_id=2)
 
         msg = {"type": "global"}
-        asyncio.run(mgr.broadcast_to_all(msg))
+        deliver(mgr, mgr.broadcast_to_all(msg))
 
         for ws in (a, b, c):
-            ws.send_json.assert_awaited_once_with(msg)
+            assert sent(ws) == [msg]
 
     def test_empty_manager_is_noop(self):
         mgr = ConnectionManager()
         # Should not raise.
-        asyncio.run(mgr.broadcast_to_all({"a": 1}))
+        deliver(mgr, mgr.broadcast_to_all({"a": 1}))
 
     def test_failing_socket_cleaned_up_others_still_sent(self):
         mgr = ConnectionManager()
         good, bad, other = make_ws(), make_ws(), make_ws()
-        bad.send_json.side_effect = RuntimeError("boom")
+        bad.send_text.side_effect = RuntimeError("boom")
         connect(mgr, good, user_id=1)
         connect(mgr, bad, user_id=1)
         connect(mgr, other, user_id=2)
 
-        asyncio.run(mgr.broadcast_to_all({"a": 1}))
+        deliver(mgr, mgr.broadcast_to_all({"a": 1}))
 
-        good.send_json.assert_awaited_once()
-        other.send_json.assert_awaited_once()
+        good.send_text.assert_awaited_once()
+        other.send_text.assert_awaited_once()
         assert bad not in mgr._active_connections.get(1, set())
         assert good in mgr._active_connections[1]
 
@@ -318,11 +339,11 @@ class TestBroadcastToProject:
         connect(mgr, stranger, user_id=3)
 
         msg = {"type": "task", "project_id": 42}
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=1, message=msg))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=1, message=msg))
 
-        owner.send_json.assert_awaited_once_with(msg)
-        admin.send_json.assert_awaited_once_with(msg)
-        stranger.send_json.assert_not_awaited()
+        assert sent(owner) == [msg]
+        assert sent(admin) == [msg]
+        stranger.send_text.assert_not_awaited()
 
     def test_collaborators_receive_shared_project_updates(self):
         mgr = ConnectionManager()
@@ -335,11 +356,11 @@ class TestBroadcastToProject:
 
         msg = {"type": "task", "project_id": 42}
         # The caller resolves owner + shares into one recipient set.
-        asyncio.run(mgr.broadcast_to_project(recipient_ids={1, 2}, message=msg))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids={1, 2}, message=msg))
 
-        owner.send_json.assert_awaited_once_with(msg)
-        collaborator.send_json.assert_awaited_once_with(msg)
-        stranger.send_json.assert_not_awaited()
+        assert sent(owner) == [msg]
+        assert sent(collaborator) == [msg]
+        stranger.send_text.assert_not_awaited()
 
     def test_empty_recipient_set_only_admins_receive(self):
         mgr = ConnectionManager()
@@ -348,10 +369,10 @@ class TestBroadcastToProject:
         connect(mgr, admin, user_id=2, is_admin=True)
         connect(mgr, plain, user_id=3)
 
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=set(), message={"a": 1}))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=set(), message={"a": 1}))
 
-        admin.send_json.assert_awaited_once()
-        plain.send_json.assert_not_awaited()
+        admin.send_text.assert_awaited_once()
+        plain.send_text.assert_not_awaited()
 
     def test_unresolved_owner_only_admins_receive(self):
         mgr = ConnectionManager()
@@ -361,46 +382,46 @@ class TestBroadcastToProject:
         connect(mgr, plain, user_id=3)
 
         # owner_id=None (e.g. project deleted): only admins get it.
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=None, message={"a": 1}))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=None, message={"a": 1}))
 
-        admin.send_json.assert_awaited_once()
-        plain.send_json.assert_not_awaited()
+        admin.send_text.assert_awaited_once()
+        plain.send_text.assert_not_awaited()
 
     def test_owner_with_no_admins(self):
         mgr = ConnectionManager()
         owner = make_ws()
         connect(mgr, owner, user_id=1)
 
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=1, message={"a": 1}))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=1, message={"a": 1}))
 
-        owner.send_json.assert_awaited_once()
+        owner.send_text.assert_awaited_once()
 
     def test_unknown_owner_and_no_admins_is_noop(self):
         mgr = ConnectionManager()
         plain = make_ws()
         connect(mgr, plain, user_id=3)
 
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=99, message={"a": 1}))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=99, message={"a": 1}))
 
-        plain.send_json.assert_not_awaited()
+        plain.send_text.assert_not_awaited()
 
     def test_failing_owner_socket_cleaned_up(self):
         mgr = ConnectionManager()
         owner = make_ws()
-        owner.send_json.side_effect = RuntimeError("boom")
+        owner.send_text.side_effect = RuntimeError("boom")
         connect(mgr, owner, user_id=1)
 
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=1, message={"a": 1}))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=1, message={"a": 1}))
 
         assert 1 not in mgr._active_connections
 
     def test_failing_admin_socket_cleaned_up(self):
         mgr = ConnectionManager()
         admin = make_ws()
-        admin.send_json.side_effect = RuntimeError("boom")
+        admin.send_text.side_effect = RuntimeError("boom")
         connect(mgr, admin, user_id=5, is_admin=True)
 
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=None, message={"a": 1}))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=None, message={"a": 1}))
 
         assert admin not in mgr._admin_connections
         assert 5 not in mgr._active_connections
@@ -411,10 +432,156 @@ class TestBroadcastToProject:
         admin_owner = make_ws()
         connect(mgr, admin_owner, user_id=1, is_admin=True)
 
-        asyncio.run(mgr.broadcast_to_project(recipient_ids=1, message={"a": 1}))
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids=1, message={"a": 1}))
+
+        # Deduplicated to a single send (admins and members form one target set).
+        assert admin_owner.send_text.await_count == 1
+
+
+# --------------------------------------------------------------------------- #
+# Per-socket queues: serialization, coalescing, slow clients
+# --------------------------------------------------------------------------- #
+def progress(task_id, processed):
+    return {
+        "type": "preprocessing_update",
+        "task_id": task_id,
+        "project_id": 1,
+        "processed_files": processed,
+        "event": "progress",
+    }
+
+
+def blocking_ws():
+    """A socket whose sends hang until ``release`` is set."""
+    ws = make_ws()
+    release = asyncio.Event()
+
+    async def send_text(text):
+        await release.wait()
+
+    ws.send_text.side_effect = send_text
+    return ws, release
+
+
+class TestOutboundQueues:
+    def test_payload_serialized_once_per_broadcast(self, monkeypatch):
+        calls = []
+        real = websocket_manager._serialize
+        monkeypatch.setattr(
+            websocket_manager,
+            "_serialize",
+            lambda message: calls.append(message) or real(message),
+        )
+        mgr = ConnectionManager()
+        sockets = [make_ws() for _ in range(3)]
+        for i, ws in enumerate(sockets):
+            connect(mgr, ws, user_id=i + 1, is_admin=i == 0)
+
+        msg = {"type": "task", "project_id": 42}
+        deliver(mgr, mgr.broadcast_to_project(recipient_ids={2, 3}, message=msg))
+
+        assert calls == [msg]
+        for ws in sockets:
+            assert sent(ws) == [msg]
+
+    def test_slow_socket_does_not_delay_others(self):
+        async def scenario():
+            mgr = ConnectionManager()
+            slow, release = blocking_ws()
+            fast = make_ws()
+            await mgr.connect(slow, 1)
+            await mgr.connect(fast, 2)
+
+            await mgr.broadcast_to_project({1, 2}, {"a": 1})
+            await asyncio.wait_for(mgr._outboxes[fast].wait_idle(), 1)
+            assert sent(fast) == [{"a": 1}]
+
+            release.set()
+            await mgr.drain(timeout=1)
+            assert slow.send_text.await_count == 1
+
+        asyncio.run(scenario())
+
+    def test_superseded_progress_is_coalesced_in_order(self):
+        async def scenario():
+            mgr = ConnectionManager()
+            ws, release = blocking_ws()
+            await mgr.connect(ws, 1)
+
+            # The first frame is picked up by the writer and blocks; the rest
+            # queue behind it.
+            await mgr.broadcast_to_user(1, progress(7, 1))
+            await asyncio.sleep(0)
+            await mgr.broadcast_to_user(1, progress(7, 2))
+            await mgr.broadcast_to_user(1, progress(8, 1))
+            await mgr.broadcast_to_user(1, progress(7, 3))
+            done = {**progress(7, 4), "event": "completed"}
+            await mgr.broadcast_to_user(1, done)
+            await mgr.broadcast_to_user(1, progress(7, 5))
+
+            release.set()
+            await mgr.drain(timeout=1)
+            return ws
+
+        ws = asyncio.run(scenario())
+        assert [(m["task_id"], m["processed_files"]) for m in sent(ws)] == [
+            (7, 1),
+            (7, 3),  # replaced (7, 2) in place
+            (8, 1),
+            (7, 4),  # lifecycle event: never coalesced away
+            (7, 5),  # queued after the event, not folded into the earlier slot
+        ]
+
+    def test_full_queue_closes_the_socket(self, monkeypatch):
+        monkeypatch.setattr(websocket_manager, "MAX_PENDING_MESSAGES", 2)
+
+        async def scenario():
+            mgr = ConnectionManager()
+            ws, _ = blocking_ws()
+            await mgr.connect(ws, 1)
+            for i in range(4):
+                await mgr.broadcast_to_user(1, {"n": i})
+                await asyncio.sleep(0)
+            await asyncio.gather(*mgr._closing)
+            return mgr, ws
+
+        mgr, ws = asyncio.run(scenario())
+        ws.close.assert_awaited_once_with(code=1013, reason="Client too slow")
+        assert 1 not in mgr._active_connections
+        assert ws not in mgr._outboxes
+
+    def test_send_blocked_past_threshold_closes_the_socket(self, monkeypatch):
+        monkeypatch.setattr(websocket_manager, "SLOW_CLIENT_TIMEOUT_SECONDS", 0.05)
+
+        async def scenario():
+            mgr = ConnectionManager()
+            ws, _ = blocking_ws()
+            await mgr.connect(ws, 1, is_admin=True)
+            await mgr.broadcast_to_admin({"a": 1})
+            await mgr.drain(timeout=1)
+            await asyncio.gather(*mgr._closing)
+            return mgr, ws
+
+        mgr, ws = asyncio.run(scenario())
+        ws.close.assert_awaited_once_with(code=1013, reason="Client too slow")
+        assert ws not in mgr._admin_connections
+        assert 1 not in mgr._active_connections
 
-        # Deduplicated to a single send (the `sent` set guards the owner loop).
-        assert admin_owner.send_json.await_count == 1
+    def test_send_text_is_queued_behind_broadcasts(self):
+        async def scenario():
+            mgr = ConnectionManager()
+            ws = make_ws()
+            await mgr.connect(ws, 1)
+            await mgr.broadcast_to_user(1, {"a": 1})
+            await mgr.send_text(ws, "pong")
+            await mgr.drain(timeout=1)
+            return ws
+
+        ws = asyncio.run(scenario())
+        assert [c.args[0] for c in ws.send_text.await_args_list] == [
+            '{"a":1}',
+            "pong",
+        ]
 
 
 # --------------------------------------------------------------------------- #
@@ -63,6 +63,7 @@ export interface PaginatedDocuments {
   today_count: number | null
   week_count: number | null
   month_count: number | null
+  stats_computed_at?: ISODateString | null
 }
 
 /** Count of affected resources plus a few names for display. */
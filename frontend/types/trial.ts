@@ -21,6 +21,12 @@ export type TrialAdvancedOptions = Record<string, unknown> & {
    * unknown or absent values fall back to English server-side.
    */
   prompt_language?: string
+  /**
+   * `prefix_cache` sends every static part of the prompt (system prompt,
+   * guard, schema, evidence rules) before the document so requests share a
+   * cacheable prefix. Absent or unknown values keep the classic layout.
+   */
+  prompt_layout?: 'classic' | 'prefix_cache'
 }
 
 /** Trial.meta — holds eta_seconds during processing. */